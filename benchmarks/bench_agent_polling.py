@@ -0,0 +1,114 @@
+"""
+Benchmark for how an agent polls for flow runs, with the run queue (two requests per
+poll) and with the combined query (one request per poll), with and without looking
+ahead for flow runs which are about to be due.
+
+Simulates an agent on a virtual clock over `duration` seconds, in which a flow run is
+scheduled to start every `SPACING` seconds, against an API which answers each request
+after `LATENCY` seconds, and reports the number of requests made and the mean and
+maximum delay between each flow run being due and being deployed.
+
+Usage:
+    python benchmarks/bench_agent_polling.py [duration ...]
+"""
+import sys
+from typing import Any, List
+from unittest.mock import MagicMock, patch
+
+import pendulum
+
+from prefect.agent import Agent
+from prefect.engine.state import Scheduled
+from prefect.utilities.configuration import set_temporary_config
+from prefect.utilities.graphql import GraphQLResult
+
+DEFAULT_SIZES = [600, 3600]
+SPACING = 37.0
+LATENCY = 0.05
+
+
+def run(
+    duration: int, query_mode: str, lookahead: float, max_poll_interval: float = 10.0
+) -> None:
+    start = pendulum.datetime(2020, 1, 1, tz="UTC")
+    clock = [0.0]
+    due_times = [SPACING * (i + 1) for i in range(int(duration // SPACING))]
+    deployed = {}  # type: dict
+    requests = [0]
+
+    def flow_run(i: int) -> GraphQLResult:
+        return GraphQLResult(
+            dict(
+                id=str(i),
+                state="Scheduled",
+                scheduled_start_time=start.add(seconds=due_times[i]).isoformat(),
+                serialized_state=Scheduled().serialize(),
+                flow=dict(environment=dict(labels=[])),
+                task_runs=[],
+            )
+        )
+
+    def graphql(query: Any, variables: dict = None, **kwargs: Any) -> MagicMock:
+        requests[0] += 1
+        clock[0] += LATENCY
+        pendulum.set_test_now(start.add(seconds=clock[0]))
+        horizon = clock[0] + lookahead
+        found = [
+            i
+            for i, due in enumerate(due_times)
+            if due <= horizon and str(i) not in deployed
+        ]
+        return MagicMock(
+            data=MagicMock(
+                getRunsInQueue=MagicMock(flow_run_ids=[str(i) for i in found]),
+                flow_run=[flow_run(i) for i in found],
+            )
+        )
+
+    client = MagicMock()
+    client.return_value.graphql = graphql
+    config = {
+        "cloud.agent.query_mode": query_mode,
+        "cloud.agent.lookahead": lookahead,
+        "cloud.agent.max_poll_interval": max_poll_interval,
+        "cloud.agent.auth_token": "token",
+    }
+    with set_temporary_config(config), patch("prefect.agent.agent.Client", client):
+        with patch.object(Agent, "_verify_token"):
+            agent = Agent()
+        requests[0] = 0
+        intervals = agent.poll_intervals()
+        index = 0
+        interval = intervals[index]
+        while clock[0] < duration:
+            clock[0] += interval
+            pendulum.set_test_now(start.add(seconds=clock[0]))
+            flow_runs = agent.query_flow_runs(tenant_id="tenant")
+            for run in flow_runs:
+                deployed[run.id] = clock[0] - due_times[int(run.id)]
+            index = 0 if flow_runs else min(index + 1, len(intervals) - 1)
+            interval = agent.next_poll_interval(intervals[index])
+    pendulum.set_test_now()
+
+    delays = list(deployed.values())  # type: List[float]
+    print(
+        "{:>5}s | {:<8} | max interval {:>4.0f}s | lookahead {:>4.0f}s | {:>5} requests "
+        "| delay mean {:5.2f}s max {:5.2f}s".format(
+            duration,
+            query_mode,
+            max_poll_interval,
+            lookahead,
+            requests[0],
+            sum(delays) / len(delays),
+            max(delays),
+        )
+    )
+
+
+if __name__ == "__main__":
+    sizes = [int(n) for n in sys.argv[1:]] or DEFAULT_SIZES
+    for size in sizes:
+        run(size, "queue", lookahead=0.0)
+        run(size, "combined", lookahead=0.0)
+        run(size, "combined", lookahead=10.0)
+        run(size, "combined", lookahead=30.0, max_poll_interval=30.0)
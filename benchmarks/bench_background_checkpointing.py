@@ -0,0 +1,65 @@
+"""
+Benchmark for flow runs which checkpoint every task's result to a slow store, with
+results written before each task run finishes and in the background.
+
+Runs a chain of `n_tasks` tasks, each of which works for `COMPUTE` seconds, with a
+result handler which waits `LATENCY` seconds on every write (standing in for an upload
+to S3 or GCS), and reports the wall time of the flow run with each mode.
+
+Usage:
+    python benchmarks/bench_background_checkpointing.py [n_tasks ...]
+"""
+import logging
+import sys
+import time
+from typing import Any
+
+import prefect
+from prefect import Flow, Task
+from prefect.engine import checkpointing
+from prefect.engine.result_handlers import JSONResultHandler
+from prefect.utilities.configuration import set_temporary_config
+
+DEFAULT_SIZES = [20, 100]
+COMPUTE = 0.02
+LATENCY = 0.05
+
+
+class SlowResultHandler(JSONResultHandler):
+    def write(self, result: Any) -> str:
+        time.sleep(LATENCY)
+        return super().write(result)
+
+
+class Work(Task):
+    def run(self, x: int = 0) -> int:
+        time.sleep(COMPUTE)
+        return x + 1
+
+
+def run(n_tasks: int, background: bool) -> None:
+    with Flow("chain", result_handler=SlowResultHandler()) as flow:
+        result = Work()()
+        for _ in range(n_tasks - 1):
+            result = Work()(result)
+
+    checkpointing._checkpoint_pool = None
+    with set_temporary_config({"engine.checkpointing.background": background}):
+        with prefect.context(checkpointing=True):
+            start = time.perf_counter()
+            state = flow.run()
+            elapsed = time.perf_counter() - start
+    assert state.is_successful()
+    print(
+        "{:>5} tasks | {:<10} | {:7.3f}s".format(
+            n_tasks, "background" if background else "inline", elapsed
+        )
+    )
+
+
+if __name__ == "__main__":
+    logging.getLogger("prefect").setLevel(logging.CRITICAL)
+    sizes = [int(n) for n in sys.argv[1:]] or DEFAULT_SIZES
+    for size in sizes:
+        run(size, background=False)
+        run(size, background=True)
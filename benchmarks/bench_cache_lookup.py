@@ -0,0 +1,99 @@
+"""
+Benchmark for `CloudTaskRunner.check_task_is_cached` with many cached states, with and
+without input fingerprints.
+
+Simulates a task whose `cache_for` window holds `n_states` Cached states (one of which
+matches the current inputs), each with a cached input which takes `LATENCY` seconds to
+read (standing in for a download from S3 or GCS), and reports the time taken by the
+first lookup and by a repeated lookup with each mode.
+
+Usage:
+    python benchmarks/bench_cache_lookup.py [n_states ...]
+"""
+import datetime
+import logging
+import sys
+import time
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import prefect
+from prefect.engine.cache_validators import all_inputs
+from prefect.engine.cloud import CloudTaskRunner, utilities
+from prefect.engine.result import Result, SafeResult
+from prefect.engine.result_handlers import JSONResultHandler
+from prefect.engine.state import Cached, Pending
+from prefect.utilities import hashing
+from prefect.utilities.configuration import set_temporary_config
+
+DEFAULT_SIZES = [24, 168]
+LATENCY = 0.01
+
+
+class SlowResultHandler(JSONResultHandler):
+    def read(self, result: str) -> Any:
+        time.sleep(LATENCY)
+        return super().read(result)
+
+
+def cached_states(n_states: int, fingerprinted: bool) -> list:
+    handler = SlowResultHandler()
+    expiration = datetime.datetime.utcnow() + datetime.timedelta(days=1)
+    return [
+        Cached(
+            cached_result_expiration=expiration,
+            result=SafeResult(str(x), handler),
+            cached_inputs={"x": SafeResult(str(x), handler)},
+            cached_fingerprint=hashing.fingerprint(hashing.hash_values({"x": x}))
+            if fingerprinted
+            else None,
+        )
+        # the matching state is the oldest, and so the last candidate
+        for x in range(n_states, 0, -1)
+    ]
+
+
+def run(n_states: int, fingerprinted: bool) -> None:
+    @prefect.task(
+        cache_for=datetime.timedelta(days=7),
+        cache_validator=all_inputs,
+        result_handler=SlowResultHandler(),
+    )
+    def hourly(x: int) -> int:
+        return x
+
+    client = MagicMock()
+    client.set_task_run_state.side_effect = lambda state, **kwargs: state
+    client.get_latest_cached_states.side_effect = lambda **kwargs: cached_states(
+        n_states, fingerprinted
+    )
+    utilities._CACHED_STATES.clear()
+
+    timings = []
+    config = {
+        "cloud.auth_token": "token",
+        "engine.task_runner.fingerprint_cached_states": fingerprinted,
+    }
+    with set_temporary_config(config):
+        with patch("prefect.engine.cloud.task_runner.Client", return_value=client):
+            for _ in range(2):
+                start = time.perf_counter()
+                state = CloudTaskRunner(task=hourly).check_task_is_cached(
+                    Pending(),
+                    inputs={"x": Result(1, result_handler=SlowResultHandler())},
+                )
+                timings.append(time.perf_counter() - start)
+                assert state.is_cached() and state.result == 1
+    print(
+        "{:>5} states | {:<13} | first {:7.3f}s | repeated {:7.3f}s".format(
+            n_states, "fingerprinted" if fingerprinted else "unhashed", *timings
+        )
+    )
+
+
+if __name__ == "__main__":
+    logging.getLogger("prefect").setLevel(logging.CRITICAL)
+    sizes = [int(n) for n in sys.argv[1:]] or DEFAULT_SIZES
+    for size in sizes:
+        run(size, fingerprinted=False)
+        run(size, fingerprinted=True)
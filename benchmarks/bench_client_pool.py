@@ -0,0 +1,69 @@
+"""
+Benchmark for `Client` requests against a local stub server.
+
+Reports the average time per request and how many connections the client opened or
+reused, with keep-alive enabled and disabled.
+
+Usage:
+    python benchmarks/bench_client_pool.py [n_requests ...]
+"""
+import http.server
+import json
+import sys
+import threading
+import time
+
+from prefect.client import Client
+from prefect.utilities.configuration import set_temporary_config
+
+DEFAULT_SIZES = [1000]
+
+
+class StubHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps(dict(data=dict(ok=True))).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if self.headers.get("Connection") == "close":
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def run(server: str, n_requests: int, keep_alive: bool) -> None:
+    with set_temporary_config({"cloud.requests.keep_alive": keep_alive}):
+        client = Client(api_server=server, api_token="token")
+        start = time.perf_counter()
+        for _ in range(n_requests):
+            client.post("/graphql", params=dict(query="{ ok }"))
+        elapsed = time.perf_counter() - start
+    stats = client.connection_stats
+    print(
+        "{:>6} requests | keep_alive={!s:<5} | {:7.1f}us/request | opened {:>6} | reused {:>6}".format(
+            n_requests,
+            keep_alive,
+            elapsed / n_requests * 1e6,
+            stats["opened"],
+            stats["reused"],
+        )
+    )
+
+
+if __name__ == "__main__":
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    url = "http://127.0.0.1:{}".format(httpd.server_address[1])
+
+    sizes = [int(n) for n in sys.argv[1:]] or DEFAULT_SIZES
+    for size in sizes:
+        run(url, size, keep_alive=False)
+        run(url, size, keep_alive=True)
+    httpd.shutdown()
@@ -0,0 +1,124 @@
+"""
+Benchmark for the GraphQL requests made by a `CloudTaskRunner` mapped over `n_children`
+children against a local stub server.
+
+Reports the number of requests which create (or retrieve) task runs, the number of flow
+run settings queries and the wall time, with `cloud.task_runs.create_batch_size` set to
+0 (each child retrieves its own task run, the default) and to `BATCH_SIZE`.
+
+Usage:
+    python benchmarks/bench_cloud_mapping.py [n_children ...]
+"""
+import collections
+import http.server
+import json
+import logging
+import re
+import sys
+import threading
+import time
+
+import prefect
+from prefect.core import Edge, Task
+from prefect.engine.cloud import CloudTaskRunner
+from prefect.engine.executors import LocalExecutor
+from prefect.engine.state import Pending, Success
+from prefect.utilities.configuration import set_temporary_config
+
+DEFAULT_SIZES = [1000]
+BATCH_SIZE = 500
+TASK_RUN_ALIAS = re.compile(r"(\w+): getOrCreateTaskRun")
+
+
+class StubHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    requests = collections.Counter()  # type: collections.Counter
+    lock = threading.Lock()
+    task_run = dict(
+        id="task-run",
+        version=0,
+        serialized_state=Pending().serialize(),
+        task=dict(slug="slug"),
+    )
+
+    def do_POST(self) -> None:
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        query = request["query"]
+        if "getOrCreateTaskRun" in query:
+            kind = "getOrCreateTaskRun"
+            aliases = TASK_RUN_ALIAS.findall(query) or ["getOrCreateTaskRun"]
+            data = {alias: dict(task_run=self.task_run) for alias in aliases}
+        elif "setTaskRunStates" in query:
+            kind = "setTaskRunStates"
+            states = json.loads(request["variables"])["input"]["states"]
+            data = dict(
+                setTaskRunStates=dict(states=[dict(status="SUCCESS")] * len(states))
+            )
+        else:
+            kind = "flow_run_by_pk"
+            data = dict(
+                flow_run_by_pk=dict(flow=dict(settings=dict(disable_heartbeat=True)))
+            )
+        with self.lock:
+            self.requests[kind] += 1
+
+        body = json.dumps(dict(data=data)).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class Identity(Task):
+    def run(self, x):
+        return x
+
+
+def run(server: str, n_children: int, create_batch_size: int) -> None:
+    StubHandler.requests.clear()
+    task = Identity()
+    edge = Edge(Task(), task, key="x", mapped=True)
+    with set_temporary_config(
+        {
+            "cloud.graphql": server,
+            "cloud.auth_token": "token",
+            "cloud.task_runs.create_batch_size": create_batch_size,
+        }
+    ):
+        start = time.perf_counter()
+        state = CloudTaskRunner(task=task).run(
+            upstream_states={edge: Success(result=list(range(n_children)))},
+            context=dict(
+                flow_run_id="flow-run", task_run_id="parent", task_run_version=0
+            ),
+            executor=LocalExecutor(),
+        )
+        elapsed = time.perf_counter() - start
+    assert len(state.map_states) == n_children
+    print(
+        "{:>7} children | create_batch_size={:<4} | {:>6} task run requests | {:>6} settings queries | {:7.3f}s".format(
+            n_children,
+            create_batch_size,
+            StubHandler.requests["getOrCreateTaskRun"],
+            StubHandler.requests["flow_run_by_pk"],
+            elapsed,
+        )
+    )
+
+
+if __name__ == "__main__":
+    logging.getLogger("prefect").setLevel(logging.CRITICAL)
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    url = "http://127.0.0.1:{}".format(httpd.server_address[1])
+
+    sizes = [int(n) for n in sys.argv[1:]] or DEFAULT_SIZES
+    for size in sizes:
+        run(url, size, create_batch_size=0)
+        run(url, size, create_batch_size=BATCH_SIZE)
+    httpd.shutdown()
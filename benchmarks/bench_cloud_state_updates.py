@@ -0,0 +1,108 @@
+"""
+Benchmark for the number of `setTaskRunStates` round trips made by concurrently running
+`CloudTaskRunner`s against a local stub GraphQL server.
+
+Each task run sets (at least) a `Running` and a `Success` state; the stub server adds a
+fixed latency to every request. Reports round trips per task and wall time, with
+`cloud.task_run_states.batch` disabled and enabled.
+
+Usage:
+    python benchmarks/bench_cloud_state_updates.py [n_tasks ...]
+"""
+import http.server
+import json
+import logging
+import sys
+import threading
+import time
+
+import prefect
+from prefect.engine.cloud import CloudTaskRunner
+from prefect.utilities.configuration import set_temporary_config
+
+DEFAULT_SIZES = [50, 200]
+LATENCY = 0.005
+
+
+class StubHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    set_state_requests = 0
+    lock = threading.Lock()
+
+    def do_POST(self) -> None:
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(LATENCY)
+        if "setTaskRunStates" in request["query"]:
+            with self.lock:
+                StubHandler.set_state_requests += 1
+            states = json.loads(request["variables"])["input"]["states"]
+            data = dict(
+                setTaskRunStates=dict(states=[dict(status="SUCCESS")] * len(states))
+            )
+        else:
+            data = dict(
+                flow_run_by_pk=dict(flow=dict(settings=dict(disable_heartbeat=True)))
+            )
+        body = json.dumps(dict(data=data)).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class StubServer(http.server.ThreadingHTTPServer):
+    # every task runner opens its own connection at about the same time
+    request_queue_size = 1024
+
+
+@prefect.task
+def add_one(x: int = 0) -> int:
+    return x + 1
+
+
+def run_task(i: int) -> None:
+    state = CloudTaskRunner(task=add_one).run(
+        context=dict(task_run_id=str(i), task_run_version=0)
+    )
+    assert state.is_successful(), state
+
+
+def run(server: str, n_tasks: int, batch: bool) -> None:
+    StubHandler.set_state_requests = 0
+    with set_temporary_config(
+        {
+            "cloud.graphql": server,
+            "cloud.auth_token": "token",
+            "cloud.task_run_states.batch": batch,
+        }
+    ):
+        threads = [threading.Thread(target=run_task, args=(i,)) for i in range(n_tasks)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+    print(
+        "{:>6} tasks | batch={!s:<5} | {:5.2f} round trips/task | {:7.3f}s".format(
+            n_tasks, batch, StubHandler.set_state_requests / n_tasks, elapsed
+        )
+    )
+
+
+if __name__ == "__main__":
+    logging.getLogger("prefect").setLevel(logging.CRITICAL)
+    httpd = StubServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    url = "http://127.0.0.1:{}".format(httpd.server_address[1])
+
+    sizes = [int(n) for n in sys.argv[1:]] or DEFAULT_SIZES
+    for size in sizes:
+        run(url, size, batch=False)
+        run(url, size, batch=True)
+    httpd.shutdown()
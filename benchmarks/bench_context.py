@@ -0,0 +1,67 @@
+"""
+Benchmark for the per-task overhead of entering and leaving `prefect.context`.
+
+The first measurement mirrors what happens for every mapped child: the runner's context
+(including the full configuration) is entered, and then a few task-specific keys are
+layered on top of it. The second measurement runs a real mapped task with the
+`LocalExecutor` and reports the average wall time per child.
+
+Usage:
+    python benchmarks/bench_context.py [n_children ...]
+"""
+import logging
+import sys
+import time
+
+import prefect
+from prefect.core import Edge, Task
+from prefect.engine.executors import LocalExecutor
+from prefect.engine.state import Success
+from prefect.engine.task_runner import TaskRunner
+
+DEFAULT_SIZES = [100000]
+
+
+class Identity(Task):
+    def run(self, x):
+        return x
+
+
+def bench_context_frames(n_children: int) -> float:
+    runner_context = prefect.context.to_dict()
+    start = time.perf_counter()
+    for i in range(n_children):
+        with prefect.context(runner_context):
+            with prefect.context(map_index=i, task_full_name="Identity[{}]".format(i)):
+                prefect.context.get("map_index")
+    return (time.perf_counter() - start) / n_children
+
+
+def bench_mapped_children(n_children: int) -> float:
+    task = Identity()
+    edge = Edge(Task(), task, key="x", mapped=True)
+    start = time.perf_counter()
+    state = TaskRunner(task=task).run(
+        upstream_states={edge: Success(result=list(range(n_children)))},
+        executor=LocalExecutor(),
+    )
+    elapsed = time.perf_counter() - start
+    assert len(state.map_states) == n_children
+    return elapsed / n_children
+
+
+def run(n_children: int) -> None:
+    frames = bench_context_frames(n_children)
+    children = bench_mapped_children(n_children)
+    print(
+        "{:>8} children | context enter/exit {:8.2f}us | mapped child {:8.2f}us".format(
+            n_children, frames * 1e6, children * 1e6
+        )
+    )
+
+
+if __name__ == "__main__":
+    logging.getLogger("prefect").setLevel(logging.WARNING)
+    sizes = [int(n) for n in sys.argv[1:]] or DEFAULT_SIZES
+    for size in sizes:
+        run(size)
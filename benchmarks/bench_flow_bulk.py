@@ -0,0 +1,55 @@
+"""
+Benchmark for building flows with eager edge validation, comparing one-at-a-time
+`Flow.add_edge` calls against the same calls made inside `Flow.bulk()`.
+
+Usage:
+    python benchmarks/bench_flow_bulk.py [n_edges ...]
+"""
+import sys
+import time
+
+from prefect import Flow, Task
+
+DEFAULT_SIZES = [2000, 20000]
+# building without `bulk()` validates the whole flow after every edge, so it is only
+# run for flows up to this size
+MAX_UNBATCHED = 5000
+
+
+class Add(Task):
+    def run(self, x: int, y: int) -> int:
+        return x + y
+
+
+def build(n_edges: int, bulk: bool) -> float:
+    flow = Flow(name="benchmark")
+    sources = [Task() for _ in range(n_edges)]
+    sinks = [Add() for _ in range(n_edges // 2)]
+
+    def add_edges() -> None:
+        for i, source in enumerate(sources):
+            key = "x" if i % 2 == 0 else "y"
+            flow.add_edge(source, sinks[i // 2], key=key, validate=True)
+
+    start = time.perf_counter()
+    if bulk:
+        with flow.bulk():
+            add_edges()
+    else:
+        add_edges()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    sizes = [int(n) for n in sys.argv[1:]] or DEFAULT_SIZES
+    for size in sizes:
+        unbatched = (
+            "{:8.3f}s".format(build(size, bulk=False))
+            if size <= MAX_UNBATCHED
+            else "{:>9}".format("skipped")
+        )
+        print(
+            "{:>8} edges | add_edge {} | bulk {:8.3f}s".format(
+                size, unbatched, build(size, bulk=True)
+            )
+        )
@@ -0,0 +1,37 @@
+"""
+Microbenchmark for the per-call cost of cached Flow graph queries.
+
+Once a query has been computed, repeated calls should cost the same regardless of
+how many tasks and edges the Flow contains.
+
+Usage:
+    python benchmarks/bench_flow_cache.py [n_tasks ...]
+"""
+import sys
+import timeit
+
+from bench_flow_sort import build_layered_flow
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+CALLS = 10000
+
+
+def run(n_tasks: int) -> None:
+    flow = build_layered_flow(n_tasks)
+    timings = []
+    for name, query in [
+        ("sorted_tasks", flow.sorted_tasks),
+        ("root_tasks", flow.root_tasks),
+        ("terminal_tasks", flow.terminal_tasks),
+        ("all_upstream_edges", flow.all_upstream_edges),
+    ]:
+        query()  # populate the cache
+        per_call = timeit.timeit(query, number=CALLS) / CALLS
+        timings.append("{} {:6.2f}us".format(name, per_call * 1e6))
+    print("{:>8} tasks | {}".format(n_tasks, " | ".join(timings)))
+
+
+if __name__ == "__main__":
+    sizes = [int(n) for n in sys.argv[1:]] or DEFAULT_SIZES
+    for size in sizes:
+        run(size)
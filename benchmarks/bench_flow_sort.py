@@ -0,0 +1,66 @@
+"""
+Benchmarks for building and sorting large Flow graphs.
+
+Builds layered DAGs of 10k / 50k / 100k tasks (each task depends on up to three
+tasks in the previous layer) and times graph construction, topological sorting and
+the per-task adjacency queries used by the FlowRunner.
+
+Usage:
+    python benchmarks/bench_flow_sort.py [n_tasks ...]
+"""
+import random
+import sys
+import time
+from typing import Callable, List, Tuple
+
+from prefect import Flow, Task
+
+DEFAULT_SIZES = [10000, 50000, 100000]
+
+
+def timed(fn: Callable) -> Tuple[float, object]:
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def build_layered_flow(n_tasks: int, width: int = 100, seed: int = 42) -> Flow:
+    rng = random.Random(seed)
+    flow = Flow(name="benchmark-{}".format(n_tasks))
+    previous_layer = []  # type: List[Task]
+    layer = []  # type: List[Task]
+    for i in range(n_tasks):
+        task = Task(name=str(i))
+        flow.add_task(task)
+        if previous_layer:
+            for upstream in rng.sample(previous_layer, min(3, len(previous_layer))):
+                flow.add_edge(upstream, task, validate=False)
+        layer.append(task)
+        if len(layer) == width:
+            previous_layer, layer = layer, []
+    return flow
+
+
+def run(n_tasks: int) -> None:
+    build_time, flow = timed(lambda: build_layered_flow(n_tasks))
+    sort_time, sorted_tasks = timed(flow.sorted_tasks)
+    assert len(sorted_tasks) == n_tasks
+    edges_time, _ = timed(lambda: [flow.edges_to(t) for t in sorted_tasks])
+    ends_time, _ = timed(lambda: (flow.root_tasks(), flow.terminal_tasks()))
+    print(
+        "{n:>8} tasks {e:>8} edges | build {b:7.3f}s | sort {s:7.3f}s | "
+        "edges_to {et:7.3f}s | root/terminal {rt:7.3f}s".format(
+            n=n_tasks,
+            e=len(flow.edges),
+            b=build_time,
+            s=sort_time,
+            et=edges_time,
+            rt=ends_time,
+        )
+    )
+
+
+if __name__ == "__main__":
+    sizes = [int(n) for n in sys.argv[1:]] or DEFAULT_SIZES
+    for size in sizes:
+        run(size)
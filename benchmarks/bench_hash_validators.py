@@ -0,0 +1,121 @@
+"""
+Benchmark for cache validation in `CloudTaskRunner.check_task_is_cached` with value-based
+and hash-based cache validators.
+
+Simulates a task whose `cache_for` window holds `n_states` Cached states (the oldest of
+which matches the current inputs), each with an 8 MiB input written by a
+`LocalResultHandler`, validated on that input with `partial_inputs_only` (which reads
+every cached input back) and with `partial_input_hashes_only` (which compares hashes),
+and reports the time taken by each lookup. Also reports the time taken to hash NumPy
+arrays and pandas DataFrames of the same size, if those libraries are installed.
+
+Usage:
+    python benchmarks/bench_hash_validators.py [n_states ...]
+"""
+import datetime
+import logging
+import os
+import sys
+import tempfile
+import time
+from unittest.mock import MagicMock, patch
+
+from prefect.engine.cache_validators import (
+    partial_input_hashes_only,
+    partial_inputs_only,
+)
+from prefect.engine.cloud import CloudTaskRunner, utilities
+from prefect.engine.result import Result, SafeResult
+from prefect.engine.result_handlers import LocalResultHandler
+from prefect.engine.state import Cached, Pending
+from prefect.utilities import hashing
+from prefect.utilities.configuration import set_temporary_config
+from prefect.utilities.tasks import task
+
+DEFAULT_SIZES = [24, 168]
+SIZE = 8 * 2 ** 20
+
+
+def run(n_states: int, hashed: bool, handler: LocalResultHandler) -> None:
+    validator = partial_input_hashes_only if hashed else partial_inputs_only
+
+    @task(
+        cache_for=datetime.timedelta(days=7),
+        cache_validator=validator(validate_on=["data"]),
+        result_handler=handler,
+    )
+    def summarize(data: bytes, run_id: int) -> int:
+        return len(data)
+
+    inputs = [os.urandom(SIZE) for _ in range(3)]
+    expiration = datetime.datetime.utcnow() + datetime.timedelta(days=1)
+    states = []
+    for i in range(n_states):
+        data = inputs[0] if i == n_states - 1 else inputs[1 + i % 2]
+        states.append(
+            Cached(
+                cached_result_expiration=expiration,
+                result=SafeResult(handler.write(len(data)), handler),
+                cached_inputs={
+                    "data": SafeResult(handler.write(data), handler),
+                    "run_id": SafeResult(handler.write(i), handler),
+                },
+                cached_input_hashes=hashing.hash_values({"data": data, "run_id": i}),
+            )
+        )
+
+    client = MagicMock()
+    client.set_task_run_state.side_effect = lambda state, **kwargs: state
+    client.get_latest_cached_states.return_value = states
+    utilities._CACHED_STATES.clear()
+
+    current = {
+        "data": Result(inputs[0], result_handler=handler),
+        "run_id": Result(-1, result_handler=handler),
+    }
+    with set_temporary_config({"cloud.auth_token": "token"}):
+        with patch("prefect.engine.cloud.task_runner.Client", return_value=client):
+            start = time.perf_counter()
+            state = CloudTaskRunner(task=summarize).check_task_is_cached(
+                Pending(), inputs=current
+            )
+            elapsed = time.perf_counter() - start
+    assert state.is_cached() and state.result == SIZE
+    print(
+        "{:>5} states | {:<6} | {:7.3f}s".format(
+            n_states, "hashes" if hashed else "values", elapsed
+        )
+    )
+
+
+def run_hashing() -> None:
+    try:
+        import numpy
+        import pandas
+    except ImportError:
+        return
+    array = numpy.random.random(SIZE // 8)
+    df = pandas.DataFrame({"x": array, "y": numpy.arange(len(array))})
+    for name, value in [("ndarray", array), ("DataFrame", df)]:
+        start = time.perf_counter()
+        hashing.stable_hash(value)
+        print(
+            "hash {:<9} ({:>4} MiB) | {:7.3f}s".format(
+                name,
+                value.nbytes // 2 ** 20
+                if name == "ndarray"
+                else int(value.memory_usage().sum()) // 2 ** 20,
+                time.perf_counter() - start,
+            )
+        )
+
+
+if __name__ == "__main__":
+    logging.getLogger("prefect").setLevel(logging.CRITICAL)
+    sizes = [int(n) for n in sys.argv[1:]] or DEFAULT_SIZES
+    with tempfile.TemporaryDirectory() as tmp:
+        handler = LocalResultHandler(dir=tmp)
+        for size in sizes:
+            run(size, hashed=False, handler=handler)
+            run(size, hashed=True, handler=handler)
+    run_hashing()
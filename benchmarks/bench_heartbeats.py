@@ -0,0 +1,118 @@
+"""
+Benchmark for heartbeating many concurrent runs against a local stub GraphQL server.
+
+Runs `n_runs` runners concurrently in threads, each heartbeating for `RUN_TIME` seconds,
+and reports how many heartbeat subprocesses were started, how many heartbeat
+requests the server received and the wall time, with `cloud.heartbeat_mode` set to
+`"process"` and to `"service"`.
+
+Usage:
+    python benchmarks/bench_heartbeats.py [n_runs ...]
+"""
+import http.server
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from prefect.engine.runner import Runner
+from prefect.engine.state import Success
+from prefect.utilities.configuration import set_temporary_config
+from prefect.utilities.executors import run_with_heartbeat
+
+DEFAULT_SIZES = [20, 100]
+INTERVAL = 0.5
+RUN_TIME = 5.0
+
+
+class StubHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    requests = 0
+    lock = threading.Lock()
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers["Content-Length"]))
+        with self.lock:
+            StubHandler.requests += 1
+        body = json.dumps(dict(data=dict())).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class StubServer(http.server.ThreadingHTTPServer):
+    request_queue_size = 1024
+
+
+class HeartbeatRunner(Runner):
+    def __init__(self, run_id: str) -> None:
+        super().__init__()
+        self.heartbeat_cmd = ["prefect", "heartbeat", "task-run", "-i", run_id]
+
+    def _heartbeat(self) -> bool:
+        return True
+
+    @run_with_heartbeat
+    def run(self) -> Success:
+        time.sleep(RUN_TIME)
+        return Success()
+
+
+def run(server: str, n_runs: int, mode: str) -> None:
+    started = []
+    popen = subprocess.Popen
+
+    def counting_popen(*args, **kwargs):  # type: ignore
+        started.append(args[0])
+        return popen(*args, **kwargs)
+
+    subprocess.Popen = counting_popen  # type: ignore
+    StubHandler.requests = 0
+    env = dict(
+        PREFECT__CLOUD__API=server,
+        PREFECT__CLOUD__GRAPHQL=server,
+        PREFECT__CLOUD__AUTH_TOKEN="token",
+        PREFECT__CLOUD__HEARTBEAT_INTERVAL=str(INTERVAL),
+    )
+    os.environ.update(env)
+    try:
+        with set_temporary_config({"cloud.heartbeat_mode": mode}):
+            threads = [
+                threading.Thread(target=HeartbeatRunner(str(i)).run)
+                for i in range(n_runs)
+            ]
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - start
+    finally:
+        subprocess.Popen = popen  # type: ignore
+    print(
+        "{:>6} runs | mode={:<7} | {:>5} subprocesses | {:>6} requests | {:7.3f}s".format(
+            n_runs, mode, len(started), StubHandler.requests, elapsed
+        )
+    )
+
+
+if __name__ == "__main__":
+    logging.getLogger("prefect").setLevel(logging.CRITICAL)
+    httpd = StubServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    url = "http://127.0.0.1:{}".format(httpd.server_address[1])
+
+    sizes = [int(n) for n in sys.argv[1:]] or DEFAULT_SIZES
+    for size in sizes:
+        run(url, size, mode="process")
+        run(url, size, mode="service")
+    httpd.shutdown()
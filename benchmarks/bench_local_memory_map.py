@@ -0,0 +1,79 @@
+"""
+Benchmark for the memory used by processes on one host reading the same large array
+result through `LocalResultHandler`, with and without `memory_map`.
+
+Writes a NumPy array of `size_mb` MiB, starts `READERS` processes which each read it
+and sum it while holding on to it, and reports the private (anonymous) and shared
+(file-backed) resident memory of the readers and the time taken to read. Linux only,
+as memory is read from `/proc/self/status`; requires numpy.
+
+Usage:
+    python benchmarks/bench_local_memory_map.py [size_mb ...]
+"""
+import logging
+import multiprocessing
+import sys
+import tempfile
+import time
+
+import numpy
+
+from prefect.engine.result_handlers import LocalResultHandler
+
+DEFAULT_SIZES = [256]
+READERS = 4
+
+
+def rss() -> dict:
+    with open("/proc/self/status") as f:
+        fields = dict(line.split(":", 1) for line in f)
+    return {
+        name: int(fields[name].split()[0]) * 1024 for name in ["RssAnon", "RssFile"]
+    }
+
+
+def read(handler: LocalResultHandler, loc: str, queue: multiprocessing.Queue) -> None:
+    before = rss()
+    start = time.perf_counter()
+    value = handler.read(loc)
+    value.sum()
+    elapsed = time.perf_counter() - start
+    after = rss()
+    queue.put(({name: after[name] - before[name] for name in after}, elapsed))
+
+
+def run(handler: LocalResultHandler, loc: str, size_mb: int, label: str) -> None:
+    queue = multiprocessing.Queue()  # type: multiprocessing.Queue
+    readers = [
+        multiprocessing.Process(target=read, args=(handler, loc, queue))
+        for _ in range(READERS)
+    ]
+    for reader in readers:
+        reader.start()
+    results = [queue.get() for _ in readers]
+    for reader in readers:
+        reader.join()
+
+    mb = 1024 * 1024
+    print(
+        "{:>5} MiB | {} readers | {:<6} | private {:>7.1f} MiB | shared {:>7.1f} MiB | read {:6.3f}s".format(
+            size_mb,
+            READERS,
+            label,
+            sum(memory["RssAnon"] for memory, _ in results) / mb,
+            sum(memory["RssFile"] for memory, _ in results) / mb,
+            max(elapsed for _, elapsed in results),
+        )
+    )
+
+
+if __name__ == "__main__":
+    logging.getLogger("prefect").setLevel(logging.CRITICAL)
+    sizes = [int(n) for n in sys.argv[1:]] or DEFAULT_SIZES
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            array = numpy.random.random(size * 1024 * 1024 // 8)
+            loc = LocalResultHandler(dir=tmpdir, serializer="npy").write(array)
+            del array
+            run(LocalResultHandler(dir=tmpdir), loc, size, "read")
+            run(LocalResultHandler(dir=tmpdir, memory_map=True), loc, size, "mmap")
@@ -0,0 +1,58 @@
+"""
+Benchmark for the overhead of starting flow runs from the `LocalAgent`, with a new
+`prefect execute cloud-flow` process per flow run and with a `LocalWorkerPool`.
+
+Runs `n_runs` flow runs one after another, each of which fails as soon as Prefect is
+imported (since no flow run id is set), so that only the cost of starting it is
+measured, and reports the wall time of each mode.
+
+Usage:
+    python benchmarks/bench_local_worker_pool.py [n_runs ...]
+"""
+import os
+import subprocess
+import sys
+import time
+
+from prefect.agent.local.pool import LocalWorkerPool
+
+DEFAULT_SIZES = [10, 50]
+
+
+def run(n_runs: int, pooled: bool) -> None:
+    env = os.environ.copy()
+    env.pop("PREFECT__CONTEXT__FLOW_RUN_ID", None)
+    pool = LocalWorkerPool(size=1)
+    # the pool's worker is warmed up ahead of the flow runs, as the agent would do
+    pool.maintain()
+    pool.submit(env)
+    while pool.stats["idle"] != 1:
+        time.sleep(0.01)
+
+    start = time.perf_counter()
+    for _ in range(n_runs):
+        if pooled:
+            pool.submit(env)
+            while pool.stats["idle"] != 1:
+                time.sleep(0.001)
+        else:
+            subprocess.run(
+                ["prefect", "execute", "cloud-flow"],
+                env=env,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+    elapsed = time.perf_counter() - start
+    pool.shutdown()
+    print(
+        "{:>5} runs | {:<7} | {:7.3f}s | {:6.1f}ms per run".format(
+            n_runs, "pool" if pooled else "process", elapsed, 1000 * elapsed / n_runs
+        )
+    )
+
+
+if __name__ == "__main__":
+    sizes = [int(n) for n in sys.argv[1:]] or DEFAULT_SIZES
+    for size in sizes:
+        run(size, pooled=False)
+        run(size, pooled=True)
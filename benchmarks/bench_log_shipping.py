@@ -0,0 +1,90 @@
+"""
+Benchmark for shipping logs to Cloud with `CloudHandler`, sending the whole queue in
+one request as it used to, and in bounded, gzipped batches of pre-serialized logs.
+
+Queues `n_logs` logs (like those of a chatty mapped task, with a traceback each) and
+sends them through a `Client` whose HTTP session is replaced by one which only records
+the requests, and reports the time taken, the number of requests, the size of the
+largest request body and the number of logs dropped (once the queue is full) of each
+mode.
+
+Usage:
+    python benchmarks/bench_log_shipping.py [n_logs ...]
+"""
+import json
+import sys
+import time
+import traceback
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from prefect.client import Client
+from prefect.utilities.configuration import set_temporary_config
+from prefect.utilities.logging import CloudHandler
+
+DEFAULT_SIZES = [10000, 50000]
+
+
+def make_log(i: int) -> dict:
+    try:
+        {}["missing"]
+    except KeyError:
+        message = "task {} failed\n{}".format(i, traceback.format_exc())
+    return dict(
+        flowRunId="flow-run-id",
+        taskRunId="task-run-{}".format(i % 100),
+        timestamp="2020-01-01T00:00:00+00:00",
+        name="prefect.TaskRunner",
+        message=message,
+        level="ERROR",
+        info=dict(filename="task_runner.py", lineno=i, map_index=i),
+    )
+
+
+def run(n_logs: int, batched: bool) -> None:
+    bodies = []
+
+    def post(url: str, **kwargs: Any) -> MagicMock:
+        body = kwargs.get("data") or json.dumps(kwargs["json"]).encode()
+        bodies.append(len(body))
+        return MagicMock(json=lambda: dict(data=dict(writeRunLogs=dict(success=True))))
+
+    session = MagicMock()
+    session.return_value.post = post
+    logs = [make_log(i) for i in range(n_logs)]
+    with set_temporary_config({"cloud.auth_token": "token"}):
+        with patch("requests.Session", session):
+            client = Client()
+            dropped = 0
+            start = time.perf_counter()
+            if batched:
+                handler = CloudHandler()
+                handler._thread = MagicMock()
+                handler.client = client
+                for log in logs:
+                    handler.put(log)
+                handler.batch_upload()
+                dropped = handler.stats["dropped"]
+            else:
+                for log in logs:
+                    json.dumps(log)
+                client.write_run_logs(logs)
+            elapsed = time.perf_counter() - start
+    print(
+        "{:>6} logs | {:<7} | {:7.3f}s | {:>4} requests | largest {:>9} bytes | "
+        "{:>6} dropped".format(
+            n_logs,
+            "batched" if batched else "single",
+            elapsed,
+            len(bodies),
+            max(bodies),
+            dropped,
+        )
+    )
+
+
+if __name__ == "__main__":
+    sizes = [int(n) for n in sys.argv[1:]] or DEFAULT_SIZES
+    for size in sizes:
+        run(size, batched=False)
+        run(size, batched=True)
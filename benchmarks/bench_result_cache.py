@@ -0,0 +1,77 @@
+"""
+Benchmark for reading the same results repeatedly, as retried tasks and restarted flow
+runs do, through a `CachedResultHandler`.
+
+Writes `n_results` results of `PAYLOAD_SIZE` bytes with a `LocalResultHandler` which
+waits `LATENCY` seconds on every read (standing in for a remote store), reads each of
+them `READS` times, and reports the wall time and cache statistics with the wrapped
+handler, with a fresh cache (memory and disk hits) and with a cache which only shares
+its directory with the first (disk hits, as in a new process on the same worker).
+
+Usage:
+    python benchmarks/bench_result_cache.py [n_results ...]
+"""
+import logging
+import os
+import sys
+import tempfile
+import time
+from typing import Any
+
+from prefect.engine.result_handlers import CachedResultHandler, LocalResultHandler
+from prefect.engine.result_handlers import cached_result_handler
+from prefect.engine.result_handlers.cached_result_handler import ResultCache
+
+DEFAULT_SIZES = [10, 100]
+LATENCY = 0.05
+PAYLOAD_SIZE = 1024 * 1024
+READS = 5
+
+
+class SlowResultHandler(LocalResultHandler):
+    def read(self, fpath: str) -> Any:
+        time.sleep(LATENCY)
+        return super().read(fpath)
+
+
+def run(handler: Any, locations: list, label: str) -> None:
+    start = time.perf_counter()
+    for _ in range(READS):
+        for loc in locations:
+            handler.read(loc)
+    elapsed = time.perf_counter() - start
+    stats = cached_result_handler.get_result_cache().stats
+    print(
+        "{:>6} results | {:<10} | {:>5} memory hits | {:>5} disk hits | {:>5} misses | {:7.3f}s".format(
+            len(locations),
+            label,
+            stats["memory_hits"],
+            stats["disk_hits"],
+            stats["misses"],
+            elapsed,
+        )
+    )
+
+
+if __name__ == "__main__":
+    logging.getLogger("prefect").setLevel(logging.CRITICAL)
+    sizes = [int(n) for n in sys.argv[1:]] or DEFAULT_SIZES
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            inner = SlowResultHandler(dir=os.path.join(tmpdir, "results"))
+            locations = [inner.write(os.urandom(PAYLOAD_SIZE)) for _ in range(size)]
+            cache_dir = os.path.join(tmpdir, "cache")
+            cache_size = 2 * PAYLOAD_SIZE * size
+
+            cached_result_handler._result_cache = ResultCache(memory_size=0)
+            run(inner, locations, "uncached")
+
+            cached_result_handler._result_cache = ResultCache(
+                memory_size=cache_size, disk_size=cache_size, dir=cache_dir
+            )
+            run(CachedResultHandler(inner), locations, "cached")
+
+            cached_result_handler._result_cache = ResultCache(
+                memory_size=cache_size, disk_size=cache_size, dir=cache_dir
+            )
+            run(CachedResultHandler(inner), locations, "warm disk")
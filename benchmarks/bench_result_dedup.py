@@ -0,0 +1,57 @@
+"""
+Benchmark for writing the results of mapped children, many of which are identical (as
+with retries, reruns and children which return the same value), with and without
+`content_addressed` result keys.
+
+Writes the results of `n_children` children with a `LocalResultHandler`, where each
+result is one of `DISTINCT` payloads of `PAYLOAD_SIZE` bytes, twice over (standing in
+for a rerun of the flow), and reports the number of files and bytes stored and the
+wall time.
+
+Usage:
+    python benchmarks/bench_result_dedup.py [n_children ...]
+"""
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from prefect.engine.result_handlers import LocalResultHandler
+
+DEFAULT_SIZES = [100, 1000]
+DISTINCT = 10
+PAYLOAD_SIZE = 1024 * 1024
+RUNS = 2
+
+
+def run(n_children: int, content_addressed: bool) -> None:
+    payloads = [os.urandom(PAYLOAD_SIZE) for _ in range(DISTINCT)]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        handler = LocalResultHandler(dir=tmpdir, content_addressed=content_addressed)
+        start = time.perf_counter()
+        for _ in range(RUNS):
+            for i in range(n_children):
+                handler.write(payloads[i % DISTINCT])
+        elapsed = time.perf_counter() - start
+        files = os.listdir(tmpdir)
+        stored = sum(os.path.getsize(os.path.join(tmpdir, f)) for f in files)
+
+    print(
+        "{:>6} children x {} runs | {:<9} | {:>6} files | {:>8.1f} MiB stored | {:7.3f}s".format(
+            n_children,
+            RUNS,
+            "content" if content_addressed else "unique",
+            len(files),
+            stored / 1024 / 1024,
+            elapsed,
+        )
+    )
+
+
+if __name__ == "__main__":
+    logging.getLogger("prefect").setLevel(logging.CRITICAL)
+    sizes = [int(n) for n in sys.argv[1:]] or DEFAULT_SIZES
+    for size in sizes:
+        run(size, content_addressed=False)
+        run(size, content_addressed=True)
@@ -0,0 +1,94 @@
+"""
+Benchmark for the size and throughput of the serializers and compressors available to
+result handlers (see `prefect.engine.serializers`).
+
+Serializes and deserializes a NumPy array, a pandas DataFrame and a list of Python
+records of roughly `size_mb` MiB each with every applicable serializer and compressor,
+and reports the size of the serialized result and the throughput of each direction.
+Payloads, serializers and compressors whose libraries aren't installed are skipped.
+
+Usage:
+    python benchmarks/bench_result_serializers.py [size_mb ...]
+"""
+import sys
+import time
+from typing import Any, Callable, List
+
+from prefect.engine import serializers
+
+DEFAULT_SIZES = [64]
+COMPRESSIONS = [None, "zlib", "zstd", "lz4"]
+
+
+def make_payloads(size_mb: int) -> List[tuple]:
+    n_bytes = size_mb * 1024 * 1024
+    payloads = [
+        (
+            "records",
+            [
+                {"id": i, "name": "name-{}".format(i % 1000), "value": i * 0.5}
+                for i in range(n_bytes // 100)
+            ],
+            ["cloudpickle", "pickle5"],
+        )
+    ]
+    try:
+        import numpy
+    except ImportError:
+        return payloads
+    # a mix of structured and random values, so that compression is neither trivial
+    # nor pointless
+    array = numpy.arange(n_bytes // 8, dtype="float64")
+    array[::2] = numpy.random.random(len(array[::2]))
+    payloads.append(("ndarray", array, ["cloudpickle", "pickle5", "npy"]))
+    try:
+        import pandas
+    except ImportError:
+        return payloads
+    n_rows = n_bytes // 24
+    df = pandas.DataFrame(
+        {
+            "id": numpy.arange(n_rows),
+            "value": numpy.random.random(n_rows),
+            "category": pandas.Categorical(numpy.arange(n_rows) % 100),
+        }
+    )
+    payloads.append(("DataFrame", df, ["cloudpickle", "pickle5", "parquet"]))
+    return payloads
+
+
+def timed(fn: Callable) -> tuple:
+    start = time.perf_counter()
+    value = fn()
+    return value, time.perf_counter() - start
+
+
+def run(name: str, value: Any, serializer: str, compression: str, size_mb: int) -> None:
+    label = "{:>4} MiB {:<9} | {:<11} | {:<5}".format(
+        size_mb, name, serializer, compression or "-"
+    )
+    try:
+        (frames, _), write_time = timed(
+            lambda: serializers.serialize(
+                value, serializer=serializer, compression=compression
+            )
+        )
+        data = b"".join(frames)
+        _, read_time = timed(lambda: serializers.deserialize(data))
+    except ImportError as exc:
+        print("{} | unavailable: {}".format(label, exc))
+        return
+    print(
+        "{} | {:>8.1f} MiB | serialize {:>8.1f} MiB/s | deserialize {:>8.1f} MiB/s".format(
+            label, len(data) / 1024 / 1024, size_mb / write_time, size_mb / read_time,
+        )
+    )
+
+
+if __name__ == "__main__":
+    sizes = [int(n) for n in sys.argv[1:]] or DEFAULT_SIZES
+    for size in sizes:
+        for name, value, names in make_payloads(size):
+            for serializer in names:
+                for compression in COMPRESSIONS:
+                    run(name, value, serializer, compression, size)
@@ -0,0 +1,104 @@
+"""
+Benchmark for the memory used and bytes stored by `S3ResultHandler` when writing and
+reading large results against an in-memory stand-in for S3.
+
+Writes and reads a result of `size_mb` MiB with the base64-encoded format written by
+earlier versions of Prefect and with the current binary format, and reports the size
+of the stored object, the peak memory allocated by each operation (beyond the result
+itself) and the wall time. The stand-in reads uploads in 8 MiB parts, as boto3 does
+for multipart uploads.
+
+Usage:
+    python benchmarks/bench_s3_result_format.py [size_mb ...]
+"""
+import base64
+import io
+import logging
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable
+
+import cloudpickle
+
+from prefect.engine.result_handlers import S3ResultHandler
+from prefect.engine.result_handlers.s3_result_handler import _FramesReader, dumps_frames
+
+DEFAULT_SIZES = [64, 256]
+PART_SIZE = 8 * 1024 * 1024
+
+
+class InMemoryS3Client:
+    def __init__(self) -> None:
+        self.objects = {}  # type: dict
+
+    def upload_fileobj(self, stream: Any, Bucket: str, Key: str) -> None:
+        # boto3 holds at most a few parts in memory; only the object size is kept here
+        size = 0
+        while True:
+            part = stream.read(PART_SIZE)
+            if not part:
+                break
+            size += len(part)
+        self.objects[Key] = size
+
+    def download_fileobj(self, Bucket: str, Key: str, Fileobj: Any) -> None:
+        Fileobj.write(self.data)
+
+    def get_object(self, Bucket: str, Key: str, Range: str) -> dict:
+        start, end = Range[len("bytes=") :].split("-")
+        return {"Body": io.BytesIO(self.data[int(start) : int(end) + 1])}
+
+
+class LegacyS3ResultHandler(S3ResultHandler):
+    def write(self, result: Any) -> str:
+        stream = io.BytesIO(base64.b64encode(cloudpickle.dumps(result)))
+        self.client.upload_fileobj(stream, Bucket=self.bucket, Key="result")
+        return "result"
+
+
+def measure(fn: Callable) -> tuple:
+    tracemalloc.start()
+    start = time.perf_counter()
+    value = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, peak, elapsed
+
+
+def run(handler: S3ResultHandler, size_mb: int, label: str) -> None:
+    result = bytes(size_mb * 1024 * 1024)
+    client = handler.client = InMemoryS3Client()
+
+    uri, write_peak, write_time = measure(lambda: handler.write(result))
+    stored = client.objects[uri]
+
+    # the stored object is rebuilt outside of the measurements
+    if isinstance(handler, LegacyS3ResultHandler):
+        client.data = base64.b64encode(cloudpickle.dumps(result))
+    else:
+        client.data = _FramesReader(dumps_frames(result)).readall()
+    value, read_peak, read_time = measure(lambda: handler.read(uri))
+    assert len(value) == len(result)
+
+    mb = 1024 * 1024
+    print(
+        "{:>5} MiB | {:<6} | {:>8.1f} MiB stored | write peak {:>7.1f} MiB, {:6.3f}s | read peak {:>7.1f} MiB, {:6.3f}s".format(
+            size_mb,
+            label,
+            stored / mb,
+            write_peak / mb,
+            write_time,
+            (read_peak - len(result)) / mb,
+            read_time,
+        )
+    )
+
+
+if __name__ == "__main__":
+    logging.getLogger("prefect").setLevel(logging.CRITICAL)
+    sizes = [int(n) for n in sys.argv[1:]] or DEFAULT_SIZES
+    for size in sizes:
+        run(LegacyS3ResultHandler(bucket="bucket"), size, "base64")
+        run(S3ResultHandler(bucket="bucket"), size, "binary")
@@ -0,0 +1,73 @@
+"""
+Benchmark for soft timeouts, with a new thread pool per call and with a shared
+`SoftTimeoutExecutor`.
+
+Runs `n_calls` calls with a one millisecond timeout of a task which sleeps for `SLEEP`
+seconds (checking `prefect.context.cancel_event` in the shared mode), and reports the
+wall time of each mode and the number of threads still alive once every call has timed
+out.
+
+Usage:
+    python benchmarks/bench_soft_timeouts.py [n_calls ...]
+"""
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+import prefect
+from prefect.utilities.executors import SoftTimeoutExecutor
+
+DEFAULT_SIZES = [100, 1000]
+SLEEP = 2.0
+
+
+def slow_task() -> None:
+    cancel_event = prefect.context.get("cancel_event")
+    if cancel_event is not None:
+        cancel_event.wait(SLEEP)
+    else:
+        time.sleep(SLEEP)
+
+
+def per_call(n_calls: int) -> None:
+    for _ in range(n_calls):
+        executor = ThreadPoolExecutor()
+        future = executor.submit(slow_task)
+        try:
+            future.result(timeout=0.001)
+        except FutureTimeout:
+            pass
+        executor.shutdown(wait=False)
+
+
+def shared(n_calls: int) -> None:
+    executor = SoftTimeoutExecutor()
+    for _ in range(n_calls):
+        try:
+            executor.run(slow_task, timeout=0.001)
+        except TimeoutError:
+            pass
+
+
+def run(n_calls: int, pooled: bool) -> None:
+    baseline = threading.active_count()
+    start = time.perf_counter()
+    (shared if pooled else per_call)(n_calls)
+    elapsed = time.perf_counter() - start
+    threads = threading.active_count() - baseline
+    print(
+        "{:>5} calls | {:<8} | {:7.3f}s | {:>5} threads left".format(
+            n_calls, "shared" if pooled else "per call", elapsed, threads
+        )
+    )
+    # let the abandoned runs finish before the next measurement
+    time.sleep(SLEEP + 0.5)
+
+
+if __name__ == "__main__":
+    sizes = [int(n) for n in sys.argv[1:]] or DEFAULT_SIZES
+    for size in sizes:
+        run(size, pooled=False)
+        run(size, pooled=True)
@@ -0,0 +1,56 @@
+"""
+Benchmark for hard timeouts outside of the main thread, with a new process per call
+and with a `TimeoutProcessPool`.
+
+Runs `n_calls` calls with a timeout from a worker thread (as Dask workers do), each
+returning a result of each of `RESULT_SIZES` bytes, and reports the wall time of each
+mode.
+
+Usage:
+    python benchmarks/bench_timeout_pool.py [n_calls ...]
+"""
+import sys
+import threading
+import time
+
+from prefect.utilities.executors import TimeoutProcessPool, _process_timeout
+
+DEFAULT_SIZES = [100, 1000]
+RESULT_SIZES = [100, 16 * 2 ** 20]
+
+
+def make_result(size: int) -> bytes:
+    return bytes(size)
+
+
+def run(n_calls: int, result_size: int, pooled: bool) -> None:
+    pool = TimeoutProcessPool()
+    timings = []
+
+    def calls() -> None:
+        start = time.perf_counter()
+        for _ in range(n_calls):
+            if pooled:
+                value = pool.run(make_result, result_size, timeout=30)
+            else:
+                value = _process_timeout(make_result, result_size, timeout=30)
+            assert len(value) == result_size
+        timings.append(time.perf_counter() - start)
+
+    thread = threading.Thread(target=calls)
+    thread.start()
+    thread.join()
+    pool.shutdown()
+    print(
+        "{:>5} calls | {:>9} byte results | {:<7} | {:7.3f}s".format(
+            n_calls, result_size, "pool" if pooled else "process", timings[0]
+        )
+    )
+
+
+if __name__ == "__main__":
+    sizes = [int(n) for n in sys.argv[1:]] or DEFAULT_SIZES
+    for size in sizes:
+        for result_size in RESULT_SIZES:
+            run(size, result_size, pooled=False)
+            run(size, result_size, pooled=True)
@@ -8,7 +8,7 @@ import time
 import threading
 from contextlib import contextmanager
 from concurrent.futures import ThreadPoolExecutor, Future
-from typing import Any, Generator, Iterable, Union, Set
+from typing import Any, Generator, Iterable, List, Optional, Union, Set, cast
 
 import pendulum
 
@@ -17,7 +17,7 @@ from prefect.client import Client
 from prefect.engine.state import Failed, Submitted
 from prefect.serialization import state
 from prefect.utilities.exceptions import AuthorizationError
-from prefect.utilities.graphql import GraphQLResult, with_args
+from prefect.utilities.graphql import EnumValue, GraphQLResult, with_args
 from prefect.utilities.context import context
 
 ascii_name = r"""
@@ -62,6 +62,20 @@ class Agent:
     In order for this to operate `PREFECT__CLOUD__AGENT__AUTH_TOKEN` must be set as an
     environment variable or in your user configuration file.
 
+    How the agent polls for flow runs is configured by the `cloud.agent` config section:
+        - `query_mode`: `"queue"` (the default) asks the run queue for the ids of flow runs
+            to deploy and then queries their metadata, in two requests per poll;
+            `"combined"` queries due flow runs along with their metadata in a single
+            request (or, with `max_flow_runs_per_poll`, in pages until enough of them
+            match), and matches their labels on the agent
+        - `max_flow_runs_per_poll`: the most flow runs deployed per poll (0 for no limit);
+            the agent polls again right away while flow runs are found
+        - `max_poll_interval`: the longest time, in seconds, between polls while no flow
+            runs are found
+        - `lookahead`: if positive, each poll also finds flow runs scheduled to start
+            within this many seconds, and the agent polls again as soon as the earliest of
+            them is due rather than at its next interval
+
     Args:
         - name (str, optional): An optional name to give this agent. Can also be set through
             the environment variable `PREFECT__CLOUD__AGENT__NAME`. Defaults to "agent"
@@ -98,6 +112,16 @@ class Agent:
         self.logger = logger
         self.submitting_flow_runs = set()  # type: Set[str]
 
+        self.query_mode = config.cloud.agent.get("query_mode", "queue")
+        self.max_flow_runs_per_poll = config.cloud.agent.get(
+            "max_flow_runs_per_poll", 0
+        )
+        self.max_poll_interval = config.cloud.agent.get("max_poll_interval", 10.0)
+        self.lookahead = config.cloud.agent.get("lookahead", 0.0)
+        # the start time of the earliest flow run found by the last poll which wasn't
+        # due yet
+        self._next_flow_run_start = None  # type: Optional[pendulum.DateTime]
+
     def _verify_token(self, token: str) -> None:
         """
         Checks whether a token with a `RUNNER` scope was provided
@@ -127,17 +151,10 @@ class Agent:
                 tenant_id = self.agent_connect()
 
                 # Loop intervals for query sleep backoff
-                loop_intervals = {
-                    0: 0.25,
-                    1: 0.5,
-                    2: 1.0,
-                    3: 2.0,
-                    4: 4.0,
-                    5: 8.0,
-                    6: 10.0,
-                }
+                loop_intervals = self.poll_intervals()
 
                 index = 0
+                interval = loop_intervals[index]
 
                 # the max workers default has changed in 3.5 and 3.8. For stable results the
                 # default 3.8 behavior is elected here.
@@ -145,22 +162,52 @@ class Agent:
 
                 with ThreadPoolExecutor(max_workers=max_workers) as executor:
                     self.logger.debug("Max Workers: {}".format(max_workers))
-                    while not exit_event.wait(timeout=loop_intervals[index]):
+                    while not exit_event.wait(timeout=interval):
                         self.heartbeat()
 
                         if self.agent_process(executor, tenant_id):
                             index = 0
-                        elif index < max(loop_intervals.keys()):
+                        elif index < len(loop_intervals) - 1:
                             index += 1
 
+                        interval = self.next_poll_interval(loop_intervals[index])
                         self.logger.debug(
-                            "Next query for flow runs in {} seconds".format(
-                                loop_intervals[index]
-                            )
+                            "Next query for flow runs in {} seconds".format(interval)
                         )
         finally:
             self.on_shutdown()
 
+    def poll_intervals(self) -> List[float]:
+        """
+        The intervals between polls for flow runs, which back off from 0.25 seconds to
+        `max_poll_interval` seconds while no flow runs are found
+
+        Returns:
+            - List[float]: the interval after each successive poll which found no flow runs
+        """
+        intervals = [0.25]
+        while intervals[-1] * 2 < self.max_poll_interval:
+            intervals.append(intervals[-1] * 2)
+        if intervals[-1] < self.max_poll_interval:
+            intervals.append(self.max_poll_interval)
+        return intervals
+
+    def next_poll_interval(self, interval: float) -> float:
+        """
+        The time to wait before the next poll for flow runs, which is cut short if the
+        last poll found a flow run (with `lookahead`) which is due sooner
+
+        Args:
+            - interval (float): the backoff interval after the last poll
+
+        Returns:
+            - float: the number of seconds to wait
+        """
+        if self._next_flow_run_start is None:
+            return interval
+        due_in = (self._next_flow_run_start - pendulum.now("UTC")).total_seconds()
+        return max(0.0, min(interval, due_in))
+
     def on_shutdown(self) -> None:
         """
         Invoked when the event loop is exiting and the agent is shutting down. Intended
@@ -325,6 +372,50 @@ class Agent:
         # keep a copy of what was curringly running before the query (future callbacks may be updating this set)
         currently_submitting_flow_runs = self.submitting_flow_runs.copy()
 
+        now = pendulum.now("UTC")
+        before = now.add(seconds=self.lookahead) if self.lookahead else now
+        # running flow runs are deployed again once they have task runs which were
+        # scheduled to start more than 3 seconds ago
+        stale = str(now.subtract(seconds=3))
+        if self.query_mode == "combined":
+            flow_runs = self._query_due_flow_runs(
+                tenant_id, before, stale, currently_submitting_flow_runs
+            )
+        else:
+            flow_runs = self._query_flow_runs_in_queue(
+                tenant_id, before, stale, currently_submitting_flow_runs
+            )
+
+        if not self.lookahead:
+            return flow_runs
+
+        # flow runs which were found by looking ahead are deployed by a later poll, which
+        # happens as soon as the first of them is due
+        due, upcoming = [], []  # type: list, List[pendulum.DateTime]
+        for flow_run in flow_runs:
+            start_time = flow_run.get("scheduled_start_time")
+            if flow_run.get("state") == "Scheduled" and start_time:
+                start = cast(pendulum.DateTime, pendulum.parse(start_time))
+                if start > now:
+                    upcoming.append(start)
+                    continue
+            due.append(flow_run)
+        self._next_flow_run_start = min(upcoming) if upcoming else None
+        if upcoming:
+            self.logger.debug(
+                "{} flow run(s) due within {} seconds".format(
+                    len(upcoming), self.lookahead
+                )
+            )
+        return due
+
+    def _query_flow_runs_in_queue(
+        self,
+        tenant_id: str,
+        before: pendulum.DateTime,
+        stale: str,
+        currently_submitting_flow_runs: Set[str],
+    ) -> list:
         # Get scheduled flow runs from queue
         mutation = {
             "mutation($input: getRunsInQueueInput!)": {
@@ -332,13 +423,12 @@ class Agent:
             }
         }
 
-        now = pendulum.now("UTC")
         result = self.client.graphql(
             mutation,
             variables={
                 "input": {
                     "tenantId": tenant_id,
-                    "before": now.isoformat(),
+                    "before": before.isoformat(),
                     "labels": list(self.labels),
                 }
             },
@@ -363,6 +453,20 @@ class Agent:
                 len(already_submitting), list(already_submitting)
             )
 
+        if (
+            self.max_flow_runs_per_poll
+            and len(target_flow_run_ids) > self.max_flow_runs_per_poll
+        ):
+            # the queue returns flow runs in the order they're due
+            target_flow_run_ids = set(
+                [
+                    flow_run_id
+                    for flow_run_id in result.data.getRunsInQueue.flow_run_ids  # type: ignore
+                    if flow_run_id in target_flow_run_ids
+                ][: self.max_flow_runs_per_poll]
+            )
+            msg += " (deploying {} this poll)".format(self.max_flow_runs_per_poll)
+
         self.logger.debug(msg)
 
         # Query metadata fow flow runs found in queue
@@ -380,34 +484,12 @@ class Agent:
                                 # OR running with task runs scheduled to start more than 3 seconds ago
                                 {
                                     "state": {"_eq": "Running"},
-                                    "task_runs": {
-                                        "state_start_time": {
-                                            "_lte": str(now.subtract(seconds=3))
-                                        }
-                                    },
+                                    "task_runs": {"state_start_time": {"_lte": stale}},
                                 },
                             ],
                         }
                     },
-                ): {
-                    "id": True,
-                    "version": True,
-                    "tenant_id": True,
-                    "state": True,
-                    "serialized_state": True,
-                    "parameters": True,
-                    "flow": {"id", "name", "environment", "storage", "version"},
-                    with_args(
-                        "task_runs",
-                        {
-                            "where": {
-                                "state_start_time": {
-                                    "_lte": str(now.subtract(seconds=3))
-                                }
-                            }
-                        },
-                    ): {"id", "version", "task_id", "serialized_state"},
-                }
+                ): self._flow_run_fields(stale)
             }
         }
 
@@ -418,6 +500,102 @@ class Agent:
         else:
             return []
 
+    def _query_due_flow_runs(
+        self,
+        tenant_id: str,
+        before: pendulum.DateTime,
+        stale: str,
+        currently_submitting_flow_runs: Set[str],
+    ) -> list:
+        where = {
+            "tenant_id": {"_eq": tenant_id},
+            "_or": [
+                # flow runs which are EITHER scheduled to start...
+                {
+                    "state": {"_eq": "Scheduled"},
+                    "scheduled_start_time": {"_lte": before.isoformat()},
+                },
+                # OR running with task runs scheduled to start more than 3 seconds ago
+                {
+                    "state": {"_eq": "Running"},
+                    "task_runs": {
+                        "state": {"_in": ["Scheduled", "Retrying"]},
+                        "state_start_time": {"_lte": stale},
+                    },
+                },
+            ],
+        }  # type: dict
+        if currently_submitting_flow_runs:
+            where["id"] = {"_nin": list(currently_submitting_flow_runs)}
+        args = {
+            "where": where,
+            # flow runs are ordered by id as well, so that pages don't overlap
+            "order_by": [
+                {"scheduled_start_time": EnumValue("asc")},
+                {"id": EnumValue("asc")},
+            ],
+        }  # type: dict
+
+        # the run queue only returns flow runs whose labels are all labels of this
+        # agent, so the same is done here; since labels are matched after querying,
+        # flow runs are queried in pages of `max_flow_runs_per_poll` until enough of
+        # them match, so that flow runs for other agents can't fill every poll
+        labels = set(self.labels)
+        flow_runs = []  # type: list
+        found = set()  # type: Set[str]
+        offset = 0
+        while True:
+            if self.max_flow_runs_per_poll:
+                args.update(limit=self.max_flow_runs_per_poll, offset=offset)
+            query = {
+                "query": {with_args("flow_run", args): self._flow_run_fields(stale)}
+            }
+            result = self.client.graphql(query)
+            page = result.data.flow_run  # type: ignore
+            for flow_run in page:
+                if flow_run.id in found:
+                    continue
+                found.add(flow_run.id)
+                if set((flow_run.flow.environment or {}).get("labels") or []) <= labels:
+                    flow_runs.append(flow_run)
+            if (
+                not self.max_flow_runs_per_poll
+                or len(page) < self.max_flow_runs_per_poll
+                or len(flow_runs) >= self.max_flow_runs_per_poll
+            ):
+                break
+            offset += len(page)
+        if self.max_flow_runs_per_poll:
+            flow_runs = flow_runs[: self.max_flow_runs_per_poll]
+
+        if flow_runs:
+            self.logger.debug(
+                "Found flow runs {}".format([flow_run.id for flow_run in flow_runs])
+            )
+        else:
+            self.logger.debug("No flow runs found")
+        return flow_runs
+
+    def _flow_run_fields(self, stale: str) -> dict:
+        fields = {
+            "id": True,
+            "version": True,
+            "tenant_id": True,
+            "state": True,
+            "serialized_state": True,
+            "parameters": True,
+            "flow": {"id", "name", "environment", "storage", "version"},
+            with_args("task_runs", {"where": {"state_start_time": {"_lte": stale}}},): {
+                "id",
+                "version",
+                "task_id",
+                "serialized_state",
+            },
+        }  # type: dict
+        if self.lookahead:
+            fields["scheduled_start_time"] = True
+        return fields
+
     def update_state(self, flow_run: GraphQLResult) -> None:
         """
         After a flow run is grabbed this function sets the state to Submitted so it
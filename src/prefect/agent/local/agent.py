@@ -2,10 +2,11 @@ import os
 import sys
 import socket
 from subprocess import PIPE, STDOUT, Popen
-from typing import Iterable, List
+from typing import Iterable, List, Optional
 
 from prefect import config, context
 from prefect.agent import Agent
+from prefect.agent.local.pool import LocalWorkerPool
 from prefect.engine.state import Failed
 from prefect.environments.storage import Azure, GCS, Local, S3
 from prefect.serialization.storage import StorageSchema
@@ -30,6 +31,18 @@ class LocalAgent(Agent):
     prefect agent start local --env MY_SECRET_KEY=secret --env OTHER_VAR=$OTHER_VAR
     ```
 
+    For frequent, short flow runs, the agent can keep a pool of worker processes which
+    have already imported Prefect, and run flow runs in them rather than starting a new
+    `prefect execute cloud-flow` process for each one:
+    ```
+    prefect agent start local --worker-pool 4
+    ```
+    Each worker runs one flow run at a time, with the same environment variables and
+    import paths as a subprocess would have; workers are replaced after
+    `max_runs_per_worker` flow runs, or once their peak memory has grown by
+    `max_worker_memory_growth` MiB. Modules imported by flow runs stay imported in a
+    worker until it is replaced.
+
     Args:
         - name (str, optional): An optional name to give this agent. Can also be set through
             the environment variable `PREFECT__CLOUD__AGENT__NAME`. Defaults to "agent"
@@ -44,6 +57,13 @@ class LocalAgent(Agent):
         - hostname_label (boolean, optional): a boolean specifying whether this agent should auto-label itself
             with the hostname of the machine it is running on.  Useful for flows which are stored on the local
             filesystem.
+        - worker_pool_size (int, optional): the number of idle worker processes to keep
+            ready to run flow runs; if 0 (the default), each flow run gets a new subprocess
+        - max_runs_per_worker (int, optional): the number of flow runs after which a
+            worker process is replaced; defaults to 50, and 0 means no limit
+        - max_worker_memory_growth (int, optional): the growth of a worker process's peak
+            memory, in MiB, after which it is replaced; defaults to 512, and 0 means no
+            limit
     """
 
     def __init__(
@@ -54,11 +74,23 @@ class LocalAgent(Agent):
         import_paths: List[str] = None,
         show_flow_logs: bool = False,
         hostname_label: bool = True,
+        worker_pool_size: int = 0,
+        max_runs_per_worker: int = 50,
+        max_worker_memory_growth: int = 512,
     ) -> None:
         self.processes = []  # type: list
         self.import_paths = import_paths or []
         self.show_flow_logs = show_flow_logs
         super().__init__(name=name, labels=labels, env_vars=env_vars)
+        self.worker_pool = None  # type: Optional[LocalWorkerPool]
+        if worker_pool_size:
+            self.worker_pool = LocalWorkerPool(
+                size=worker_pool_size,
+                max_runs=max_runs_per_worker,
+                max_memory_growth=max_worker_memory_growth,
+                show_flow_logs=show_flow_logs,
+                logger=self.logger,
+            )
         hostname = socket.gethostname()
         if hostname_label and (hostname not in self.labels):
             assert isinstance(self.labels, list)
@@ -78,8 +110,18 @@ class LocalAgent(Agent):
                     if not self.show_flow_logs:
                         for raw_line in iter(process.stdout.readline, b""):
                             self.logger.info(raw_line.decode("utf-8").rstrip())
+        if self.worker_pool is not None:
+            self.worker_pool.maintain()
         super().heartbeat()
 
+    def on_shutdown(self) -> None:
+        """
+        Retires the agent's worker processes, if it has any; flow runs which are
+        running in them are finished first.
+        """
+        if self.worker_pool is not None:
+            self.worker_pool.shutdown()
+
     def deploy_flow(self, flow_run: GraphQLResult) -> str:
         """
         Deploy flow runs on your local machine as Docker containers
@@ -120,6 +162,13 @@ class LocalAgent(Agent):
 
         current_env["PYTHONPATH"] = ":".join(python_path)
 
+        if self.worker_pool is not None:
+            pid = self.worker_pool.submit(current_env)
+            self.logger.debug(
+                "Submitted flow run {} to worker PID {}".format(flow_run.id, pid)
+            )
+            return "PID: {}".format(pid)
+
         stdout = sys.stdout if self.show_flow_logs else PIPE
 
         # note: we will allow these processes to be orphaned if the agent were to exit
@@ -0,0 +1,232 @@
+"""
+A pool of pre-warmed worker processes which execute flow runs for the `LocalAgent`.
+"""
+import collections
+import json
+import logging
+import sys
+import threading
+from subprocess import PIPE, STDOUT, Popen
+from typing import IO, Dict, List, cast
+
+WORKER_COMMAND = ["prefect", "execute", "worker"]
+
+# the number of lines of output of each flow run which are kept to be logged if it fails
+MAX_OUTPUT_LINES = 1000
+
+
+class _Worker:
+    def __init__(self, process: Popen) -> None:
+        self.process = process
+        self.stdin = cast(IO[bytes], process.stdin)
+        self.stdout = cast(IO[bytes], process.stdout)
+        self.busy = False
+        self.retiring = False
+        self.flow_run_id = None  # type: object
+        # the output of the current flow run, unless it is shown
+        output = collections.deque(maxlen=MAX_OUTPUT_LINES)  # type: collections.deque
+        self.output = output
+
+
+class LocalWorkerPool:
+    """
+    A pool of worker processes (each running `prefect execute worker`) which import
+    Prefect once and then execute the flow runs sent to them one at a time, so that flow
+    runs don't each pay for starting an interpreter and importing Prefect.
+
+    `maintain` keeps `size` idle workers started ahead of flow runs. If every worker is
+    busy when a flow run is submitted, another worker is started for it, which retires
+    once the run is done if there are enough idle workers by then. Workers also retire
+    (and are replaced by `maintain`) after `max_runs` flow runs, or once their peak
+    memory has grown by `max_memory_growth` MiB, so that anything leaked by flow runs
+    (including the modules they import) is eventually released.
+
+    Args:
+        - size (int): the number of idle workers to keep ready
+        - max_runs (int, optional): the number of flow runs after which a worker
+            retires; 0 for no limit
+        - max_memory_growth (int, optional): the growth of a worker's peak memory, in
+            MiB, after which it retires; 0 for no limit
+        - show_flow_logs (bool, optional): whether the output of flow runs is written to
+            stdout; otherwise the last 1000 lines of output of each flow run are kept,
+            and logged if the flow run fails
+        - logger (logging.Logger, optional): the logger to report failed flow runs and
+            workers to
+        - command (List[str], optional): the command which starts a worker; defaults to
+            `prefect execute worker`
+    """
+
+    def __init__(
+        self,
+        size: int,
+        max_runs: int = 0,
+        max_memory_growth: int = 0,
+        show_flow_logs: bool = False,
+        logger: logging.Logger = None,
+        command: List[str] = None,
+    ) -> None:
+        self.size = size
+        self.max_runs = max_runs
+        self.max_memory_growth = max_memory_growth
+        self.show_flow_logs = show_flow_logs
+        self.logger = logger or logging.getLogger(type(self).__name__)
+        self.command = command or WORKER_COMMAND
+        self._workers = []  # type: List[_Worker]
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """
+        The number of idle, busy and retiring workers.
+        """
+        with self._lock:
+            return dict(
+                idle=sum(1 for w in self._workers if not (w.busy or w.retiring)),
+                busy=sum(1 for w in self._workers if w.busy),
+                retiring=sum(1 for w in self._workers if w.retiring and not w.busy),
+            )
+
+    def maintain(self) -> None:
+        """
+        Starts workers until `size` of them are idle.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            idle = sum(1 for w in self._workers if not (w.busy or w.retiring))
+            for _ in range(self.size - idle):
+                self._start()
+
+    def submit(self, env: dict) -> int:
+        """
+        Sends a flow run to an idle worker, starting a new worker if none are idle.
+
+        Args:
+            - env (dict): the environment variables to run the flow run with, as they
+                would be given to a `prefect execute cloud-flow` process
+
+        Returns:
+            - int: the PID of the worker running the flow run
+
+        Raises:
+            - RuntimeError: if the pool has been shut down, or a new worker exits before
+                the flow run can be sent to it
+        """
+        line = (json.dumps(dict(env=env)) + "\n").encode()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The worker pool has been shut down.")
+            for worker in self._workers:
+                if not (worker.busy or worker.retiring) and self._send(worker, line):
+                    break
+            else:
+                worker = self._start()
+                if not self._send(worker, line):
+                    raise RuntimeError(
+                        "Worker PID {} exited before it was sent a flow run.".format(
+                            worker.process.pid
+                        )
+                    )
+            worker.busy = True
+            worker.flow_run_id = env.get("PREFECT__CONTEXT__FLOW_RUN_ID")
+            return worker.process.pid
+
+    def shutdown(self) -> None:
+        """
+        Retires every worker. Busy workers finish their flow runs before exiting.
+        """
+        with self._lock:
+            self._closed = True
+            for worker in self._workers:
+                self._retire(worker)
+
+    def _start(self) -> _Worker:
+        process = Popen(
+            self.command
+            + [
+                "--max-runs",
+                str(self.max_runs),
+                "--max-memory-growth",
+                str(self.max_memory_growth),
+            ],
+            stdin=PIPE,
+            stdout=PIPE,
+            # output of flow runs shares the pipe of their results, so that it is
+            # read in order with them
+            stderr=sys.stdout if self.show_flow_logs else STDOUT,
+        )
+        worker = _Worker(process)
+        self._workers.append(worker)
+        threading.Thread(
+            target=self._read_results,
+            args=(worker,),
+            name="PrefectLocalWorker-{}".format(process.pid),
+            daemon=True,
+        ).start()
+        return worker
+
+    def _send(self, worker: _Worker, line: bytes) -> bool:
+        try:
+            worker.stdin.write(line)
+            worker.stdin.flush()
+            return True
+        except OSError:
+            # the worker exited since it was last seen to be idle
+            worker.retiring = True
+            return False
+
+    def _retire(self, worker: _Worker) -> None:
+        # a worker exits once its standard input is closed, after its current run
+        worker.retiring = True
+        try:
+            worker.stdin.close()
+        except OSError:
+            pass
+
+    def _read_results(self, worker: _Worker) -> None:
+        for raw_line in worker.stdout:
+            line = raw_line.decode("utf-8", "replace").rstrip()
+            try:
+                result = json.loads(line)
+            except ValueError:
+                result = None
+            if not (isinstance(result, dict) and "exit_code" in result):
+                worker.output.append(line)
+                continue
+            if result["exit_code"]:
+                self.logger.info(
+                    "Flow run {} in worker PID {} failed: {}".format(
+                        result.get("flow_run_id"),
+                        worker.process.pid,
+                        result.get("error"),
+                    )
+                )
+                self._log_output(worker)
+            worker.output.clear()
+            with self._lock:
+                worker.busy = False
+                worker.flow_run_id = None
+                if result.get("retiring"):
+                    worker.retiring = True
+                else:
+                    idle = [w for w in self._workers if not (w.busy or w.retiring)]
+                    # workers started while every worker was busy retire once
+                    # there are enough idle workers again
+                    if len(idle) > self.size:
+                        self._retire(worker)
+
+        returncode = worker.process.wait()
+        with self._lock:
+            self._workers.remove(worker)
+        if worker.busy:
+            self.logger.info(
+                "Worker PID {} exited with code {} while running flow run {}".format(
+                    worker.process.pid, returncode, worker.flow_run_id
+                )
+            )
+            self._log_output(worker)
+
+    def _log_output(self, worker: _Worker) -> None:
+        for line in worker.output:
+            self.logger.info(line)
@@ -96,6 +96,13 @@ def agent():
     hidden=True,
     is_flag=True,
 )
+@click.option(
+    "--worker-pool",
+    type=int,
+    default=0,
+    help="The number of pre-warmed worker processes the local agent keeps.",
+    hidden=True,
+)
 @click.option("--no-pull", is_flag=True, help="Pull images flag.", hidden=True)
 @click.option(
     "--no-cloud-logs",
@@ -119,6 +126,7 @@ def start(
     base_url,
     import_path,
     show_flow_logs,
+    worker_pool,
 ):
     """
     Start an agent.
@@ -148,6 +156,8 @@ def start(
                                     Used for Flows which might import from scripts or local packages.
                                     Multiple values supported e.g. `-p /root/my_scripts -p /utilities`
         --show-flow-logs, -f        Display logging output from flows run by the agent (available for Local and Docker agents only)
+        --worker-pool       INT     The number of idle worker processes, with Prefect already imported, to keep
+                                    ready to run flow runs; by default each flow run gets a new process
 
     \b
     Docker Agent Options:
@@ -198,6 +208,7 @@ def start(
                 env_vars=env_vars,
                 import_paths=list(import_path),
                 show_flow_logs=show_flow_logs,
+                worker_pool_size=worker_pool,
             ).start()
         elif agent_option == "docker":
             from_qualified_name(retrieved_agent)(
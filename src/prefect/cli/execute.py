@@ -1,8 +1,24 @@
+import atexit
+import io
+import json
+import logging
+import os
+import sys
+
 import click
 
 import prefect
 from prefect.client import Client
+from prefect.configuration import (
+    DEFAULT_CONFIG,
+    ENV_VAR_PREFIX,
+    USER_CONFIG,
+    load_configuration,
+    process_task_defaults,
+)
 from prefect.utilities.graphql import with_args
+from prefect.utilities.logging import CloudHandler, configure_logging
+from prefect.utilities.process_state import reset_process_state
 
 
 @click.group(hidden=True)
@@ -17,6 +33,7 @@ def execute():
     \b
     Arguments:
         cloud-flow  Execute a cloud flow's environment (during deployment)
+        worker      Execute cloud flows sent on standard input in this process
 
     \b
     Examples:
@@ -77,3 +94,160 @@ def cloud_flow():
         client.set_flow_run_state(flow_run_id=flow_run_id, version=version, state=state)
         click.echo(str(exc))
         raise exc
+
+
+def _max_rss() -> int:
+    """
+    Returns the peak resident memory of this process, in bytes (or 0 where this isn't
+    available, such as on Windows).
+    """
+    try:
+        import resource
+    except ImportError:
+        return 0
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, and Linux kilobytes
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def _run_cloud_flow_with_env(env: dict) -> None:
+    """
+    Runs `prefect execute cloud-flow` in this process, with the environment variables,
+    import paths and configuration which it would have had in its own process, and
+    restores them afterwards.
+
+    Logging is configured from the run's configuration, with a `CloudHandler` of its own
+    whose logs are sent before the run finishes, and the objects Prefect shares between
+    runs in a process (the heartbeat service, timeout and checkpoint pools, result cache
+    and the caches of flow run settings and Cached states, and anything else registered
+    with `prefect.utilities.process_state.register_reset`) are reset after the run.
+    Unlike in a process of its own, a run still shares:
+
+    - modules imported by earlier runs, along with any changes those runs made to them
+        (`prefect.context` is restored, but other module globals aren't)
+    - threads started by earlier runs which are still running, such as soft timeout runs
+        which timed out
+    - the batcher of task run states (`cloud.task_run_states.batch`), which only batches
+        together updates sent with the same API server and auth token
+    """
+    old_environ = dict(os.environ)
+    old_path = list(sys.path)
+    old_config = prefect.config.copy()
+    loggers = [logging.getLogger(name) for name in ["prefect", "CloudHandler"]]
+    old_logging = [(logger, logger.level, list(logger.handlers)) for logger in loggers]
+    try:
+        os.environ.clear()
+        os.environ.update(env)
+        for path in reversed(env.get("PYTHONPATH", "").split(":")):
+            if path and path not in sys.path:
+                sys.path.insert(0, path)
+
+        # the configuration is updated in place, since modules hold references to it
+        new_config = process_task_defaults(
+            load_configuration(
+                path=DEFAULT_CONFIG,
+                user_config_path=USER_CONFIG,
+                env_var_prefix=ENV_VAR_PREFIX,
+            )
+        )
+        prefect.config.clear()
+        prefect.config.update(new_config)
+
+        with prefect.context(prefect.config.get("context", {}), config=prefect.config):
+            for logger in loggers:
+                logger.handlers = []
+            configure_logging()
+            cloud_flow.callback()
+    finally:
+        for handler in loggers[0].handlers:
+            if isinstance(handler, CloudHandler):
+                handler.flush()
+                atexit.unregister(handler.flush)
+        for logger, level, handlers in old_logging:
+            logger.handlers = handlers
+            logger.setLevel(level)
+        reset_process_state()
+        prefect.config.clear()
+        prefect.config.update(old_config)
+        sys.path[:] = old_path
+        os.environ.clear()
+        os.environ.update(old_environ)
+
+
+@execute.command(hidden=True)
+@click.option(
+    "--max-runs",
+    type=int,
+    default=0,
+    help="The number of flow runs after which the worker exits.",
+    hidden=True,
+)
+@click.option(
+    "--max-memory-growth",
+    type=int,
+    default=0,
+    help="The growth of peak memory, in MiB, after which the worker exits.",
+    hidden=True,
+)
+def worker(max_runs, max_memory_growth):
+    """
+    Execute cloud flows sent on standard input, one at a time, in this process.
+
+    \b
+    Options:
+        --max-runs              INT     The number of flow runs after which the worker exits
+        --max-memory-growth     INT     The growth of peak memory, in MiB, after which the worker exits
+
+    \b
+    Each line read from standard input is a JSON object holding the `env` which a
+    `prefect execute cloud-flow` process would be started with; the flow run is executed
+    with those environment variables, and its result written as a line of JSON, e.g.:
+        {"flow_run_id": "ID", "exit_code": 1, "error": "...", "retiring": false}
+
+    \b
+    Since `prefect` is imported once, each flow run skips the cost of starting a new
+    interpreter. Output of flow runs goes to standard error. The worker exits once
+    standard input is closed, or (with `"retiring": true`) after `--max-runs` flow runs
+    or once its peak memory has grown by `--max-memory-growth` MiB.
+    """
+    try:
+        # results get the original standard output to themselves, and anything
+        # printed by flow runs goes to standard error instead
+        results = io.open(os.dup(sys.stdout.fileno()), "w", buffering=1)
+        os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    except (AttributeError, io.UnsupportedOperation):
+        results = sys.stdout
+
+    baseline_rss = _max_rss()
+    runs = 0
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        env = json.loads(line)["env"]
+        exit_code, error = 0, None
+        try:
+            _run_cloud_flow_with_env(env)
+        except SystemExit as exc:
+            if exc.code:
+                exit_code, error = 1, repr(exc)
+        except Exception as exc:
+            exit_code, error = 1, repr(exc)
+        runs += 1
+
+        retiring = bool(max_runs and runs >= max_runs) or bool(
+            max_memory_growth
+            and _max_rss() - baseline_rss >= max_memory_growth * 2 ** 20
+        )
+        result = dict(
+            flow_run_id=env.get("PREFECT__CONTEXT__FLOW_RUN_ID"),
+            exit_code=exit_code,
+            error=error,
+            retiring=retiring,
+        )
+        # the run's output is written before its result, which may share its pipe
+        sys.stdout.flush()
+        sys.stderr.flush()
+        results.write(json.dumps(result) + "\n")
+        results.flush()
+        if retiring:
+            break
@@ -1,3 +1,5 @@
+import sys
+import threading
 import time
 
 import click
@@ -14,11 +16,13 @@ def heartbeat():
     \b
     Usage:
         $ prefect heartbeat [task-run/flow-run] -i ID
+        $ prefect heartbeat service
 
     \b
     Arguments:
         task-run   Send heartbeat for a given task run ID
         flow-run   Send heartbeat for a given flow run ID
+        service    Send batched heartbeats for runs registered on standard input
     """
     pass
 
@@ -97,3 +101,50 @@ def flow_run(id, num):
         if num:
             iter_count += 1
         time.sleep(config.cloud.heartbeat_interval)
+
+
+@heartbeat.command(hidden=True)
+def service():
+    """
+    Send batched heartbeats for every run registered on standard input.
+
+    \b
+    Each line read from standard input registers or unregisters a run, e.g.:
+        add task-run ID
+        remove flow-run ID
+
+    \b
+    Every `cloud.heartbeat_interval` seconds, a single request heartbeats all registered
+    runs. The service exits once standard input is closed, which happens when the
+    process that started it exits.
+    """
+    client = Client()
+    runs = {"flow-run": set(), "task-run": set()}
+    lock = threading.Lock()
+    closed = threading.Event()
+
+    def read_registrations():
+        for line in sys.stdin:
+            try:
+                action, kind, id = line.split()
+                with lock:
+                    if action == "add":
+                        runs[kind].add(id)
+                    elif action == "remove":
+                        runs[kind].discard(id)
+            except (KeyError, ValueError):
+                click.echo("Ignoring invalid heartbeat registration: {!r}".format(line))
+        closed.set()
+
+    threading.Thread(target=read_registrations, daemon=True).start()
+
+    while not closed.is_set():
+        with lock:
+            flow_run_ids, task_run_ids = list(runs["flow-run"]), list(runs["task-run"])
+        try:
+            client.update_heartbeats(
+                flow_run_ids=flow_run_ids, task_run_ids=task_run_ids
+            )
+        except Exception as exc:
+            click.echo("Heartbeat failed: {!r}".format(exc))
+        closed.wait(config.cloud.heartbeat_interval)
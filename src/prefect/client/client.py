@@ -1,10 +1,22 @@
 import datetime
+import gzip
 import json
 import os
+import threading
 import uuid
 import warnings
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, Optional, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
 from urllib.parse import urljoin
 
 import pendulum
@@ -76,6 +88,9 @@ class Client:
     """
 
     def __init__(self, api_server: str = None, api_token: str = None):
+        self._session = None  # type: Optional[requests.Session]
+        # guards the lazy creation of the session
+        self._session_lock = threading.Lock()
         self._access_token = None
         self._refresh_token = None
         self._access_token_expires_at = pendulum.now()
@@ -104,9 +119,58 @@ class Client:
                     # be cleared
                     self.logout_from_tenant()
 
+    def __getstate__(self) -> dict:
+        # sessions hold open sockets and locks, so each process builds its own
+        state = self.__dict__.copy()
+        state["_session"] = None
+        del state["_session_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._session_lock = threading.Lock()
+
     # -------------------------------------------------------------------------
     # Utilities
 
+    def _get_session(self) -> "requests.Session":
+        """
+        Returns this client's HTTP session, creating it on first use. The session is
+        shared by every request (and thread) using this client, so that connections are
+        pooled and kept alive between requests.
+
+        The session is configured by the `cloud.requests` config section:
+            - `pool_maxsize`: the maximum number of connections kept open per host
+            - `keep_alive`: whether connections are kept open for reuse by later requests
+
+        Returns:
+            - requests.Session: the session to make requests with
+        """
+        if self._session is not None:
+            return self._session
+
+        with self._session_lock:
+            if self._session is None:
+                settings = prefect.context.config.cloud.get("requests", {})
+                pool_maxsize = settings.get("pool_maxsize", 10)
+
+                session = requests.Session()
+                retries = Retry(
+                    total=6,
+                    backoff_factor=1,
+                    status_forcelist=[500, 502, 503, 504],
+                    method_whitelist=["DELETE", "GET", "POST"],
+                )
+                session.mount(
+                    "https://",
+                    HTTPAdapter(max_retries=retries, pool_maxsize=pool_maxsize),
+                )
+                session.mount("http://", HTTPAdapter(pool_maxsize=pool_maxsize))
+                if not settings.get("keep_alive", True):
+                    session.headers["Connection"] = "close"
+                self._session = session
+        return self._session
+
     def get(
         self,
         path: str,
@@ -150,6 +214,7 @@ class Client:
         headers: dict = None,
         params: Dict[str, JSONLike] = None,
         token: str = None,
+        compress_body: bool = False,
     ) -> dict:
         """
         Convenience function for calling the Prefect API with token auth and POST request
@@ -162,6 +227,7 @@ class Client:
             - headers(dict): headers to pass with the request
             - params (dict): POST parameters
             - token (str): an auth token. If not supplied, the `client.access_token` is used.
+            - compress_body (bool, optional): whether to gzip the body of the request
 
         Returns:
             - dict: Dictionary representation of the request made
@@ -173,6 +239,7 @@ class Client:
             server=server,
             headers=headers,
             token=token,
+            compress_body=compress_body,
         )
         if response.text:
             return response.json()
@@ -184,8 +251,9 @@ class Client:
         query: Any,
         raise_on_error: bool = True,
         headers: Dict[str, str] = None,
-        variables: Dict[str, JSONLike] = None,
+        variables: Union[Dict[str, JSONLike], str] = None,
         token: str = None,
+        compress_body: bool = False,
     ) -> GraphQLResult:
         """
         Convenience function for running queries against the Prefect GraphQL API
@@ -198,8 +266,10 @@ class Client:
             - headers (dict): any additional headers that should be passed as part of the
                 request
             - variables (dict): Variables to be filled into a query with the key being
-                equivalent to the variables that are accepted by the query
+                equivalent to the variables that are accepted by the query, or a string of
+                them already encoded as JSON
             - token (str): an auth token. If not supplied, the `client.access_token` is used.
+            - compress_body (bool, optional): whether to gzip the body of the request
 
         Returns:
             - dict: Data returned from the GraphQL query
@@ -211,8 +281,14 @@ class Client:
             path="",
             server=self.api_server,
             headers=headers,
-            params=dict(query=parse_graphql(query), variables=json.dumps(variables)),
+            params=dict(
+                query=parse_graphql(query),
+                variables=variables
+                if isinstance(variables, str)
+                else json.dumps(variables),
+            ),
             token=token,
+            compress_body=compress_body,
         )
 
         if raise_on_error and "errors" in result:
@@ -232,6 +308,7 @@ class Client:
         server: str = None,
         headers: dict = None,
         token: str = None,
+        compress_body: bool = False,
     ) -> "requests.models.Response":
         """
         Runs any specified request (GET, POST, DELETE) against the server
@@ -244,6 +321,7 @@ class Client:
                 server is used if not specified
             - headers (dict, optional): Headers to pass with the request
             - token (str): an auth token. If not supplied, the `client.access_token` is used.
+            - compress_body (bool, optional): whether to gzip the JSON body of a POST request
 
         Returns:
             - requests.models.Response: The response returned from the request
@@ -269,16 +347,14 @@ class Client:
             headers["Authorization"] = "Bearer {}".format(token)
         headers["X-PREFECT-CORE-VERSION"] = str(prefect.__version__)
 
-        session = requests.Session()
-        retries = Retry(
-            total=6,
-            backoff_factor=1,
-            status_forcelist=[500, 502, 503, 504],
-            method_whitelist=["DELETE", "GET", "POST"],
-        )
-        session.mount("https://", HTTPAdapter(max_retries=retries))
+        session = self._get_session()
         if method == "GET":
             response = session.get(url, headers=headers, params=params, timeout=30)
+        elif method == "POST" and compress_body:
+            headers["Content-Type"] = "application/json"
+            headers["Content-Encoding"] = "gzip"
+            data = gzip.compress(json.dumps(params).encode(), compresslevel=6)
+            response = session.post(url, headers=headers, data=data, timeout=30)
         elif method == "POST":
             response = session.post(url, headers=headers, json=params, timeout=30)
         elif method == "DELETE":
@@ -825,6 +901,54 @@ class Client:
         }
         self.graphql(mutation, raise_on_error=False)
 
+    def update_heartbeats(
+        self,
+        flow_run_ids: Iterable[str] = (),
+        task_run_ids: Iterable[str] = (),
+        batch_size: int = None,
+    ) -> None:
+        """
+        Convenience method for heartbeating any number of flow runs and task runs with
+        batched requests.
+
+        If a request fails, the remaining batches are still sent, and the error of the
+        first failed request is raised afterwards. Errors returned by the API for
+        individual runs are not raised.
+
+        Args:
+            - flow_run_ids (Iterable[str], optional): the flow run IDs to heartbeat
+            - task_run_ids (Iterable[str], optional): the task run IDs to heartbeat
+            - batch_size (int, optional): the most runs heartbeat by a single request;
+                defaults to `cloud.heartbeat_batch_size` (0 for no limit)
+        """
+        if batch_size is None:
+            batch_size = prefect.context.config.cloud.get("heartbeat_batch_size", 0)
+
+        fields = []  # type: List[Tuple[str, Any]]
+        for i, flow_run_id in enumerate(flow_run_ids):
+            alias = "flow_run_{}: updateFlowRunHeartbeat".format(i)
+            fields.append(
+                (with_args(alias, {"input": {"flowRunId": flow_run_id}}), {"success"})
+            )
+        for i, task_run_id in enumerate(task_run_ids):
+            alias = "task_run_{}: updateTaskRunHeartbeat".format(i)
+            fields.append(
+                (with_args(alias, {"input": {"taskRunId": task_run_id}}), {"success"})
+            )
+
+        error = None  # type: Optional[Exception]
+        for i in range(0, len(fields), batch_size or len(fields) or 1):
+            try:
+                self.graphql(
+                    {"mutation": dict(fields[i : i + (batch_size or len(fields))])},
+                    raise_on_error=False,
+                )
+            except Exception as exc:
+                # a failed batch doesn't stop the others from being heartbeat
+                error = error or exc
+        if error is not None:
+            raise error
+
     def set_flow_run_state(
         self, flow_run_id: str, version: int, state: "prefect.engine.state.State"
     ) -> None:
@@ -947,6 +1071,68 @@ class Client:
             state=state,
         )
 
+    def get_task_run_infos(
+        self, flow_run_id: str, task_id: str, map_indices: Iterable[int]
+    ) -> List[TaskRunInfoResult]:
+        """
+        Retrieves (creating them if necessary) the task runs of several children of a
+        mapped task with a single request.
+
+        Args:
+            - flow_run_id (str): the id of the flow run that these task runs live in
+            - task_id (str): the task id of the mapped task
+            - map_indices (Iterable[int]): the mapping indices of the task runs
+
+        Returns:
+            - List[NamedTuple]: a tuple containing `id, task_id, version, state` for each
+                map index, in the same order as `map_indices`
+
+        Raises:
+            - ClientError: if the GraphQL mutation is bad for any reason
+        """
+        map_indices = list(map_indices)
+        if not map_indices:
+            return []
+
+        fields = {}  # type: Dict[str, Any]
+        for i, map_index in enumerate(map_indices):
+            fields[
+                with_args(
+                    "task_run_{}: getOrCreateTaskRun".format(i),
+                    {
+                        "input": {
+                            "flowRunId": flow_run_id,
+                            "taskId": task_id,
+                            "mapIndex": map_index,
+                        }
+                    },
+                )
+            ] = {
+                "task_run": {
+                    "id": True,
+                    "version": True,
+                    "serialized_state": True,
+                    "task": {"slug": True},
+                }
+            }
+        result = self.graphql({"mutation": fields})  # type: Any
+
+        task_run_infos = []
+        for i in range(len(map_indices)):
+            task_run = result.data["task_run_{}".format(i)].task_run
+            task_run_infos.append(
+                TaskRunInfoResult(
+                    id=task_run.id,
+                    task_id=task_id,
+                    task_slug=task_run.task.slug,
+                    version=task_run.version,
+                    state=prefect.engine.state.State.deserialize(
+                        task_run.serialized_state
+                    ),
+                )
+            )
+        return task_run_infos
+
     def set_task_run_state(
         self,
         task_run_id: str,
@@ -970,6 +1156,27 @@ class Client:
         Returns:
             - State: the state the current task run should be considered in
         """
+        return self.set_task_run_states(
+            [dict(task_run_id=task_run_id, version=version, state=state)]
+        )[0]
+
+    def set_task_run_states(
+        self, task_run_states: List[Dict[str, Any]]
+    ) -> List["prefect.engine.state.State"]:
+        """
+        Sets new states for any number of task runs with a single mutation.
+
+        Args:
+            - task_run_states (List[dict]): a list of dictionaries, each with the
+                `task_run_id`, `version` and `state` keys accepted by `set_task_run_state`
+
+        Raises:
+            - ClientError: if the GraphQL mutation is bad for any reason
+
+        Returns:
+            - List[State]: the state each task run should be considered in, in the same
+                order as `task_run_states`
+        """
         mutation = {
             "mutation($input: setTaskRunStatesInput!)": {
                 "setTaskRunStates(input: $input)": {
@@ -978,33 +1185,40 @@ class Client:
             }
         }
 
-        serialized_state = state.serialize()
-
         result = self.graphql(
             mutation,
             variables=dict(
                 input=dict(
                     states=[
                         dict(
-                            state=serialized_state,
-                            taskRunId=task_run_id,
-                            version=version,
+                            state=update["state"].serialize(),
+                            taskRunId=update["task_run_id"],
+                            version=update["version"],
                         )
+                        for update in task_run_states
                     ]
                 )
             ),
         )  # type: Any
-        state_payload = result.data.setTaskRunStates.states[0]
-        if state_payload.status == "QUEUED":
-            # If appropriate, the state attribute of the Queued state can be
-            # set by the caller of this method
-            return prefect.engine.state.Queued(
-                message=state_payload.get("message"),
-                start_time=pendulum.now("UTC").add(
-                    seconds=prefect.context.config.cloud.queue_interval
-                ),
-            )
-        return state
+
+        state_payloads = result.data.setTaskRunStates.states
+        states = []  # type: List[prefect.engine.state.State]
+        for i, update in enumerate(task_run_states):
+            state_payload = state_payloads[i]
+            if state_payload.status == "QUEUED":
+                # If appropriate, the state attribute of the Queued state can be
+                # set by the caller of this method
+                states.append(
+                    prefect.engine.state.Queued(
+                        message=state_payload.get("message"),
+                        start_time=pendulum.now("UTC").add(
+                            seconds=prefect.context.config.cloud.queue_interval
+                        ),
+                    )
+                )
+            else:
+                states.append(update["state"])
+        return states
 
     def set_secret(self, name: str, value: Any) -> None:
         """
@@ -1165,12 +1379,21 @@ class Client:
         if not result.data.writeRunLog.success:
             raise ValueError("Writing log failed.")
 
-    def write_run_logs(self, logs: List[Dict]) -> None:
+    def write_run_logs(
+        self,
+        logs: List[Dict],
+        serialized_logs: List[str] = None,
+        compress_body: bool = False,
+    ) -> None:
         """
         Uploads a collection of logs to Cloud.
 
         Args:
             - logs (List[Dict]): a list of log entries to add
+            - serialized_logs (List[str], optional): the JSON encoding of each of `logs`,
+                if it is already known; these are sent as they are, rather than encoding
+                the logs again
+            - compress_body (bool, optional): whether to gzip the body of the request
 
         Raises:
             - ValueError: if uploading the logs fail
@@ -1181,8 +1404,13 @@ class Client:
             }
         }
 
+        if serialized_logs is not None:
+            variables = '{"input": {"logs": [' + ", ".join(serialized_logs) + "]}}"
+        else:
+            variables = json.dumps(dict(input=dict(logs=logs)))
+
         result = self.graphql(
-            mutation, variables=dict(input=dict(logs=logs))
+            mutation, variables=variables, compress_body=compress_body
         )  # type: Any
 
         if not result.data.writeRunLogs.success:
@@ -10,12 +10,14 @@ import time
 import uuid
 import warnings
 from collections import Counter
+from contextlib import contextmanager
 from pathlib import Path
 from typing import (
     Any,
     Callable,
     Dict,
     Iterable,
+    Iterator,
     List,
     Mapping,
     Optional,
@@ -51,26 +53,26 @@ def cache(method: Callable) -> Callable:
     """
     Decorator for caching Flow methods.
 
-    Each Flow has a _cache dict that can be used to memoize expensive functions. This
-    decorator automatically compares a hash of the Flow's current tasks, edges, and reference_tasks
-    to a cached hash; if the hash is the same, it attempts to retrieve a value from the cache.
-    If the hash is different, it invalidates the cache.
+    Each Flow has a _cache dict that can be used to memoize expensive functions. Every
+    Flow also carries a `_version` counter which is incremented whenever its tasks, edges
+    or reference tasks are modified; this decorator compares the version stored in the
+    cache to the Flow's current version and invalidates the cache if they differ. As a
+    result, checking the cache has a constant cost regardless of the size of the Flow.
     """
+    signature = inspect.signature(method)
 
     @functools.wraps(method)
     def wrapper(self, *args, **kwargs):  # type: ignore
 
-        cache_check = dict(
-            tasks=self.tasks.copy(),
-            edges=self.edges.copy(),
-            reference_tasks=copy.copy(self._reference_tasks),
-        )
-        if any(self._cache.get(k) != v for k, v in cache_check.items()):
+        if self._cache.get("version") != self._version:
             self._cache.clear()
-            self._cache.update(cache_check)
+            self._cache["version"] = self._version
 
-        callargs = inspect.signature(method).bind(self, *args, **kwargs).arguments
-        key = (method.__name__, tuple(callargs.items())[1:])
+        if args or kwargs:
+            callargs = signature.bind(self, *args, **kwargs).arguments
+            key = (method.__name__, tuple(callargs.items())[1:])
+        else:
+            key = (method.__name__, ())
         if key not in self._cache:
             self._cache[key] = method(self, *args, **kwargs)
         return self._cache[key]
@@ -78,6 +80,54 @@ def cache(method: Callable) -> Callable:
     return wrapper
 
 
+class _ObservedSet(set):
+    """
+    A set which calls `on_change` whenever it is modified in place. Flows use it for
+    their tasks and edges, so that modifying them directly (rather than through
+    `Flow.add_task()` or `Flow.add_edge()`) invalidates the flow's indexes and cache.
+
+    Pickling or copying an `_ObservedSet` produces a plain `set`.
+    """
+
+    def __init__(self, items: Iterable = (), on_change: Callable = None) -> None:
+        super().__init__(items)
+        self._on_change = on_change
+
+    def __reduce__(self) -> tuple:
+        return (set, (list(self),))
+
+
+def _observed(name: str) -> Callable:
+    method = getattr(set, name)
+
+    @functools.wraps(method)
+    def wrapper(self, *args):  # type: ignore
+        result = method(self, *args)
+        if self._on_change is not None:
+            self._on_change()
+        return result
+
+    return wrapper
+
+
+for _name in [
+    "add",
+    "clear",
+    "difference_update",
+    "discard",
+    "intersection_update",
+    "pop",
+    "remove",
+    "symmetric_difference_update",
+    "update",
+    "__iand__",
+    "__ior__",
+    "__isub__",
+    "__ixor__",
+]:
+    setattr(_ObservedSet, _name, _observed(_name))
+
+
 class Flow:
     """
     The Flow class is used as the representation of a collection of dependent Tasks.
@@ -152,6 +202,7 @@ class Flow:
         result_handler: ResultHandler = None,
     ):
         self._cache = {}  # type: dict
+        self._version = 0
 
         if not name:
             raise ValueError("A name must be provided for the flow.")
@@ -165,6 +216,10 @@ class Flow:
 
         self.tasks = set()  # type: Set[Task]
         self.edges = set()  # type: Set[Edge]
+        # tasks whose edges still need to be validated, each with a count of the keyed
+        # edges that were added again although already in the flow; only set within
+        # `Flow.bulk()`
+        self._deferred_validation = None  # type: Optional[Dict[Task, Counter]]
         self.constants = collections.defaultdict(
             dict
         )  # type: Dict[Task, Dict[str, Any]]
@@ -173,14 +228,7 @@ class Flow:
             self.add_task(t)
 
         self.set_reference_tasks(reference_tasks or [])
-        for e in edges or []:
-            self.add_edge(
-                upstream_task=e.upstream_task,
-                downstream_task=e.downstream_task,
-                key=e.key,
-                mapped=e.mapped,
-                validate=validate,
-            )
+        self.add_edges(edges or [], validate=validate)
 
         self._prefect_version = prefect.__version__
 
@@ -220,6 +268,93 @@ class Flow:
         new.set_reference_tasks(self._reference_tasks)
         return new
 
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        # the indexes are rebuilt from the tasks and edges when they're first used
+        for attr in ["_upstream_index", "_downstream_index", "_slug_index"]:
+            state.pop(attr, None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        state = state.copy()
+        # flows pickled by earlier versions of Prefect (e.g., in storage) store their
+        # tasks and edges as `tasks` and `edges`, and don't carry a mutation counter
+        tasks = state.pop("_tasks", state.pop("tasks", set()))
+        edges = state.pop("_edges", state.pop("edges", set()))
+        if "_version" not in state:
+            state.update(_cache={}, _version=0, _deferred_validation=None)
+        self.__dict__.update(state)
+        # restoring the tasks and edges doesn't change the flow, so its cache is kept
+        self._tasks = _ObservedSet(tasks, on_change=self._invalidate_indexes)
+        self._edges = _ObservedSet(edges, on_change=self._invalidate_indexes)
+        self._indexes_stale = True
+
+    # Tasks and edges ----------------------------------------------------------
+
+    @property
+    def tasks(self) -> Set[Task]:
+        """
+        The tasks of the flow. Tasks should be added with `Flow.add_task()`; modifying
+        this set directly is supported, but causes the flow's indexes to be rebuilt.
+        """
+        return self._tasks
+
+    @tasks.setter
+    def tasks(self, tasks: Iterable[Task]) -> None:
+        self._tasks = _ObservedSet(tasks, on_change=self._invalidate_indexes)
+        self._invalidate_indexes()
+
+    @property
+    def edges(self) -> Set[Edge]:
+        """
+        The edges of the flow. Edges should be added with `Flow.add_edge()`; modifying
+        this set directly is supported, but causes the flow's indexes to be rebuilt.
+        """
+        return self._edges
+
+    @edges.setter
+    def edges(self, edges: Iterable[Edge]) -> None:
+        self._edges = _ObservedSet(edges, on_change=self._invalidate_indexes)
+        self._invalidate_indexes()
+
+    def _invalidate_indexes(self) -> None:
+        self._indexes_stale = True
+        self._version += 1
+
+    def _refresh_indexes(self) -> None:
+        # the adjacency indexes relate each task to its upstream / downstream edges;
+        # they are maintained incrementally by `add_task()` and `add_edge()`, and
+        # rebuilt from scratch after the tasks or edges are modified directly
+        if not self._indexes_stale:
+            return
+        upstream = {t: set() for t in self._tasks}  # type: Dict[Task, Set[Edge]]
+        downstream = {t: set() for t in self._tasks}  # type: Dict[Task, Set[Edge]]
+        for edge in self._edges:
+            # edges to tasks which aren't in the flow are reported by `validate()`
+            if edge.downstream_task in upstream:
+                upstream[edge.downstream_task].add(edge)
+            if edge.upstream_task in downstream:
+                downstream[edge.upstream_task].add(edge)
+        self._upstream_index = upstream
+        self._downstream_index = downstream
+        self._slug_index = {t.slug: t for t in self._tasks if t.slug}
+        self._indexes_stale = False
+
+    @property
+    def _upstream_edges(self) -> Dict[Task, Set[Edge]]:
+        self._refresh_indexes()
+        return self._upstream_index
+
+    @property
+    def _downstream_edges(self) -> Dict[Task, Set[Edge]]:
+        self._refresh_indexes()
+        return self._downstream_index
+
+    @property
+    def _slugs(self) -> Dict[str, Task]:
+        self._refresh_indexes()
+        return self._slug_index
+
     # Identification -----------------------------------------------------------
 
     def get_tasks(
@@ -278,17 +413,24 @@ class Flow:
 
         new = as_task(new, flow=self)
 
-        # update tasks
-        self.tasks.remove(old)
-        self.add_task(new)
+        affected_edges = self._upstream_edges[old] | self._downstream_edges[old]
 
-        self._cache.clear()
+        # update tasks; the sets of tasks and edges are modified with `set` methods so
+        # that the indexes, which are updated alongside them, aren't rebuilt
+        set.remove(self._tasks, old)
+        del self._upstream_edges[old]
+        del self._downstream_edges[old]
+        if self._slugs.get(old.slug) is old:
+            del self._slugs[old.slug]
+        self.add_task(new)
 
-        affected_edges = {e for e in self.edges if old in e.tasks}
+        self._version += 1
 
         # remove old edges
         for edge in affected_edges:
-            self.edges.remove(edge)
+            set.remove(self._edges, edge)
+            self._upstream_edges.get(edge.downstream_task, set()).discard(edge)
+            self._downstream_edges.get(edge.upstream_task, set()).discard(edge)
 
         # replace with new edges
         for edge in affected_edges:
@@ -337,7 +479,7 @@ class Flow:
         Returns:
             - set of Task objects that have no upstream dependencies
         """
-        return set(t for t in self.tasks if not self.edges_to(t))
+        return set(t for t, edges in self._upstream_edges.items() if not edges)
 
     @cache
     def terminal_tasks(self) -> Set[Task]:
@@ -347,7 +489,7 @@ class Flow:
         Returns:
             - set of Task objects that have no downstream dependencies
         """
-        return set(t for t in self.tasks if not self.edges_from(t))
+        return set(t for t, edges in self._downstream_edges.items() if not edges)
 
     def parameters(self) -> Set[Parameter]:
         """
@@ -396,11 +538,11 @@ class Flow:
         Returns:
             - None
         """
-        self._cache.clear()
         reference_tasks = set(tasks)
         if any(t not in self.tasks for t in reference_tasks):
             raise ValueError("reference tasks must be part of the flow.")
         self._reference_tasks = reference_tasks
+        self._version += 1
 
     # Graph --------------------------------------------------------------------
 
@@ -424,15 +566,20 @@ class Flow:
                 "Tasks must be Task instances (received {})".format(type(task))
             )
         elif task not in self.tasks:
-            if task.slug and any(task.slug == t.slug for t in self.tasks):
+            if task.slug and task.slug in self._slugs:
                 raise ValueError(
                     'A task with the slug "{}" already exists in this '
                     "flow.".format(task.slug)
                 )
 
         if task not in self.tasks:
-            self.tasks.add(task)
-            self._cache.clear()
+            # the indexes are updated below, so they aren't invalidated here
+            set.add(self._tasks, task)
+            self._upstream_edges[task] = set()
+            self._downstream_edges[task] = set()
+            if task.slug:
+                self._slugs[task.slug] = task
+            self._version += 1
 
         return task
 
@@ -475,6 +622,19 @@ class Flow:
         self.add_task(upstream_task)
         self.add_task(downstream_task)
 
+        # within `Flow.bulk()`, validation is performed once all edges have been added
+        if validate and self._deferred_validation is not None:
+            repeated = self._deferred_validation.setdefault(downstream_task, Counter())
+            # adding an edge that is already in the flow doesn't change the flow's
+            # edges, but it assigns the edge's key again, so it is counted here in
+            # order to be rejected exactly as it would be outside of `Flow.bulk()`
+            if key is not None and (
+                Edge(upstream_task, downstream_task, key=key, mapped=mapped)
+                in self.edges
+            ):
+                repeated[key] += 1
+            validate = False
+
         # we can only check the downstream task's edges once it has been added to the
         # flow, so we need to perform this check here and not earlier.
         if validate and key and key in {e.key for e in self.edges_to(downstream_task)}:
@@ -491,7 +651,11 @@ class Flow:
             key=key,
             mapped=mapped,
         )
-        self.edges.add(edge)
+        # the indexes are updated below, so they aren't invalidated here
+        set.add(self._edges, edge)
+        self._upstream_edges[downstream_task].add(edge)
+        self._downstream_edges[upstream_task].add(edge)
+        self._version += 1
 
         # check that the edges are valid keywords by binding them
         if validate and key is not None:
@@ -500,14 +664,104 @@ class Flow:
             }
             inspect.signature(downstream_task.run).bind_partial(**edge_keys)
 
-        self._cache.clear()
-
         # check for cycles
         if validate:
             self.validate()
 
         return edge
 
+    def add_edges(self, edges: Iterable[Edge], validate: bool = None) -> List[Edge]:
+        """
+        Add many edges to the flow at once. The edges are added within `Flow.bulk()`,
+        so that the flow is validated a single time after all edges have been added
+        rather than after each individual edge.
+
+        Args:
+            - edges ([Edge]): the edges to add to the flow
+            - validate (bool, optional): Whether or not to check the validity of
+                the flow (e.g., presence of cycles and illegal keys). Defaults to the value
+                of `eager_edge_validation` in your prefect configuration file.
+
+        Returns:
+            - A list of Edge objects added to the flow
+        """
+        with self.bulk():
+            return [
+                self.add_edge(
+                    upstream_task=e.upstream_task,
+                    downstream_task=e.downstream_task,
+                    key=e.key,
+                    mapped=e.mapped,
+                    validate=validate,
+                )
+                for e in edges
+            ]
+
+    @contextmanager
+    def bulk(self) -> Iterator["Flow"]:
+        """
+        Context manager for efficiently building large flows. Any validation requested
+        while adding edges inside the context (e.g., checking keys against a task's
+        `run()` signature and checking for cycles) is deferred until the context exits,
+        at which point each affected task's signature is bound a single time and the
+        flow is sorted a single time.
+
+        Nested calls are allowed; validation happens when the outermost context exits.
+        If an error is raised inside the context, no validation is performed.
+
+        Example:
+            ```python
+            flow = Flow("big-flow")
+            with flow.bulk():
+                for upstream, downstream in pairs:
+                    flow.add_edge(upstream, downstream, validate=True)
+            ```
+
+        Returns:
+            - Iterator[Flow]: a context manager yielding this flow
+
+        Raises:
+            - ValueError: if a task has been assigned the same argument more than once
+            - ValueError: if a cycle is found in the flow's DAG
+            - TypeError: if an edge key does not match the downstream task's `run()` signature
+        """
+        if self._deferred_validation is not None:
+            yield self
+            return
+
+        self._deferred_validation = {}
+        try:
+            yield self
+            tasks = self._deferred_validation
+        finally:
+            self._deferred_validation = None
+
+        if tasks:
+            for task, repeated in tasks.items():
+                self._validate_edge_keys(task, repeated)
+            self.validate()
+
+    def _validate_edge_keys(self, task: Task, repeated: Counter = None) -> None:
+        """
+        Checks that no argument of `task` is assigned by more than one edge and that
+        all edge keys can be bound to the task's `run()` signature.
+
+        Args:
+            - task (Task): the task whose upstream edges are checked
+            - repeated (Counter, optional): the number of times each key was assigned
+                again by adding an edge which was already in the flow
+        """
+        keys = [e.key for e in self._upstream_edges[task] if e.key is not None]
+        for key, count in (Counter(keys) + (repeated or Counter())).items():
+            if count > 1:
+                raise ValueError(
+                    'Argument "{a}" for task {t} has already been assigned in '
+                    "this flow. If you are trying to call the task again with "
+                    "new arguments, call Task.copy() before adding the result "
+                    "to this flow.".format(a=key, t=task)
+                )
+        inspect.signature(task.run).bind_partial(**{k: None for k in keys})
+
     def chain(self, *tasks: Task, validate: bool = None) -> List[Edge]:
         """
         Adds a sequence of dependent tasks to the flow; each task should be provided
@@ -523,12 +777,13 @@ class Flow:
             - A list of Edge objects added to the flow
         """
         edges = []
-        for u_task, d_task in zip(tasks, tasks[1:]):
-            edges.append(
-                self.add_edge(
-                    upstream_task=u_task, downstream_task=d_task, validate=validate
+        with self.bulk():
+            for u_task, d_task in zip(tasks, tasks[1:]):
+                edges.append(
+                    self.add_edge(
+                        upstream_task=u_task, downstream_task=d_task, validate=validate
+                    )
                 )
-            )
         return edges
 
     def update(self, flow: "Flow", validate: bool = None) -> None:
@@ -546,15 +801,9 @@ class Flow:
             if task not in self.tasks:
                 self.add_task(task)
 
-        for edge in flow.edges:
-            if edge not in self.edges:
-                self.add_edge(
-                    upstream_task=edge.upstream_task,
-                    downstream_task=edge.downstream_task,
-                    key=edge.key,
-                    mapped=edge.mapped,
-                    validate=validate,
-                )
+        self.add_edges(
+            [edge for edge in flow.edges if edge not in self.edges], validate=validate
+        )
 
         self.constants.update(flow.constants or {})
 
@@ -567,10 +816,7 @@ class Flow:
         Returns:
             - dict with the key as tasks and the value as a set of upstream edges
         """
-        edges = {t: set() for t in self.tasks}  # type: Dict[Task, Set[Edge]]
-        for edge in self.edges:
-            edges[edge.downstream_task].add(edge)
-        return edges
+        return {t: edges.copy() for t, edges in self._upstream_edges.items()}
 
     @cache
     def all_downstream_edges(self) -> Dict[Task, Set[Edge]]:
@@ -581,10 +827,7 @@ class Flow:
         Returns:
             - dict with the key as tasks and the value as a set of downstream edges
         """
-        edges = {t: set() for t in self.tasks}  # type: Dict[Task, Set[Edge]]
-        for edge in self.edges:
-            edges[edge.upstream_task].add(edge)
-        return edges
+        return {t: edges.copy() for t, edges in self._downstream_edges.items()}
 
     def edges_to(self, task: Task) -> Set[Edge]:
         """
@@ -604,7 +847,7 @@ class Flow:
             raise ValueError(
                 "Task {t} was not found in Flow {f}".format(t=task, f=self)
             )
-        return self.all_upstream_edges()[task]
+        return self._upstream_edges[task].copy()
 
     def edges_from(self, task: Task) -> Set[Edge]:
         """
@@ -624,7 +867,7 @@ class Flow:
             raise ValueError(
                 "Task {t} was not found in Flow {f}".format(t=task, f=self)
             )
-        return self.all_downstream_edges()[task]
+        return self._downstream_edges[task].copy()
 
     def upstream_tasks(self, task: Task) -> Set[Task]:
         """
@@ -705,44 +948,37 @@ class Flow:
         # downstream tasks)
         if root_tasks:
             tasks = set(root_tasks)
-            seen = set()  # type: Set[Task]
-
-            # while the set of tasks is different from the seen tasks...
-            while tasks.difference(seen):
-                # iterate over the new tasks...
-                for t in list(tasks.difference(seen)):
-                    # add its downstream tasks to the task list
-                    tasks.update(self.downstream_tasks(t))
-                    # mark it as seen
-                    seen.add(t)
+            frontier = list(tasks)
+            while frontier:
+                for edge in self.edges_from(frontier.pop()):
+                    if edge.downstream_task not in tasks:
+                        tasks.add(edge.downstream_task)
+                        frontier.append(edge.downstream_task)
         else:
             tasks = self.tasks
 
-        # build the list of sorted tasks
-        remaining_tasks = list(tasks)
+        # count the upstream edges of each task that originate from a task under
+        # consideration; tasks with no such edges are ready to be sorted
+        indegree = {
+            t: sum(1 for e in self._upstream_edges[t] if e.upstream_task in tasks)
+            for t in tasks
+        }
+        ready = collections.deque(t for t, count in indegree.items() if count == 0)
+
+        # build the list of sorted tasks, releasing each downstream task once all
+        # of its upstream edges have been visited
         sorted_tasks = []
-        while remaining_tasks:
-            # mark the flow as cyclic unless we prove otherwise
-            cyclic = True
-
-            # iterate over each remaining task
-            for task in remaining_tasks.copy():
-                # check all the upstream tasks of that task
-                for upstream_task in self.upstream_tasks(task):
-                    # if the upstream task is also remaining, it means it
-                    # hasn't been sorted, so we can't sort this task either
-                    if upstream_task in remaining_tasks:
-                        break
-                else:
-                    # but if all upstream tasks have been sorted, we can sort
-                    # this one too. We note that we found no cycle this time.
-                    cyclic = False
-                    remaining_tasks.remove(task)
-                    sorted_tasks.append(task)
-
-            # if we were unable to match any upstream tasks, we have a cycle
-            if cyclic:
-                raise ValueError("Cycle found; flows must be acyclic!")
+        while ready:
+            task = ready.popleft()
+            sorted_tasks.append(task)
+            for edge in self._downstream_edges[task]:
+                indegree[edge.downstream_task] -= 1
+                if indegree[edge.downstream_task] == 0:
+                    ready.append(edge.downstream_task)
+
+        # any task that was never released sits on (or downstream of) a cycle
+        if len(sorted_tasks) < len(tasks):
+            raise ValueError("Cycle found; flows must be acyclic!")
 
         return tuple(sorted_tasks)
 
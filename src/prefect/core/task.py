@@ -153,10 +153,15 @@ class Task(metaclass=SignatureValidator):
             result of the previous handler.
         - on_failure (Callable, optional): A function with signature `fn(task: Task, state: State) -> None`
             with will be called anytime this Task enters a failure state
+        - map_batch_size (int, optional): when this task is mapped, the number of map indices
+            to group into a single executor submission; each index still produces its own
+            state (and future). Defaults to running every mapped child as a separate
+            submission.
 
     Raises:
         - TypeError: if `tags` is of type `str`
         - TypeError: if `timeout` is not of type `int`
+        - ValueError: if `map_batch_size` is not a positive integer
     """
 
     # Tasks are not iterable, though they do have a __getitem__ method
@@ -179,6 +184,7 @@ class Task(metaclass=SignatureValidator):
         result_handler: "ResultHandler" = None,
         state_handlers: List[Callable] = None,
         on_failure: Callable = None,
+        map_batch_size: int = None,
     ):
 
         self.name = name or type(self).__name__
@@ -219,9 +225,14 @@ class Task(metaclass=SignatureValidator):
             raise TypeError(
                 "Only integer timeouts (representing seconds) are supported."
             )
+        if map_batch_size is not None and (
+            not isinstance(map_batch_size, int) or map_batch_size < 1
+        ):
+            raise ValueError("`map_batch_size` must be a positive integer.")
         self.max_retries = max_retries
         self.retry_delay = retry_delay
         self.timeout = timeout
+        self.map_batch_size = map_batch_size
 
         self.trigger = trigger or prefect.triggers.all_successful
         self.skip_on_upstream_skip = skip_on_upstream_skip
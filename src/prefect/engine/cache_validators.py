@@ -12,12 +12,21 @@ and are used to determine whether to re-run the Task or use the cache.
 Note that _all_ validators take into account cache expiration.
 
 A cache validator returns `True` if the cache is still valid, and `False` otherwise.
+
+The hash-based validators (`all_input_hashes`, `all_parameter_hashes`,
+`partial_input_hashes_only` and `partial_parameter_hashes_only`) compare stable hashes of
+inputs and parameters (see `prefect.utilities.hashing`) instead of their values. The
+hashes are computed once, when a task run's inputs are first checked, and stored with
+its `Cached` state, so cached inputs are never read back through their result handlers;
+this also makes them suitable for inputs (such as NumPy arrays and pandas DataFrames)
+which can't be compared with `==`.
 """
-from typing import Any, Callable, Dict, Iterable
+from typing import Any, Callable, Dict, Iterable, Optional
 
 import pendulum
 
 import prefect
+from prefect.utilities import hashing
 
 
 def never_use(
@@ -269,3 +278,196 @@ def partial_inputs_only(validate_on: Iterable[str] = None,) -> Callable:
             return partial_provided == partial_needed
 
     return _partial_inputs_only
+
+
+def _validates_hashes(validator: Callable) -> Callable:
+    # task runners don't need to read the cached inputs of states checked by these
+    validator.validates_hashes = True  # type: ignore
+    return validator
+
+
+def _hashes_match(
+    cached: Optional[Dict[str, Optional[str]]],
+    current: Dict[str, Optional[str]],
+    validate_on: Iterable[str] = None,
+) -> bool:
+    if cached is None:
+        return False
+    if validate_on is not None:
+        cached = {key: value for key, value in cached.items() if key in validate_on}
+        current = {key: value for key, value in current.items() if key in validate_on}
+    # values which couldn't be hashed never match
+    if None in cached.values() or None in current.values():
+        return False
+    return cached == current
+
+
+def _current_hashes(name: str, values: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    # task runners provide the hashes of the current inputs and parameters in context,
+    # so that they're computed once rather than once per validated state
+    hashes = prefect.context.get(name)
+    if hashes is None:
+        hashes = hashing.hash_values(values or {})
+    return hashes
+
+
+@_validates_hashes
+def all_input_hashes(
+    state: "prefect.engine.state.Cached",
+    inputs: Dict[str, Any],
+    parameters: Dict[str, Any],
+) -> bool:
+    """
+    Validates the cache based on cache expiration _and_ the hashes of all inputs that were
+    provided on the last successful run, without reading the cached inputs.
+
+    Args:
+        - state (State): a `Success` state from the last successful Task run that contains the cache
+        - inputs (dict): a `dict` of inputs that were available on the last
+            successful run of the cached Task
+        - parameters (dict): a `dict` of parameters that were available on the
+            last successful run of the cached Task
+
+    Returns:
+        - boolean specifying whether or not the cache should be used
+    """
+    if duration_only(state, inputs, parameters) is False:
+        return False
+    return _hashes_match(
+        state.cached_input_hashes, _current_hashes("input_hashes", inputs)
+    )
+
+
+@_validates_hashes
+def all_parameter_hashes(
+    state: "prefect.engine.state.Cached",
+    inputs: Dict[str, Any],
+    parameters: Dict[str, Any],
+) -> bool:
+    """
+    Validates the cache based on cache expiration _and_ the hashes of all parameters that
+    were provided on the last successful run.
+
+    Args:
+        - state (State): a `Success` state from the last successful Task run that contains the cache
+        - inputs (dict): a `dict` of inputs that were available on the last
+            successful run of the cached Task
+        - parameters (dict): a `dict` of parameters that were available on the
+            last successful run of the cached Task
+
+    Returns:
+        - boolean specifying whether or not the cache should be used
+    """
+    if duration_only(state, inputs, parameters) is False:
+        return False
+    return _hashes_match(
+        state.cached_parameter_hashes, _current_hashes("parameter_hashes", parameters)
+    )
+
+
+def partial_input_hashes_only(validate_on: Iterable[str] = None,) -> Callable:
+    """
+    Validates the cache based on cache expiration _and_ the hashes of a subset of inputs
+    (determined by the `validate_on` keyword) that were provided on the last successful
+    run, without reading the cached inputs.
+
+    Args:
+        - validate_on (list): a `list` of strings specifying the input names
+            to validate against
+
+    Returns:
+        - Callable: the actual validation function specifying whether or not the cache should be used
+
+    Example:
+    ```python
+    from datetime import timedelta
+    import pandas as pd
+    from prefect import Flow, task
+    from prefect.engine.cache_validators import partial_input_hashes_only
+
+    @task(cache_for=timedelta(days=1),
+          cache_validator=partial_input_hashes_only(validate_on=['df']))
+    def summarize(df, verbose=False):
+        return df.describe()
+
+    with Flow("My Flow") as f:
+        summary = summarize(pd.DataFrame({"x": range(1000)}))
+    ```
+    """
+
+    @_validates_hashes
+    def _partial_input_hashes_only(
+        state: "prefect.engine.state.Cached",
+        inputs: Dict[str, Any],
+        parameters: Dict[str, Any],
+    ) -> bool:
+        """
+        The actual cache validation function that will be used.
+
+        Args:
+            - state (State): a `Success` state from the last successful Task run that contains the cache
+            - inputs (dict): a `dict` of inputs that were available on the last
+                successful run of the cached Task
+            - parameters (dict): a `dict` of parameters that were available on the
+                last successful run of the cached Task
+
+        Returns:
+            - boolean specifying whether or not the cache should be used
+        """
+        if duration_only(state, inputs, parameters) is False:
+            return False
+        elif validate_on is None:
+            return True  # if you dont want to validate on anything, then the cache is valid
+        return _hashes_match(
+            state.cached_input_hashes,
+            _current_hashes("input_hashes", inputs),
+            validate_on,
+        )
+
+    return _partial_input_hashes_only
+
+
+def partial_parameter_hashes_only(validate_on: Iterable[str] = None,) -> Callable:
+    """
+    Validates the cache based on cache expiration _and_ the hashes of a subset of
+    parameters (determined by the `validate_on` keyword) that were provided on the last
+    successful run.
+
+    Args:
+        - validate_on (list): a `list` of strings specifying the parameter names
+            to validate against
+
+    Returns:
+        - Callable: the actual validation function specifying whether or not the cache should be used
+    """
+
+    @_validates_hashes
+    def _partial_parameter_hashes_only(
+        state: "prefect.engine.state.Cached",
+        inputs: Dict[str, Any],
+        parameters: Dict[str, Any],
+    ) -> bool:
+        """
+        The actual cache validation function that will be used.
+
+        Args:
+            - state (State): a `Success` state from the last successful Task run that contains the cache
+            - inputs (dict): a `dict` of inputs that were available on the last
+                successful run of the cached Task
+            - parameters (dict): a `dict` of parameters that were available on the
+                last successful run of the cached Task
+
+        Returns:
+            - boolean specifying whether or not the cache should be used
+        """
+        if duration_only(state, inputs, parameters) is False:
+            return False
+        elif validate_on is None:
+            return True  # if you dont want to validate on anything, then the cache is valid
+        return _hashes_match(
+            state.cached_parameter_hashes,
+            _current_hashes("parameter_hashes", parameters),
+            validate_on,
+        )
+
+    return _partial_parameter_hashes_only
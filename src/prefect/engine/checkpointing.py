@@ -0,0 +1,171 @@
+"""
+Checkpointing in the background: when `engine.checkpointing.background` is set, task
+runners hand the results of successful tasks to a `CheckpointPool`, which writes them
+with their result handlers on a bounded pool of threads while the task's state (and the
+in-memory value of its result) is returned immediately, so that downstream tasks don't
+wait for uploads to finish.
+
+A result waits for its pending write whenever its safe value is needed: when
+`Result.store_safe_value` is called (for example, before its Success state is sent to
+Prefect Cloud) and when it is pickled. Flow runners wait for every pending write before
+determining the final state of the flow run, and task states whose results could not be
+written become `Failed`.
+"""
+import concurrent.futures
+import threading
+from typing import Any, Optional, Set
+
+import prefect
+from prefect.engine.result import Result
+from prefect.engine.state import Failed, State
+from prefect.utilities import logging
+from prefect.utilities.process_state import register_reset
+
+
+class CheckpointPool:
+    """
+    A pool of threads which write the values of results with their result handlers in
+    the background.
+
+    Args:
+        - max_workers (int, optional): the number of results written at once; defaults
+            to 4
+        - max_pending (int, optional): the number of results which may be waiting to be
+            written (or being written) at once; submitting more blocks until earlier
+            writes finish. Defaults to 16
+    """
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 16) -> None:
+        if max_pending < max_workers:
+            raise ValueError("max_pending must be at least max_workers.")
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.logger = logging.get_logger(type(self).__name__)
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="prefect-checkpoint"
+        )
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._pending = set()  # type: Set[concurrent.futures.Future]
+
+    @property
+    def pending(self) -> int:
+        """
+        The number of results waiting to be written, or being written.
+        """
+        with self._lock:
+            return len(self._pending)
+
+    def submit(self, result: Result) -> None:
+        """
+        Writes the value of a result in the background. Blocks while `max_pending`
+        results are already waiting to be written.
+
+        Args:
+            - result (Result): the result to write, with its result handler
+        """
+        self._slots.acquire()
+        context = prefect.context.to_dict()
+        future = self._executor.submit(self._write, result, context)
+        with self._lock:
+            self._pending.add(future)
+        result._checkpoint = future
+        future.add_done_callback(self._done)
+
+    def _write(self, result: Result, context: dict) -> None:
+        # result handlers read secrets (among other things) from the context of the
+        # task run which produced the result
+        with prefect.context(context):
+            try:
+                result._store_safe_value()
+            except Exception as exc:
+                self.logger.error(
+                    "Task '{name}': unexpected error while checkpointing result: "
+                    "{exc}".format(
+                        name=context.get("task_full_name", "<unknown>"), exc=repr(exc)
+                    )
+                )
+                raise
+
+    def _done(self, future: concurrent.futures.Future) -> None:
+        with self._lock:
+            self._pending.discard(future)
+        self._slots.release()
+
+    def flush(self, timeout: float = None) -> None:
+        """
+        Waits for every result submitted so far to be written (or to fail to be).
+
+        Args:
+            - timeout (float, optional): the number of seconds to wait for, if not
+                forever
+
+        Raises:
+            - TimeoutError: if results are still being written after `timeout` seconds
+        """
+        with self._lock:
+            pending = list(self._pending)
+        _, not_done = concurrent.futures.wait(pending, timeout=timeout)
+        if not_done:
+            raise TimeoutError(
+                "{} results are still being checkpointed.".format(len(not_done))
+            )
+
+
+_checkpoint_pool = None  # type: Optional[CheckpointPool]
+_checkpoint_pool_lock = threading.Lock()
+
+
+def get_checkpoint_pool() -> CheckpointPool:
+    """
+    Returns the `CheckpointPool` shared by every task runner in this process, creating
+    it on first use from the `engine.checkpointing` configuration.
+
+    Returns:
+        - CheckpointPool: the checkpoint pool for this process
+    """
+    global _checkpoint_pool
+    with _checkpoint_pool_lock:
+        if _checkpoint_pool is None:
+            config = prefect.context.config.engine.checkpointing
+            _checkpoint_pool = CheckpointPool(
+                max_workers=config.max_workers, max_pending=config.max_pending
+            )
+        return _checkpoint_pool
+
+
+@register_reset
+def reset_checkpoint_pool() -> None:
+    """
+    Forgets the `CheckpointPool` shared by every task runner in this process, so that
+    the next call to `get_checkpoint_pool` creates a new one from the current
+    configuration.
+    """
+    global _checkpoint_pool
+    with _checkpoint_pool_lock:
+        _checkpoint_pool = None
+
+
+def check_checkpoint(state: State) -> State:
+    """
+    Waits for the result of a state to be written, if it's being written in the
+    background, and returns a `Failed` state in its place if it couldn't be.
+
+    Args:
+        - state (State): the state to check
+
+    Returns:
+        - State: the state, or a `Failed` state whose result is the error raised while
+            writing its result
+    """
+    result = getattr(state, "_result", None)
+    if not isinstance(result, Result):
+        return state
+    exc = result._wait_for_checkpoint()
+    if exc is None:
+        return state
+    return Failed(
+        message="Failed to checkpoint result: {}".format(repr(exc)),
+        result=exc,
+        cached_inputs=state.cached_inputs,
+    )
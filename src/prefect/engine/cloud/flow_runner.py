@@ -6,11 +6,13 @@ import prefect
 from prefect.client import Client
 from prefect.core import Flow, Task
 from prefect.engine.cloud import CloudTaskRunner
-from prefect.engine.cloud.utilities import prepare_state_for_cloud
+from prefect.engine.cloud.utilities import (
+    get_flow_run_settings,
+    prepare_state_for_cloud,
+)
 from prefect.engine.flow_runner import FlowRunner, FlowRunnerInitializeResult
 from prefect.engine.runner import ENDRUN
 from prefect.engine.state import Failed, State
-from prefect.utilities.graphql import with_args
 
 
 class CloudFlowRunner(FlowRunner):
@@ -69,15 +71,8 @@ class CloudFlowRunner(FlowRunner):
             flow_run_id = prefect.context.get("flow_run_id", "")  # type: str
             self.heartbeat_cmd = ["prefect", "heartbeat", "flow-run", "-i", flow_run_id]
 
-            query = {
-                "query": {
-                    with_args("flow_run_by_pk", {"id": flow_run_id}): {
-                        "flow": {"settings": True},
-                    }
-                }
-            }
-            flow_run = self.client.graphql(query).data.flow_run_by_pk
-            if flow_run.flow.settings.get("disable_heartbeat"):
+            settings = get_flow_run_settings(self.client, flow_run_id)
+            if settings.get("disable_heartbeat"):
                 return False
             return True
         except Exception as exc:
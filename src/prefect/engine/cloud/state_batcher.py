@@ -0,0 +1,140 @@
+"""
+Coalesces task run state updates into batched `setTaskRunStates` mutations.
+
+When `cloud.task_run_states.batch` is set to `True`, `CloudTaskRunner`s hand their state
+updates to a single background thread per process instead of sending each one with a
+blocking request. Every update that is waiting when the thread becomes free is sent
+with the same mutation, so many concurrently running tasks share each round trip.
+"""
+import collections
+import threading
+from concurrent.futures import Future
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+import prefect
+from prefect.client import Client
+from prefect.engine.state import State
+
+_PendingUpdate = Tuple[Tuple[str, str], Client, Dict[str, Any], Future]
+
+
+class TaskRunStateBatcher:
+    """
+    Sends task run state updates from a background thread, batching together every
+    update which is waiting to be sent.
+
+    A batch never contains more than one update for the same task run, so that each
+    update is validated against the version set by the one before it; updates are only
+    batched together if they were submitted with clients for the same API server and
+    auth token. If a batched mutation fails, its updates are retried one at a time so
+    that an error (for example, a version mismatch) is only reported for the task run it
+    concerns.
+
+    Args:
+        - max_batch_size (int, optional): the maximum number of states sent in one mutation
+    """
+
+    def __init__(self, max_batch_size: int = 100) -> None:
+        self.max_batch_size = max_batch_size
+        self.round_trips = 0
+        self._queue = collections.deque()  # type: Deque[_PendingUpdate]
+        self._condition = threading.Condition()
+        self._thread = None  # type: Optional[threading.Thread]
+
+    def submit(
+        self, client: Client, task_run_id: str, version: int, state: State
+    ) -> Future:
+        """
+        Queues a state update to be sent by the background thread.
+
+        Args:
+            - client (Client): the client to send the update with
+            - task_run_id (str): the id of the task run to set state for
+            - version (int): the current version of the task run state
+            - state (State): the new state for this task run
+
+        Returns:
+            - Future: a future which resolves to the state the task run should be
+                considered in (see `Client.set_task_run_state`), or raises the error
+                encountered while setting it
+        """
+        future = Future()  # type: Future
+        update = dict(task_run_id=task_run_id, version=version, state=state)
+        key = (client.api_server, client.get_auth_token())
+        with self._condition:
+            self._queue.append((key, client, update, future))
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="prefect-task-run-states", daemon=True
+                )
+                self._thread.start()
+            self._condition.notify()
+        return future
+
+    def _next_batch(self) -> List[_PendingUpdate]:
+        with self._condition:
+            while not self._queue:
+                self._condition.wait()
+
+            key = self._queue[0][0]
+            batch = []  # type: List[_PendingUpdate]
+            deferred = []  # type: List[_PendingUpdate]
+            task_run_ids = set()  # type: Set[str]
+            while self._queue and len(batch) < self.max_batch_size:
+                pending = self._queue.popleft()
+                task_run_id = pending[2]["task_run_id"]
+                if pending[0] != key or task_run_id in task_run_ids:
+                    deferred.append(pending)
+                else:
+                    task_run_ids.add(task_run_id)
+                    batch.append(pending)
+            self._queue.extendleft(reversed(deferred))
+            return batch
+
+    def _send(self, client: Client, updates: List[Dict[str, Any]]) -> List[State]:
+        self.round_trips += 1
+        return client.set_task_run_states(updates)
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            client = batch[0][1]
+            try:
+                states = self._send(client, [update for _, _, update, _ in batch])
+            except Exception as exc:
+                if len(batch) == 1:
+                    batch[0][3].set_exception(exc)
+                    continue
+                # retry individually so that errors are attributed to the right run
+                for _, _, update, future in batch:
+                    try:
+                        future.set_result(self._send(client, [update])[0])
+                    except Exception as exc:
+                        future.set_exception(exc)
+                continue
+
+            for (_, _, _, future), state in zip(batch, states):
+                future.set_result(state)
+
+
+_batcher = None  # type: Optional[TaskRunStateBatcher]
+_batcher_lock = threading.Lock()
+
+
+def get_task_run_state_batcher() -> TaskRunStateBatcher:
+    """
+    Returns this process's `TaskRunStateBatcher`, creating it on first use with the
+    batch size from `cloud.task_run_states.max_batch_size`.
+
+    Returns:
+        - TaskRunStateBatcher: the batcher shared by all task runners in this process
+    """
+    global _batcher
+    with _batcher_lock:
+        if _batcher is None:
+            _batcher = TaskRunStateBatcher(
+                max_batch_size=prefect.context.config.cloud.task_run_states.get(
+                    "max_batch_size", 100
+                )
+            )
+        return _batcher
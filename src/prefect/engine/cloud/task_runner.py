@@ -1,17 +1,27 @@
 import copy
 import datetime
 import _thread
+import threading
 import time
 import warnings
-from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 import pendulum
 
 import prefect
 from prefect.client import Client
 from prefect.core import Edge, Task
+from prefect.utilities import hashing
 from prefect.utilities.executors import tail_recursive
-from prefect.engine.cloud.utilities import prepare_state_for_cloud
+from prefect.engine.checkpointing import check_checkpoint
+from prefect.engine.cloud.state_batcher import get_task_run_state_batcher
+from prefect.engine.cloud.utilities import (
+    get_cached_state,
+    get_flow_run_settings,
+    prepare_state_for_cloud,
+    put_cached_state,
+)
 from prefect.engine.result import NoResult, Result
 from prefect.engine.result_handlers import ResultHandler
 from prefect.engine.runner import ENDRUN, call_state_handlers
@@ -25,7 +35,18 @@ from prefect.engine.state import (
     State,
 )
 from prefect.engine.task_runner import TaskRunner, TaskRunnerInitializeResult
-from prefect.utilities.graphql import with_args
+
+# batched state updates which haven't been waited on yet, for each `CloudTaskRunner.run()`
+# call in progress in the current thread (innermost last); these are kept out of
+# `prefect.context` and off the runner, which are sent along with mapped children to
+# executors that may pickle them
+_pending_state_updates = threading.local()
+
+
+def _get_pending_state_updates() -> List[List[Future]]:
+    if not hasattr(_pending_state_updates, "stack"):
+        _pending_state_updates.stack = []
+    return _pending_state_updates.stack
 
 
 class CloudTaskRunner(TaskRunner):
@@ -68,15 +89,8 @@ class CloudTaskRunner(TaskRunner):
 
             # use empty string for testing purposes
             flow_run_id = prefect.context.get("flow_run_id", "")  # type: str
-            query = {
-                "query": {
-                    with_args("flow_run_by_pk", {"id": flow_run_id}): {
-                        "flow": {"settings": True},
-                    }
-                }
-            }
-            flow_run = self.client.graphql(query).data.flow_run_by_pk
-            if flow_run.flow.settings.get("disable_heartbeat"):
+            settings = get_flow_run_settings(self.client, flow_run_id)
+            if settings.get("disable_heartbeat"):
                 return False
             return True
         except Exception as exc:
@@ -99,6 +113,12 @@ class CloudTaskRunner(TaskRunner):
         """
         raise_on_exception = prefect.context.get("raise_on_exception", False)
 
+        # Cloud records where the results of successful states were written to, so a
+        # result being checkpointed in the background is waited for here; no other
+        # state has a result which is still being written
+        if new_state.is_successful():
+            new_state = check_checkpoint(new_state)
+
         try:
             new_state = super().call_runner_target_handlers(
                 old_state=old_state, new_state=new_state
@@ -113,14 +133,33 @@ class CloudTaskRunner(TaskRunner):
         task_run_id = prefect.context.get("task_run_id")
         version = prefect.context.get("task_run_version")
 
+        # when batching, updates are only waited on if they might be queued (or if there is
+        # no `run()` call to wait on them at the end of the run)
+        pending_stack = _get_pending_state_updates()
+        pending_updates = pending_stack[-1] if pending_stack else None
+        batch = prefect.context.config.cloud.task_run_states.get("batch", False)
+
         try:
             cloud_state = prepare_state_for_cloud(new_state)
-            state = self.client.set_task_run_state(
-                task_run_id=task_run_id,
-                version=version,
-                state=cloud_state,
-                cache_for=self.task.cache_for,
-            )
+            if batch:
+                future = get_task_run_state_batcher().submit(
+                    client=self.client,
+                    task_run_id=task_run_id,
+                    version=version,
+                    state=cloud_state,
+                )
+                if new_state.is_running() or pending_updates is None:
+                    state = future.result()
+                else:
+                    pending_updates.append(future)
+                    state = cloud_state
+            else:
+                state = self.client.set_task_run_state(
+                    task_run_id=task_run_id,
+                    version=version,
+                    state=cloud_state,
+                    cache_for=self.task.cache_for,
+                )
         except Exception as exc:
             self.logger.exception(
                 "Failed to set task state with error: {}".format(repr(exc))
@@ -151,9 +190,9 @@ class CloudTaskRunner(TaskRunner):
         """
 
         # if the map_index is not None, this is a dynamic task and we need to load
-        # task run info for it
+        # task run info for it (unless its parent already loaded it)
         map_index = context.get("map_index")
-        if map_index not in [-1, None]:
+        if map_index not in [-1, None] and not context.get("_task_run_created"):
             try:
                 task_run_info = self.client.get_task_run_info(
                     flow_run_id=context.get("flow_run_id", ""),
@@ -184,11 +223,83 @@ class CloudTaskRunner(TaskRunner):
 
         return super().initialize_run(state=state, context=context)
 
+    def prepare_mapped_children(
+        self, initial_states: List[Optional[State]], map_indices: Iterable[int]
+    ) -> Tuple[List[Optional[State]], List[Dict[str, Any]]]:
+        """
+        Creates (or retrieves) the task runs of a group of mapped children with batched
+        requests of `cloud.task_runs.create_batch_size` task runs each, so that every child
+        starts with its task run id, version and state. If this fails, or the batch size
+        is 0, each child retrieves its own task run instead.
+
+        Args:
+            - initial_states (List[Optional[State]]): the initial state of each child, if
+                known
+            - map_indices (Iterable[int]): the map index of each child
+
+        Returns:
+            - Tuple[List[Optional[State]], List[dict]]: the initial state of each child, and
+                a dictionary of context to run each child with
+        """
+        batch_size = prefect.context.config.cloud.task_runs.get("create_batch_size", 0)
+        if not batch_size:
+            return super().prepare_mapped_children(
+                initial_states=initial_states, map_indices=map_indices
+            )
+
+        map_indices = list(map_indices)
+        task_run_infos = []  # type: List[Any]
+        try:
+            for i in range(0, len(map_indices), batch_size):
+                task_run_infos.extend(
+                    self.client.get_task_run_infos(
+                        flow_run_id=prefect.context.get("flow_run_id", ""),
+                        task_id=prefect.context.get("task_id", ""),
+                        map_indices=map_indices[i : i + batch_size],
+                    )
+                )
+            if len(task_run_infos) != len(map_indices):
+                raise ValueError(
+                    "Expected {} task runs, got {}.".format(
+                        len(map_indices), len(task_run_infos)
+                    )
+                )
+        except Exception as exc:
+            self.logger.exception(
+                "Failed to create mapped task runs with error: {}".format(repr(exc))
+            )
+            return super().prepare_mapped_children(
+                initial_states=initial_states, map_indices=map_indices
+            )
+
+        # if state was provided, keep it; otherwise use the one from db
+        states = [
+            state or task_run_info.state
+            for state, task_run_info in zip(initial_states, task_run_infos)
+        ]
+        child_contexts = [
+            dict(
+                task_run_id=task_run_info.id,
+                task_run_version=task_run_info.version,
+                _task_run_created=True,
+            )
+            for task_run_info in task_run_infos
+        ]
+        return states, child_contexts
+
     @call_state_handlers
     def check_task_is_cached(self, state: State, inputs: Dict[str, Result]) -> State:
         """
         Checks if task is cached in the DB and whether any of the caches are still valid.
 
+        If `engine.task_runner.fingerprint_cached_states` is set, candidates whose
+        fingerprint matches this task run's are checked first, and Cached states used
+        recently in this process are reused without querying for them. Every candidate is
+        still checked by the task's cache validator: value-based validators (such as
+        `all_inputs`) read the candidate's cached inputs through their result handlers,
+        while hash-based validators (such as `all_input_hashes`) only compare hashes, so
+        cached inputs are never read.
+
         Args:
             - state (State): the current state of this task
             - inputs (Dict[str, Result]): a dictionary of inputs whose keys correspond
@@ -201,6 +312,37 @@ class CloudTaskRunner(TaskRunner):
             - ENDRUN: if the task is not ready to run
         """
         if self.task.cache_for is not None:
+            fingerprint = None
+            if prefect.context.config.engine.task_runner.get(
+                "fingerprint_cached_states", False
+            ):
+                fingerprint = hashing.fingerprint(
+                    {key: res.value_hash for key, res in inputs.items()},
+                    hashing.hash_values(prefect.context.get("parameters") or {}),
+                )
+            index_key = (
+                self.client.api_server,
+                self.task.cache_key or prefect.context.get("task_id", ""),
+                fingerprint,
+            )
+
+            # task runs with the same inputs and parameters as a recent task run in this
+            # process use the same cache, without querying for candidates
+            if fingerprint is not None:
+                recent_state = get_cached_state(index_key)  # type: ignore
+                if recent_state is not None and self._validate_cached_state(
+                    recent_state, inputs, fingerprint
+                ):
+                    self.logger.debug(
+                        "Task '{name}': using a recently used Cached state".format(
+                            name=prefect.context.get("task_full_name", self.task.name)
+                        )
+                    )
+                    recent_state._result = recent_state._result.to_result(
+                        self.task.result_handler
+                    )
+                    return recent_state
+
             oldest_valid_cache = datetime.datetime.utcnow() - self.task.cache_for
             cached_states = self.client.get_latest_cached_states(
                 task_id=prefect.context.get("task_id", ""),
@@ -222,16 +364,23 @@ class CloudTaskRunner(TaskRunner):
                     )
                 )
 
+            # candidates computed from the same inputs and parameters are checked first,
+            # as they are the most likely to be valid
+            cached_states = sorted(
+                cached_states,
+                key=lambda candidate: fingerprint is None
+                or getattr(candidate, "cached_fingerprint", None) != fingerprint,
+            )
+
             for candidate_state in cached_states:
                 assert isinstance(candidate_state, Cached)  # mypy assert
-                candidate_state.cached_inputs = {
-                    key: res.to_result(inputs[key].result_handler)  # type: ignore
-                    for key, res in (candidate_state.cached_inputs or {}).items()
-                }
-                sanitized_inputs = {key: res.value for key, res in inputs.items()}
-                if self.task.cache_validator(
-                    candidate_state, sanitized_inputs, prefect.context.get("parameters")
-                ):
+                unread_state = copy.copy(candidate_state)
+                if self._validate_cached_state(candidate_state, inputs, fingerprint):
+                    if (
+                        fingerprint is not None
+                        and candidate_state.cached_fingerprint == fingerprint
+                    ):
+                        put_cached_state(index_key, unread_state)  # type: ignore
                     candidate_state._result = candidate_state._result.to_result(
                         self.task.result_handler
                     )
@@ -246,6 +395,19 @@ class CloudTaskRunner(TaskRunner):
 
         return state
 
+    def _validate_cached_state(
+        self,
+        candidate_state: Cached,
+        inputs: Dict[str, Result],
+        fingerprint: Optional[str],
+    ) -> bool:
+        if not getattr(self.task.cache_validator, "validates_hashes", False):
+            candidate_state.cached_inputs = {
+                key: res.to_result(inputs[key].result_handler)  # type: ignore
+                for key, res in (candidate_state.cached_inputs or {}).items()
+            }
+        return self.validate_cache(candidate_state, inputs)
+
     @tail_recursive
     def run(
         self,
@@ -274,33 +436,71 @@ class CloudTaskRunner(TaskRunner):
             - `State` object representing the final post-run state of the Task
         """
         context = context or {}
-        end_state = super().run(
-            state=state,
-            upstream_states=upstream_states,
-            context=context,
-            executor=executor,
-        )
-        while (end_state.is_retrying() or end_state.is_queued()) and (
-            end_state.start_time <= pendulum.now("utc").add(minutes=1)  # type: ignore
-        ):
-            assert isinstance(end_state, (Retrying, Queued))
-            naptime = max(
-                (end_state.start_time - pendulum.now("utc")).total_seconds(), 0
-            )
-            time.sleep(naptime)
-
-            # currently required as context has reset to its original state
-            task_run_info = self.client.get_task_run_info(
-                flow_run_id=context.get("flow_run_id", ""),
-                task_id=context.get("task_id", ""),
-                map_index=context.get("map_index"),
-            )
-            context.update(task_run_version=task_run_info.version)  # type: ignore
 
+        # state updates which were batched without being waited on
+        pending_updates = []  # type: List[Future]
+        pending_stack = _get_pending_state_updates()
+        pending_stack.append(pending_updates)
+        try:
             end_state = super().run(
-                state=end_state,
+                state=state,
                 upstream_states=upstream_states,
                 context=context,
                 executor=executor,
             )
+            end_state = self.wait_for_state_updates(pending_updates, state=end_state)
+            while (end_state.is_retrying() or end_state.is_queued()) and (
+                end_state.start_time <= pendulum.now("utc").add(minutes=1)  # type: ignore
+            ):
+                assert isinstance(end_state, (Retrying, Queued))
+                naptime = max(
+                    (end_state.start_time - pendulum.now("utc")).total_seconds(), 0
+                )
+                time.sleep(naptime)
+
+                # currently required as context has reset to its original state
+                task_run_info = self.client.get_task_run_info(
+                    flow_run_id=context.get("flow_run_id", ""),
+                    task_id=context.get("task_id", ""),
+                    map_index=context.get("map_index"),
+                )
+                context.update(task_run_version=task_run_info.version)  # type: ignore
+
+                end_state = super().run(
+                    state=end_state,
+                    upstream_states=upstream_states,
+                    context=context,
+                    executor=executor,
+                )
+                end_state = self.wait_for_state_updates(
+                    pending_updates, state=end_state
+                )
+        finally:
+            pending_stack.pop()
         return end_state
+
+    def wait_for_state_updates(
+        self, pending_updates: List[Future], state: State
+    ) -> State:
+        """
+        Waits for any batched state updates which haven't been waited on yet.
+
+        Args:
+            - pending_updates (List[Future]): futures returned by the state batcher; the
+                list is emptied once they have completed
+            - state (State): the current state of the task run
+
+        Returns:
+            - State: `state`, or a `ClientFailed` state if any update failed
+        """
+        try:
+            for future in pending_updates:
+                future.result()
+        except Exception as exc:
+            self.logger.exception(
+                "Failed to set task state with error: {}".format(repr(exc))
+            )
+            state = ClientFailed(state=state)
+        finally:
+            del pending_updates[:]
+        return state
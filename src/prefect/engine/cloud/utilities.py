@@ -1,4 +1,26 @@
-from prefect.engine.state import State, Failed
+import collections
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from prefect.client import Client
+from prefect.engine.state import Cached, State, Failed
+from prefect.utilities.graphql import with_args
+from prefect.utilities.process_state import register_reset
+
+# the most recently used flow run settings, keyed by API server and flow run id
+_FLOW_RUN_SETTINGS = (
+    collections.OrderedDict()
+)  # type: collections.OrderedDict[Tuple[str, str], Dict[str, Any]]
+_FLOW_RUN_SETTINGS_LOCK = threading.Lock()
+_FLOW_RUN_SETTINGS_MAXSIZE = 100
+
+# the most recently used Cached states, serialized and keyed by API server, cache key and
+# fingerprint
+_CACHED_STATES = (
+    collections.OrderedDict()
+)  # type: collections.OrderedDict[Tuple[str, str, str], dict]
+_CACHED_STATES_LOCK = threading.Lock()
+_CACHED_STATES_MAXSIZE = 1000
 
 
 def prepare_state_for_cloud(state: State) -> State:
@@ -21,3 +43,90 @@ def prepare_state_for_cloud(state: State) -> State:
                 res.store_safe_value()
 
     return state
+
+
+def get_flow_run_settings(client: Client, flow_run_id: str) -> Dict[str, Any]:
+    """
+    Retrieves the settings of the flow that a flow run belongs to. Settings are cached
+    per flow run, so that the task runs of a flow run don't each query for them.
+
+    Args:
+        - client (Client): the client to query Prefect Cloud with
+        - flow_run_id (str): the id of the flow run
+
+    Returns:
+        - dict: the flow's settings
+
+    Raises:
+        - ClientError: if the query fails; failed queries are not cached
+    """
+    key = (client.api_server, flow_run_id)
+    with _FLOW_RUN_SETTINGS_LOCK:
+        if key in _FLOW_RUN_SETTINGS:
+            _FLOW_RUN_SETTINGS.move_to_end(key)
+            return _FLOW_RUN_SETTINGS[key]
+
+    query = {
+        "query": {
+            with_args("flow_run_by_pk", {"id": flow_run_id}): {
+                "flow": {"settings": True},
+            }
+        }
+    }
+    settings = client.graphql(query).data.flow_run_by_pk.flow.settings
+
+    with _FLOW_RUN_SETTINGS_LOCK:
+        _FLOW_RUN_SETTINGS[key] = settings
+        while len(_FLOW_RUN_SETTINGS) > _FLOW_RUN_SETTINGS_MAXSIZE:
+            _FLOW_RUN_SETTINGS.popitem(last=False)
+    return settings
+
+
+def get_cached_state(key: Tuple[str, str, str]) -> Optional[Cached]:
+    """
+    Retrieves a Cached state which was recently used by a task run in this process, so
+    that task runs with the same inputs and parameters don't query for it again.
+
+    Args:
+        - key (Tuple[str, str, str]): the API server, the cache key (or task id) of the
+            task, and the fingerprint of the task run's inputs and parameters
+
+    Returns:
+        - Optional[Cached]: a new copy of the state, if one was stored under the key
+    """
+    with _CACHED_STATES_LOCK:
+        if key not in _CACHED_STATES:
+            return None
+        _CACHED_STATES.move_to_end(key)
+        serialized = _CACHED_STATES[key]
+    return State.deserialize(serialized)  # type: ignore
+
+
+def put_cached_state(key: Tuple[str, str, str], state: Cached) -> None:
+    """
+    Stores a Cached state used by a task run for `get_cached_state`, evicting the least
+    recently used states beyond the first 1000.
+
+    Args:
+        - key (Tuple[str, str, str]): the API server, the cache key (or task id) of the
+            task, and the fingerprint of the task run's inputs and parameters
+        - state (Cached): the state, with its result and cached inputs in their
+            serialized form
+    """
+    serialized = state.serialize()
+    with _CACHED_STATES_LOCK:
+        _CACHED_STATES[key] = serialized
+        _CACHED_STATES.move_to_end(key)
+        while len(_CACHED_STATES) > _CACHED_STATES_MAXSIZE:
+            _CACHED_STATES.popitem(last=False)
+
+
+@register_reset
+def reset_caches() -> None:
+    """
+    Clears the flow run settings and Cached states kept by this process.
+    """
+    with _FLOW_RUN_SETTINGS_LOCK:
+        _FLOW_RUN_SETTINGS.clear()
+    with _CACHED_STATES_LOCK:
+        _CACHED_STATES.clear()
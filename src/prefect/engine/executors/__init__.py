@@ -11,6 +11,11 @@ for an Executor consists of the following methods:
 - `map(fn, *args, upstream_states, **kwargs)`: submit function to be mapped
     over based on the edge information contained in `upstream_states`.  Any "mapped" Edge
     will be converted into multiple function submissions, one for each value of the upstream mapped tasks.
+- `add_done_callback(future, fn)`: call `fn` once `future` has completed; used by the
+    `FlowRunner` when `engine.flow_runner.scheduling` is set to `"ready_queue"` to submit
+    tasks only after their upstream tasks have finished
+- `scatter(obj)`: ship `obj` to wherever work is executed once, returning an object
+    that can be passed to many `submit` / `map` calls in its place
 
 Currently, the available executor options are:
 
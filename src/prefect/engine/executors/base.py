@@ -58,6 +58,36 @@ class Executor:
         """
         raise NotImplementedError()
 
+    def add_done_callback(self, future: Any, fn: Callable[[Any], None]) -> None:
+        """
+        Registers a callback to be called once the provided future has completed.
+
+        The callback receives a single argument: an object which can stand in for `future`
+        in later calls to `submit()` without triggering any recomputation. By default, the
+        future is resolved with `wait()` and the callback is called immediately with the
+        resolved value; executors with real asynchronous futures should override this
+        method to call `fn` from a completion hook instead.
+
+        Args:
+            - future (Any): a future-like object returned by `submit()`
+            - fn (Callable): a function accepting the completed future (or its value)
+        """
+        fn(self.wait(future))
+
+    def scatter(self, obj: Any) -> Any:
+        """
+        Sends `obj` to the executor's workers once, returning an object which can be passed
+        to any number of `submit()` or `map()` calls in place of `obj` without reshipping
+        it with each submission. By default, `obj` is returned unchanged.
+
+        Args:
+            - obj (Any): the object to scatter
+
+        Returns:
+            - Any: an object that can stand in for `obj` when submitting work
+        """
+        return obj
+
     def wait(self, futures: Any) -> Any:
         """
         Resolves futures to their values. Blocks until the future is complete.
@@ -171,6 +171,37 @@ class DaskExecutor(Executor):
         fire_and_forget(futures)
         return futures
 
+    def add_done_callback(self, future: Future, fn: Callable[[Any], None]) -> None:
+        """
+        Registers a callback to be called with `future` once it has completed. The
+        callback runs in a separate thread and receives the future itself, so that its
+        result can be passed on to other computations without being gathered locally.
+
+        Args:
+            - future (Future): a Future returned by `submit()`
+            - fn (Callable): a function accepting the completed Future
+        """
+        future.add_done_callback(fn)
+
+    def scatter(self, obj: Any) -> Future:
+        """
+        Sends `obj` to the cluster's workers a single time and returns a Future referencing
+        it; Dask resolves the Future wherever it is passed as (part of) an argument.
+
+        Args:
+            - obj (Any): the object to scatter
+
+        Returns:
+            - Future: a Future which resolves to `obj`
+        """
+        if self.is_started and hasattr(self, "client"):
+            return self.client.scatter([obj], hash=False)[0]
+        elif self.is_started:
+            with worker_client(separate_thread=True) as client:
+                return client.scatter([obj], hash=False)[0]
+        else:
+            raise ValueError("This executor has not been started.")
+
     def wait(self, futures: Any) -> Any:
         """
         Resolves the Future objects to their values. Blocks until the computation is complete.
@@ -1,3 +1,6 @@
+import collections
+import functools
+import queue
 from typing import (
     Any,
     Callable,
@@ -15,7 +18,7 @@ import pendulum
 
 import prefect
 from prefect.core import Edge, Flow, Task
-from prefect.engine import signals
+from prefect.engine import checkpointing, signals
 from prefect.engine.result import Result
 from prefect.engine.result_handlers import ConstantResultHandler
 from prefect.engine.runner import ENDRUN, Runner, call_state_handlers
@@ -395,56 +398,34 @@ class FlowRunner(Runner):
         if set(return_tasks).difference(self.flow.tasks):
             raise ValueError("Some tasks in return_tasks were not found in the flow.")
 
-        # -- process each task in order
+        scheduling = prefect.config.engine.flow_runner.get("scheduling", "eager")
+        if scheduling not in ("eager", "ready_queue"):
+            raise ValueError(
+                'Unknown scheduling mode "{}"; expected "eager" or "ready_queue".'.format(
+                    scheduling
+                )
+            )
 
         with executor.start():
 
-            for task in self.flow.sorted_tasks():
-
-                task_state = task_states.get(task)
-                if task_state is None and isinstance(
-                    task, prefect.tasks.core.constants.Constant
-                ):
-                    task_states[task] = task_state = Success(result=task.value)
-
-                # if the state is finished, don't run the task, just use the provided state
-                if (
-                    isinstance(task_state, State)
-                    and task_state.is_finished()
-                    and not task_state.is_cached()
-                    and not task_state.is_mapped()
-                ):
-                    continue
-
-                upstream_states = {}  # type: Dict[Edge, Union[State, Iterable]]
-
-                # -- process each edge to the task
-                for edge in self.flow.edges_to(task):
-                    upstream_states[edge] = task_states.get(
-                        edge.upstream_task, Pending(message="Task state not available.")
-                    )
-
-                # augment edges with upstream constants
-                for key, val in self.flow.constants[task].items():
-                    edge = Edge(
-                        upstream_task=prefect.tasks.core.constants.Constant(val),
-                        downstream_task=task,
-                        key=key,
-                    )
-                    upstream_states[edge] = Success(
-                        "Auto-generated constant value",
-                        result=Result(val, result_handler=ConstantResultHandler(val)),
-                    )
-
-                # -- run the task
+            if scheduling == "ready_queue":
+                self.submit_ready_tasks(
+                    task_states=task_states,
+                    task_contexts=task_contexts,
+                    task_runner_state_handlers=task_runner_state_handlers,
+                    executor=executor,
+                    max_in_flight=prefect.config.engine.flow_runner.get(
+                        "max_in_flight", 0
+                    ),
+                )
 
-                with prefect.context(task_full_name=task.name, task_tags=task.tags):
-                    task_states[task] = executor.submit(
-                        self.run_task,
+            # -- process each task in order
+            else:
+                for task in self.flow.sorted_tasks():
+                    self.submit_task(
                         task=task,
-                        state=task_state,
-                        upstream_states=upstream_states,
-                        context=dict(prefect.context, **task_contexts.get(task, {})),
+                        task_states=task_states,
+                        task_contexts=task_contexts,
                         task_runner_state_handlers=task_runner_state_handlers,
                         executor=executor,
                     )
@@ -479,6 +460,13 @@ class FlowRunner(Runner):
 
             assert isinstance(final_states, dict)
 
+            # wait for any results still being checkpointed in the background, and
+            # fail the tasks whose results couldn't be
+            if prefect.context.config.engine.checkpointing.get("background", False):
+                final_states, all_final_states = self.check_checkpoints(
+                    final_states, all_final_states
+                )
+
         key_states = set(flatten_seq([all_final_states[t] for t in reference_tasks]))
         terminal_states = set(
             flatten_seq([all_final_states[t] for t in terminal_tasks])
@@ -494,6 +482,185 @@ class FlowRunner(Runner):
 
         return state
 
+    def check_checkpoints(
+        self,
+        final_states: Dict[Task, State],
+        all_final_states: Dict[Task, Union[State, List[State]]],
+    ) -> Tuple[Dict[Task, State], Dict[Task, Union[State, List[State]]]]:
+        """
+        Waits for every result being checkpointed in the background in this process,
+        and replaces the states of tasks whose results couldn't be written with `Failed`
+        states.
+
+        Args:
+            - final_states (Dict[Task, State]): the final states of tasks
+            - all_final_states (Dict[Task, Union[State, List[State]]]): the final states
+                of tasks, with the states of the children of mapped tasks in place of
+                the mapped states
+
+        Returns:
+            - Tuple[dict, dict]: the updated `final_states` and `all_final_states`
+        """
+        checkpointing.get_checkpoint_pool().flush()
+        final_states = {
+            t: checkpointing.check_checkpoint(s) for t, s in final_states.items()
+        }
+        for t, s in list(all_final_states.items()):
+            if isinstance(s, list):
+                checked = [checkpointing.check_checkpoint(ms) for ms in s]
+                final_states[t].map_states = checked  # type: ignore
+                final_states[t].result = [ms.result for ms in checked]
+                all_final_states[t] = checked
+            else:
+                all_final_states[t] = final_states[t]
+        return final_states, all_final_states
+
+    def submit_task(
+        self,
+        task: Task,
+        task_states: Dict[Task, State],
+        task_contexts: Dict[Task, Dict[str, Any]],
+        task_runner_state_handlers: Iterable[Callable],
+        executor: "prefect.engine.executors.base.Executor",
+    ) -> bool:
+        """
+        Submits a single task to the executor, passing it the current states (or futures)
+        of its upstream tasks. The resulting future is stored in `task_states`.
+
+        Args:
+            - task (Task): the task to submit
+            - task_states (dict): dictionary of task states (or futures), with keys being
+                Tasks and values their corresponding state; updated in place
+            - task_contexts (Dict[Task, Dict[str, Any]]): contexts that will be provided to each task
+            - task_runner_state_handlers (Iterable[Callable]): A list of state change
+                handlers that will be provided to the task_runner, and called whenever a task changes
+                state.
+            - executor (Executor): executor to use when performing computation
+
+        Returns:
+            - bool: `True` if the task was submitted, or `False` if it already had a
+                finished state and was skipped
+        """
+        task_state = task_states.get(task)
+        if task_state is None and isinstance(
+            task, prefect.tasks.core.constants.Constant
+        ):
+            task_states[task] = task_state = Success(result=task.value)
+
+        # if the state is finished, don't run the task, just use the provided state
+        if (
+            isinstance(task_state, State)
+            and task_state.is_finished()
+            and not task_state.is_cached()
+            and not task_state.is_mapped()
+        ):
+            return False
+
+        upstream_states = {}  # type: Dict[Edge, Union[State, Iterable]]
+
+        # -- process each edge to the task
+        for edge in self.flow.edges_to(task):
+            upstream_states[edge] = task_states.get(
+                edge.upstream_task, Pending(message="Task state not available.")
+            )
+
+        # augment edges with upstream constants
+        for key, val in self.flow.constants[task].items():
+            edge = Edge(
+                upstream_task=prefect.tasks.core.constants.Constant(val),
+                downstream_task=task,
+                key=key,
+            )
+            upstream_states[edge] = Success(
+                "Auto-generated constant value",
+                result=Result(val, result_handler=ConstantResultHandler(val)),
+            )
+
+        # -- run the task
+
+        with prefect.context(task_full_name=task.name, task_tags=task.tags):
+            task_states[task] = executor.submit(
+                self.run_task,
+                task=task,
+                state=task_state,
+                upstream_states=upstream_states,
+                context=dict(prefect.context, **task_contexts.get(task, {})),
+                task_runner_state_handlers=task_runner_state_handlers,
+                executor=executor,
+            )
+        return True
+
+    def submit_ready_tasks(
+        self,
+        task_states: Dict[Task, State],
+        task_contexts: Dict[Task, Dict[str, Any]],
+        task_runner_state_handlers: Iterable[Callable],
+        executor: "prefect.engine.executors.base.Executor",
+        max_in_flight: int = 0,
+    ) -> None:
+        """
+        Submits the flow's tasks to the executor as they become ready to run, rather than
+        all at once. Each task tracks the number of its upstream edges which have not yet
+        completed; a task is submitted only once that count reaches zero, and executor
+        completion callbacks are used to learn when submitted tasks have finished.
+
+        This bounds the amount of work the executor has to track at any one time, at the
+        cost of a round-trip to the flow runner between each task and its downstream tasks.
+
+        Args:
+            - task_states (dict): dictionary of task states (or futures), with keys being
+                Tasks and values their corresponding state; updated in place
+            - task_contexts (Dict[Task, Dict[str, Any]]): contexts that will be provided to each task
+            - task_runner_state_handlers (Iterable[Callable]): A list of state change
+                handlers that will be provided to the task_runner, and called whenever a task changes
+                state.
+            - executor (Executor): executor to use when performing computation
+            - max_in_flight (int, optional): the maximum number of tasks that may be
+                submitted but not yet completed at any one time; `0` means no limit
+        """
+        tasks = self.flow.sorted_tasks()
+        pending_edges = {t: len(self.flow.edges_to(t)) for t in tasks}
+        ready = collections.deque(t for t in tasks if not pending_edges[t])
+        completed = queue.Queue()  # type: queue.Queue
+        remaining = len(tasks)
+        in_flight = 0
+
+        def on_done(task: Task, future: Any) -> None:
+            completed.put((task, future))
+
+        def release(task: Task) -> None:
+            for edge in self.flow.edges_from(task):
+                pending_edges[edge.downstream_task] -= 1
+                if not pending_edges[edge.downstream_task]:
+                    ready.append(edge.downstream_task)
+
+        while remaining:
+            while ready and (not max_in_flight or in_flight < max_in_flight):
+                task = ready.popleft()
+                if self.submit_task(
+                    task=task,
+                    task_states=task_states,
+                    task_contexts=task_contexts,
+                    task_runner_state_handlers=task_runner_state_handlers,
+                    executor=executor,
+                ):
+                    in_flight += 1
+                    executor.add_done_callback(
+                        task_states[task], functools.partial(on_done, task)
+                    )
+                else:
+                    # tasks with finished states are not run, so they release their
+                    # downstream tasks immediately
+                    remaining -= 1
+                    release(task)
+
+            if remaining:
+                task, future = completed.get()
+                task_states[task] = future
+                in_flight -= 1
+                remaining -= 1
+                release(task)
+
     def determine_final_state(
         self,
         state: State,
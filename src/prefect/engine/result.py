@@ -17,9 +17,10 @@ also provides a `NoResult` object representing the _absence_ of computation / da
 whose value is `None`.
 """
 
-from typing import Any, Union
+from typing import Any, Dict, Optional, Union
 
 from prefect.engine.result_handlers import ResultHandler
+from prefect.utilities import hashing
 
 
 class ResultInterface:
@@ -42,6 +43,19 @@ class ResultInterface:
         val = self.value  # type: ignore
         return "<{type}: {val}>".format(type=type(self).__name__, val=repr(val))
 
+    @property
+    def value_hash(self) -> Optional[str]:
+        """
+        A stable hash of the value of this result (see
+        `prefect.utilities.hashing.stable_hash`), which is computed the first time it's
+        needed and then kept with the result, or `None` if the value can't be hashed.
+        """
+        if "_value_hash" not in self.__dict__:
+            self._value_hash = hashing.hash_values(
+                {"value": self.value}  # type: ignore
+            )["value"]
+        return self._value_hash
+
     def to_result(self, result_handler: ResultHandler = None) -> "ResultInterface":
         """
         If no result handler provided, returns self.  If a ResultHandler is provided, however,
@@ -78,11 +92,34 @@ class Result(ResultInterface):
         self.value = value
         self.safe_value = NoResult  # type: SafeResult
         self.result_handler = result_handler  # type: ignore
+        # the write of the value in the background, if any (see
+        # `prefect.engine.checkpointing`), or the error it raised once pickled
+        self._checkpoint = None  # type: Any
+
+    def __getstate__(self) -> dict:
+        # results are pickled once their value has been written
+        error = self._wait_for_checkpoint()
+        state = self.__dict__.copy()
+        state["_checkpoint"] = error
+        return state
 
     def store_safe_value(self) -> None:
         """
-        Populate the `safe_value` attribute with a `SafeResult` using the result handler
+        Populate the `safe_value` attribute with a `SafeResult` using the result handler.
+        If the value is being written in the background, waits for it to be written
+        instead.
+
+        Raises:
+            - Exception: any error raised while writing the value in the background
         """
+        if getattr(self, "_checkpoint", None) is not None:
+            error = self._wait_for_checkpoint()
+            if error is not None:
+                raise error
+            return
+        self._store_safe_value()
+
+    def _store_safe_value(self) -> None:
         # don't bother with `None` values
         if self.value is None:
             return
@@ -90,11 +127,21 @@ class Result(ResultInterface):
             assert isinstance(
                 self.result_handler, ResultHandler
             ), "Result has no ResultHandler"  # mypy assert
-            value = self.result_handler.write(self.value)
+            value, metadata = self.result_handler.write_with_metadata(self.value)
             self.safe_value = SafeResult(
-                value=value, result_handler=self.result_handler
+                value=value, result_handler=self.result_handler, metadata=metadata
             )
 
+    def _wait_for_checkpoint(self) -> Optional[BaseException]:
+        """
+        Waits for the value of this result to be written, if it's being written in the
+        background, and returns the error raised while writing it (if any).
+        """
+        checkpoint = getattr(self, "_checkpoint", None)
+        if checkpoint is None or isinstance(checkpoint, BaseException):
+            return checkpoint
+        return checkpoint.exception()
+
 
 class SafeResult(ResultInterface):
     """
@@ -104,11 +151,16 @@ class SafeResult(ResultInterface):
     Args:
         - value (Any): the safe represenation of a value
         - result_handler (ResultHandler): the result handler to use when reading this result's value
+        - metadata (dict, optional): metadata recorded by the result handler when writing
+            the value, such as the serializer it used
     """
 
-    def __init__(self, value: Any, result_handler: ResultHandler):
+    def __init__(
+        self, value: Any, result_handler: ResultHandler, metadata: Dict[str, Any] = None
+    ):
         self.value = value
         self.result_handler = result_handler
+        self.metadata = metadata or {}
 
     @property
     def safe_value(self) -> "SafeResult":
@@ -38,6 +38,7 @@ from prefect.engine.result_handlers.constant_result_handler import ConstantResul
 from prefect.engine.result_handlers.json_result_handler import JSONResultHandler
 from prefect.engine.result_handlers.local_result_handler import LocalResultHandler
 from prefect.engine.result_handlers.secret_result_handler import SecretResultHandler
+from prefect.engine.result_handlers.cached_result_handler import CachedResultHandler
 
 try:
     from prefect.engine.result_handlers.gcs_result_handler import GCSResultHandler
@@ -2,12 +2,13 @@ import base64
 import json
 import os
 import uuid
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
 
 import cloudpickle
 import pendulum
 
 from prefect.client import Secret
+from prefect.engine import serializers
 from prefect.engine.result_handlers import ResultHandler
 
 if TYPE_CHECKING:
@@ -33,6 +34,21 @@ class AzureResultHandler(ResultHandler):
             which stores your Azure credentials; this Secret must be a JSON payload
             with two keys: `ACCOUNT_NAME` and either `ACCOUNT_KEY` or `SAS_TOKEN`
             (if both are defined then`ACCOUNT_KEY` is used)
+        - serializer (str, optional): the name of the serializer to write results with;
+            `"auto"` chooses one for each result (see `prefect.engine.serializers`). If
+            neither a serializer nor a compressor is chosen, results are written as
+            base64-encoded pickles, as they were by earlier versions of Prefect
+        - compression (str, optional): the name of the compressor to compress results
+            with, if any
+        - content_addressed (bool, optional): if `True`, results are stored under keys
+            derived from the hash of their serialized bytes (see
+            `prefect.engine.serializers.content_hash`) and aren't uploaded again if a
+            result with the same key already exists, so that identical results, such as
+            those of retried tasks, reruns or mapped children, are only stored once.
+            Defaults to `False`, in which case every result is uploaded to a new key
+
+    Results written by earlier versions of Prefect (as base64-encoded pickles) can
+    still be read.
     """
 
     def __init__(
@@ -40,12 +56,19 @@ class AzureResultHandler(ResultHandler):
         container: str,
         connection_string: str = None,
         azure_credentials_secret: str = "AZ_CREDENTIALS",
+        serializer: str = None,
+        compression: str = None,
+        content_addressed: bool = False,
     ) -> None:
+        serializers.validate(serializer, compression)
+        self.serializer = serializer
+        self.compression = compression
         self.container = container
         self.connection_string = connection_string or os.getenv(
             "AZURE_STORAGE_CONNECTION_STRING"
         )
         self.azure_credentials_secret = azure_credentials_secret
+        self.content_addressed = content_addressed
         super().__init__()
 
     def initialize_service(self) -> None:
@@ -88,6 +111,54 @@ class AzureResultHandler(ResultHandler):
     def __setstate__(self, state: dict) -> None:
         self.__dict__.update(state)
 
+    def fingerprint(self, uri: str) -> Optional[str]:
+        """
+        Identifies the content of a result by its URI, if the result is
+        content-addressed, and otherwise by its ETag.
+
+        Args:
+            - uri (str): the Azure Blob URI
+
+        Returns:
+            - str: the fingerprint of the result, or `None` if it can't be found
+        """
+        if self.content_addressed and uri.startswith("sha256/"):
+            return uri
+        try:
+            blob = self.service.get_blob_properties(
+                container_name=self.container, blob_name=uri
+            )
+        except Exception as exc:
+            self.logger.debug("Unable to find result at {}: {}".format(uri, repr(exc)))
+            return None
+        return blob.properties.etag
+
+    def read_serialized(self, uri: str) -> Optional[bytes]:
+        """
+        Downloads the bytes of a result as they are stored, if it was written in the
+        format of `prefect.engine.serializers`.
+
+        Args:
+            - uri (str): the Azure Blob URI
+
+        Returns:
+            - bytes: the stored bytes of the result, or `None` if it was written by an
+                earlier version of Prefect
+        """
+        data = self.service.get_blob_to_bytes(
+            container_name=self.container, blob_name=uri
+        ).content
+        return data if serializers.is_serialized(data) else None
+
+    def _exists(self, uri: str) -> bool:
+        try:
+            return self.service.exists(container_name=self.container, blob_name=uri)
+        except Exception as exc:
+            # results are uploaded whenever they can't be found, including when the
+            # credentials in use aren't allowed to check
+            self.logger.debug("Unable to find result at {}: {}".format(uri, repr(exc)))
+            return False
+
     def write(self, result: Any) -> str:
         """
         Given a result, writes the result to a location in Azure Blob storage
@@ -99,21 +170,57 @@ class AzureResultHandler(ResultHandler):
         Returns:
             - str: the Blob URI
         """
-        date = pendulum.now("utc").format("Y/M/D")
-        uri = "{date}/{uuid}.prefect_result".format(date=date, uuid=uuid.uuid4())
-        self.logger.debug("Starting to upload result to {}...".format(uri))
+        return self.write_with_metadata(result)[0]
+
+    def write_with_metadata(self, result: Any) -> Tuple[str, Dict[str, Any]]:
+        """
+        Given a result, writes the result to a location in Azure Blob storage
+        and returns the resulting URI.
+
+        Args:
+            - result (Any): the written result
 
+        Returns:
+            - Tuple[str, dict]: the Blob URI, and the serializer and compressor the
+                result was written with
+        """
         ## prepare data
-        binary_data = base64.b64encode(cloudpickle.dumps(result)).decode()
+        frames, metadata = serializers.serialize_result(
+            result,
+            serializer=self.serializer,
+            compression=self.compression,
+            base64_encoded=True,
+        )
+
+        if self.content_addressed:
+            uri = "sha256/{}.prefect_result".format(serializers.content_hash(frames))
+            if self._exists(uri):
+                self.logger.debug("Result already exists at {}.".format(uri))
+                return uri, metadata
+        else:
+            date = pendulum.now("utc").format("Y/M/D")
+            uri = "{date}/{uuid}.prefect_result".format(date=date, uuid=uuid.uuid4())
+        self.logger.debug("Starting to upload result to {}...".format(uri))
 
         ## upload
-        self.service.create_blob_from_text(
-            container_name=self.container, blob_name=uri, text=binary_data
-        )
+        if metadata:
+            stream = serializers.FramesReader(frames)
+            self.service.create_blob_from_stream(
+                container_name=self.container,
+                blob_name=uri,
+                stream=stream,
+                count=stream.size,
+            )
+        else:
+            self.service.create_blob_from_text(
+                container_name=self.container,
+                blob_name=uri,
+                text=bytes(frames[0]).decode(),
+            )
 
         self.logger.debug("Finished uploading result to {}.".format(uri))
 
-        return uri
+        return uri, metadata
 
     def read(self, uri: str) -> Any:
         """
@@ -127,14 +234,19 @@ class AzureResultHandler(ResultHandler):
         """
         try:
             self.logger.debug("Starting to download result from {}...".format(uri))
-            blob_result = self.service.get_blob_to_text(
+            blob_result = self.service.get_blob_to_bytes(
                 container_name=self.container, blob_name=uri
             )
-            content_string = blob_result.content
-            try:
-                return_val = cloudpickle.loads(base64.b64decode(content_string))
-            except EOFError:
-                return_val = None
+            content = blob_result.content
+            if serializers.is_serialized(content):
+                # deserialize from a mutable copy, so that arrays read in place are
+                # writable
+                return_val = serializers.deserialize(bytearray(content))
+            else:
+                try:
+                    return_val = cloudpickle.loads(base64.b64decode(content))
+                except EOFError:
+                    return_val = None
             self.logger.debug("Finished downloading result from {}.".format(uri))
         except Exception as exc:
             self.logger.exception(
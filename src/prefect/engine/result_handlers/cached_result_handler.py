@@ -0,0 +1,348 @@
+"""
+Result Handlers provide the hooks that Prefect uses to store task results in production; a `ResultHandler` can be provided to a `Flow` at creation.
+
+Anytime a task needs its output or inputs stored, a result handler is used to determine where this data should be stored (and how it can be retrieved).
+"""
+import collections
+import hashlib
+import os
+import tempfile
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import prefect
+from prefect.engine import serializers
+from prefect.engine.result_handlers import ResultHandler
+from prefect.utilities.process_state import register_reset
+from prefect.utilities.serialization import to_qualified_name
+
+
+class ResultCache:
+    """
+    A two-level, least-recently-used cache of serialized results: payloads are kept in
+    memory up to `memory_size` bytes, and on disk (in `dir`) up to `disk_size` bytes.
+    Payloads evicted from memory remain on disk, and payloads read from disk are moved
+    back into memory.
+
+    Size limits are enforced per process; processes which share a cache directory also
+    share the payloads stored in it.
+
+    Args:
+        - memory_size (int): the maximum number of bytes to keep in memory
+        - disk_size (int): the maximum number of bytes to keep on disk; if 0, nothing
+            is stored on disk
+        - dir (str, optional): the directory to store payloads in; required if
+            `disk_size` is greater than 0
+    """
+
+    def __init__(self, memory_size: int, disk_size: int = 0, dir: str = None) -> None:
+        if disk_size and not dir:
+            raise ValueError("A directory is required to cache results on disk.")
+        self.memory_size = memory_size
+        self.disk_size = disk_size
+        self.dir = os.path.abspath(os.path.expanduser(dir)) if dir else None
+        self._lock = threading.Lock()
+        self._memory = collections.OrderedDict()  # type: Dict[str, bytes]
+        self._memory_bytes = 0
+        self._disk = None  # type: Optional[Dict[str, int]]
+        self._disk_bytes = 0
+        self._stats = collections.Counter()  # type: Dict[str, int]
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """
+        Counts of `memory_hits`, `disk_hits`, `misses` and `evictions` (from disk) since
+        the cache was created, along with the number of bytes currently cached in
+        `memory_bytes` and `disk_bytes`.
+        """
+        with self._lock:
+            stats = {
+                key: self._stats[key]
+                for key in ["memory_hits", "disk_hits", "misses", "evictions"]
+            }
+            stats.update(memory_bytes=self._memory_bytes, disk_bytes=self._disk_bytes)
+            return stats
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Retrieves a payload from the cache.
+
+        Args:
+            - key (str): the key the payload was stored under
+
+        Returns:
+            - bytes: the payload, or `None` if it isn't cached
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)  # type: ignore
+                self._stats["memory_hits"] += 1
+                return self._memory[key]
+
+            payload = self._read_from_disk(key)
+            if payload is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["disk_hits"] += 1
+            self._store_in_memory(key, payload)
+            return payload
+
+    def put(self, key: str, payload: bytes) -> None:
+        """
+        Stores a payload in the cache, evicting the least recently used payloads as
+        necessary.
+
+        Args:
+            - key (str): the key to store the payload under
+            - payload (bytes): the payload
+        """
+        with self._lock:
+            self._store_in_memory(key, payload)
+            self._store_on_disk(key, payload)
+
+    def _store_in_memory(self, key: str, payload: bytes) -> None:
+        if len(payload) > self.memory_size:
+            return
+        if key in self._memory:
+            self._memory_bytes -= len(self._memory.pop(key))
+        self._memory[key] = payload
+        self._memory_bytes += len(payload)
+        while self._memory_bytes > self.memory_size:
+            _, evicted = self._memory.popitem(last=False)  # type: ignore
+            self._memory_bytes -= len(evicted)
+
+    def _load_disk_index(self) -> Dict[str, int]:
+        # the index of payloads on disk is loaded on first use, ordered by when each
+        # payload was last used
+        if self._disk is None:
+            self._disk = collections.OrderedDict()
+            os.makedirs(self.dir, exist_ok=True)  # type: ignore
+            entries = []
+            for entry in os.scandir(self.dir):
+                if entry.is_file() and not entry.name.startswith("."):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, entry.name, stat.st_size))
+            for _, key, size in sorted(entries):
+                self._disk[key] = size
+                self._disk_bytes += size
+        return self._disk
+
+    def _read_from_disk(self, key: str) -> Optional[bytes]:
+        if not self.disk_size:
+            return None
+        index = self._load_disk_index()
+        path = os.path.join(self.dir, key)  # type: ignore
+        try:
+            with open(path, "rb") as f:
+                payload = f.read()
+            os.utime(path)
+        except OSError:
+            # payloads may be evicted by other processes sharing the directory
+            if key in index:
+                self._disk_bytes -= index.pop(key)
+            return None
+        if key in index:
+            self._disk_bytes -= index.pop(key)
+        index[key] = len(payload)
+        self._disk_bytes += len(payload)
+        return payload
+
+    def _store_on_disk(self, key: str, payload: bytes) -> None:
+        if len(payload) > self.disk_size:
+            return
+        index = self._load_disk_index()
+        if key in index:
+            index.move_to_end(key)  # type: ignore
+            return
+
+        # write to a temporary file first, so that other processes never read a
+        # partially written payload
+        fd, tmp_path = tempfile.mkstemp(dir=self.dir, prefix=".")
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, os.path.join(self.dir, key))  # type: ignore
+        index[key] = len(payload)
+        self._disk_bytes += len(payload)
+
+        while self._disk_bytes > self.disk_size:
+            evicted, size = index.popitem(last=False)  # type: ignore
+            self._disk_bytes -= size
+            self._stats["evictions"] += 1
+            try:
+                os.remove(os.path.join(self.dir, evicted))  # type: ignore
+            except OSError:
+                pass
+
+
+_result_cache = None  # type: Optional[ResultCache]
+_result_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    """
+    Returns the `ResultCache` shared by every `CachedResultHandler` in this process,
+    creating it on first use from the `engine.result_cache` configuration.
+
+    Returns:
+        - ResultCache: the result cache for this process
+    """
+    global _result_cache
+    with _result_cache_lock:
+        if _result_cache is None:
+            config = prefect.context.config.engine.result_cache
+            _result_cache = ResultCache(
+                memory_size=config.memory_size,
+                disk_size=config.disk_size,
+                dir=config.dir,
+            )
+        return _result_cache
+
+
+@register_reset
+def reset_result_cache() -> None:
+    """
+    Forgets the `ResultCache` shared by every `CachedResultHandler` in this process, so
+    that the next call to `get_result_cache` creates a new one from the current
+    configuration.
+    """
+    global _result_cache
+    with _result_cache_lock:
+        _result_cache = None
+
+
+class CachedResultHandler(ResultHandler):
+    """
+    Result Handler which caches the results read by another result handler, so that
+    reading the same result more than once on a worker (for example, when a task is
+    retried or a flow run is restarted) only downloads it from the wrapped handler once.
+
+    Results are cached by their location along with the wrapped handler's
+    `fingerprint` of it: a hash of the result for content-addressed locations, and
+    otherwise a version such as its ETag or modification time, so that a location which
+    is overwritten is read again. Checking the fingerprint of a location which isn't
+    content-addressed is a request of its own (such as an S3 `HEAD` request), and
+    results whose location has no fingerprint aren't cached at all.
+
+    Results are cached in the bytes they are stored as (see `prefect.engine.serializers`)
+    in a `ResultCache` shared by the whole process; see the `engine.result_cache`
+    configuration for its size and location. Results stored in another format are
+    serialized with `cloudpickle` to be cached.
+
+    Args:
+        - handler (ResultHandler): the result handler to read and write results with
+    """
+
+    def __init__(self, handler: ResultHandler) -> None:
+        self.handler = handler
+        super().__init__()
+
+    def cache_key(self, loc: Any, fingerprint: str) -> str:
+        """
+        Computes the key that the result at the given location is cached under, from the
+        type of the wrapped handler, the location and the fingerprint of its content.
+
+        Args:
+            - loc (Any): the location of a written result
+            - fingerprint (str): the fingerprint of the result, from the wrapped handler
+
+        Returns:
+            - str: the cache key
+        """
+        identity = "\0".join(
+            [to_qualified_name(type(self.handler)), str(loc), fingerprint]
+        )
+        return hashlib.sha256(identity.encode()).hexdigest()
+
+    def fingerprint(self, loc: Any) -> Optional[str]:
+        """
+        Identifies the content of a result with the wrapped handler.
+
+        Args:
+            - loc (Any): the location of a written result
+
+        Returns:
+            - str: the fingerprint of the result, or `None` if it can't be determined
+        """
+        return self.handler.fingerprint(loc)
+
+    def read_serialized(self, loc: Any) -> Optional[bytes]:
+        """
+        Reads the bytes of a result as they are stored, with the wrapped handler.
+
+        Args:
+            - loc (Any): the location of a written result
+
+        Returns:
+            - bytes: the stored bytes of the result, or `None` if they can't be read
+        """
+        return self.handler.read_serialized(loc)
+
+    def write(self, result: Any) -> Any:
+        """
+        Writes a result with the wrapped handler.
+
+        Args:
+            - result (Any): the result to write
+
+        Returns:
+            - Any: the location of the written result
+        """
+        return self.handler.write(result)
+
+    def write_with_metadata(self, result: Any) -> Tuple[Any, Dict[str, Any]]:
+        """
+        Writes a result with the wrapped handler.
+
+        Args:
+            - result (Any): the result to write
+
+        Returns:
+            - Tuple[Any, dict]: the location of the written result, and its metadata
+        """
+        return self.handler.write_with_metadata(result)
+
+    def read(self, loc: Any) -> Any:
+        """
+        Reads a result from the cache or, if it isn't cached (or the location has been
+        written to since), with the wrapped handler, in which case it is cached for
+        subsequent reads.
+
+        Args:
+            - loc (Any): the location of a written result
+
+        Returns:
+            - Any: the result
+        """
+        fingerprint = self.handler.fingerprint(loc)
+        if fingerprint is None:
+            return self.handler.read(loc)
+
+        cache = get_result_cache()
+        key = self.cache_key(loc, fingerprint)
+        payload = cache.get(key)
+        if payload is not None:
+            self.logger.debug("Read result from {} from the cache.".format(loc))
+            # deserialize from a mutable copy, so that arrays read in place are writable
+            return serializers.deserialize(bytearray(payload))
+
+        try:
+            payload = self.handler.read_serialized(loc)
+        except Exception as exc:
+            self.logger.debug(
+                "Result from {} could not be read as bytes: {}".format(loc, repr(exc))
+            )
+        if payload is not None:
+            cache.put(key, payload)
+            return serializers.deserialize(bytearray(payload))
+
+        result = self.handler.read(loc)
+        # some handlers return `None` instead of raising an error
+        if result is not None:
+            try:
+                frames, _ = serializers.serialize(result, serializer="cloudpickle")
+                cache.put(key, b"".join(frames))
+            except Exception as exc:
+                self.logger.debug(
+                    "Result from {} could not be cached: {}".format(loc, repr(exc))
+                )
+        return result
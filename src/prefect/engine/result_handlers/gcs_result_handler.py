@@ -1,11 +1,12 @@
 import base64
 import uuid
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
 
 import cloudpickle
 import pendulum
 
 from prefect.client import Secret
+from prefect.engine import serializers
 from prefect.engine.result_handlers import ResultHandler
 
 if TYPE_CHECKING:
@@ -27,11 +28,37 @@ class GCSResultHandler(ResultHandler):
         - bucket (str): the name of the bucket to write to / read from
         - credentials_secret (str, optional): the name of the Prefect Secret
             which stores a JSON representation of your Google Cloud credentials.
+        - serializer (str, optional): the name of the serializer to write results with;
+            `"auto"` chooses one for each result (see `prefect.engine.serializers`). If
+            neither a serializer nor a compressor is chosen, results are written as
+            base64-encoded pickles, as they were by earlier versions of Prefect
+        - compression (str, optional): the name of the compressor to compress results
+            with, if any
+        - content_addressed (bool, optional): if `True`, results are stored under keys
+            derived from the hash of their serialized bytes (see
+            `prefect.engine.serializers.content_hash`) and aren't uploaded again if a
+            result with the same key already exists, so that identical results, such as
+            those of retried tasks, reruns or mapped children, are only stored once.
+            Defaults to `False`, in which case every result is uploaded to a new key
+
+    Results written by earlier versions of Prefect (as base64-encoded pickles) can
+    still be read.
     """
 
-    def __init__(self, bucket: str = None, credentials_secret: str = None,) -> None:
+    def __init__(
+        self,
+        bucket: str = None,
+        credentials_secret: str = None,
+        serializer: str = None,
+        compression: str = None,
+        content_addressed: bool = False,
+    ) -> None:
+        serializers.validate(serializer, compression)
         self.bucket = bucket
         self.credentials_secret = credentials_secret
+        self.serializer = serializer
+        self.compression = compression
+        self.content_addressed = content_addressed
         super().__init__()
 
     def initialize_client(self) -> None:
@@ -66,6 +93,51 @@ class GCSResultHandler(ResultHandler):
     def __setstate__(self, state: dict) -> None:
         self.__dict__.update(state)
 
+    def fingerprint(self, uri: str) -> Optional[str]:
+        """
+        Identifies the content of a result by its URI, if the result is
+        content-addressed, and otherwise by its MD5 hash (or its ETag, for objects
+        without one).
+
+        Args:
+            - uri (str): the GCS URI
+
+        Returns:
+            - str: the fingerprint of the result, or `None` if it can't be found
+        """
+        if self.content_addressed and uri.startswith("sha256/"):
+            return uri
+        try:
+            blob = self.gcs_bucket.get_blob(uri)
+        except Exception as exc:
+            self.logger.debug("Unable to find result at {}: {}".format(uri, repr(exc)))
+            return None
+        return None if blob is None else (blob.md5_hash or blob.etag)
+
+    def read_serialized(self, uri: str) -> Optional[bytes]:
+        """
+        Downloads the bytes of a result as they are stored, if it was written in the
+        format of `prefect.engine.serializers`.
+
+        Args:
+            - uri (str): the GCS URI
+
+        Returns:
+            - bytes: the stored bytes of the result, or `None` if it was written by an
+                earlier version of Prefect
+        """
+        data = self.gcs_bucket.blob(uri).download_as_string()
+        return data if serializers.is_serialized(data) else None
+
+    def _exists(self, uri: str) -> bool:
+        try:
+            return self.gcs_bucket.blob(uri).exists()
+        except Exception as exc:
+            # results are uploaded whenever they can't be found, including when the
+            # credentials in use aren't allowed to check
+            self.logger.debug("Unable to find result at {}: {}".format(uri, repr(exc)))
+            return False
+
     def write(self, result: Any) -> str:
         """
         Given a result, writes the result to a location in GCS
@@ -77,13 +149,44 @@ class GCSResultHandler(ResultHandler):
         Returns:
             - str: the GCS URI
         """
-        date = pendulum.now("utc").format("Y/M/D")
-        uri = "{date}/{uuid}.prefect_result".format(date=date, uuid=uuid.uuid4())
+        return self.write_with_metadata(result)[0]
+
+    def write_with_metadata(self, result: Any) -> Tuple[str, Dict[str, Any]]:
+        """
+        Given a result, writes the result to a location in GCS
+        and returns the resulting URI.
+
+        Args:
+            - result (Any): the written result
+
+        Returns:
+            - Tuple[str, dict]: the GCS URI, and the serializer and compressor the
+                result was written with
+        """
+        frames, metadata = serializers.serialize_result(
+            result,
+            serializer=self.serializer,
+            compression=self.compression,
+            base64_encoded=True,
+        )
+
+        if self.content_addressed:
+            uri = "sha256/{}.prefect_result".format(serializers.content_hash(frames))
+            if self._exists(uri):
+                self.logger.debug("Result already exists at {}.".format(uri))
+                return uri, metadata
+        else:
+            date = pendulum.now("utc").format("Y/M/D")
+            uri = "{date}/{uuid}.prefect_result".format(date=date, uuid=uuid.uuid4())
         self.logger.debug("Starting to upload result to {}...".format(uri))
-        binary_data = base64.b64encode(cloudpickle.dumps(result)).decode()
-        self.gcs_bucket.blob(uri).upload_from_string(binary_data)
+        blob = self.gcs_bucket.blob(uri)
+        if metadata:
+            stream = serializers.FramesReader(frames)
+            blob.upload_from_file(stream, size=stream.size)
+        else:
+            blob.upload_from_string(bytes(frames[0]).decode())
         self.logger.debug("Finished uploading result to {}.".format(uri))
-        return uri
+        return uri, metadata
 
     def read(self, uri: str) -> Any:
         """
@@ -98,10 +201,15 @@ class GCSResultHandler(ResultHandler):
         try:
             self.logger.debug("Starting to download result from {}...".format(uri))
             result = self.gcs_bucket.blob(uri).download_as_string()
-            try:
-                return_val = cloudpickle.loads(base64.b64decode(result))
-            except EOFError:
-                return_val = None
+            if serializers.is_serialized(result):
+                # deserialize from a mutable copy, so that arrays read in place are
+                # writable
+                return_val = serializers.deserialize(bytearray(result))
+            else:
+                try:
+                    return_val = cloudpickle.loads(base64.b64decode(result))
+                except EOFError:
+                    return_val = None
             self.logger.debug("Finished downloading result from {}.".format(uri))
         except Exception as exc:
             self.logger.exception(
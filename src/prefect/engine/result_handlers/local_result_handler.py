@@ -5,21 +5,25 @@ Anytime a task needs its output or inputs stored, a result handler is used to de
 """
 import base64
 import cloudpickle
+import mmap
 import os
 import pendulum
+import uuid
 
 from slugify import slugify
-from typing import Any
+from typing import Any, Dict, Optional, Tuple
 
 import prefect
+from prefect.engine import serializers
 from prefect.engine.result_handlers import ResultHandler
 
 
 class LocalResultHandler(ResultHandler):
     """
     Hook for storing and retrieving task results from local file storage.
-    Task results are written using `cloudpickle` and stored in the
-    provided location for use in future runs.
+    Task results are serialized (by default, with `cloudpickle`; see
+    `prefect.engine.serializers`) and stored in the provided location for use in
+    future runs.
 
     Args:
         - dir (str, optional): the _absolute_ path to a directory for storing
@@ -27,9 +31,34 @@ class LocalResultHandler(ResultHandler):
         - validate (bool, optional): a boolean specifying whether to validate the
             provided directory path; if `True`, the directory will be converted to an
             absolute path and created.  Defaults to `True`
+        - serializer (str, optional): the name of the serializer to write results with;
+            `"auto"` chooses one for each result. If neither a serializer nor a
+            compressor is chosen, results are written as pickles, as they were by
+            earlier versions of Prefect
+        - compression (str, optional): the name of the compressor to compress results
+            with, if any
+        - memory_map (bool, optional): if `True`, results are read from memory-mapped
+            files, so that the arrays they hold (when written by the `"npy"` or
+            `"pickle5"` serializers, without compression) are read-only views of the
+            file which share its pages with every other reader on the host, rather than
+            private copies. Defaults to `False`
+        - content_addressed (bool, optional): if `True`, results are stored in files
+            named by the hash of their serialized bytes (see
+            `prefect.engine.serializers.content_hash`) and identical results, such as
+            those of retried tasks, reruns or mapped children, are only written once.
+            Defaults to `False`, in which case every result is written to a new file
     """
 
-    def __init__(self, dir: str = None, validate: bool = True):
+    def __init__(
+        self,
+        dir: str = None,
+        validate: bool = True,
+        serializer: str = None,
+        compression: str = None,
+        memory_map: bool = False,
+        content_addressed: bool = False,
+    ):
+        serializers.validate(serializer, compression)
         full_prefect_path = os.path.abspath(prefect.config.home_dir)
         if (
             dir is None
@@ -47,6 +76,10 @@ class LocalResultHandler(ResultHandler):
         else:
             abs_directory = directory
         self.dir = abs_directory
+        self.serializer = serializer
+        self.compression = compression
+        self.memory_map = memory_map
+        self.content_addressed = content_addressed
         super().__init__()
 
     def read(self, fpath: str) -> Any:
@@ -60,11 +93,62 @@ class LocalResultHandler(ResultHandler):
             - the read result from the provided file
         """
         self.logger.debug("Starting to read result from {}...".format(fpath))
+        data = None  # type: Any
         with open(fpath, "rb") as f:
-            val = cloudpickle.loads(f.read())
+            if self.memory_map and serializers.is_serialized(
+                f.read(len(serializers.MAGIC))
+            ):
+                # the map stays open for as long as anything refers to its contents
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                # read into a mutable buffer, so that arrays read in place are writable
+                f.seek(0)
+                data = bytearray(os.fstat(f.fileno()).st_size)
+                f.readinto(data)  # type: ignore
+        if serializers.is_serialized(data):
+            val = serializers.deserialize(data, read_only=self.memory_map)
+        else:
+            val = cloudpickle.loads(data)
         self.logger.debug("Finished reading result from {}...".format(fpath))
         return val
 
+    def fingerprint(self, fpath: str) -> Optional[str]:
+        """
+        Identifies the content of a result by its file name, if the result is
+        content-addressed, and otherwise by the file's modification time and size.
+
+        Args:
+            - fpath (str): the _absolute_ path to the location of a written result
+
+        Returns:
+            - str: the fingerprint of the result, or `None` if the file can't be found
+        """
+        if self.content_addressed and os.path.basename(fpath).startswith(
+            "prefect-result-"
+        ):
+            return os.path.basename(fpath)
+        try:
+            stat = os.stat(fpath)
+        except OSError:
+            return None
+        return "{}-{}".format(stat.st_mtime_ns, stat.st_size)
+
+    def read_serialized(self, fpath: str) -> Optional[bytes]:
+        """
+        Reads the bytes of a result as they are stored, if it was written in the format of
+        `prefect.engine.serializers`.
+
+        Args:
+            - fpath (str): the _absolute_ path to the location of a written result
+
+        Returns:
+            - bytes: the stored bytes of the result, or `None` if it was written by an
+                earlier version of Prefect
+        """
+        with open(fpath, "rb") as f:
+            data = f.read()
+        return data if serializers.is_serialized(data) else None
+
     def write(self, result: Any) -> str:
         """
         Serialize the provided result to local disk.
@@ -75,10 +159,41 @@ class LocalResultHandler(ResultHandler):
         Returns:
             - str: the _absolute_ path to the written result on disk
         """
-        fname = "prefect-result-" + slugify(pendulum.now("utc").isoformat())
+        return self.write_with_metadata(result)[0]
+
+    def write_with_metadata(self, result: Any) -> Tuple[str, Dict[str, Any]]:
+        """
+        Serialize the provided result to local disk.
+
+        Args:
+            - result (Any): the result to write and store
+
+        Returns:
+            - Tuple[str, dict]: the _absolute_ path to the written result on disk, and
+                the serializer and compressor it was written with
+        """
+        frames, metadata = serializers.serialize_result(
+            result, serializer=self.serializer, compression=self.compression
+        )
+        if self.content_addressed:
+            fname = "prefect-result-" + serializers.content_hash(frames)
+        else:
+            fname = "prefect-result-{}-{}".format(
+                slugify(pendulum.now("utc").isoformat()), uuid.uuid4().hex
+            )
         loc = os.path.join(self.dir, fname)
+
+        if self.content_addressed and os.path.exists(loc):
+            self.logger.debug("Result already exists at {}.".format(loc))
+            return loc, metadata
+
         self.logger.debug("Starting to upload result to {}...".format(loc))
-        with open(loc, "wb") as f:
-            f.write(cloudpickle.dumps(result))
+        # results are written under a temporary name and moved into place, so that a
+        # result is never read (or found to exist) before it has been fully written
+        tmp = "{}.{}.tmp".format(loc, uuid.uuid4().hex)
+        with open(tmp, "wb") as f:
+            for frame in frames:
+                f.write(frame)
+        os.replace(tmp, loc)
         self.logger.debug("Finished uploading result to {}...".format(loc))
-        return loc
+        return loc, metadata
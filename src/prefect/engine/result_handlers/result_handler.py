@@ -5,7 +5,7 @@ Anytime a task needs its output or inputs stored, a result handler is used to de
 """
 import base64
 import tempfile
-from typing import Any
+from typing import Any, Dict, Optional, Tuple
 
 import cloudpickle
 
@@ -24,9 +24,53 @@ class ResultHandler:
     def write(self, result: Any) -> Any:
         return None
 
+    def write_with_metadata(self, result: Any) -> Tuple[Any, Dict[str, Any]]:
+        """
+        Writes a result, returning its location along with metadata describing how it
+        was written (for example, which serializer was used), which is recorded on the
+        `SafeResult` for the written value.
+
+        Args:
+            - result (Any): the result to write
+
+        Returns:
+            - Tuple[Any, dict]: the location of the written result, and its metadata
+        """
+        return self.write(result), {}
+
     def read(self, loc: str) -> Any:
         return None
 
+    def fingerprint(self, loc: Any) -> Optional[str]:
+        """
+        Identifies the content currently stored at a location, with either a hash of the
+        content or a version (such as an ETag or modification time) which changes
+        whenever the location is written to. Results are only cached by
+        `CachedResultHandler` if their location has a fingerprint.
+
+        Args:
+            - loc (Any): the location of a written result
+
+        Returns:
+            - str: the fingerprint of the result, or `None` if it can't be determined
+        """
+        return None
+
+    def read_serialized(self, loc: Any) -> Optional[bytes]:
+        """
+        Reads the bytes of a result as they are stored, if it was written in the format of
+        `prefect.engine.serializers`, so that they can be cached without serializing the
+        result again.
+
+        Args:
+            - loc (Any): the location of a written result
+
+        Returns:
+            - bytes: the stored bytes of the result, or `None` if it wasn't written in
+                that format (or this handler can't read it as bytes)
+        """
+        return None
+
     def __eq__(self, other: object) -> bool:
         """
         Equality depends on result handler type and any public attributes
@@ -2,17 +2,24 @@ import base64
 import io
 import json
 import uuid
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 import cloudpickle
 import pendulum
 
 from prefect.client import Secret
+from prefect.engine import serializers
 from prefect.engine.result_handlers import ResultHandler
 
 if TYPE_CHECKING:
     import boto3
 
+# the number of bytes requested by the first ranged download of a result, which holds
+# its header (and, for small results, all of its frames)
+_PREFIX_SIZE = 64 * 1024
+# the number of bytes copied at a time from downloads into frames
+_CHUNK_SIZE = 8 * 1024 * 1024
+
 
 class S3ResultHandler(ResultHandler):
     """
@@ -30,11 +37,41 @@ class S3ResultHandler(ResultHandler):
             with two keys: `ACCESS_KEY` and `SECRET_ACCESS_KEY` which will be
             passed directly to `boto3`.  If not provided, `boto3`
             will fall back on standard AWS rules for authentication.
+        - serializer (str, optional): the name of the serializer to write results with;
+            `"auto"` chooses one for each result (see `prefect.engine.serializers`). If
+            neither a serializer nor a compressor is chosen, results are written as
+            base64-encoded pickles, as they were by earlier versions of Prefect
+        - compression (str, optional): the name of the compressor to compress results
+            with, if any
+        - content_addressed (bool, optional): if `True`, results are stored under keys
+            derived from the hash of their serialized bytes (see
+            `prefect.engine.serializers.content_hash`) and aren't uploaded again if a
+            result with the same key already exists, so that identical results, such as
+            those of retried tasks, reruns or mapped children, are only stored once.
+            Defaults to `False`, in which case every result is uploaded to a new key
+
+    Results are written in a binary format which is streamed into multipart uploads
+    and read back with ranged downloads, so that neither holds more than one copy of
+    a result in memory; serializers which support it (such as pickle protocol 5, when
+    available, and `"npy"`) store large buffers without copying them at all. Results
+    written by earlier versions of Prefect (as base64-encoded pickles) can still be
+    read.
     """
 
-    def __init__(self, bucket: str, aws_credentials_secret: str = None) -> None:
+    def __init__(
+        self,
+        bucket: str,
+        aws_credentials_secret: str = None,
+        serializer: str = None,
+        compression: str = None,
+        content_addressed: bool = False,
+    ) -> None:
+        serializers.validate(serializer, compression)
         self.bucket = bucket
         self.aws_credentials_secret = aws_credentials_secret
+        self.serializer = serializer
+        self.compression = compression
+        self.content_addressed = content_addressed
         super().__init__()
 
     def initialize_client(self) -> None:
@@ -91,18 +128,44 @@ class S3ResultHandler(ResultHandler):
         Returns:
             - str: the S3 URI
         """
-        date = pendulum.now("utc").format("Y/M/D")
-        uri = "{date}/{uuid}.prefect_result".format(date=date, uuid=uuid.uuid4())
-        self.logger.debug("Starting to upload result to {}...".format(uri))
+        return self.write_with_metadata(result)[0]
+
+    def write_with_metadata(self, result: Any) -> Tuple[str, Dict[str, Any]]:
+        """
+        Given a result, writes the result to a location in S3
+        and returns the resulting URI.
+
+        Args:
+            - result (Any): the written result
 
+        Returns:
+            - Tuple[str, dict]: the S3 URI, and the serializer and compressor the
+                result was written with
+        """
         ## prepare data
-        binary_data = base64.b64encode(cloudpickle.dumps(result))
-        stream = io.BytesIO(binary_data)
+        frames, metadata = serializers.serialize_result(
+            result,
+            serializer=self.serializer,
+            compression=self.compression,
+            base64_encoded=True,
+        )
+
+        if self.content_addressed:
+            uri = "sha256/{}.prefect_result".format(serializers.content_hash(frames))
+            if self._exists(uri):
+                self.logger.debug("Result already exists at {}.".format(uri))
+                return uri, metadata
+        else:
+            date = pendulum.now("utc").format("Y/M/D")
+            uri = "{date}/{uuid}.prefect_result".format(date=date, uuid=uuid.uuid4())
+        self.logger.debug("Starting to upload result to {}...".format(uri))
 
-        ## upload
-        self.client.upload_fileobj(stream, Bucket=self.bucket, Key=uri)
+        ## upload, in parts for large results
+        self.client.upload_fileobj(
+            serializers.FramesReader(frames), Bucket=self.bucket, Key=uri
+        )
         self.logger.debug("Finished uploading result to {}.".format(uri))
-        return uri
+        return uri, metadata
 
     def read(self, uri: str) -> Any:
         """
@@ -116,16 +179,13 @@ class S3ResultHandler(ResultHandler):
         """
         try:
             self.logger.debug("Starting to download result from {}...".format(uri))
-            stream = io.BytesIO()
-
-            ## download
-            self.client.download_fileobj(Bucket=self.bucket, Key=uri, Fileobj=stream)
-            stream.seek(0)
+            prefix = self._download_range(uri, 0, _PREFIX_SIZE)
 
-            try:
-                return_val = cloudpickle.loads(base64.b64decode(stream.read()))
-            except EOFError:
-                return_val = None
+            if serializers.is_serialized(prefix):
+                frames = self._download_frames(uri, prefix)
+                return_val = serializers.deserialize_frames(frames)
+            else:
+                return_val = self._read_base64(uri, prefix)
             self.logger.debug("Finished downloading result from {}.".format(uri))
 
         except Exception as exc:
@@ -137,3 +197,110 @@ class S3ResultHandler(ResultHandler):
             return_val = None
 
         return return_val
+
+    def fingerprint(self, uri: str) -> Optional[str]:
+        """
+        Identifies the content of a result by its URI, if the result is
+        content-addressed, and otherwise by its ETag.
+
+        Args:
+            - uri (str): the S3 URI
+
+        Returns:
+            - str: the fingerprint of the result, or `None` if it can't be found
+        """
+        if self.content_addressed and uri.startswith("sha256/"):
+            return uri
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=uri)["ETag"]
+        except Exception as exc:
+            self.logger.debug("Unable to find result at {}: {}".format(uri, repr(exc)))
+            return None
+
+    def read_serialized(self, uri: str) -> Optional[bytes]:
+        """
+        Downloads the bytes of a result as they are stored, if it was written in the
+        format of `prefect.engine.serializers`.
+
+        Args:
+            - uri (str): the S3 URI
+
+        Returns:
+            - bytes: the stored bytes of the result, or `None` if it was written by an
+                earlier version of Prefect
+        """
+        stream = io.BytesIO()
+        self.client.download_fileobj(Bucket=self.bucket, Key=uri, Fileobj=stream)
+        data = stream.getvalue()
+        return data if serializers.is_serialized(data) else None
+
+    def _exists(self, uri: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=uri)
+        except Exception as exc:
+            # results are uploaded whenever they can't be found, including when the
+            # credentials in use aren't allowed to check
+            self.logger.debug("Unable to find result at {}: {}".format(uri, repr(exc)))
+            return False
+        return True
+
+    def _download_range(self, uri: str, start: int, length: int = None) -> bytes:
+        # downloads `length` bytes from `start`, or every byte from `start` if no length
+        # is given; ranges which start at or after the end of the result are empty
+        end = "" if length is None else str(start + length - 1)
+        try:
+            response = self.client.get_object(
+                Bucket=self.bucket, Key=uri, Range="bytes={}-{}".format(start, end)
+            )
+        except Exception as exc:
+            error = getattr(exc, "response", None) or {}
+            if (
+                error.get("Error", {}).get("Code") == "InvalidRange"
+                or error.get("ResponseMetadata", {}).get("HTTPStatusCode") == 416
+            ):
+                return b""
+            raise
+        return response["Body"].read()
+
+    def _download_frames(self, uri: str, prefix: bytes) -> List[bytearray]:
+        header_size = serializers.header_size(prefix)
+        if len(prefix) < header_size:
+            prefix += self._download_range(uri, len(prefix), header_size - len(prefix))
+        lengths = serializers.frame_lengths(prefix)
+
+        # frames are downloaded into buffers allocated up front, starting with any of
+        # their bytes that were downloaded with the header
+        frames = []
+        offset = header_size
+        for length in lengths:
+            frame = bytearray(length)
+            available = prefix[offset : offset + length]
+            frame[: len(available)] = available
+            if len(available) < length:
+                start = offset + len(available)
+                body = self.client.get_object(
+                    Bucket=self.bucket,
+                    Key=uri,
+                    Range="bytes={}-{}".format(start, offset + length - 1),
+                )["Body"]
+                view = memoryview(frame)
+                position = len(available)
+                while position < length:
+                    chunk = body.read(min(_CHUNK_SIZE, length - position))
+                    if not chunk:
+                        raise EOFError("Result {} is truncated.".format(uri))
+                    view[position : position + len(chunk)] = chunk
+                    position += len(chunk)
+            frames.append(frame)
+            offset += length
+        return frames
+
+    def _read_base64(self, uri: str, prefix: bytes) -> Any:
+        # results smaller than the prefix were downloaded whole with it
+        data = prefix
+        if len(prefix) == _PREFIX_SIZE:
+            data += self._download_range(uri, len(prefix))
+        try:
+            return cloudpickle.loads(base64.b64decode(data))
+        except EOFError:
+            return None
@@ -0,0 +1,705 @@
+"""
+Serializers turn task results into bytes (and back) for result handlers, optionally
+compressing them. Result handlers write results in a self-describing format, so that a
+result can always be read back without knowing how it was written:
+
+- a header, made up of magic bytes, the format version and the number of frames, followed
+    by the length of each frame
+- a JSON frame with the metadata of the result, naming its serializer and compressor,
+    padded with whitespace so that the next frame starts at a multiple of `ALIGNMENT`
+- the frames written by the serializer, each compressed by the compressor (if any)
+
+Serializers write lists of frames rather than single strings of bytes, so that large
+buffers (such as the data of NumPy arrays) can be written without being copied.
+
+The available serializers are:
+
+- `"cloudpickle"`: any object, pickled with `cloudpickle`
+- `"pickle5"`: any object, pickled with pickle protocol 5 so that buffers supporting it
+    are stored out-of-band (requires Python 3.8+, or the `pickle5` package)
+- `"npy"`: NumPy arrays which don't hold Python objects, in NumPy's `.npy` format
+    (requires `numpy`)
+- `"parquet"`: pandas DataFrames, in Apache Parquet format (requires `pandas` and
+    `pyarrow`)
+- `"auto"`: picks one of the above for each result, based on its type (see
+    `choose_serializer`)
+
+Unless a serializer or compressor is chosen, result handlers write results as they were
+written by earlier versions of Prefect instead (see `serialize_legacy`), so that those
+versions can still read them.
+
+and the available compressors are `"zlib"`, `"zstd"` (requires `zstandard`) and `"lz4"`
+(requires `lz4`).
+"""
+import base64
+import functools
+import hashlib
+import io
+import json
+import pickle
+import struct
+import sys
+import zlib
+from typing import Any, Dict, List, Tuple
+
+import cloudpickle
+
+MAGIC = b"\x00PFR"
+FORMAT_VERSION = 1
+HEADER = struct.Struct(">4sBI")
+FRAME_LENGTH = struct.Struct(">Q")
+# the offset in a result at which its serializer's frames start is a multiple of this
+# many bytes, so that arrays read in place from memory-mapped results are aligned
+ALIGNMENT = 64
+
+
+class Serializer:
+    """
+    Base class for serializers, which convert values to frames of bytes and back.
+    """
+
+    name = None  # type: str
+
+    def accepts(self, value: Any) -> bool:
+        """
+        Whether this serializer can serialize the given value.
+
+        Args:
+            - value (Any): the value to serialize
+
+        Returns:
+            - bool: whether the value can be serialized
+        """
+        return True
+
+    def serialize(self, value: Any) -> List[memoryview]:
+        """
+        Serializes a value.
+
+        Args:
+            - value (Any): the value to serialize
+
+        Returns:
+            - List[memoryview]: the serialized frames
+        """
+        raise NotImplementedError()
+
+    def deserialize(self, frames: List[Any]) -> Any:
+        """
+        Deserializes a value.
+
+        Args:
+            - frames (List[bytes-like]): the frames created by `serialize`
+
+        Returns:
+            - Any: the deserialized value
+        """
+        raise NotImplementedError()
+
+
+class CloudpickleSerializer(Serializer):
+    """
+    Serializes any object with `cloudpickle`.
+    """
+
+    name = "cloudpickle"
+
+    def serialize(self, value: Any) -> List[memoryview]:
+        return [memoryview(cloudpickle.dumps(value))]
+
+    def deserialize(self, frames: List[Any]) -> Any:
+        return cloudpickle.loads(frames[0])
+
+
+def _pickle5() -> Any:
+    """
+    Returns a `pickle` module which supports pickle protocol 5, or `None`.
+    """
+    if pickle.HIGHEST_PROTOCOL >= 5:
+        return pickle
+    try:
+        import pickle5  # type: ignore
+
+        return pickle5
+    except ImportError:
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def _cloudpickle_supports_buffers() -> bool:
+    """
+    Whether `cloudpickle` can pickle with protocol 5 and out-of-band buffers.
+    """
+    try:
+        cloudpickle.dumps(None, protocol=5, buffer_callback=lambda buffer: None)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+class Pickle5Serializer(Serializer):
+    """
+    Serializes objects with pickle protocol 5, storing the buffers of objects which
+    support out-of-band pickling (such as NumPy arrays and pandas DataFrames) in frames
+    of their own, without copying them. Uses `cloudpickle` if it supports protocol 5,
+    and `pickle` otherwise.
+
+    Requires Python 3.8+ or the `pickle5` package.
+    """
+
+    name = "pickle5"
+
+    def serialize(self, value: Any) -> List[memoryview]:
+        buffers = []  # type: list
+        if _cloudpickle_supports_buffers():
+            data = cloudpickle.dumps(value, protocol=5, buffer_callback=buffers.append)
+        else:
+            pickle_module = _pickle5()
+            if pickle_module is None:
+                raise ImportError(
+                    "Pickle protocol 5 requires Python 3.8+ or the `pickle5` package."
+                )
+            data = pickle_module.dumps(
+                value, protocol=5, buffer_callback=buffers.append
+            )
+        return [memoryview(data)] + [buffer.raw() for buffer in buffers]
+
+    def deserialize(self, frames: List[Any]) -> Any:
+        pickle_module = _pickle5() or pickle  # type: Any
+        return pickle_module.loads(frames[0], buffers=frames[1:])
+
+
+class NumpySerializer(Serializer):
+    """
+    Serializes NumPy arrays (except those holding Python objects) in NumPy's `.npy`
+    format; contiguous arrays are written without being copied, and read back without
+    being copied again. Subclasses of `numpy.ndarray` (such as masked arrays and
+    matrices) aren't accepted, as the format only stores their data.
+
+    Requires `numpy`.
+    """
+
+    name = "npy"
+
+    def accepts(self, value: Any) -> bool:
+        # values can only be arrays if NumPy has been imported
+        numpy = sys.modules.get("numpy")  # type: Any
+        return (
+            numpy is not None
+            and type(value) is numpy.ndarray
+            and not value.dtype.hasobject
+        )
+
+    def serialize(self, value: Any) -> List[memoryview]:
+        import numpy
+
+        if not (value.flags.c_contiguous or value.flags.f_contiguous):
+            value = numpy.ascontiguousarray(value)
+        header = io.BytesIO()
+        numpy.lib.format.write_array_header_2_0(
+            header, numpy.lib.format.header_data_from_array_1_0(value)
+        )
+        order = (
+            "F" if value.flags.f_contiguous and not value.flags.c_contiguous else "C"
+        )
+        data = memoryview(value.reshape(-1, order=order).view(numpy.uint8))
+        return [memoryview(header.getvalue()), data]
+
+    def deserialize(self, frames: List[Any]) -> Any:
+        import numpy
+
+        header = io.BytesIO(frames[0])
+        numpy.lib.format.read_magic(header)
+        shape, fortran_order, dtype = numpy.lib.format.read_array_header_2_0(header)
+        array = numpy.frombuffer(frames[1], dtype=dtype)
+        return array.reshape(shape, order="F" if fortran_order else "C")
+
+
+class ParquetSerializer(Serializer):
+    """
+    Serializes pandas DataFrames in Apache Parquet format.
+
+    Requires `pandas` and `pyarrow`.
+    """
+
+    name = "parquet"
+
+    def accepts(self, value: Any) -> bool:
+        pandas = sys.modules.get("pandas")  # type: Any
+        if pandas is None or not isinstance(value, pandas.DataFrame):
+            return False
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def serialize(self, value: Any) -> List[memoryview]:
+        import pyarrow
+        import pyarrow.parquet
+
+        stream = pyarrow.BufferOutputStream()
+        pyarrow.parquet.write_table(pyarrow.Table.from_pandas(value), stream)
+        return [memoryview(stream.getvalue())]
+
+    def deserialize(self, frames: List[Any]) -> Any:
+        import pyarrow
+        import pyarrow.parquet
+
+        table = pyarrow.parquet.read_table(pyarrow.BufferReader(frames[0]))
+        return table.to_pandas()
+
+
+class Compressor:
+    """
+    Base class for compressors, which compress each frame written by a serializer.
+    """
+
+    name = None  # type: str
+
+    def compress(self, data: Any) -> bytes:
+        """
+        Compresses a frame.
+
+        Args:
+            - data (bytes-like): the frame to compress
+
+        Returns:
+            - bytes: the compressed frame
+        """
+        raise NotImplementedError()
+
+    def decompress(self, data: Any) -> bytes:
+        """
+        Decompresses a frame.
+
+        Args:
+            - data (bytes-like): the compressed frame
+
+        Returns:
+            - bytes: the frame
+        """
+        raise NotImplementedError()
+
+
+class ZlibCompressor(Compressor):
+    """
+    Compresses frames with `zlib`.
+    """
+
+    name = "zlib"
+
+    def compress(self, data: Any) -> bytes:
+        return zlib.compress(data)
+
+    def decompress(self, data: Any) -> bytes:
+        return zlib.decompress(data)
+
+
+class ZstdCompressor(Compressor):
+    """
+    Compresses frames with Zstandard.
+
+    Requires `zstandard`.
+    """
+
+    name = "zstd"
+
+    def compress(self, data: Any) -> bytes:
+        import zstandard
+
+        return zstandard.ZstdCompressor().compress(data)
+
+    def decompress(self, data: Any) -> bytes:
+        import zstandard
+
+        # frames are always written with their size, so they can be decompressed at once
+        return zstandard.ZstdDecompressor().decompress(data)
+
+
+class LZ4Compressor(Compressor):
+    """
+    Compresses frames with LZ4.
+
+    Requires `lz4`.
+    """
+
+    name = "lz4"
+
+    def compress(self, data: Any) -> bytes:
+        import lz4.frame
+
+        return lz4.frame.compress(data)
+
+    def decompress(self, data: Any) -> bytes:
+        import lz4.frame
+
+        return lz4.frame.decompress(data)
+
+
+SERIALIZERS = {
+    serializer.name: serializer
+    for serializer in [
+        CloudpickleSerializer(),
+        Pickle5Serializer(),
+        NumpySerializer(),
+        ParquetSerializer(),
+    ]
+}  # type: Dict[str, Serializer]
+
+COMPRESSORS = {
+    compressor.name: compressor
+    for compressor in [ZlibCompressor(), ZstdCompressor(), LZ4Compressor()]
+}  # type: Dict[str, Compressor]
+
+
+def validate(serializer: str = None, compression: str = None) -> None:
+    """
+    Checks that a serializer and compressor exist.
+
+    Args:
+        - serializer (str, optional): the name of a serializer, `"auto"`, or `None`
+        - compression (str, optional): the name of a compressor, or `None`
+
+    Raises:
+        - ValueError: if either doesn't exist
+    """
+    if (
+        serializer is not None
+        and serializer != "auto"
+        and serializer not in SERIALIZERS
+    ):
+        raise ValueError(
+            "Unknown serializer {!r}; expected one of: {}".format(
+                serializer, ", ".join(["auto"] + sorted(SERIALIZERS))
+            )
+        )
+    if compression is not None and compression not in COMPRESSORS:
+        raise ValueError(
+            "Unknown compression {!r}; expected one of: {}".format(
+                compression, ", ".join(sorted(COMPRESSORS))
+            )
+        )
+
+
+def _pickle_serializer() -> Serializer:
+    """
+    Returns the serializer the `"auto"` serializer pickles values with: protocol 5 if
+    `cloudpickle` supports it, and `cloudpickle`'s default protocol otherwise.
+    """
+    if _cloudpickle_supports_buffers():
+        return SERIALIZERS["pickle5"]
+    return SERIALIZERS["cloudpickle"]
+
+
+def choose_serializer(value: Any) -> Serializer:
+    """
+    Chooses the serializer used for a value by the `"auto"` serializer: arrays (but
+    not subclasses of them) are written in `.npy` format and DataFrames in Parquet
+    format, if their libraries are installed, and everything else is pickled with
+    protocol 5 if `cloudpickle` supports it, and with `cloudpickle`'s default protocol
+    otherwise. DataFrames which can't be written in Parquet format (for example, those
+    with duplicate column names) are pickled instead when they are serialized.
+
+    Args:
+        - value (Any): the value to serialize
+
+    Returns:
+        - Serializer: the serializer to use
+    """
+    for name in ["npy", "parquet"]:
+        if SERIALIZERS[name].accepts(value):
+            return SERIALIZERS[name]
+    return _pickle_serializer()
+
+
+def serialize(
+    value: Any, serializer: str = "cloudpickle", compression: str = None
+) -> Tuple[List[memoryview], Dict[str, Any]]:
+    """
+    Serializes a value into the frames of a self-describing result, which can be
+    written out in order (or joined) and read back with `deserialize`.
+
+    Args:
+        - value (Any): the value to serialize
+        - serializer (str, optional): the name of the serializer to use; defaults to
+            `"cloudpickle"`. `"auto"` chooses one based on the type of the value
+        - compression (str, optional): the name of the compressor to use, if any
+
+    Returns:
+        - Tuple[List[memoryview], dict]: the frames, and the metadata recording the
+            serializer and compressor used
+
+    Raises:
+        - ValueError: if the serializer or compressor doesn't exist
+    """
+    validate(serializer, compression)
+    if serializer == "auto":
+        chosen = choose_serializer(value)
+        try:
+            frames = chosen.serialize(value)
+        except Exception:
+            if chosen.name != "parquet":
+                raise
+            chosen = _pickle_serializer()
+            frames = chosen.serialize(value)
+    else:
+        chosen = SERIALIZERS[serializer]
+        frames = chosen.serialize(value)
+
+    if compression is not None:
+        compressor = COMPRESSORS[compression]
+        frames = [memoryview(compressor.compress(frame)) for frame in frames]
+
+    metadata = dict(serializer=chosen.name, compression=compression)
+    metadata_frame = json.dumps(metadata).encode()
+    size = HEADER.size + (len(frames) + 1) * FRAME_LENGTH.size + len(metadata_frame)
+    metadata_frame += b" " * (-size % ALIGNMENT)
+    frames = [memoryview(metadata_frame)] + [frame.cast("B") for frame in frames]
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, len(frames)) + b"".join(
+        FRAME_LENGTH.pack(frame.nbytes) for frame in frames
+    )
+    return [memoryview(header)] + frames, metadata
+
+
+def serialize_legacy(value: Any, base64_encoded: bool = False) -> List[memoryview]:
+    """
+    Serializes a value as result handlers wrote results before the format of this module
+    was introduced: pickled with `cloudpickle` and, for handlers which stored text,
+    base64-encoded. Result handlers write results this way unless a serializer or
+    compressor is chosen, so that earlier versions of Prefect can still read them.
+
+    Args:
+        - value (Any): the value to serialize
+        - base64_encoded (bool, optional): whether to base64-encode the pickle; defaults
+            to `False`
+
+    Returns:
+        - List[memoryview]: a single frame, holding the serialized value
+    """
+    data = cloudpickle.dumps(value)
+    if base64_encoded:
+        data = base64.b64encode(data)
+    return [memoryview(data)]
+
+
+def serialize_result(
+    value: Any,
+    serializer: str = None,
+    compression: str = None,
+    base64_encoded: bool = False,
+) -> Tuple[List[memoryview], Dict[str, Any]]:
+    """
+    Serializes a value for a result handler: with `serialize_legacy` if neither a
+    serializer nor a compressor is chosen, and with `serialize` otherwise (with the
+    `"cloudpickle"` serializer, if only a compressor is chosen).
+
+    Args:
+        - value (Any): the value to serialize
+        - serializer (str, optional): the name of the serializer to use, if any
+        - compression (str, optional): the name of the compressor to use, if any
+        - base64_encoded (bool, optional): whether results written with
+            `serialize_legacy` are base64-encoded; defaults to `False`
+
+    Returns:
+        - Tuple[List[memoryview], dict]: the frames, and the metadata recording the
+            serializer and compressor used (which is empty for results written with
+            `serialize_legacy`)
+    """
+    if serializer is None and compression is None:
+        return serialize_legacy(value, base64_encoded=base64_encoded), {}
+    return serialize(
+        value, serializer=serializer or "cloudpickle", compression=compression
+    )
+
+
+class FramesReader(io.RawIOBase):
+    """
+    A read-only, seekable stream of the frames of a result, which copies them into the
+    caller's buffers as they are read, so that uploads never hold a second copy of a
+    result.
+
+    Args:
+        - frames (List[bytes-like]): the frames to read, in order
+    """
+
+    def __init__(self, frames: List[Any]) -> None:
+        super().__init__()
+        self._frames = [memoryview(frame).cast("B") for frame in frames]
+        self._size = sum(frame.nbytes for frame in self._frames)
+        self._position = 0
+
+    @property
+    def size(self) -> int:
+        """
+        The number of bytes in the stream.
+        """
+        return self._size
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self._size
+        if offset < 0:
+            raise ValueError("Negative seek position {}".format(offset))
+        self._position = offset
+        return offset
+
+    def readinto(self, buffer: Any) -> int:
+        buffer = memoryview(buffer).cast("B")
+        written = 0
+        start = 0
+        for frame in self._frames:
+            if written == buffer.nbytes:
+                break
+            end = start + frame.nbytes
+            if self._position < end:
+                offset = self._position - start
+                n = min(frame.nbytes - offset, buffer.nbytes - written)
+                buffer[written : written + n] = frame[offset : offset + n]
+                written += n
+                self._position += n
+            start = end
+        return written
+
+
+def content_hash(frames: List[Any]) -> str:
+    """
+    Hashes the frames of a serialized result, so that results can be stored under a
+    key derived from their content. Identical values written with the same serializer
+    and compressor have the same hash.
+
+    Args:
+        - frames (List[bytes-like]): the frames of a serialized result, as returned by
+            `serialize`
+
+    Returns:
+        - str: the hex digest of the SHA-256 hash of the frames, as written
+    """
+    digest = hashlib.sha256()
+    for frame in frames:
+        digest.update(frame)
+    return digest.hexdigest()
+
+
+def is_serialized(data: Any) -> bool:
+    """
+    Whether the given bytes start a result written by `serialize`, rather than a
+    result written by an earlier version of Prefect.
+
+    Args:
+        - data (bytes-like): the first bytes of a result
+
+    Returns:
+        - bool: whether the result was written by `serialize`
+    """
+    return bytes(data[: len(MAGIC)]) == MAGIC
+
+
+def header_size(data: Any) -> int:
+    """
+    Returns the size of the header of a result, from its first `HEADER.size` bytes.
+
+    Args:
+        - data (bytes-like): the first bytes of a result
+
+    Returns:
+        - int: the size of its header
+
+    Raises:
+        - ValueError: if the result was written with an unsupported format version
+    """
+    _, version, n_frames = HEADER.unpack_from(data)
+    if version != FORMAT_VERSION:
+        raise ValueError("Unsupported result format version: {}".format(version))
+    return HEADER.size + n_frames * FRAME_LENGTH.size
+
+
+def frame_lengths(header: Any) -> List[int]:
+    """
+    Returns the lengths of the frames of a result, from its header.
+
+    Args:
+        - header (bytes-like): the header of a result
+
+    Returns:
+        - List[int]: the lengths of its frames (the first of which is its metadata)
+    """
+    n_frames = (header_size(header) - HEADER.size) // FRAME_LENGTH.size
+    return [
+        FRAME_LENGTH.unpack_from(header, HEADER.size + i * FRAME_LENGTH.size)[0]
+        for i in range(n_frames)
+    ]
+
+
+def read_metadata(frames: List[Any]) -> Dict[str, Any]:
+    """
+    Returns the metadata of a result, from its frames.
+
+    Args:
+        - frames (List[bytes-like]): the frames of a result, without its header
+
+    Returns:
+        - dict: the metadata recorded by `serialize`
+    """
+    return json.loads(bytes(frames[0]).decode())
+
+
+def deserialize_frames(frames: List[Any], read_only: bool = False) -> Any:
+    """
+    Deserializes a value from the frames of a result.
+
+    Args:
+        - frames (List[bytes-like]): the frames of a result, without its header
+        - read_only (bool, optional): if `True`, arrays may be read in place from
+            frames which can't be written to, and so can't be written to themselves;
+            if `False` (the default), such frames are copied first
+
+    Returns:
+        - Any: the deserialized value
+    """
+    meta = read_metadata(frames)
+    data_frames = frames[1:]
+    if meta.get("compression") is not None:
+        compressor = COMPRESSORS[meta["compression"]]
+        data_frames = [compressor.decompress(frame) for frame in data_frames]
+    if not read_only:
+        # only the frames after the first hold buffers which are read in place
+        data_frames = data_frames[:1] + [
+            bytearray(frame) if memoryview(frame).readonly else frame
+            for frame in data_frames[1:]
+        ]
+    return SERIALIZERS[meta["serializer"]].deserialize(data_frames)
+
+
+def deserialize(data: Any, read_only: bool = False) -> Any:
+    """
+    Deserializes a value from a result written by `serialize`, without copying its
+    frames unless they need to be copied to be written to.
+
+    Args:
+        - data (bytes-like): the result
+        - read_only (bool, optional): if `True`, arrays may be read in place from data
+            which can't be written to (such as a read-only memory map), and so can't
+            be written to themselves; if `False` (the default), they are copied
+
+    Returns:
+        - Any: the deserialized value
+    """
+    view = memoryview(data).cast("B")
+    offset = header_size(view)
+    frames = []
+    for length in frame_lengths(view):
+        frames.append(view[offset : offset + length])
+        offset += length
+    return deserialize_frames(frames, read_only=read_only)
@@ -665,6 +665,15 @@ class Cached(Success):
         - cached_parameters (dict): Defaults to `None`
         - cached_result_expiration (datetime): The time at which this cache
             expires and can no longer be used. Defaults to `None`
+        - cached_fingerprint (str, optional): A stable hash of the inputs and parameters
+            the cached result was computed from (see
+            `prefect.utilities.hashing.fingerprint`), which identifies the task runs
+            the cache can be used by without reading its inputs. Defaults to `None`
+        - cached_input_hashes (dict, optional): A dictionary of input keys to stable
+            hashes of the inputs (see `prefect.utilities.hashing.hash_values`), which are
+            compared by the hash-based cache validators. Defaults to `None`
+        - cached_parameter_hashes (dict, optional): A dictionary of parameter names to
+            stable hashes of the parameters. Defaults to `None`
         - context (dict, optional): A dictionary of execution context information; values
             should be JSON compatible
     """
@@ -678,12 +687,18 @@ class Cached(Success):
         cached_inputs: Dict[str, Result] = None,
         cached_parameters: Dict[str, Any] = None,
         cached_result_expiration: datetime.datetime = None,
+        cached_fingerprint: str = None,
+        cached_input_hashes: Dict[str, Optional[str]] = None,
+        cached_parameter_hashes: Dict[str, Optional[str]] = None,
         context: Dict[str, Any] = None,
     ):
         super().__init__(
             message=message, result=result, context=context, cached_inputs=cached_inputs
         )
         self.cached_parameters = cached_parameters  # type: Optional[Dict[str, Any]]
+        self.cached_fingerprint = cached_fingerprint
+        self.cached_input_hashes = cached_input_hashes
+        self.cached_parameter_hashes = cached_parameter_hashes
         if cached_result_expiration is not None:
             cached_result_expiration = pendulum.instance(cached_result_expiration)
         self.cached_result_expiration = (
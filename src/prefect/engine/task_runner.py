@@ -1,6 +1,8 @@
 import collections
 import copy
 import itertools
+import operator
+import queue
 import threading
 from functools import partial, wraps
 from typing import (
@@ -9,6 +11,7 @@ from typing import (
     Callable,
     Dict,
     Iterable,
+    Iterator,
     List,
     NamedTuple,
     Optional,
@@ -23,7 +26,7 @@ import pendulum
 import prefect
 from prefect import config
 from prefect.core import Edge, Task
-from prefect.engine import signals
+from prefect.engine import checkpointing, signals
 from prefect.engine.result import NoResult, Result
 from prefect.engine.result_handlers import JSONResultHandler, ResultHandler
 from prefect.engine.runner import ENDRUN, Runner, call_state_handlers
@@ -46,6 +49,7 @@ from prefect.engine.state import (
     TimedOut,
     TriggerFailed,
 )
+from prefect.utilities import hashing
 from prefect.utilities.executors import (
     run_with_heartbeat,
     tail_recursive,
@@ -621,10 +625,7 @@ class TaskRunner(Runner):
         """
         if state.is_cached():
             assert isinstance(state, Cached)  # mypy assert
-            sanitized_inputs = {key: res.value for key, res in inputs.items()}
-            if self.task.cache_validator(
-                state, sanitized_inputs, prefect.context.get("parameters")
-            ):
+            if self.validate_cache(state, inputs):
                 state._result = state._result.to_result(self.task.result_handler)
                 return state
             else:
@@ -634,11 +635,8 @@ class TaskRunner(Runner):
             candidate_states = prefect.context.caches.get(
                 self.task.cache_key or self.task.name, []
             )
-            sanitized_inputs = {key: res.value for key, res in inputs.items()}
             for candidate in candidate_states:
-                if self.task.cache_validator(
-                    candidate, sanitized_inputs, prefect.context.get("parameters")
-                ):
+                if self.validate_cache(candidate, inputs):
                     candidate._result = candidate._result.to_result(
                         self.task.result_handler
                     )
@@ -653,6 +651,34 @@ class TaskRunner(Runner):
             )
         return state or Pending("Cache was invalid; ready to run.")
 
+    def validate_cache(self, state: Cached, inputs: Dict[str, Result]) -> bool:
+        """
+        Checks whether a Cached state can be used by this task run, with the task's cache
+        validator.
+
+        Hash-based cache validators (see `prefect.engine.cache_validators`) are given the
+        hashes of this task run's inputs and parameters in context, so that they're
+        computed once rather than once per validated state; the hashes of inputs are
+        kept with their results.
+
+        Args:
+            - state (Cached): the Cached state to validate
+            - inputs (Dict[str, Result]): a dictionary of inputs whose keys correspond
+                to the task's `run()` arguments.
+
+        Returns:
+            - bool: whether the cache can be used
+        """
+        sanitized_inputs = {key: res.value for key, res in inputs.items()}
+        parameters = prefect.context.get("parameters")
+        if not getattr(self.task.cache_validator, "validates_hashes", False):
+            return self.task.cache_validator(state, sanitized_inputs, parameters)
+        with prefect.context(
+            input_hashes={key: res.value_hash for key, res in inputs.items()},
+            parameter_hashes=hashing.hash_values(parameters or {}),
+        ):
+            return self.task.cache_validator(state, sanitized_inputs, parameters)
+
     def run_mapped_task(
         self,
         state: State,
@@ -663,6 +689,19 @@ class TaskRunner(Runner):
         """
         If the task is being mapped, submits children tasks for execution. Returns a `Mapped` state.
 
+        If `engine.task_runner.max_mapped_in_flight` is set to a positive number, the upstream
+        states of each child are generated on demand and at most that many children are
+        running at once; each further child is submitted as soon as an earlier one
+        finishes, so only a bounded number of children (and their upstream states) is
+        held in memory at any time.
+
+        If the task has a `map_batch_size` greater than 1, children are grouped into batches
+        of that many map indices and each batch is submitted to the executor as a single
+        unit. Every child is still run individually, so each map index has its own state.
+
+        If `engine.task_runner.scatter_upstream_states` is `True`, upstream states are
+        prepared with `scatter_upstream_states` before any children are generated.
+
         Args:
             - state (State): the current task state
             - upstream_states (Dict[Edge, State]): the upstream states
@@ -676,8 +715,340 @@ class TaskRunner(Runner):
             - ENDRUN: if the current state is not `Running`
         """
 
-        map_upstream_states = []
+        def run_fn(
+            state: State,
+            map_index: int,
+            upstream_states: Dict[Edge, State],
+            child_context: Dict[str, Any] = None,
+        ) -> State:
+            map_context = context.copy()
+            map_context.update(child_context or {}, map_index=map_index)
+            with prefect.context(self.context):
+                return self.run(
+                    upstream_states=upstream_states,
+                    # if we set the state here, then it will not be processed by `initialize_run()`
+                    state=state,
+                    context=map_context,
+                    executor=executor,
+                )
+
+        if prefect.context.config.engine.task_runner.get(
+            "scatter_upstream_states", False
+        ):
+            upstream_states = self.scatter_upstream_states(
+                upstream_states=upstream_states, executor=executor
+            )
+
+        max_in_flight = prefect.context.config.engine.task_runner.get(
+            "max_mapped_in_flight", 0
+        )
+        batch_size = self.task.map_batch_size or 1
+        if max_in_flight or batch_size > 1:
+            return self.run_mapped_task_in_windows(
+                state=state,
+                upstream_states=upstream_states,
+                run_fn=run_fn,
+                executor=executor,
+                window_size=max_in_flight,
+                batch_size=batch_size,
+            )
+
+        map_upstream_states = list(
+            self.generate_map_upstream_states(
+                state=state, upstream_states=upstream_states
+            )
+        )
+
+        # generate initial states, if available
+        if isinstance(state, Mapped):
+            initial_states = list(state.map_states)  # type: List[Optional[State]]
+        else:
+            initial_states = []
+        initial_states.extend([None] * (len(map_upstream_states) - len(initial_states)))
+
+        current_state = Mapped(
+            message="Preparing to submit {} mapped tasks.".format(len(initial_states)),
+            map_states=initial_states,  # type: ignore
+        )
+        state = self.handle_state_change(old_state=state, new_state=current_state)
+        if state is not current_state:
+            return state
+
+        initial_states, child_contexts = self.prepare_mapped_children(
+            initial_states=initial_states, map_indices=range(len(initial_states))
+        )
+
+        # map over the initial states, a counter representing the map_index, the mapped upstream states
+        # and any additional context for each child
+        map_states = executor.map(
+            run_fn,
+            initial_states,
+            range(len(map_upstream_states)),
+            map_upstream_states,
+            child_contexts,
+        )
+
+        self.logger.debug(
+            "{} mapped tasks submitted for execution.".format(len(map_states))
+        )
+        new_state = Mapped(
+            message="Mapped tasks submitted for execution.", map_states=map_states
+        )
+        return self.handle_state_change(old_state=state, new_state=new_state)
+
+    def run_mapped_task_in_windows(
+        self,
+        state: State,
+        upstream_states: Dict[Edge, State],
+        run_fn: Callable,
+        executor: "prefect.engine.executors.Executor",
+        window_size: int = 0,
+        batch_size: int = 1,
+    ) -> State:
+        """
+        Submits the children of a mapped task lazily, in batches, or both. The upstream
+        states of each child are generated on demand and, if `window_size` is set, at
+        most `window_size` children are submitted but unfinished at any one time: the
+        next child is submitted as soon as any earlier one finishes (executor completion
+        callbacks are used to learn when they do), and the children of the last window
+        are returned as futures, as they are when mapping without a window. The `Mapped`
+        state entered before submission still holds one initial state (or `None`) per
+        child, as its `n_map_states` is the length of its `map_states`.
+
+        Children are grouped into batches of `batch_size` map indices; each batch is a
+        single executor submission which runs its children one after another, and the
+        state of each child is then selected from its batch's result with a (cheap)
+        submission of its own, so that downstream tasks receive one future per child.
+        With a window, at most `window_size // batch_size` batches (and at least one)
+        are running at once.
+
+        While the window is full, this method blocks the thread it runs on until a
+        child finishes.
+
+        Args:
+            - state (State): the current task state
+            - upstream_states (Dict[Edge, State]): the upstream states
+            - run_fn (Callable): the function used to run each child, with signature
+                `run_fn(state, map_index, upstream_states, child_context)`
+            - executor (Executor): executor to use when performing computation
+            - window_size (int, optional): the maximum number of children submitted but
+                unfinished at once; if 0 (the default), all children are submitted at
+                once
+            - batch_size (int, optional): the number of children run by each executor
+                submission; defaults to 1
+
+        Returns:
+            - State: a `Mapped` state whose children have all been submitted
+        """
+
+        def run_batch(batch: List[tuple]) -> List[State]:
+            return [run_fn(*child) for child in batch]
+
+        n_map_states = self.count_mapped_children(
+            state=state, upstream_states=upstream_states
+        )
+
+        # generate initial states, if available; children without one are given a
+        # `None` placeholder, since a `Mapped` state's `n_map_states` (which is what
+        # backends such as Cloud use to create the children) is the length of its
+        # `map_states`
+        if isinstance(state, Mapped):
+            initial_states = list(state.map_states)  # type: List[Optional[State]]
+        else:
+            initial_states = []
+        initial_states.extend([None] * (n_map_states - len(initial_states)))
+
+        current_state = Mapped(
+            message="Preparing to submit {} mapped tasks in windows of {} (batches of {}).".format(
+                n_map_states, window_size or n_map_states, batch_size
+            ),
+            map_states=initial_states,  # type: ignore
+        )
+        state = self.handle_state_change(old_state=state, new_state=current_state)
+        if state is not current_state:
+            return state
+
+        children = enumerate(
+            self.generate_map_upstream_states(
+                state=state, upstream_states=upstream_states
+            )
+        )
+
+        def generate_batches() -> Iterator[List[tuple]]:
+            # children are prepared a window at a time, so that runners can load
+            # per-child information for a whole window at once
+            while True:
+                window_children = list(itertools.islice(children, window_size or None))
+                if not window_children:
+                    return
+                window_states, child_contexts = self.prepare_mapped_children(
+                    initial_states=[initial_states[i] for i, _ in window_children],
+                    map_indices=[i for i, _ in window_children],
+                )
+                window = [
+                    (window_state, map_index, child_states, child_context)
+                    for window_state, (map_index, child_states), child_context in zip(
+                        window_states, window_children, child_contexts
+                    )
+                ]  # type: List[tuple]
+                for i in range(0, len(window), batch_size):
+                    yield window[i : i + batch_size]
+
+        max_in_flight = max(window_size // batch_size, 1) if window_size else 0
+        # the future (or, once it has finished, the completed future passed to its
+        # callback) of each submission, along with the number of children it runs
+        submissions = []  # type: List[Tuple[int, Any]]
+        completed = queue.Queue()  # type: queue.Queue
+        in_flight = 0
+
+        def on_done(n: int, future: Any) -> None:
+            completed.put((n, future))
+
+        def collect(block: bool) -> None:
+            nonlocal in_flight
+            try:
+                n, future = completed.get(block=block)
+            except queue.Empty:
+                return
+            submissions[n] = (submissions[n][0], future)
+            in_flight -= 1
+
+        for batch in generate_batches():
+            while max_in_flight and in_flight >= max_in_flight:
+                collect(block=True)
+            if batch_size > 1:
+                future = executor.submit(run_batch, batch)
+            else:
+                future = executor.submit(run_fn, *batch[0])
+            submissions.append((len(batch), future))
+            if max_in_flight:
+                in_flight += 1
+                executor.add_done_callback(
+                    future, partial(on_done, len(submissions) - 1)
+                )
+        while not completed.empty():
+            collect(block=False)
+
+        map_states = []  # type: List[Any]
+        for n_children, future in submissions:
+            if batch_size > 1:
+                map_states.extend(
+                    executor.submit(operator.getitem, future, i)
+                    for i in range(n_children)
+                )
+            else:
+                map_states.append(future)
+
+        self.logger.debug(
+            "{} mapped tasks submitted for execution.".format(len(map_states))
+        )
+        new_state = Mapped(
+            message="Mapped tasks submitted for execution.", map_states=map_states
+        )
+        return self.handle_state_change(old_state=state, new_state=new_state)
+
+    def prepare_mapped_children(
+        self, initial_states: List[Optional[State]], map_indices: Iterable[int]
+    ) -> Tuple[List[Optional[State]], List[Dict[str, Any]]]:
+        """
+        Called with a group of mapped children before they are submitted, to provide the
+        initial state and any additional context for each of them. Runners which need
+        per-child information (for example, from a backend) can load it for the whole
+        group at once by overriding this method.
+
+        Args:
+            - initial_states (List[Optional[State]]): the initial state of each child, if
+                known
+            - map_indices (Iterable[int]): the map index of each child
+
+        Returns:
+            - Tuple[List[Optional[State]], List[dict]]: the initial state of each child, and
+                a dictionary of context to run each child with
+        """
+        return initial_states, [{} for _ in initial_states]
+
+    def scatter_upstream_states(
+        self,
+        upstream_states: Dict[Edge, State],
+        executor: "prefect.engine.executors.Executor",
+    ) -> Dict[Edge, State]:
+        """
+        Prepares the upstream states of a mapped task so that each child only receives
+        its own payload:
+            - states which are _not_ mapped over are shared by every child, so they are
+                scattered to the executor a single time and children receive a reference
+                to them
+            - states whose results are mapped over are stripped of their `cached_inputs`,
+                which children never use, so that the per-element copies only carry the
+                element itself
+
+        Args:
+            - upstream_states (Dict[Edge, State]): the upstream states
+            - executor (Executor): executor to use when performing computation
+
+        Returns:
+            - Dict[Edge, State]: the upstream states to generate children from
+        """
+        scattered = {}  # type: Dict[Edge, State]
+        for edge, upstream_state in upstream_states.items():
+            if not edge.mapped:
+                scattered[edge] = executor.scatter(upstream_state)
+            elif upstream_state.is_mapped():
+                scattered[edge] = upstream_state
+            else:
+                scattered[edge] = copy.copy(upstream_state)
+                scattered[edge].cached_inputs = {}
+        return scattered
+
+    def count_mapped_children(
+        self, state: State, upstream_states: Dict[Edge, State]
+    ) -> int:
+        """
+        Computes how many children a mapped task will have, i.e. the length of the shortest
+        mapped upstream iterable, without generating the children's upstream states.
+
+        Args:
+            - state (State): the current task state
+            - upstream_states (Dict[Edge, State]): the upstream states
+
+        Returns:
+            - int: the number of mapped children
+        """
+        lengths = []
+        try:
+            for edge, upstream_state in upstream_states.items():
+                if not edge.mapped:
+                    continue
+                elif upstream_state.is_mapped():
+                    lengths.append(len(upstream_state.map_states))  # type: ignore
+                elif not state.is_mapped() or upstream_state._result != NoResult:
+                    lengths.append(len(upstream_state.result))
+                else:
+                    lengths.append(len(state.map_states))  # type: ignore
+        except TypeError:
+            # the upstream result doesn't support `len()`, so we count the children directly
+            return sum(
+                1
+                for _ in self.generate_map_upstream_states(
+                    state=state, upstream_states=upstream_states
+                )
+            )
+        return min(lengths) if lengths else 0
+
+    def generate_map_upstream_states(
+        self, state: State, upstream_states: Dict[Edge, State]
+    ) -> Iterator[Dict[Edge, State]]:
+        """
+        Lazily generates the upstream states of each child of a mapped task, in order of
+        `map_index`, stopping at the end of the shortest mapped upstream iterable.
+
+        Args:
+            - state (State): the current task state
+            - upstream_states (Dict[Edge, State]): the upstream states
 
+        Returns:
+            - Iterator[Dict[Edge, State]]: the upstream states for each child
+        """
         # we don't know how long the iterables are, but we want to iterate until we reach
         # the end of the shortest one
         counter = itertools.count()
@@ -726,54 +1097,12 @@ class TaskRunner(Runner):
                             if i >= len(state.map_states):  # type: ignore
                                 raise IndexError()
 
-                # only add this iteration if we made it through all iterables
-                map_upstream_states.append(states)
-
             # index error means we reached the end of the shortest iterable
             except IndexError:
-                break
-
-        def run_fn(
-            state: State, map_index: int, upstream_states: Dict[Edge, State]
-        ) -> State:
-            map_context = context.copy()
-            map_context.update(map_index=map_index)
-            with prefect.context(self.context):
-                return self.run(
-                    upstream_states=upstream_states,
-                    # if we set the state here, then it will not be processed by `initialize_run()`
-                    state=state,
-                    context=map_context,
-                    executor=executor,
-                )
-
-        # generate initial states, if available
-        if isinstance(state, Mapped):
-            initial_states = list(state.map_states)  # type: List[Optional[State]]
-        else:
-            initial_states = []
-        initial_states.extend([None] * (len(map_upstream_states) - len(initial_states)))
+                return
 
-        current_state = Mapped(
-            message="Preparing to submit {} mapped tasks.".format(len(initial_states)),
-            map_states=initial_states,  # type: ignore
-        )
-        state = self.handle_state_change(old_state=state, new_state=current_state)
-        if state is not current_state:
-            return state
-
-        # map over the initial states, a counter representing the map_index, and also the mapped upstream states
-        map_states = executor.map(
-            run_fn, initial_states, range(len(map_upstream_states)), map_upstream_states
-        )
-
-        self.logger.debug(
-            "{} mapped tasks submitted for execution.".format(len(map_states))
-        )
-        new_state = Mapped(
-            message="Mapped tasks submitted for execution.", map_states=map_states
-        )
-        return self.handle_state_change(old_state=state, new_state=new_state)
+            # only yield this iteration if we made it through all iterables
+            yield states
 
     @call_state_handlers
     def wait_for_mapped_task(
@@ -911,7 +1240,12 @@ class TaskRunner(Runner):
             and self.task.checkpoint is not False
             and self.result_handler is not None
         ):
-            state._result.store_safe_value()
+            if prefect.context.config.engine.checkpointing.get("background", False):
+                # downstream tasks use the value in memory, and the write is waited
+                # for (and checked) when the flow run finishes
+                checkpointing.get_checkpoint_pool().submit(state._result)  # type: ignore
+            else:
+                state._result.store_safe_value()
 
         return state
 
@@ -943,11 +1277,30 @@ class TaskRunner(Runner):
             and self.task.cache_for is not None
         ):
             expiration = pendulum.now("utc") + self.task.cache_for
+            # hashing every input can be expensive, so hashes are only recorded for
+            # hash-based cache validators or when cached states are fingerprinted
+            input_hashes = None  # type: Optional[Dict[str, Optional[str]]]
+            parameter_hashes = None  # type: Optional[Dict[str, Optional[str]]]
+            fingerprint = None
+            validates_hashes = getattr(
+                self.task.cache_validator, "validates_hashes", False
+            )
+            if validates_hashes or prefect.context.config.engine.task_runner.get(
+                "fingerprint_cached_states", False
+            ):
+                input_hashes = {key: res.value_hash for key, res in inputs.items()}
+                parameter_hashes = hashing.hash_values(
+                    prefect.context.get("parameters") or {}
+                )
+                fingerprint = hashing.fingerprint(input_hashes, parameter_hashes)
             cached_state = Cached(
                 result=state._result,
                 cached_inputs=inputs,
                 cached_result_expiration=expiration,
                 cached_parameters=prefect.context.get("parameters"),
+                cached_fingerprint=fingerprint,
+                cached_input_hashes=input_hashes,
+                cached_parameter_hashes=parameter_hashes,
                 message=state.message,
             )
             return cached_state
@@ -11,6 +11,7 @@ class SafeResultSchema(ObjectSchema):
 
     value = JSONCompatible(allow_none=True)
     result_handler = fields.Nested(ResultHandlerSchema, allow_none=False)
+    metadata = JSONCompatible(allow_none=True)
 
 
 class NoResultSchema(ObjectSchema):
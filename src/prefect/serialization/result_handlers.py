@@ -5,6 +5,7 @@ from marshmallow import ValidationError, fields, post_load
 
 from prefect.engine.result_handlers import (
     AzureResultHandler,
+    CachedResultHandler,
     GCSResultHandler,
     JSONResultHandler,
     LocalResultHandler,
@@ -58,6 +59,9 @@ class GCSResultHandlerSchema(BaseResultHandlerSchema):
 
     bucket = fields.String(allow_none=False)
     credentials_secret = fields.String(allow_none=True)
+    serializer = fields.String(allow_none=True)
+    compression = fields.String(allow_none=True)
+    content_addressed = fields.Boolean(allow_none=True)
 
 
 class JSONResultHandlerSchema(BaseResultHandlerSchema):
@@ -70,6 +74,10 @@ class LocalResultHandlerSchema(BaseResultHandlerSchema):
         object_class = LocalResultHandler
 
     dir = fields.String(allow_none=True)
+    serializer = fields.String(allow_none=True)
+    compression = fields.String(allow_none=True)
+    memory_map = fields.Boolean(allow_none=True)
+    content_addressed = fields.Boolean(allow_none=True)
 
 
 class S3ResultHandlerSchema(BaseResultHandlerSchema):
@@ -78,6 +86,9 @@ class S3ResultHandlerSchema(BaseResultHandlerSchema):
 
     bucket = fields.String(allow_none=False)
     aws_credentials_secret = fields.String(allow_none=True)
+    serializer = fields.String(allow_none=True)
+    compression = fields.String(allow_none=True)
+    content_addressed = fields.Boolean(allow_none=True)
 
 
 class AzureResultHandlerSchema(BaseResultHandlerSchema):
@@ -86,6 +97,16 @@ class AzureResultHandlerSchema(BaseResultHandlerSchema):
 
     container = fields.String(allow_none=False)
     azure_credentials_secret = fields.String(allow_none=True)
+    serializer = fields.String(allow_none=True)
+    compression = fields.String(allow_none=True)
+    content_addressed = fields.Boolean(allow_none=True)
+
+
+class CachedResultHandlerSchema(BaseResultHandlerSchema):
+    class Meta:
+        object_class = CachedResultHandler
+
+    handler = fields.Nested("ResultHandlerSchema", allow_none=False)
 
 
 class ResultHandlerSchema(OneOfSchema):
@@ -101,6 +122,7 @@ class ResultHandlerSchema(OneOfSchema):
         "JSONResultHandler": JSONResultHandlerSchema,
         "LocalResultHandler": LocalResultHandlerSchema,
         "AzureResultHandler": AzureResultHandlerSchema,
+        "CachedResultHandler": CachedResultHandlerSchema,
         "SecretResultHandler": SecretResultHandlerSchema,
         "CustomResultHandler": CustomResultHandlerSchema,
     }
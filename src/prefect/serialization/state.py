@@ -125,6 +125,13 @@ class CachedSchema(SuccessSchema):
 
     cached_parameters = JSONCompatible(allow_none=True)
     cached_result_expiration = fields.DateTime(allow_none=True)
+    cached_fingerprint = fields.String(allow_none=True)
+    cached_input_hashes = fields.Dict(
+        keys=fields.String(), values=fields.String(allow_none=True), allow_none=True
+    )
+    cached_parameter_hashes = fields.Dict(
+        keys=fields.String(), values=fields.String(allow_none=True), allow_none=True
+    )
 
 
 class MappedSchema(SuccessSchema):
@@ -83,6 +83,7 @@ class TaskSchema(TaskMethodsMixin, ObjectSchema):
     inputs = fields.Method("load_inputs", allow_none=True)
     outputs = fields.Method("load_outputs", allow_none=True)
     timeout = fields.Integer(allow_none=True)
+    map_batch_size = fields.Integer(allow_none=True)
     trigger = StatefulFunctionReference(
         valid_functions=[
             prefect.triggers.all_finished,
@@ -110,6 +111,10 @@ class TaskSchema(TaskMethodsMixin, ObjectSchema):
             prefect.engine.cache_validators.all_parameters,
             prefect.engine.cache_validators.partial_inputs_only,
             prefect.engine.cache_validators.partial_parameters_only,
+            prefect.engine.cache_validators.all_input_hashes,
+            prefect.engine.cache_validators.all_parameter_hashes,
+            prefect.engine.cache_validators.partial_input_hashes_only,
+            prefect.engine.cache_validators.partial_parameter_hashes_only,
         ],
         # don't reject custom functions, just leave them as strings
         reject_invalid=False,
@@ -39,6 +39,7 @@ Prefect provides various key / value pairs in context that are always available
 | `task_run_count` | the run count of the task run - typically only interesting for retrying tasks |
 | `task_loop_count` | if the Task utilizes looping, the loop count of the task run |
 | `task_loop_result` | if the Task is looping, the current loop result |
+| `cancel_event` | if the Task has a `timeout` which can only be enforced softly, a `threading.Event` which is set once the task run times out |
 
 In addition, Prefect Cloud supplies some additional context variables:
 
@@ -57,11 +58,20 @@ Users can also provide values to context at runtime.
 
 import contextlib
 import threading
-from typing import Any, Iterator, MutableMapping
+from typing import Any, Dict, Iterator, List, MutableMapping
 
 from prefect.configuration import Config, config
 from prefect.utilities.collections import DotDict, merge_dicts
 
+# sentinel recorded for keys that did not exist before a context frame changed them
+_MISSING = object()
+
+
+class _FrameStacks(threading.local):
+    def __init__(self) -> None:
+        # stacks of context frames, keyed by the id of the Context they belong to
+        self.stacks = {}  # type: Dict[int, List[Dict[str, Any]]]
+
 
 class Context(DotDict, threading.local):
     """
@@ -69,12 +79,22 @@ class Context(DotDict, threading.local):
 
     The `Context` is a `DotDict` subclass, and can be instantiated the same way.
 
+    Entering the context with `prefect.context(...)` pushes a new frame onto a per-thread
+    stack. Whenever a key is modified, its previous value is recorded in the innermost
+    frame (only the first time it changes), and exiting the context pops the frame and
+    restores the recorded values. Entering and exiting a context therefore costs time
+    proportional to the number of keys changed rather than to the size of the context.
+
     Args:
         - *args (Any): arguments to provide to the `DotDict` constructor (e.g.,
             an initial dictionary)
         - **kwargs (Any): any key / value pairs to initialize this context with
     """
 
+    # per-thread frame stacks; these can't be stored on the instance since its `__dict__`
+    # holds the context's data
+    _frames = _FrameStacks()
+
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
         if "context" in config:
@@ -99,6 +119,24 @@ class Context(DotDict, threading.local):
     def __repr__(self) -> str:
         return "<Context>"
 
+    def _frame_stack(self) -> List[Dict[str, Any]]:
+        return Context._frames.stacks.setdefault(id(self), [])
+
+    def _record(self, key: str) -> None:
+        stack = Context._frames.stacks.get(id(self))
+        if stack:
+            frame = stack[-1]
+            if key not in frame:
+                frame[key] = self.__dict__.get(key, _MISSING)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._record(key)
+        self.__dict__[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        self._record(key)
+        del self.__dict__[key]
+
     @contextlib.contextmanager
     def __call__(self, *args: MutableMapping, **kwargs: Any) -> Iterator["Context"]:
         """
@@ -109,18 +147,37 @@ class Context(DotDict, threading.local):
             with prefect.context(dict(a=1, b=2), c=3):
                 print(prefect.context.a) # 1
         """
-        previous_context = self.copy()
+        stack = self._frame_stack()
+        frame = {}  # type: Dict[str, Any]
+        stack.append(frame)
         try:
             new_context = dict(*args, **kwargs)
             if "config" in new_context:
-                new_context["config"] = merge_dicts(
-                    self.get("config", {}), new_context["config"]
-                )
+                # runners re-enter the configuration they were created with for every
+                # task run, in which case there's nothing to merge
+                if new_context["config"] == self.get("config", {}):
+                    del new_context["config"]
+                else:
+                    new_context["config"] = merge_dicts(
+                        self.get("config", {}), new_context["config"]
+                    )
             self.update(new_context)  # type: ignore
             yield self
         finally:
-            self.clear()
-            self.update(previous_context)
+            # frames are almost always popped in order, but a context manager can be
+            # closed out of order (e.g. by an abandoned generator)
+            for i in range(len(stack) - 1, -1, -1):
+                if stack[i] is frame:
+                    del stack[i]
+                    break
+            if not stack:
+                Context._frames.stacks.pop(id(self), None)
+            data = self.__dict__
+            for key, value in frame.items():
+                if value is _MISSING:
+                    data.pop(key, None)
+                else:
+                    data[key] = value
 
 
 context = Context()
@@ -1,9 +1,16 @@
+import atexit
+import collections
 import datetime
+import glob
+import mmap
 import multiprocessing
+import multiprocessing.connection
 import os
+import pickle
 import signal
 import subprocess
 import sys
+import tempfile
 import threading
 import time
 import warnings
@@ -12,13 +19,27 @@ from concurrent.futures import ThreadPoolExecutor
 from concurrent.futures import TimeoutError as FutureTimeout
 from functools import wraps
 from logging import Logger
-from typing import TYPE_CHECKING, Any, Callable, Dict, List, Union
-
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Counter,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+import cloudpickle
 import dask
 import dask.bag
 
 import prefect
 from prefect.core.edge import Edge
+from prefect.utilities.logging import get_logger
+from prefect.utilities.process_state import register_reset
 
 if TYPE_CHECKING:
     import prefect.engine.runner
@@ -27,20 +48,186 @@ if TYPE_CHECKING:
 StateList = Union["State", List["State"]]
 
 
+class HeartbeatService:
+    """
+    Sends heartbeats for every run in this process from a single, long-lived
+    `prefect heartbeat service` subprocess, rather than starting a new subprocess for
+    every run.
+
+    Runs are registered and unregistered by writing to the subprocess's standard input;
+    it sends one batched heartbeat for all registered runs per `cloud.heartbeat_interval`
+    and exits when this process exits. If the subprocess dies, it is restarted (with all
+    currently registered runs) the next time a run is registered or unregistered.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._runs = collections.Counter()  # type: Counter[Tuple[str, str]]
+        self._process = None  # type: Optional[subprocess.Popen]
+
+    def register(self, kind: str, run_id: str) -> None:
+        """
+        Starts heartbeating a run; registering the same run more than once requires a
+        matching number of calls to `unregister`.
+
+        Args:
+            - kind (str): either `"flow-run"` or `"task-run"`
+            - run_id (str): the ID of the run
+        """
+        with self._lock:
+            self._runs[(kind, run_id)] += 1
+            if self._runs[(kind, run_id)] == 1:
+                try:
+                    self._send("add", kind, run_id)
+                except Exception:
+                    del self._runs[(kind, run_id)]
+                    raise
+
+    def unregister(self, kind: str, run_id: str) -> None:
+        """
+        Stops heartbeating a run.
+
+        Args:
+            - kind (str): either `"flow-run"` or `"task-run"`
+            - run_id (str): the ID of the run
+        """
+        with self._lock:
+            self._runs[(kind, run_id)] -= 1
+            if self._runs[(kind, run_id)] <= 0:
+                del self._runs[(kind, run_id)]
+                self._send("remove", kind, run_id)
+
+    def _send(self, action: str, kind: str, run_id: str) -> None:
+        if self._process is not None and self._process.poll() is None:
+            try:
+                self._write("{} {} {}\n".format(action, kind, run_id))
+                return
+            except OSError:
+                pass
+        # (re)starting the service registers every current run
+        if self._runs:
+            self._start()
+
+    def _write(self, lines: str) -> None:
+        self._process.stdin.write(lines)  # type: ignore
+        self._process.stdin.flush()  # type: ignore
+
+    def _start(self) -> None:
+        current_env = dict(os.environ).copy()
+        auth_token = prefect.context.config.cloud.get("auth_token")
+        api_url = prefect.context.config.cloud.get("api")
+        current_env.setdefault("PREFECT__CLOUD__AUTH_TOKEN", auth_token)
+        current_env.setdefault("PREFECT__CLOUD__API", api_url)
+        self._process = subprocess.Popen(
+            ["prefect", "heartbeat", "service"],
+            stdin=subprocess.PIPE,
+            env=current_env,
+            universal_newlines=True,
+            # the service exits once every copy of the write end of its standard input
+            # is closed, so other programs started by this process mustn't inherit it
+            close_fds=True,
+        )
+        self._write("".join("add {} {}\n".format(kind, id) for kind, id in self._runs))
+
+    def stop(self) -> None:
+        """
+        Stops the subprocess, which stops heartbeating every registered run until a run
+        is next registered or unregistered.
+        """
+        with self._lock:
+            if self._process is not None:
+                try:
+                    self._process.stdin.close()  # type: ignore
+                except OSError:
+                    pass
+                self._process.wait()
+                self._process = None
+
+    def _close_in_child(self) -> None:
+        # forked children inherit the write end of the service's standard input without
+        # an exec to close it, and would otherwise keep the service alive after this
+        # process exits; they start their own service instead
+        if self._process is not None and self._process.stdin is not None:
+            # the file itself is closed, without flushing anything the parent process
+            # was writing when it forked
+            self._process.stdin.buffer.raw.close()  # type: ignore
+
+
+_heartbeat_service = None  # type: Optional[HeartbeatService]
+_heartbeat_service_pid = None  # type: Optional[int]
+_heartbeat_service_lock = threading.Lock()
+
+
+def _close_heartbeat_service_in_child() -> None:
+    if _heartbeat_service is not None:
+        _heartbeat_service._close_in_child()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_close_heartbeat_service_in_child)
+
+
+def get_heartbeat_service() -> HeartbeatService:
+    """
+    Returns this process's `HeartbeatService`, creating it on first use (and again in
+    any forked child process).
+
+    Returns:
+        - HeartbeatService: the heartbeat service shared by all runners in this process
+    """
+    global _heartbeat_service, _heartbeat_service_pid
+    with _heartbeat_service_lock:
+        if _heartbeat_service is None or _heartbeat_service_pid != os.getpid():
+            _heartbeat_service = HeartbeatService()
+            _heartbeat_service_pid = os.getpid()
+        return _heartbeat_service
+
+
+@register_reset
+def reset_heartbeat_service() -> None:
+    """
+    Stops this process's `HeartbeatService`, if one was created, so that the next call
+    to `get_heartbeat_service` creates a new one.
+    """
+    global _heartbeat_service
+    with _heartbeat_service_lock:
+        if _heartbeat_service is not None:
+            _heartbeat_service.stop()
+        _heartbeat_service = None
+
+
+def _heartbeat_service_run(heartbeat_cmd: List[str]) -> Optional[Tuple[str, str]]:
+    # `prefect heartbeat [flow-run/task-run] -i ID` commands can be served by the
+    # heartbeat service; any other command is run in its own subprocess
+    if (
+        len(heartbeat_cmd) == 5
+        and heartbeat_cmd[:2] == ["prefect", "heartbeat"]
+        and heartbeat_cmd[2] in ("flow-run", "task-run")
+        and heartbeat_cmd[3] in ("-i", "--id")
+    ):
+        return heartbeat_cmd[2], heartbeat_cmd[4]
+    return None
+
+
 def run_with_heartbeat(
     runner_method: Callable[..., "prefect.engine.state.State"]
 ) -> Callable[..., "prefect.engine.state.State"]:
     """
     Utility decorator for running class methods with a heartbeat.  The class should implement
     `self._heartbeat` with no arguments.
+
+    By default, `self.heartbeat_cmd` is run in a new subprocess for every run; if
+    `cloud.heartbeat_mode` is set to `"service"`, runs are heartbeat by this process's
+    `HeartbeatService` instead.
     """
 
     @wraps(runner_method)
     def inner(
         self: "prefect.engine.runner.Runner", *args: Any, **kwargs: Any
     ) -> "prefect.engine.state.State":
+        p = None
+        service_run = None
         try:
-            p = None
             try:
                 if self._heartbeat():
                     # we use Popen + a prefect CLI for a few reasons:
@@ -50,13 +237,19 @@ def run_with_heartbeat(
                     # - using multiprocessing.Process would release the GIL but a subprocess
                     #   cannot be spawned from a deamonic subprocess, and Dask sometimes will
                     #   submit tasks to run within daemonic subprocesses
-                    current_env = dict(os.environ).copy()
-                    auth_token = prefect.context.config.cloud.get("auth_token")
-                    api_url = prefect.context.config.cloud.get("api")
-                    current_env.setdefault("PREFECT__CLOUD__AUTH_TOKEN", auth_token)
-                    current_env.setdefault("PREFECT__CLOUD__API", api_url)
-                    p = subprocess.Popen(self.heartbeat_cmd, env=current_env)
+                    if prefect.context.config.cloud.get("heartbeat_mode") == "service":
+                        service_run = _heartbeat_service_run(self.heartbeat_cmd)
+                    if service_run is not None:
+                        get_heartbeat_service().register(*service_run)
+                    else:
+                        current_env = dict(os.environ).copy()
+                        auth_token = prefect.context.config.cloud.get("auth_token")
+                        api_url = prefect.context.config.cloud.get("api")
+                        current_env.setdefault("PREFECT__CLOUD__AUTH_TOKEN", auth_token)
+                        current_env.setdefault("PREFECT__CLOUD__API", api_url)
+                        p = subprocess.Popen(self.heartbeat_cmd, env=current_env)
             except Exception as exc:
+                service_run = None
                 self.logger.exception(
                     "Heartbeat failed to start.  This could result in a zombie run."
                 )
@@ -64,6 +257,11 @@ def run_with_heartbeat(
         finally:
             if p is not None:
                 p.kill()
+            if service_run is not None:
+                try:
+                    get_heartbeat_service().unregister(*service_run)
+                except Exception as exc:
+                    self.logger.exception("Heartbeat failed to stop.")
 
     return inner
 
@@ -106,15 +304,22 @@ def multiprocessing_timeout(
 ) -> Any:
     """
     Helper function for implementing timeouts on function executions.
-    Implemented by spawning a new multiprocess.Process() and joining with timeout.
+    Implemented by running the function in a new (forked) process, which is stopped if
+    the function times out. If `engine.timeouts.reuse_workers` is set, the function is
+    instead run in a worker process of this process's `TimeoutProcessPool`, which is
+    killed (and replaced) if the function times out; see its documentation for how this
+    differs.
+
     Args:
         - fn (callable): the function to execute
         - *args (Any): arguments to pass to the function
         - timeout (int): the length of time to allow for
             execution before raising a `TimeoutError`, represented as an integer in seconds
         - **kwargs (Any): keyword arguments to pass to the function
+
     Returns:
         - the result of `f(*args, **kwargs)`
+
     Raises:
         - AssertionError: if run from a daemonic process
         - TimeoutError: if function execution exceeds the allowed timeout
@@ -123,31 +328,345 @@ def multiprocessing_timeout(
     if timeout is None:
         return fn(*args, **kwargs)
 
+    if prefect.context.config.engine.timeouts.get("reuse_workers", False):
+        return get_timeout_pool().run(fn, *args, timeout=timeout, **kwargs)
+    return _process_timeout(fn, *args, timeout=timeout, **kwargs)
+
+
+def _timeout_worker(
+    conn: "multiprocessing.connection.Connection", threshold: int, shm_dir: str
+) -> None:
+    # the main loop of a `TimeoutProcessPool` worker, which runs calls until the pool
+    # closes its end of the pipe
+    while True:
+        try:
+            call = conn.recv_bytes()
+        except (EOFError, OSError):
+            return
+        try:
+            task, ctx = pickle.loads(call)
+            fn, args, kwargs = pickle.loads(task)
+            with prefect.context(ctx):
+                message = ("value", fn(*args, **kwargs))  # type: Tuple[str, Any]
+        except Exception as exc:
+            message = ("error", exc)
+        conn.send(_dump_timeout_result(message, threshold, shm_dir))
+
+
+def _dumps(obj: Any) -> bytes:
+    # the standard library's pickler is much faster than cloudpickle's (which is written
+    # in Python), and is enough for data such as contexts and most results
+    try:
+        return pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return cloudpickle.dumps(obj)
+
+
+def _dump_timeout_result(
+    message: Tuple[str, Any], threshold: int, shm_dir: str
+) -> Tuple[str, Any]:
+    try:
+        data = _dumps(message)
+    except Exception as exc:
+        data = _dumps(
+            ("error", TypeError("Could not pickle the result: {}".format(repr(exc))))
+        )
+    if len(data) <= threshold:
+        return ("pickle", data)
+    # large results are handed over through a file in shared memory instead of being
+    # copied through the pipe
+    fd, path = tempfile.mkstemp(
+        prefix="prefect-timeout-{}-".format(os.getpid()), dir=shm_dir
+    )
+    with open(fd, "wb") as f:
+        f.write(data)
+    return ("file", path)
+
+
+def _load_timeout_result(kind: str, data: Any) -> Tuple[str, Any]:
+    if kind == "pickle":
+        return pickle.loads(data)
+    try:
+        with open(data, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                return pickle.loads(buffer)  # type: ignore
+    finally:
+        os.unlink(data)
+
+
+class _TimeoutWorker:
+    def __init__(self, threshold: int, shm_dir: str) -> None:
+        self.conn, child_conn = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(
+            target=_timeout_worker,
+            args=(child_conn, threshold, shm_dir),
+            name="prefect-timeout-worker",
+        )
+        self.process.start()
+        child_conn.close()
+        self.calls = 0
+
+    def kill(self, shm_dir: str) -> None:
+        self.conn.close()
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        # remove any result the worker was handing over when it was killed
+        for path in glob.glob(
+            os.path.join(shm_dir, "prefect-timeout-{}-*".format(self.process.pid))
+        ):
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+
+class TimeoutProcessPool:
+    """
+    A pool of reusable worker processes which run functions with hard timeouts outside of
+    the main thread, where `signal` alarms can't be used. `multiprocessing_timeout` only
+    uses it if `engine.timeouts.reuse_workers` is set, and otherwise forks a new process
+    for every call.
+
+    Each call is sent to an idle worker (or to a new worker, if none is idle), and the
+    worker is killed and discarded if the call times out, so that calls only pay for
+    starting a process after a timeout or once a worker has run `max_calls_per_worker`
+    calls. Calls and their context are pickled with `cloudpickle`; calls which can't be
+    pickled run in a new process of their own, as they do without the pool. Results which
+    pickle to more than `shared_memory_threshold` bytes are written to a file in shared
+    memory (`/dev/shm`, where it exists) rather than sent through the worker's pipe; they
+    are still copied when they are unpickled.
+
+    Unlike a process forked for each call, a worker:
+
+    - is a copy of this process as it was when the worker started, so changes made
+        since then (to module globals, for example) aren't seen by its calls
+    - keeps any changes its calls make to module globals, environment variables and
+        other process-wide state for its later calls, which may belong to unrelated tasks
+    - runs copies of each function and its arguments, which were pickled and unpickled
+        rather than inherited; those which don't unpickle to equivalent objects (such as
+        objects compared by identity) behave differently
+
+    Args:
+        - max_idle_workers (int, optional): the number of idle workers kept for later
+            calls; defaults to 4
+        - shared_memory_threshold (int, optional): the size in bytes above which
+            results are returned through shared memory; defaults to 1 MiB
+        - max_calls_per_worker (int, optional): the number of calls each worker runs
+            before it is replaced, which bounds how long state left behind by calls is
+            kept; defaults to 100
+    """
+
+    def __init__(
+        self,
+        max_idle_workers: int = 4,
+        shared_memory_threshold: int = 2 ** 20,
+        max_calls_per_worker: int = 100,
+    ) -> None:
+        if max_calls_per_worker < 1:
+            raise ValueError("max_calls_per_worker must be at least 1.")
+        self.max_idle_workers = max_idle_workers
+        self.shared_memory_threshold = shared_memory_threshold
+        self.max_calls_per_worker = max_calls_per_worker
+        self.shm_dir = (
+            "/dev/shm"
+            if os.access("/dev/shm", os.W_OK | os.X_OK)
+            else tempfile.gettempdir()
+        )
+        self._lock = threading.Lock()
+        self._idle = []  # type: List[_TimeoutWorker]
+        self._busy = set()  # type: Set[_TimeoutWorker]
+
+    @property
+    def workers(self) -> int:
+        """
+        The number of live worker processes, idle or running calls.
+        """
+        with self._lock:
+            return len(self._idle) + len(self._busy)
+
+    def run(
+        self, fn: Callable, *args: Any, timeout: float = None, **kwargs: Any
+    ) -> Any:
+        """
+        Runs a function in a worker process, and kills the worker if it doesn't return
+        within `timeout` seconds.
+
+        Args:
+            - fn (callable): the function to execute
+            - *args (Any): arguments to pass to the function
+            - timeout (float, optional): the number of seconds to allow for execution
+                before raising a `TimeoutError`, if any
+            - **kwargs (Any): keyword arguments to pass to the function
+
+        Returns:
+            - the result of `fn(*args, **kwargs)`
+
+        Raises:
+            - TimeoutError: if function execution exceeds the allowed timeout
+            - RuntimeError: if the worker process exits while running the function
+        """
+        try:
+            call = _dumps(
+                (cloudpickle.dumps((fn, args, kwargs)), prefect.context.to_dict())
+            )
+        except Exception:
+            return _process_timeout(fn, *args, timeout=timeout, **kwargs)
+
+        worker = self._acquire()
+        worker.calls += 1
+        try:
+            worker.conn.send_bytes(call)
+            if not worker.conn.poll(timeout):
+                raise TimeoutError("Execution timed out.")
+            kind, data = worker.conn.recv()
+        except TimeoutError:
+            self._discard(worker)
+            raise
+        except (EOFError, OSError):
+            self._discard(worker)
+            raise RuntimeError(
+                "The timeout worker process exited with code {}.".format(
+                    worker.process.exitcode
+                )
+            )
+        self._release(worker)
+
+        status, value = _load_timeout_result(kind, data)
+        if status == "error":
+            raise value
+        return value
+
+    def _acquire(self) -> _TimeoutWorker:
+        with self._lock:
+            while self._idle:
+                worker = self._idle.pop()
+                # workers which died while idle (for example, killed by the OOM killer)
+                # are replaced
+                if worker.process.is_alive():
+                    self._busy.add(worker)
+                    return worker
+                worker.kill(self.shm_dir)
+        worker = _TimeoutWorker(self.shared_memory_threshold, self.shm_dir)
+        with self._lock:
+            self._busy.add(worker)
+        return worker
+
+    def _release(self, worker: _TimeoutWorker) -> None:
+        with self._lock:
+            self._busy.discard(worker)
+            if (
+                len(self._idle) < self.max_idle_workers
+                and worker.calls < self.max_calls_per_worker
+            ):
+                self._idle.append(worker)
+                return
+        worker.kill(self.shm_dir)
+
+    def _discard(self, worker: _TimeoutWorker) -> None:
+        with self._lock:
+            self._busy.discard(worker)
+        worker.kill(self.shm_dir)
+
+    def shutdown(self) -> None:
+        """
+        Stops every worker process, including those running calls.
+        """
+        with self._lock:
+            workers = self._idle + list(self._busy)
+            self._idle, self._busy = [], set()
+        for worker in workers:
+            worker.kill(self.shm_dir)
+
+
+_timeout_pool = None  # type: Optional[TimeoutProcessPool]
+_timeout_pool_pid = None  # type: Optional[int]
+_timeout_pool_lock = threading.Lock()
+
+
+def get_timeout_pool() -> TimeoutProcessPool:
+    """
+    Returns this process's `TimeoutProcessPool`, creating it on first use (and again in
+    any forked child process) from the `engine.timeouts` configuration. Its workers are
+    stopped when this process exits.
+
+    Returns:
+        - TimeoutProcessPool: the timeout pool shared by all task runs in this process
+    """
+    global _timeout_pool, _timeout_pool_pid
+    with _timeout_pool_lock:
+        if _timeout_pool is None or _timeout_pool_pid != os.getpid():
+            config = prefect.context.config.engine.timeouts
+            _timeout_pool = TimeoutProcessPool(
+                max_idle_workers=config.max_idle_workers,
+                shared_memory_threshold=config.shared_memory_threshold,
+                max_calls_per_worker=config.max_calls_per_worker,
+            )
+            _timeout_pool_pid = os.getpid()
+            # workers aren't daemonic (so that tasks can start processes of their own),
+            # and must be stopped before multiprocessing waits for them at exit
+            atexit.register(_timeout_pool.shutdown)
+        return _timeout_pool
+
+
+@register_reset
+def reset_timeout_pool() -> None:
+    """
+    Stops the workers of this process's `TimeoutProcessPool`, if one was created, so
+    that the next call to `get_timeout_pool` creates a new pool from the current
+    configuration.
+    """
+    global _timeout_pool
+    with _timeout_pool_lock:
+        if _timeout_pool is not None:
+            _timeout_pool.shutdown()
+            atexit.unregister(_timeout_pool.shutdown)
+        _timeout_pool = None
+
+
+def _process_timeout(
+    fn: Callable, *args: Any, timeout: float = None, **kwargs: Any
+) -> Any:
+    # runs a call in a new (forked) process of its own
+
     def retrieve_value(
-        *args: Any, _container: multiprocessing.Queue, _ctx_dict: dict, **kwargs: Any
+        *args: Any,
+        _conn: "multiprocessing.connection.Connection",
+        _ctx_dict: dict,
+        **kwargs: Any
     ) -> None:
-        """Puts the return value in a multiprocessing-safe container"""
+        """Sends the return value through a pipe"""
         try:
             with prefect.context(_ctx_dict):
                 val = fn(*args, **kwargs)
-            _container.put(val)
+            _conn.send(("value", val))
         except Exception as exc:
-            _container.put(exc)
+            _conn.send(("error", exc))
 
-    q = multiprocessing.Queue()  # type: multiprocessing.Queue
-    kwargs["_container"] = q
+    conn, child_conn = multiprocessing.Pipe(duplex=False)
+    kwargs["_conn"] = child_conn
     kwargs["_ctx_dict"] = prefect.context.to_dict()
     p = multiprocessing.Process(target=retrieve_value, args=args, kwargs=kwargs)
     p.start()
-    p.join(timeout)
-    p.terminate()
-    if not q.empty():
-        res = q.get()
-        if isinstance(res, Exception):
-            raise res
-        return res
-    else:
-        raise TimeoutError("Execution timed out.")
+    child_conn.close()
+    try:
+        # the result is received before the process is stopped, so that results
+        # which are still being sent aren't lost
+        if not conn.poll(timeout):
+            raise TimeoutError("Execution timed out.")
+        try:
+            status, res = conn.recv()
+        except EOFError:
+            raise RuntimeError(
+                "The timeout process exited with code {}.".format(p.exitcode)
+            )
+    finally:
+        conn.close()
+        p.terminate()
+        p.join()
+    if status == "error":
+        raise res
+    return res
 
 
 def timeout_handler(
@@ -158,8 +677,9 @@ def timeout_handler(
 
     The exact implementation varies depending on whether this function is being run
     in the main thread or a non-daemonic subprocess.  If this is run from a daemonic subprocess or on Windows,
-    the task is run in a `ThreadPoolExecutor` and only a soft timeout is enforced, meaning
-    a `TimeoutError` is raised at the appropriate time but the task continues running in the background.
+    the task is run in this process's `SoftTimeoutExecutor` and only a soft timeout is enforced, meaning
+    a `TimeoutError` is raised at the appropriate time but the task continues running in the background
+    (though it can check `prefect.context.cancel_event` to stop early).
 
     Args:
         - fn (callable): the function to execute
@@ -179,7 +699,7 @@ def timeout_handler(
         return fn(*args, **kwargs)
 
     # if we are running the main thread, use a signal to stop execution at the appropriate time;
-    # else if we are running in a non-daemonic process, spawn a subprocess to kill at the appropriate time
+    # else if we are running in a non-daemonic process, run in a worker process to kill at the appropriate time
     if not sys.platform.startswith("win"):
         if threading.current_thread() is threading.main_thread():
             return main_thread_timeout(fn, *args, timeout=timeout, **kwargs)
@@ -201,21 +721,184 @@ def timeout_handler(
         )
 
     warnings.warn(msg)
-    executor = ThreadPoolExecutor()
+    return get_soft_timeout_executor().run(fn, *args, timeout=timeout, **kwargs)
 
-    def run_with_ctx(*args: Any, _ctx_dict: dict, **kwargs: Any) -> Any:
-        with prefect.context(_ctx_dict):
-            return fn(*args, **kwargs)
 
-    fut = executor.submit(
-        run_with_ctx, *args, _ctx_dict=prefect.context.to_dict(), **kwargs
-    )
+class SoftTimeoutExecutor:
+    """
+    A bounded pool of threads which runs functions with soft timeouts, for processes
+    where they can't be stopped when they time out (daemonic processes, and Windows).
+
+    A call which times out raises a `TimeoutError` in its caller but keeps running, and
+    keeping its thread, until it returns; it is then "abandoned". To let calls stop
+    early, each call is run with a `threading.Event` in `prefect.context.cancel_event`,
+    which is set when the call times out:
+
+    ```python
+    @task(timeout=60)
+    def long_running():
+        for chunk in chunks:
+            if prefect.context.cancel_event.is_set():
+                return
+            process(chunk)
+    ```
+
+    Timeouts are measured from when each call starts, so time spent waiting for a free
+    thread doesn't count against them; however, once every thread is consumed by
+    abandoned calls (which may never return), calls which are waiting for one time out
+    without ever running.
 
-    try:
-        return fut.result(timeout=timeout)
-    except FutureTimeout:
+    Args:
+        - max_workers (int, optional): the number of threads, shared by every call
+            (including abandoned calls which are still running); defaults to 32
+    """
+
+    def __init__(self, max_workers: int = 32) -> None:
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="prefect-soft-timeout"
+        )
+        self._lock = threading.Lock()
+        self._running = 0
+        self._abandoned = set()  # type: Set[Any]
+        self._stats = collections.Counter()  # type: Counter[str]
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """
+        Statistics for the calls run by this executor:
+
+        - `running`: the number of calls running, including abandoned calls
+        - `abandoned`: the number of calls which timed out and are still running, each
+            of which is consuming a thread
+        - `timed_out`: the number of calls which timed out
+        - `never_started`: the number of calls which timed out before they started,
+            because every thread was consumed by abandoned calls
+        - `finished_after_timeout`: the number of calls which returned after timing out
+        """
+        with self._lock:
+            stats = {
+                key: self._stats[key]
+                for key in ["timed_out", "never_started", "finished_after_timeout"]
+            }
+            stats.update(running=self._running, abandoned=len(self._abandoned))
+            return stats
+
+    def run(
+        self, fn: Callable, *args: Any, timeout: float = None, **kwargs: Any
+    ) -> Any:
+        """
+        Runs a function in one of this executor's threads, and stops waiting for it
+        `timeout` seconds after it starts.
+
+        Args:
+            - fn (callable): the function to execute
+            - *args (Any): arguments to pass to the function
+            - timeout (float, optional): the number of seconds to wait for the function
+                before raising a `TimeoutError`, if any
+            - **kwargs (Any): keyword arguments to pass to the function
+
+        Returns:
+            - the result of `fn(*args, **kwargs)`
+
+        Raises:
+            - TimeoutError: if function execution exceeds the allowed timeout
+        """
+        cancel_event = threading.Event()
+        started = threading.Event()
+        ctx = prefect.context.to_dict()
+        ctx["cancel_event"] = cancel_event
+        future = self._executor.submit(self._run, fn, args, kwargs, ctx, started)
+
+        # the call waits for a free thread for as long as other calls might free one
+        while not started.wait(timeout):
+            with self._lock:
+                if len(self._abandoned) >= self.max_workers and future.cancel():
+                    self._stats["timed_out"] += 1
+                    self._stats["never_started"] += 1
+                    raise TimeoutError(
+                        "Execution timed out before it started: all {} soft timeout "
+                        "threads are consumed by runs which timed out.".format(
+                            self.max_workers
+                        )
+                    )
+
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeout:
+            pass
+
+        cancel_event.set()
+        with self._lock:
+            self._stats["timed_out"] += 1
+            self._abandoned.add(future)
+            abandoned = len(self._abandoned)
+        future.add_done_callback(self._finish_abandoned)
+        if abandoned >= self.max_workers // 2:
+            get_logger(type(self).__name__).warning(
+                "{} of {} soft timeout threads are consumed by runs which timed "
+                "out but are still running.".format(abandoned, self.max_workers)
+            )
         raise TimeoutError("Execution timed out.")
 
+    def _run(
+        self,
+        fn: Callable,
+        args: tuple,
+        kwargs: dict,
+        ctx: dict,
+        started: threading.Event,
+    ) -> Any:
+        with self._lock:
+            self._running += 1
+        started.set()
+        try:
+            with prefect.context(ctx):
+                return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def _finish_abandoned(self, future: Any) -> None:
+        with self._lock:
+            if future in self._abandoned:
+                self._abandoned.discard(future)
+                self._stats["finished_after_timeout"] += 1
+
+
+_soft_timeout_executor = None  # type: Optional[SoftTimeoutExecutor]
+_soft_timeout_executor_lock = threading.Lock()
+
+
+def get_soft_timeout_executor() -> SoftTimeoutExecutor:
+    """
+    Returns this process's `SoftTimeoutExecutor`, creating it on first use from the
+    `engine.timeouts` configuration.
+
+    Returns:
+        - SoftTimeoutExecutor: the soft timeout executor shared by all task runs in this
+            process
+    """
+    global _soft_timeout_executor
+    with _soft_timeout_executor_lock:
+        if _soft_timeout_executor is None:
+            _soft_timeout_executor = SoftTimeoutExecutor(
+                max_workers=prefect.context.config.engine.timeouts.soft_timeout_threads
+            )
+        return _soft_timeout_executor
+
+
+@register_reset
+def reset_soft_timeout_executor() -> None:
+    """
+    Forgets this process's `SoftTimeoutExecutor`, so that the next call to
+    `get_soft_timeout_executor` creates a new one from the current configuration. Runs
+    which timed out keep their threads until they return.
+    """
+    global _soft_timeout_executor
+    with _soft_timeout_executor_lock:
+        _soft_timeout_executor = None
+
 
 class RecursiveCall(Exception):
     def __init__(self, func: Callable, *args: Any, **kwargs: Any):
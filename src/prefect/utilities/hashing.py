@@ -0,0 +1,177 @@
+"""
+Stable hashes of Python values, which (unlike `hash()`) are the same in every process
+and on every machine, for identifying task inputs and parameters across runs.
+"""
+import hashlib
+import sys
+from typing import Any, Dict, Optional
+
+import cloudpickle
+
+
+def stable_hash(value: Any) -> str:
+    """
+    Hashes a value by its contents, so that equal values have equal hashes in every
+    process.
+
+    `None`, booleans, numbers, strings, bytes-like objects, NumPy arrays, pandas
+    DataFrames, Series and Indexes, and lists, tuples, sets and dicts of them are hashed
+    by their contents, regardless of the order of the items of sets and dicts. Arrays
+    are hashed from their memory (along with their dtype and shape) and pandas objects
+    from `pandas.util.hash_pandas_object`, without being copied or pickled. Other objects,
+    including subclasses of arrays (such as masked arrays, whose masks aren't part of
+    their memory), are hashed by their pickles, which are stable for most objects within
+    one version of Python and their libraries.
+
+    Hashes include the type of each value, so they don't follow `==`: values which are
+    equal but have different types (such as `1`, `1.0` and `True`, or a list and a tuple
+    with the same items) have different hashes, while NaN has the same hash as itself.
+    Values compared by their hashes (for example by the hash-based cache validators) are
+    therefore only equal if they have the same types.
+
+    Args:
+        - value (Any): the value to hash
+
+    Returns:
+        - str: the hex digest of the SHA-256 hash of the value
+
+    Raises:
+        - Exception: if the value holds an object which can't be pickled
+    """
+    digest = hashlib.sha256()
+    _update(digest, value)
+    return digest.hexdigest()
+
+
+def _update(digest: Any, value: Any) -> None:
+    def tag(name: str, size: int) -> None:
+        # every value is prefixed by its kind and size, so that (for example) ["ab"]
+        # and ["a", "b"] have different hashes
+        digest.update("{}:{}:".format(name, size).encode())
+
+    if value is None or isinstance(value, (bool, int, float, complex)):
+        text = repr(value)
+        tag(type(value).__name__, len(text))
+        digest.update(text.encode())
+    elif isinstance(value, str):
+        data = value.encode("utf-8", "surrogatepass")
+        tag("str", len(data))
+        digest.update(data)
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        data = memoryview(value).cast("B")
+        tag("bytes", data.nbytes)
+        digest.update(data)
+    elif isinstance(value, (list, tuple)):
+        tag(type(value).__name__, len(value))
+        for item in value:
+            _update(digest, item)
+    elif isinstance(value, (set, frozenset)):
+        tag("set", len(value))
+        for item_hash in sorted(stable_hash(item) for item in value):
+            digest.update(item_hash.encode())
+    elif isinstance(value, dict):
+        tag("dict", len(value))
+        for key_hash, item in sorted(
+            ((stable_hash(key), item) for key, item in value.items()),
+            key=lambda pair: pair[0],
+        ):
+            digest.update(key_hash.encode())
+            _update(digest, item)
+    elif not _update_array(digest, value) and not _update_pandas(digest, value):
+        data = cloudpickle.dumps(value)
+        tag("pickle", len(data))
+        digest.update(data)
+
+
+def _update_array(digest: Any, value: Any) -> bool:
+    # values can only be arrays if NumPy has been imported
+    numpy = sys.modules.get("numpy")  # type: Any
+    if numpy is None or not (
+        type(value) is numpy.ndarray or isinstance(value, numpy.generic)
+    ):
+        return False
+    array = numpy.asarray(value)
+    _update(digest, ["ndarray", array.dtype.str, list(array.shape)])
+    if array.dtype.hasobject:
+        _update(digest, array.tolist())
+    else:
+        data = memoryview(numpy.ascontiguousarray(array).reshape(-1).view(numpy.uint8))
+        digest.update("{}:".format(data.nbytes).encode())
+        digest.update(data)
+    return True
+
+
+def _update_pandas(digest: Any, value: Any) -> bool:
+    pandas = sys.modules.get("pandas")  # type: Any
+    if pandas is None or not isinstance(
+        value, (pandas.DataFrame, pandas.Series, pandas.Index)
+    ):
+        return False
+    if isinstance(value, pandas.DataFrame):
+        _update(
+            digest, ["DataFrame", list(value.columns), list(map(str, value.dtypes))]
+        )
+        _update(digest, list(value.index.names))
+    elif isinstance(value, pandas.Series):
+        _update(digest, ["Series", value.name, str(value.dtype)])
+        _update(digest, list(value.index.names))
+    else:
+        _update(digest, ["Index", list(value.names), str(value.dtype)])
+    try:
+        # one 64-bit hash per row, of its values and its index
+        rows = pandas.util.hash_pandas_object(
+            value, index=not isinstance(value, pandas.Index)
+        )
+    except TypeError:
+        # objects which pandas can't hash (such as lists) are pickled instead
+        data = cloudpickle.dumps(value)
+        digest.update("pickle:{}:".format(len(data)).encode())
+        digest.update(data)
+    else:
+        _update_array(digest, rows.values)
+    return True
+
+
+def hash_values(values: Dict[str, Any]) -> Dict[str, Optional[str]]:
+    """
+    Hashes each of a collection of named values, such as the inputs of a task run.
+
+    Args:
+        - values (Dict[str, Any]): the values to hash, by name
+
+    Returns:
+        - Dict[str, Optional[str]]: the hash of each value, by name, or `None` for
+            values which hold objects which can't be hashed
+    """
+    hashes = {}  # type: Dict[str, Optional[str]]
+    for key, value in (values or {}).items():
+        try:
+            hashes[key] = stable_hash(value)
+        except Exception:
+            hashes[key] = None
+    return hashes
+
+
+def fingerprint(
+    input_hashes: Dict[str, Optional[str]],
+    parameter_hashes: Dict[str, Optional[str]] = None,
+) -> Optional[str]:
+    """
+    Computes the fingerprint of a task run from the hashes of its inputs and of the
+    parameters of its flow run (see `hash_values`), which is equal for task runs whose
+    inputs and parameters have equal hashes.
+
+    Args:
+        - input_hashes (Dict[str, Optional[str]]): the hashes of the task run's inputs,
+            by name
+        - parameter_hashes (Dict[str, Optional[str]], optional): the hashes of the
+            parameters of the flow run, by name
+
+    Returns:
+        - Optional[str]: the fingerprint, or `None` if any of the inputs or parameters
+            couldn't be hashed
+    """
+    hashes = [input_hashes or {}, parameter_hashes or {}]
+    if any(value is None for group in hashes for value in group.values()):
+        return None
+    return stable_hash(hashes)
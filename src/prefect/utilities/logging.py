@@ -14,8 +14,9 @@ import logging
 import sys
 import threading
 import time
-from queue import Queue, Empty
-from typing import Any
+from collections import Counter
+from queue import Empty, Full, Queue
+from typing import Any, Dict, List, Optional, Tuple
 
 import pendulum
 
@@ -35,6 +36,25 @@ PREFECT_LOG_RECORD_ATTRIBUTES = (
 
 
 class CloudHandler(logging.StreamHandler):
+    """
+    A logging handler which ships logs to Prefect Cloud in batches from a background
+    thread, every `cloud.logging_heartbeat` seconds.
+
+    Each log is encoded as JSON once, when it is queued, and that encoding is what gets
+    sent. Logs are sent in requests of at most `cloud.logging_max_batch_count` logs and
+    `cloud.logging_max_batch_bytes` bytes of JSON, gzipped if `cloud.logging_compress`
+    is set (until the server rejects a gzipped request). At most
+    `cloud.logging_max_queue_size` logs wait to be sent, and the last tenth of the queue
+    is reserved for logs at or above `WARNING`; what happens to further logs depends on
+    `cloud.logging_overflow`:
+        - `"drop"`: logs which arrive while the queue (or, for logs below `WARNING`, the
+            unreserved part of it) is full are dropped
+        - `"sample"`: additionally, once the queue is half full only one of every
+            `cloud.logging_sample_rate` logs below `WARNING` is kept
+
+    The number of logs sent, sampled and dropped are reported by `stats`.
+    """
+
     def __init__(self) -> None:
         super().__init__(sys.stdout)
         self.client = None
@@ -45,44 +65,124 @@ class CloudHandler(logging.StreamHandler):
         handler.setFormatter(formatter)
         self.logger.addHandler(handler)
         self.logger.setLevel(context.config.logging.level)
+        self._counts = Counter()  # type: Counter
+        # counts are updated by the threads emitting logs and by the thread uploading
+        # them; a separate lock keeps logging calls from waiting on uploads
+        self._counts_lock = threading.Lock()
+        self._upload_lock = threading.Lock()
+        # a log taken from the queue which didn't fit in the last batch
+        self._pending = None  # type: Optional[Tuple[dict, str]]
 
     @property
     def queue(self) -> Queue:
         if not hasattr(self, "_queue"):
-            self._queue = Queue()  # type: Queue
+            config = context.config.cloud
+            self.max_batch_count = config.logging_max_batch_count
+            self.max_batch_bytes = config.logging_max_batch_bytes
+            self.overflow = config.logging_overflow
+            self.sample_rate = config.logging_sample_rate
+            self.compress = config.logging_compress
+            self._queue = Queue(maxsize=config.logging_max_queue_size)  # type: Queue
             self._flush = False
             self.start()
         return self._queue
 
+    @property
+    def stats(self) -> Dict[str, int]:
+        """
+        The number of logs which were sent, sampled (that is, arrived while the queue
+        was at least half full with `cloud.logging_overflow` set to `"sample"`, whether
+        or not they were kept), dropped (because the queue was full or they weren't
+        sampled) or failed to send, and of requests and bytes sent, by this handler.
+        """
+        with self._counts_lock:
+            return {
+                key: self._counts[key]
+                for key in ["sent", "sampled", "dropped", "failed", "batches", "bytes"]
+            }
+
+    def _count(self, key: str, n: int = 1) -> int:
+        with self._counts_lock:
+            self._counts[key] += n
+            return self._counts[key]
+
     def flush(self) -> None:
         self._flush = True
         if self.client is not None:
             self.batch_upload()
             self._thread.join()
 
+    def _next_batch(self) -> List[Tuple[dict, str]]:
+        queue = self.queue
+        batch = []  # type: List[Tuple[dict, str]]
+        size = 0
+        while len(batch) < self.max_batch_count:
+            if self._pending is not None:
+                item, self._pending = self._pending, None
+            else:
+                try:
+                    item = queue.get(False)
+                except Empty:
+                    break
+            # a log which would take the batch over its size limit is held back for
+            # the next batch (unless it is alone, in which case it is sent anyway)
+            if batch and size + len(item[1]) > self.max_batch_bytes:
+                self._pending = item
+                break
+            batch.append(item)
+            size += len(item[1])
+        return batch
+
     def batch_upload(self) -> None:
-        logs = []
-        try:
+        with self._upload_lock:
             while True:
-                log = self.queue.get(False)
-                logs.append(log)
-        except Empty:
-            pass
+                batch = self._next_batch()
+                if not batch:
+                    return
+                self._upload(batch)
+
+    def _upload(self, batch: List[Tuple[dict, str]]) -> None:
+        logs, serialized_logs = [log for log, _ in batch], [data for _, data in batch]
+        try:
+            self._write_run_logs(logs, serialized_logs)
+            with self._counts_lock:
+                self._counts.update(
+                    sent=len(batch),
+                    batches=1,
+                    bytes=sum(len(data) for data in serialized_logs),
+                )
+        except Exception as exc:
+            self._count("failed", len(batch))
+            message = "Failed to write log with error: {}".format(str(exc))
+            self.logger.critical(message)
 
-        if logs:
+            # Attempt to write batch error log otherwise log invalid cloud communication
             try:
                 assert self.client is not None
-                self.client.write_run_logs(logs)
+                self.client.write_run_logs([self._make_error_log(message)])
             except Exception as exc:
-                message = "Failed to write log with error: {}".format(str(exc))
-                self.logger.critical(message)
+                self.logger.critical("Unable to write logs to Prefect Cloud")
 
-                # Attempt to write batch error log otherwise log invalid cloud communication
-                try:
-                    assert self.client is not None
-                    self.client.write_run_logs([self._make_error_log(message)])
-                except Exception as exc:
-                    self.logger.critical("Unable to write logs to Prefect Cloud")
+    def _write_run_logs(self, logs: List[dict], serialized_logs: List[str]) -> None:
+        assert self.client is not None
+        try:
+            self.client.write_run_logs(
+                logs, serialized_logs=serialized_logs, compress_body=self.compress
+            )
+        except Exception as exc:
+            status = getattr(getattr(exc, "response", None), "status_code", None)
+            if not self.compress or status not in (400, 415):
+                raise
+            # servers which don't accept gzipped requests are sent uncompressed ones
+            self.compress = False
+            self.logger.warning(
+                "Gzipped logs were rejected ({}); sending them uncompressed.".format(
+                    status
+                )
+            )
+            self.client.write_run_logs(
+                logs, serialized_logs=serialized_logs, compress_body=False
+            )
 
     def _monitor(self) -> None:
         while not self._flush:
@@ -106,13 +206,32 @@ class CloudHandler(logging.StreamHandler):
 
     def put(self, log: dict) -> None:
         try:
-            json.dumps(log)  # make sure the payload is serializable
-            self.queue.put(log)
+            data = json.dumps(log)
         except TypeError as exc:
             message = "Failed to write log with error: {}".format(str(exc))
             self.logger.critical(message)
 
-            self.queue.put(self._make_error_log(message))
+            log = self._make_error_log(message)
+            data = json.dumps(log)
+
+        queue = self.queue
+        if queue.maxsize and logging.getLevelName(log.get("level", "")) in range(
+            logging.WARNING
+        ):
+            size = queue.qsize()
+            # logs below WARNING leave room in the queue for more severe logs, such as
+            # this handler's own errors
+            if size >= queue.maxsize - max(queue.maxsize // 10, 1):
+                self._count("dropped")
+                return
+            if self.overflow == "sample" and size * 2 >= queue.maxsize:
+                if self._count("sampled") % self.sample_rate:
+                    self._count("dropped")
+                    return
+        try:
+            queue.put((log, data), block=False)
+        except Full:
+            self._count("dropped")
 
     def emit(self, record) -> None:  # type: ignore
         # if we shouldn't log to cloud, don't emit
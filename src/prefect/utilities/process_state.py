@@ -0,0 +1,42 @@
+"""
+Prefect shares some objects between every run in a process (such as the heartbeat
+service, the timeout and checkpoint pools and the result cache), which are created from
+the configuration of the first run to use them. Each module which holds such an object
+registers a function which resets it with `register_reset`, so that processes which
+execute several flow runs (such as `prefect execute worker`) can give each run its own
+with `reset_process_state`.
+"""
+import threading
+from typing import Callable, List
+
+_RESETS = []  # type: List[Callable[[], None]]
+_RESETS_LOCK = threading.Lock()
+
+
+def register_reset(fn: Callable[[], None]) -> Callable[[], None]:
+    """
+    Registers a function which stops and forgets an object shared between the runs in
+    this process, to be called by `reset_process_state`. Can be used as a decorator.
+
+    Args:
+        - fn (Callable[[], None]): the function to register
+
+    Returns:
+        - Callable[[], None]: the function
+    """
+    with _RESETS_LOCK:
+        if fn not in _RESETS:
+            _RESETS.append(fn)
+    return fn
+
+
+def reset_process_state() -> None:
+    """
+    Stops and forgets every object shared between the runs in this process, by calling
+    each function registered with `register_reset` in the order they were registered,
+    so that the next run creates its own from its configuration.
+    """
+    with _RESETS_LOCK:
+        resets = list(_RESETS)
+    for fn in resets:
+        fn()
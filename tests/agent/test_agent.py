@@ -1,6 +1,7 @@
 from unittest.mock import MagicMock
 import logging
 
+import pendulum
 import pytest
 
 from prefect.agent import Agent
@@ -444,3 +445,182 @@ def test_agent_process_raises_exception_and_logs(monkeypatch, runner_token):
     with pytest.raises(Exception):
         agent.agent_process(executor, "id")
         assert client.write_run_log.called
+
+
+def test_agent_poll_intervals_back_off_to_max_poll_interval(runner_token):
+    agent = Agent()
+    assert agent.poll_intervals() == [0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 10.0]
+
+    with set_temporary_config({"cloud.agent.max_poll_interval": 16.0}):
+        agent = Agent()
+    assert agent.poll_intervals() == [0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0]
+
+
+def test_query_flow_runs_limits_flow_runs_per_poll(monkeypatch, runner_token):
+    gql_return = MagicMock(
+        return_value=MagicMock(
+            data=MagicMock(
+                getRunsInQueue=MagicMock(flow_run_ids=["id3", "id1", "id2"]),
+                flow_run=[{"id": "id3"}, {"id": "id1"}],
+            )
+        )
+    )
+    client = MagicMock()
+    client.return_value.graphql = gql_return
+    monkeypatch.setattr("prefect.agent.agent.Client", client)
+
+    with set_temporary_config({"cloud.agent.max_flow_runs_per_poll": 2}):
+        agent = Agent()
+    agent.query_flow_runs(tenant_id="id")
+
+    query = list(gql_return.call_args_list[1][0][0]["query"].keys())[0]
+    assert '"id3"' in query and '"id1"' in query and '"id2"' not in query
+
+
+def make_flow_run(id, labels=(), **kwargs):
+    return GraphQLResult(
+        dict(id=id, flow=dict(environment=dict(labels=list(labels))), **kwargs)
+    )
+
+
+def test_query_flow_runs_combined_uses_one_request(monkeypatch, runner_token):
+    gql_return = MagicMock(
+        return_value=MagicMock(
+            data=MagicMock(
+                flow_run=[
+                    make_flow_run("id1"),
+                    make_flow_run("id2", labels=["foo"]),
+                    make_flow_run("id3", labels=["bar"]),
+                ]
+            )
+        )
+    )
+    client = MagicMock()
+    client.return_value.graphql = gql_return
+    monkeypatch.setattr("prefect.agent.agent.Client", client)
+
+    with set_temporary_config(
+        {"cloud.agent.query_mode": "combined", "cloud.agent.max_flow_runs_per_poll": 5}
+    ):
+        agent = Agent(labels=["foo"])
+    agent.submitting_flow_runs.add("id4")
+    flow_runs = agent.query_flow_runs(tenant_id="tenant")
+
+    # flow runs with labels that the agent doesn't have are left for other agents
+    assert [flow_run.id for flow_run in flow_runs] == ["id1", "id2"]
+    assert gql_return.call_count == 1
+    query = list(gql_return.call_args[0][0]["query"].keys())[0]
+    assert 'tenant_id: { _eq: "tenant" }' in query
+    assert 'id: { _nin: ["id4"] }' in query
+    assert "limit: 5" in query
+    assert "order_by: [{ scheduled_start_time: asc }, { id: asc }]" in query
+
+
+def test_query_flow_runs_combined_pages_until_enough_flow_runs_match(
+    monkeypatch, runner_token
+):
+    pages = [
+        [make_flow_run("id1", labels=["bar"]), make_flow_run("id2", labels=["bar"])],
+        [make_flow_run("id3", labels=["foo"]), make_flow_run("id4", labels=["bar"])],
+        [make_flow_run("id5"), make_flow_run("id6", labels=["foo"])],
+        [make_flow_run("id7")],
+    ]
+    gql_return = MagicMock(
+        side_effect=[MagicMock(data=MagicMock(flow_run=page)) for page in pages]
+    )
+    client = MagicMock()
+    client.return_value.graphql = gql_return
+    monkeypatch.setattr("prefect.agent.agent.Client", client)
+
+    with set_temporary_config(
+        {"cloud.agent.query_mode": "combined", "cloud.agent.max_flow_runs_per_poll": 2}
+    ):
+        agent = Agent(labels=["foo"])
+    flow_runs = agent.query_flow_runs(tenant_id="tenant")
+
+    # flow runs for other agents don't count towards the limit
+    assert [flow_run.id for flow_run in flow_runs] == ["id3", "id5"]
+    assert gql_return.call_count == 3
+    queries = [
+        list(call[0][0]["query"].keys())[0] for call in gql_return.call_args_list
+    ]
+    assert all("limit: 2" in query for query in queries)
+    for offset, query in zip([0, 2, 4], queries):
+        assert "offset: {}".format(offset) in query
+
+
+def test_query_flow_runs_combined_stops_paging_at_the_last_page(
+    monkeypatch, runner_token
+):
+    gql_return = MagicMock(
+        side_effect=[
+            MagicMock(
+                data=MagicMock(
+                    flow_run=[
+                        make_flow_run("id1", labels=["bar"]),
+                        make_flow_run("id2"),
+                    ]
+                )
+            ),
+            MagicMock(data=MagicMock(flow_run=[make_flow_run("id3", labels=["bar"])])),
+        ]
+    )
+    client = MagicMock()
+    client.return_value.graphql = gql_return
+    monkeypatch.setattr("prefect.agent.agent.Client", client)
+
+    with set_temporary_config(
+        {"cloud.agent.query_mode": "combined", "cloud.agent.max_flow_runs_per_poll": 2}
+    ):
+        agent = Agent()
+    flow_runs = agent.query_flow_runs(tenant_id="tenant")
+
+    assert [flow_run.id for flow_run in flow_runs] == ["id2"]
+    assert gql_return.call_count == 2
+
+
+def test_query_flow_runs_holds_back_flow_runs_found_by_lookahead(
+    monkeypatch, runner_token
+):
+    now = pendulum.now("UTC")
+    gql_return = MagicMock(
+        return_value=MagicMock(
+            data=MagicMock(
+                flow_run=[
+                    make_flow_run(
+                        "due",
+                        state="Scheduled",
+                        scheduled_start_time=now.subtract(seconds=1).isoformat(),
+                    ),
+                    make_flow_run(
+                        "later",
+                        state="Scheduled",
+                        scheduled_start_time=now.add(seconds=20).isoformat(),
+                    ),
+                    make_flow_run(
+                        "soon",
+                        state="Scheduled",
+                        scheduled_start_time=now.add(seconds=5).isoformat(),
+                    ),
+                ]
+            )
+        )
+    )
+    client = MagicMock()
+    client.return_value.graphql = gql_return
+    monkeypatch.setattr("prefect.agent.agent.Client", client)
+
+    with set_temporary_config(
+        {"cloud.agent.query_mode": "combined", "cloud.agent.lookahead": 30.0}
+    ):
+        agent = Agent()
+    assert agent.next_poll_interval(10.0) == 10.0
+
+    flow_runs = agent.query_flow_runs(tenant_id="tenant")
+    assert [flow_run.id for flow_run in flow_runs] == ["due"]
+    query = list(gql_return.call_args[0][0]["query"].keys())[0]
+    assert "scheduled_start_time" in query
+
+    # the agent polls again as soon as the first of the held back flow runs is due
+    assert 3.0 < agent.next_poll_interval(10.0) <= 5.0
+    assert agent.next_poll_interval(1.0) == 1.0
@@ -1,5 +1,8 @@
+import logging
 import os
 import socket
+import sys
+import time
 from unittest.mock import MagicMock
 
 import pytest
@@ -9,6 +12,7 @@ from testfixtures.popen import MockPopen
 from testfixtures import compare, LogCapture
 
 from prefect.agent.local import LocalAgent
+from prefect.agent.local.pool import LocalWorkerPool
 from prefect.environments.storage import Docker, Local, Azure, GCS, S3
 from prefect.utilities.configuration import set_temporary_config
 from prefect.utilities.graphql import GraphQLResult
@@ -422,3 +426,179 @@ def test_local_agent_heartbeat(
     # the heartbeat should stop tracking upon exit
     compare(process.returncode, returncode)
     assert len(agent.processes) == 0
+
+
+def test_local_agent_deploys_flow_runs_to_worker_pool(monkeypatch, runner_token):
+    popen = MagicMock()
+    monkeypatch.setattr("prefect.agent.local.agent.Popen", popen)
+
+    agent = LocalAgent(worker_pool_size=2, import_paths=["my_path"])
+    agent.worker_pool = MagicMock(submit=MagicMock(return_value=42))
+    result = agent.deploy_flow(
+        flow_run=GraphQLResult(
+            {
+                "flow": GraphQLResult({"storage": Local(directory="test").serialize()}),
+                "id": "id",
+            }
+        )
+    )
+
+    assert result == "PID: 42"
+    assert not popen.called
+    env = agent.worker_pool.submit.call_args[0][0]
+    assert env["PREFECT__CONTEXT__FLOW_RUN_ID"] == "id"
+    assert env["PYTHONPATH"].endswith(":my_path")
+
+
+def test_local_agent_maintains_and_shuts_down_worker_pool(runner_token):
+    agent = LocalAgent(
+        worker_pool_size=2, max_runs_per_worker=10, max_worker_memory_growth=100
+    )
+    assert agent.worker_pool.size == 2
+    assert agent.worker_pool.max_runs == 10
+    assert agent.worker_pool.max_memory_growth == 100
+
+    agent.worker_pool = MagicMock()
+    agent.heartbeat()
+    assert agent.worker_pool.maintain.called
+    agent.on_shutdown()
+    assert agent.worker_pool.shutdown.called
+
+
+class TestLocalWorkerPool:
+    # stands in for `prefect execute worker`, reporting a result for each flow run
+    WORKER = "\n".join(
+        [
+            "import json, sys",
+            "max_runs = int(sys.argv[sys.argv.index('--max-runs') + 1])",
+            "for runs, line in enumerate(sys.stdin, 1):",
+            "    env = json.loads(line)['env']",
+            "    print('output of', env.get('PREFECT__CONTEXT__FLOW_RUN_ID'),",
+            "          file=sys.stderr, flush=True)",
+            "    if env.get('CRASH'):",
+            "        sys.exit(3)",
+            "    retiring = bool(max_runs and runs >= max_runs)",
+            "    result = dict(flow_run_id=env.get('PREFECT__CONTEXT__FLOW_RUN_ID'),",
+            "                  exit_code=int(env.get('FAIL', 0)), error='oops',",
+            "                  retiring=retiring)",
+            "    print(json.dumps(result), flush=True)",
+            "    if retiring:",
+            "        break",
+        ]
+    )
+
+    def make_pool(self, size, **kwargs):
+        return LocalWorkerPool(
+            size=size, command=[sys.executable, "-c", self.WORKER], **kwargs
+        )
+
+    def wait_for(self, predicate, timeout=10):
+        start = time.time()
+        while not predicate():
+            assert time.time() - start < timeout
+            time.sleep(0.01)
+
+    def env(self, id, **kwargs):
+        return dict(PREFECT__CONTEXT__FLOW_RUN_ID=id, **kwargs)
+
+    def test_maintain_keeps_idle_workers(self):
+        pool = self.make_pool(2)
+        try:
+            pool.maintain()
+            pool.maintain()
+            assert pool.stats == dict(idle=2, busy=0, retiring=0)
+        finally:
+            pool.shutdown()
+
+    def test_flow_runs_are_sent_to_idle_workers(self):
+        pool = self.make_pool(1)
+        try:
+            pool.maintain()
+            (worker,) = pool._workers
+            assert pool.submit(self.env("a")) == worker.process.pid
+            self.wait_for(lambda: pool.stats["idle"] == 1)
+            assert pool.submit(self.env("b")) == worker.process.pid
+            self.wait_for(lambda: pool.stats["idle"] == 1)
+            assert pool._workers == [worker]
+        finally:
+            pool.shutdown()
+
+    def test_extra_workers_are_started_when_all_are_busy_and_retire(self):
+        pool = self.make_pool(1)
+        try:
+            pool.maintain()
+            pids = {pool.submit(self.env("a")), pool.submit(self.env("b"))}
+            assert len(pids) == 2
+            self.wait_for(lambda: len(pool._workers) == 1)
+            assert pool.stats == dict(idle=1, busy=0, retiring=0)
+        finally:
+            pool.shutdown()
+
+    def test_workers_retire_after_max_runs_and_are_replaced(self):
+        pool = self.make_pool(1, max_runs=2)
+        try:
+            pool.maintain()
+            pid = pool.submit(self.env("a"))
+            self.wait_for(lambda: pool.stats["idle"] == 1)
+            assert pool.submit(self.env("b")) == pid
+            self.wait_for(lambda: not pool._workers)
+
+            pool.maintain()
+            assert pool.submit(self.env("c")) != pid
+        finally:
+            pool.shutdown()
+
+    def test_failed_and_crashed_runs_are_logged(self, caplog):
+        caplog.set_level(logging.INFO)
+        pool = self.make_pool(1)
+        try:
+            pool.maintain()
+            pool.submit(self.env("a", FAIL="1"))
+            pool.submit(self.env("b", CRASH="1"))
+            self.wait_for(
+                lambda: "Flow run a in worker PID" in caplog.text
+                and "exited with code 3 while running flow run b" in caplog.text
+            )
+            assert "failed: oops" in caplog.text
+        finally:
+            pool.shutdown()
+
+    def test_output_of_failed_and_crashed_runs_is_logged(self, caplog):
+        caplog.set_level(logging.INFO)
+        pool = self.make_pool(1)
+        try:
+            pool.maintain()
+            pool.submit(self.env("a"))
+            self.wait_for(lambda: pool.stats["idle"] == 1)
+            pool.submit(self.env("b", FAIL="1"))
+            self.wait_for(lambda: pool.stats["idle"] == 1)
+            pool.submit(self.env("c", CRASH="1"))
+            self.wait_for(lambda: "while running flow run c" in caplog.text)
+            self.wait_for(lambda: "output of c" in caplog.text)
+            assert "output of b" in caplog.text
+            assert "output of a" not in caplog.text
+        finally:
+            pool.shutdown()
+
+    def test_output_is_shown_instead_of_logged_with_show_flow_logs(self, caplog):
+        caplog.set_level(logging.INFO)
+        pool = self.make_pool(1, show_flow_logs=True)
+        try:
+            pool.maintain()
+            pool.submit(self.env("a", FAIL="1"))
+            self.wait_for(lambda: "Flow run a in worker PID" in caplog.text)
+            assert "output of a" not in caplog.text
+        finally:
+            pool.shutdown()
+
+    def test_shutdown_retires_workers(self):
+        pool = self.make_pool(2)
+        pool.maintain()
+        processes = [w.process for w in pool._workers]
+        pool.shutdown()
+        for process in processes:
+            assert process.wait(timeout=10) == 0
+        with pytest.raises(RuntimeError, match="shut down"):
+            pool.submit(self.env("a"))
+        pool.maintain()
+        self.wait_for(lambda: not pool._workers)
@@ -75,6 +75,18 @@ def test_agent_start_local_import_paths(monkeypatch, runner_token):
     assert result.exit_code == 0
 
 
+def test_agent_start_local_worker_pool(monkeypatch, runner_token):
+    start = MagicMock()
+    monkeypatch.setattr("prefect.agent.local.LocalAgent.start", start)
+    init = MagicMock(return_value=None)
+    monkeypatch.setattr("prefect.agent.local.LocalAgent.__init__", init)
+
+    runner = CliRunner()
+    result = runner.invoke(agent, ["start", "local", "--worker-pool", "4"])
+    assert result.exit_code == 0
+    assert init.call_args[1]["worker_pool_size"] == 4
+
+
 def test_agent_start_docker(monkeypatch, runner_token):
     start = MagicMock()
     monkeypatch.setattr("prefect.agent.docker.DockerAgent.start", start)
@@ -1,9 +1,15 @@
+import json
+import logging
+import os
+import sys
 from unittest.mock import MagicMock, PropertyMock
 
 from click.testing import CliRunner
 
 import prefect
-from prefect.cli.execute import execute
+from prefect.cli.execute import cloud_flow, execute
+from prefect.engine.cloud import utilities as cloud_utilities
+from prefect.utilities import executors
 from prefect.utilities.configuration import set_temporary_config
 
 
@@ -89,3 +95,108 @@ def test_execute_cloud_flow_raises_exception():
         result = runner.invoke(execute, "cloud-flow")
         assert result.exit_code == 1
         assert "Not currently executing a flow within a Cloud context." in result.output
+
+
+def test_execute_worker_runs_flow_runs_with_their_environment(monkeypatch):
+    seen = []
+
+    def run():
+        seen.append(
+            (
+                os.environ.get("MY_VAR"),
+                prefect.context.get("flow_run_id"),
+                prefect.context.config.cloud.api,
+                sys.path[0],
+            )
+        )
+        if len(seen) == 2:
+            raise ValueError("oops")
+
+    monkeypatch.setattr(cloud_flow, "callback", run)
+    api = prefect.config.cloud.api
+    runs = [
+        dict(
+            MY_VAR=str(i),
+            PREFECT__CONTEXT__FLOW_RUN_ID="run-{}".format(i),
+            PREFECT__CLOUD__API="http://api-{}".format(i),
+            PYTHONPATH="/my/path/{}".format(i),
+        )
+        for i in range(2)
+    ]
+
+    runner = CliRunner()
+    result = runner.invoke(
+        execute,
+        ["worker"],
+        input="".join(json.dumps(dict(env=env)) + "\n" for env in runs),
+    )
+    assert result.exit_code == 0
+
+    assert seen == [
+        ("0", "run-0", "http://api-0", "/my/path/0"),
+        ("1", "run-1", "http://api-1", "/my/path/1"),
+    ]
+    results = [json.loads(line) for line in result.output.splitlines()]
+    assert results == [
+        dict(flow_run_id="run-0", exit_code=0, error=None, retiring=False),
+        dict(
+            flow_run_id="run-1",
+            exit_code=1,
+            error="ValueError('oops')",
+            retiring=False,
+        ),
+    ]
+
+    # the environment is restored after each run
+    assert "MY_VAR" not in os.environ
+    assert "/my/path/1" not in sys.path
+    assert prefect.config.cloud.api == api
+    assert "flow_run_id" not in prefect.context
+
+
+def test_execute_worker_configures_logging_and_resets_shared_state(monkeypatch):
+    seen = []
+
+    def run():
+        logger = logging.getLogger("prefect")
+        seen.append((logger.level, logger.handlers))
+        # objects shared between runs in a process are created by this run
+        executors._soft_timeout_executor = executors.SoftTimeoutExecutor()
+        cloud_utilities._CACHED_STATES["key"] = {}
+
+    monkeypatch.setattr(cloud_flow, "callback", run)
+    logger = logging.getLogger("prefect")
+    level, handlers = logger.level, list(logger.handlers)
+    runs = [
+        dict(PREFECT__LOGGING__LEVEL="DEBUG"),
+        dict(PREFECT__LOGGING__LEVEL="ERROR"),
+    ]
+
+    runner = CliRunner()
+    result = runner.invoke(
+        execute,
+        ["worker"],
+        input="".join(json.dumps(dict(env=env)) + "\n" for env in runs),
+    )
+    assert result.exit_code == 0
+
+    assert [run_level for run_level, _ in seen] == [logging.DEBUG, logging.ERROR]
+    # each run has handlers of its own
+    assert all(run_handlers is not handlers for _, run_handlers in seen)
+    assert (logger.level, logger.handlers) == (level, handlers)
+    assert executors._soft_timeout_executor is None
+    assert not cloud_utilities._CACHED_STATES
+
+
+def test_execute_worker_retires_after_max_runs(monkeypatch):
+    calls = []
+    monkeypatch.setattr(cloud_flow, "callback", lambda: calls.append(1))
+
+    runner = CliRunner()
+    result = runner.invoke(
+        execute, ["worker", "--max-runs", "2"], input='{"env": {}}\n' * 3
+    )
+    assert result.exit_code == 0
+    assert len(calls) == 2
+    results = [json.loads(line) for line in result.output.splitlines()]
+    assert [r["retiring"] for r in results] == [False, True]
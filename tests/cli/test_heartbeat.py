@@ -1,3 +1,5 @@
+import os
+import threading
 from unittest.mock import MagicMock
 
 from click.testing import CliRunner
@@ -83,3 +85,47 @@ def test_heartbeat_multiple_flow_run_heartbeats(patch_post):
         assert result.exit_code == 0
         assert post.called
         assert post.call_count == 2
+
+
+def test_heartbeat_service_batches_registered_runs(patch_post):
+    post = patch_post(dict(data=dict()))
+    read_fd, write_fd = os.pipe()
+    stdin = os.fdopen(read_fd, "rb")
+    with os.fdopen(write_fd, "w") as registrations:
+        registrations.write("add task-run a\nadd task-run b\nadd flow-run c\n")
+        registrations.write("remove task-run b\n")
+        registrations.flush()
+        # the service exits once its standard input is closed
+        threading.Timer(0.5, registrations.close).start()
+
+        with set_temporary_config(
+            {
+                "cloud.graphql": "http://my-cloud.foo",
+                "cloud.auth_token": "secret_token",
+                "cloud.heartbeat_interval": 0.1,
+            }
+        ):
+            runner = CliRunner()
+            result = runner.invoke(heartbeat, ["service"], input=stdin)
+
+    assert result.exit_code == 0
+    assert post.call_count > 1
+    mutation = post.call_args[1]["json"]["query"]
+    assert mutation.count("updateFlowRunHeartbeat") == 1
+    assert mutation.count("updateTaskRunHeartbeat") == 1
+    assert '"c"' in mutation and '"a"' in mutation
+
+
+def test_heartbeat_service_ignores_invalid_registrations(patch_post):
+    patch_post(dict(data=dict()))
+    with set_temporary_config(
+        {
+            "cloud.graphql": "http://my-cloud.foo",
+            "cloud.auth_token": "secret_token",
+            "cloud.heartbeat_interval": 0.1,
+        }
+    ):
+        runner = CliRunner()
+        result = runner.invoke(heartbeat, ["service"], input="add job x\nhello\n")
+    assert result.exit_code == 0
+    assert "Ignoring invalid heartbeat registration" in result.output
@@ -1,10 +1,14 @@
 import datetime
+import gzip
+import http.server
 import json
 import os
 import tempfile
+import threading
 import uuid
 from unittest.mock import MagicMock, mock_open
 
+import cloudpickle
 import marshmallow
 import pendulum
 import pytest
@@ -13,7 +17,7 @@ import requests
 import prefect
 from prefect.client.client import Client, FlowRunInfoResult, TaskRunInfoResult
 from prefect.engine.result import NoResult, Result, SafeResult
-from prefect.engine.state import Pending
+from prefect.engine.state import Pending, Running, Success
 from prefect.utilities.configuration import set_temporary_config
 from prefect.utilities.exceptions import AuthorizationError, ClientError
 from prefect.utilities.graphql import GraphQLResult, decompress
@@ -62,6 +66,106 @@ def test_version_header_cant_be_overridden(monkeypatch):
     )
 
 
+def test_client_reuses_its_session(monkeypatch):
+    get = MagicMock()
+    session = MagicMock()
+    session.return_value.get = get
+    monkeypatch.setattr("requests.Session", session)
+    with set_temporary_config(
+        {"cloud.graphql": "http://my-cloud.foo", "cloud.auth_token": "secret_token"}
+    ):
+        client = Client()
+    client.get("/foo/bar")
+    client.get("/foo/baz")
+    assert session.call_count == 1
+    assert get.call_count == 2
+
+
+def test_client_session_is_not_pickled(monkeypatch):
+    with set_temporary_config(
+        {"cloud.graphql": "http://my-cloud.foo", "cloud.auth_token": "secret_token"}
+    ):
+        client = Client()
+    client._get_session()
+    new_client = cloudpickle.loads(cloudpickle.dumps(client))
+    assert new_client._session is None
+    assert new_client._session_lock is not client._session_lock
+    assert new_client._get_session() is not client._session
+    assert client._session is not None
+
+
+def test_clients_create_their_sessions_independently():
+    with set_temporary_config(
+        {"cloud.graphql": "http://my-cloud.foo", "cloud.auth_token": "secret_token"}
+    ):
+        client, other = Client(), Client()
+    with client._session_lock:
+        # another client's session isn't held up by this client's lock
+        assert other._get_session() is not None
+
+
+class TestConnectionPooling:
+    @pytest.fixture()
+    def server(self):
+        connections = []
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                # a handler is created for each connection the server accepts
+                connections.append(self.client_address)
+                super().setup()
+
+            def do_GET(self):
+                body = json.dumps(dict(success=True)).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                if self.headers.get("Connection") == "close":
+                    self.send_header("Connection", "close")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield "http://127.0.0.1:{}".format(server.server_address[1]), connections
+        server.shutdown()
+        server.server_close()
+
+    def test_connections_are_reused(self, server):
+        url, connections = server
+        client = Client(api_server=url, api_token="secret_token")
+        for _ in range(5):
+            assert client.get("/foo") == dict(success=True)
+        assert len(connections) == 1
+
+    def test_connections_are_reused_across_threads(self, server):
+        url, connections = server
+        client = Client(api_server=url, api_token="secret_token")
+        threads = [
+            threading.Thread(target=lambda: [client.get("/foo") for _ in range(5)])
+            for _ in range(4)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert 1 <= len(connections) <= 4
+
+    def test_keep_alive_can_be_disabled(self, server):
+        url, connections = server
+        with set_temporary_config({"cloud.requests.keep_alive": False}):
+            client = Client(api_server=url, api_token="secret_token")
+            for _ in range(3):
+                assert client.get("/foo") == dict(success=True)
+        assert len(connections) == 3
+
+
 def test_client_posts_graphql_to_api_server(patch_post):
     post = patch_post(dict(data=dict(success=True)))
 
@@ -541,6 +645,51 @@ def test_get_task_run_info(patch_post):
     assert result.version == 0
 
 
+def test_get_task_run_infos_sends_one_mutation(patch_post):
+    def task_run(id, state):
+        return {
+            "task_run": {
+                "id": id,
+                "version": 1,
+                "serialized_state": state.serialize(),
+                "task": {"slug": "slug"},
+            }
+        }
+
+    response = {
+        "task_run_0": task_run("id-3", Pending()),
+        "task_run_1": task_run("id-5", Running()),
+    }
+    post = patch_post(dict(data=response))
+
+    with set_temporary_config(
+        {"cloud.graphql": "http://my-cloud.foo", "cloud.auth_token": "secret_token"}
+    ):
+        client = Client()
+        result = client.get_task_run_infos(
+            flow_run_id="74-salt", task_id="72-salt", map_indices=[3, 5]
+        )
+
+    assert post.call_count == 1
+    query = post.call_args[1]["json"]["query"]
+    assert "task_run_0: getOrCreateTaskRun" in query
+    assert "mapIndex: 5" in query
+    assert [r.id for r in result] == ["id-3", "id-5"]
+    assert [type(r.state) for r in result] == [Pending, Running]
+    assert all(r.task_id == "72-salt" and r.version == 1 for r in result)
+
+
+def test_get_task_run_infos_with_no_map_indices(patch_post):
+    post = patch_post(dict(data=dict()))
+
+    with set_temporary_config(
+        {"cloud.graphql": "http://my-cloud.foo", "cloud.auth_token": "secret_token"}
+    ):
+        client = Client()
+        assert client.get_task_run_infos("74-salt", "72-salt", map_indices=[]) == []
+    assert post.call_count == 0
+
+
 def test_get_task_run_info_with_error(patch_post):
     response = {
         "data": {"getOrCreateTaskRun": None},
@@ -615,6 +764,86 @@ def test_set_task_run_state_responds_to_config_when_queued(patch_post):
     assert result.start_time >= pendulum.now("UTC").add(seconds=749)
 
 
+def test_update_heartbeats_sends_one_mutation(patch_post):
+    post = patch_post(dict(data=dict()))
+
+    with set_temporary_config(
+        {"cloud.graphql": "http://my-cloud.foo", "cloud.auth_token": "secret_token"}
+    ):
+        client = Client()
+        client.update_heartbeats(flow_run_ids=["f"], task_run_ids=["a", "b"])
+
+    assert post.call_count == 1
+    query = post.call_args[1]["json"]["query"]
+    assert query.count("updateFlowRunHeartbeat") == 1
+    assert query.count("updateTaskRunHeartbeat") == 2
+    assert all('"{}"'.format(id) in query for id in ["f", "a", "b"])
+
+
+def test_update_heartbeats_sends_batches(patch_post):
+    post = patch_post(dict(data=dict()))
+
+    with set_temporary_config(
+        {
+            "cloud.graphql": "http://my-cloud.foo",
+            "cloud.auth_token": "secret_token",
+            "cloud.heartbeat_batch_size": 2,
+        }
+    ):
+        client = Client()
+        client.update_heartbeats(flow_run_ids=["f"], task_run_ids=["a", "b", "c"])
+
+    assert post.call_count == 2
+    queries = [call[1]["json"]["query"] for call in post.call_args_list]
+    assert [q.count("Heartbeat(") for q in queries] == [2, 2]
+    assert all(
+        any('"{}"'.format(id) in q for q in queries) for id in ["f", "a", "b", "c"]
+    )
+
+
+def test_update_heartbeats_without_runs_sends_nothing(patch_post):
+    post = patch_post(dict(data=dict()))
+
+    with set_temporary_config(
+        {"cloud.graphql": "http://my-cloud.foo", "cloud.auth_token": "secret_token"}
+    ):
+        Client().update_heartbeats()
+
+    assert post.call_count == 0
+
+
+def test_set_task_run_states_sends_one_mutation(patch_post):
+    response = {
+        "data": {
+            "setTaskRunStates": {
+                "states": [{"status": "SUCCESS"}, {"status": "QUEUED"}]
+            }
+        }
+    }
+    post = patch_post(response)
+    running, success = Running(), Success()
+
+    with set_temporary_config(
+        {"cloud.graphql": "http://my-cloud.foo", "cloud.auth_token": "secret_token"}
+    ):
+        client = Client()
+        result = client.set_task_run_states(
+            [
+                dict(task_run_id="1", version=0, state=success),
+                dict(task_run_id="2", version=3, state=running),
+            ]
+        )
+
+    assert post.call_count == 1
+    variables = json.loads(post.call_args[1]["json"]["variables"])
+    assert [(s["taskRunId"], s["version"]) for s in variables["input"]["states"]] == [
+        ("1", 0),
+        ("2", 3),
+    ]
+    assert result[0] is success
+    assert result[1].is_queued()
+
+
 def test_set_task_run_state_serializes(patch_post):
     response = {"data": {"setTaskRunStates": {"states": [{"status": "SUCCESS"}]}}}
     post = patch_post(response)
@@ -645,3 +874,22 @@ def test_set_task_run_state_with_error(patch_post):
 
     with pytest.raises(ClientError, match="something went wrong"):
         client.set_task_run_state(task_run_id="76-salt", version=0, state=Pending())
+
+
+def test_write_run_logs_sends_serialized_logs_compressed(patch_post):
+    post = patch_post(dict(data=dict(writeRunLogs=dict(success=True))))
+    logs = [dict(message="one", info={}), dict(message="two", info={})]
+
+    with set_temporary_config(
+        {"cloud.graphql": "http://my-cloud.foo", "cloud.auth_token": "secret_token"}
+    ):
+        client = Client()
+    client.write_run_logs(
+        logs, serialized_logs=[json.dumps(log) for log in logs], compress_body=True
+    )
+
+    kwargs = post.call_args[1]
+    assert kwargs["headers"]["Content-Encoding"] == "gzip"
+    body = json.loads(gzip.decompress(kwargs["data"]))
+    assert json.loads(body["variables"]) == dict(input=dict(logs=logs))
+    assert "writeRunLogs" in body["query"]
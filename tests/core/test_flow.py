@@ -1,5 +1,6 @@
 import datetime
 import logging
+import inspect
 import os
 import random
 import sys
@@ -873,6 +874,86 @@ def test_sorted_tasks_with_invalid_start_task():
         f.sorted_tasks(root_tasks=[t3])
 
 
+def test_sorted_tasks_with_multiple_edges_between_tasks():
+    f = Flow(name="test")
+    t1 = Task("1")
+    t2 = AddTask("2")
+    t3 = Task("3")
+    f.add_edge(t1, t2, key="x")
+    f.add_edge(t1, t2, key="y")
+    f.add_edge(t2, t3)
+    assert f.sorted_tasks() == (t1, t2, t3)
+
+
+def test_sorted_tasks_with_start_task_ignores_edges_from_outside_the_subgraph():
+    """
+    t1 -> t2 -> t3
+          t4 -> t3
+    """
+    f = Flow(name="test")
+    t1, t2, t3, t4 = Task("1"), Task("2"), Task("3"), Task("4")
+    f.add_edge(t1, t2)
+    f.add_edge(t2, t3)
+    f.add_edge(t4, t3)
+    assert f.sorted_tasks(root_tasks=[t2]) == (t2, t3)
+
+
+def test_sorted_tasks_scales_to_long_chains():
+    f = Flow(name="test")
+    tasks = [Task(str(i)) for i in range(10000)]
+    f.chain(*tasks)
+    assert f.sorted_tasks() == tuple(tasks)
+    assert f.root_tasks() == {tasks[0]}
+    assert f.terminal_tasks() == {tasks[-1]}
+
+
+def test_sorted_tasks_detects_cycles_downstream_of_valid_tasks():
+    f = Flow(name="test")
+    t1, t2, t3 = Task(), Task(), Task()
+    f.add_edge(t1, t2)
+    f.add_edge(t2, t3)
+    f.add_edge(t3, t2)
+    with pytest.raises(ValueError, match="Cycle found"):
+        f.sorted_tasks()
+
+
+def test_edge_indexes_are_kept_up_to_date():
+    f = Flow(name="test")
+    t1, t2, t3 = Task(), Task(), Task()
+    e1 = f.add_edge(t1, t2)
+    assert f.edges_to(t2) == {e1}
+    assert f.edges_from(t1) == {e1}
+    assert f.edges_to(t1) == set()
+
+    e2 = f.add_edge(t1, t3)
+    assert f.edges_from(t1) == {e1, e2}
+    assert f.all_downstream_edges() == {t1: {e1, e2}, t2: set(), t3: set()}
+    assert f.all_upstream_edges() == {t1: set(), t2: {e1}, t3: {e2}}
+
+
+def test_mutating_returned_edges_does_not_modify_flow():
+    f = Flow(name="test")
+    t1, t2 = Task(), Task()
+    e1 = f.add_edge(t1, t2)
+    f.edges_to(t2).clear()
+    f.edges_from(t1).clear()
+    assert f.edges_to(t2) == {e1}
+    assert f.edges_from(t1) == {e1}
+    assert f.sorted_tasks() == (t1, t2)
+
+
+def test_copied_flows_have_independent_edge_indexes():
+    f = Flow(name="test")
+    t1, t2, t3 = Task(), Task(), Task()
+    f.add_edge(t1, t2)
+    f2 = f.copy()
+    f2.add_edge(t2, t3)
+    assert f.edges_from(t2) == set()
+    assert len(f2.edges_from(t2)) == 1
+    assert f.sorted_tasks() == (t1, t2)
+    assert f2.sorted_tasks() == (t1, t2, t3)
+
+
 def test_flow_raises_for_irrelevant_user_provided_parameters():
     class ParameterTask(Task):
         def run(self):
@@ -1357,26 +1438,255 @@ class TestCache:
         f2.add_edge(t3, t4)
         assert f2.sorted_tasks() != 1
 
-    def test_adding_task_clears_cache(self):
+    def test_flows_pickled_without_indexes_are_rebuilt(self):
         f = Flow(name="test")
-        f._cache[1] = 2
-        f.add_task(Task())
-        assert 1 not in f._cache
+        t1 = Task(slug="t1")
+        t2 = Task()
+        t3 = Task()
+        f.add_edge(t1, t2, key="x")
+        f.add_edge(t2, t3)
 
-    def test_adding_edge_clears_cache(self):
+        # flows pickled by earlier versions store their tasks and edges as plain
+        # attributes and carry none of the indexes
+        state = f.__getstate__()
+        state["tasks"] = set(state.pop("_tasks"))
+        state["edges"] = set(state.pop("_edges"))
+        for attr in ["_version", "_indexes_stale", "_deferred_validation"]:
+            del state[attr]
+        state["_cache"] = {("root_tasks", ()): {t2}}
+        old = Flow.__new__(Flow)
+        old.__setstate__(state)
+
+        assert old.sorted_tasks() == (t1, t2, t3)
+        assert old.root_tasks() == {t1}
+        assert old.edges_to(t2) == f.edges_to(t2)
+        assert old.edges_from(t2) == f.edges_from(t2)
+        with pytest.raises(ValueError, match="slug"):
+            old.add_task(Task(slug="t1"))
+        old.add_edge(t3, Task())
+        assert len(old.sorted_tasks()) == 4
+
+    def test_modifying_tasks_directly_invalidates_indexes_and_cache(self):
         f = Flow(name="test")
-        f._cache[1] = 2
-        f.add_edge(Task(), Task())
-        assert 1 not in f._cache
+        t1, t2, t3 = Task(), Task(), Task()
+        f.add_edge(t1, t2)
+        assert f.sorted_tasks() == (t1, t2)
+        assert f.root_tasks() == {t1}
+
+        f.tasks.add(t3)
+        assert set(f.sorted_tasks()) == {t1, t2, t3}
+        assert f.root_tasks() == {t1, t3}
+
+        # the edge from t1 remains, as it would if the edges were modified directly
+        f.tasks.remove(t1)
+        assert f.root_tasks() == {t3}
+        assert f.edges_to(t2) == {Edge(t1, t2)}
+        with pytest.raises(ValueError, match="edges refer to tasks"):
+            f.validate()
+
+    def test_modifying_edges_directly_invalidates_indexes_and_cache(self):
+        f = Flow(name="test")
+        t1, t2, t3 = Task(), Task(), Task()
+        f.add_edge(t1, t2)
+        f.add_edge(t2, t3)
+        assert f.sorted_tasks() == (t1, t2, t3)
+
+        f.edges.discard(Edge(t1, t2))
+        f.edges.add(Edge(t3, t1))
+        assert f.sorted_tasks() == (t2, t3, t1)
+        assert f.upstream_tasks(t1) == {t3}
+
+        f.edges = {Edge(t1, t3)}
+        assert f.terminal_tasks() == {t2, t3}
+        assert f.downstream_tasks(t1) == {t3}
+
+    def test_copied_flows_have_independent_indexes(self):
+        f = Flow(name="test")
+        t1, t2, t3 = Task(), Task(), Task()
+        f.add_edge(t1, t2)
+        f2 = f.copy()
+        f2.add_edge(t2, t3)
+        f.tasks.discard(t1)
+
+        assert f.sorted_tasks() == (t2,)
+        assert f2.sorted_tasks() == (t1, t2, t3)
+
+    def test_adding_task_invalidates_cache(self):
+        f = Flow(name="test")
+        f.root_tasks()
+        f._cache[("root_tasks", ())] = 1
+        version = f._version
+        t1 = f.add_task(Task())
+        assert f._version > version
+        assert f.root_tasks() == {t1}
 
-    def test_setting_reference_tasks_clears_cache(self):
+    def test_adding_edge_invalidates_cache(self):
+        f = Flow(name="test")
+        f.terminal_tasks()
+        f._cache[("terminal_tasks", ())] = 1
+        version = f._version
+        t1, t2 = Task(), Task()
+        f.add_edge(t1, t2)
+        assert f._version > version
+        assert f.terminal_tasks() == {t2}
+
+    def test_setting_reference_tasks_invalidates_cache(self):
         f = Flow(name="test")
         t1 = Task()
         f.add_task(t1)
         f._cache[1] = 2
+        version = f._version
         f.set_reference_tasks([t1])
+        assert f._version > version
+        f.root_tasks()
         assert 1 not in f._cache
 
+    def test_replace_invalidates_cache(self):
+        f = Flow(name="test")
+        t1, t2, t3 = Task(), Task(), Task()
+        f.add_edge(t1, t2)
+        assert f.sorted_tasks() == (t1, t2)
+        f.replace(t1, t3)
+        assert f.sorted_tasks() == (t3, t2)
+
+    def test_adding_existing_task_does_not_invalidate_cache(self):
+        f = Flow(name="test")
+        t1 = f.add_task(Task())
+        f.root_tasks()
+        version = f._version
+        f.add_task(t1)
+        assert f._version == version
+        assert ("root_tasks", ()) in f._cache
+
+    def test_cache_check_does_not_copy_the_flow_graph(self, monkeypatch):
+        f = Flow(name="test")
+        f.chain(*[Task() for _ in range(10)])
+        f.sorted_tasks()
+        monkeypatch.setattr(f, "_tasks", None)
+        monkeypatch.setattr(f, "_edges", None)
+        assert len(f.sorted_tasks()) == 10
+
+
+class TestBulk:
+    def test_bulk_defers_validation_until_exit(self, monkeypatch):
+        validate = MagicMock()
+        monkeypatch.setattr("prefect.core.flow.Flow.validate", validate)
+        f = Flow(name="test")
+        tasks = [Task() for _ in range(5)]
+        with f.bulk():
+            for t1, t2 in zip(tasks, tasks[1:]):
+                f.add_edge(t1, t2, validate=True)
+            assert validate.call_count == 0
+        assert validate.call_count == 1
+
+    def test_bulk_binds_each_signature_once(self, monkeypatch):
+        f = Flow(name="test")
+        t1, t2, add = Task(), Task(), AddTask()
+        signature = MagicMock(wraps=inspect.signature)
+        monkeypatch.setattr("prefect.core.flow.inspect.signature", signature)
+        with f.bulk():
+            f.add_edge(t1, add, key="x", validate=True)
+            f.add_edge(t2, add, key="y", validate=True)
+        assert signature.call_count == 1
+
+    def test_bulk_detects_cycles_on_exit(self):
+        f = Flow(name="test")
+        t1, t2 = Task(), Task()
+        with pytest.raises(ValueError, match="Cycle found"):
+            with f.bulk():
+                f.add_edge(t1, t2, validate=True)
+                f.add_edge(t2, t1, validate=True)
+
+    def test_bulk_detects_duplicate_keys_on_exit(self):
+        f = Flow(name="test")
+        add = AddTask()
+        with pytest.raises(ValueError, match="already been assigned"):
+            with f.bulk():
+                f.add_edge(Task(), add, key="x", validate=True)
+                f.add_edge(Task(), add, key="x", validate=True)
+
+    @pytest.mark.parametrize("in_bulk", [True, False])
+    def test_bulk_detects_identical_keyed_edges_on_exit(self, in_bulk):
+        f = Flow(name="test")
+        t1, add = Task(), AddTask()
+        if not in_bulk:
+            f.add_edge(t1, add, key="x", validate=True)
+        with pytest.raises(ValueError, match="already been assigned"):
+            with f.bulk():
+                if in_bulk:
+                    f.add_edge(t1, add, key="x", validate=True)
+                f.add_edge(t1, add, key="x", validate=True)
+
+    def test_bulk_allows_identical_unkeyed_edges(self):
+        f = Flow(name="test")
+        t1, t2 = Task(), Task()
+        with f.bulk():
+            f.add_edge(t1, t2, validate=True)
+            f.add_edge(t1, t2, validate=True)
+        assert len(f.edges) == 1
+
+    def test_bulk_detects_invalid_keys_on_exit(self):
+        f = Flow(name="test")
+        with pytest.raises(TypeError):
+            with f.bulk():
+                f.add_edge(Task(), AddTask(), key="z", validate=True)
+
+    def test_bulk_skips_validation_if_not_requested(self):
+        f = Flow(name="test")
+        t1, t2 = Task(), Task()
+        with f.bulk():
+            f.add_edge(t1, t2, validate=False)
+            f.add_edge(t2, t1, validate=False)
+        with pytest.raises(ValueError, match="Cycle found"):
+            f.validate()
+
+    def test_bulk_skips_validation_if_an_error_is_raised(self, monkeypatch):
+        validate = MagicMock()
+        monkeypatch.setattr("prefect.core.flow.Flow.validate", validate)
+        f = Flow(name="test")
+        with pytest.raises(ZeroDivisionError):
+            with f.bulk():
+                f.add_edge(Task(), Task(), validate=True)
+                1 / 0
+        assert validate.call_count == 0
+        assert f._deferred_validation is None
+
+    def test_nested_bulk_validates_once_on_outermost_exit(self, monkeypatch):
+        validate = MagicMock()
+        monkeypatch.setattr("prefect.core.flow.Flow.validate", validate)
+        f = Flow(name="test")
+        with f.bulk():
+            with f.bulk():
+                f.add_edge(Task(), Task(), validate=True)
+            assert validate.call_count == 0
+            f.add_edge(Task(), Task(), validate=True)
+        assert validate.call_count == 1
+
+    def test_add_edges(self):
+        f = Flow(name="test")
+        t1, t2, t3 = Task(), AddTask(), Task()
+        edges = f.add_edges(
+            [Edge(t1, t2, key="x"), Edge(t3, t2, key="y")], validate=True
+        )
+        assert f.edges == set(edges)
+        assert f.tasks == {t1, t2, t3}
+        assert f.sorted_tasks()[-1] is t2
+
+    def test_add_edges_validates_once(self, monkeypatch):
+        validate = MagicMock()
+        monkeypatch.setattr("prefect.core.flow.Flow.validate", validate)
+        f = Flow(name="test")
+        tasks = [Task() for _ in range(5)]
+        f.add_edges([Edge(t1, t2) for t1, t2 in zip(tasks, tasks[1:])], validate=True)
+        assert validate.call_count == 1
+
+    def test_eager_chain_validates_once(self, monkeypatch):
+        validate = MagicMock()
+        monkeypatch.setattr("prefect.core.flow.Flow.validate", validate)
+        f = Flow(name="test")
+        f.chain(*[Task() for _ in range(5)], validate=True)
+        assert validate.call_count == 1
+
 
 class TestReplace:
     def test_replace_replaces_all_the_things(self):
@@ -1396,6 +1706,20 @@ class TestReplace:
         with pytest.raises(ValueError):
             f.edges_to(t1)
 
+    def test_replace_updates_edge_indexes(self):
+        with Flow(name="test") as f:
+            t1 = Task(name="t1")()
+            t2 = Task(name="t2")(upstream_tasks=[t1])
+            t3 = Task(name="t3")(upstream_tasks=[t2])
+        new = Task(name="new")
+        f.replace(t2, new)
+
+        assert {e.downstream_task for e in f.edges_from(t1)} == {new}
+        assert {e.upstream_task for e in f.edges_to(t3)} == {new}
+        assert f.upstream_tasks(new) == {t1}
+        assert f.downstream_tasks(new) == {t3}
+        assert f.sorted_tasks() == (t1, new, t3)
+
     def test_replace_complains_about_tasks_not_in_flow(self):
         with Flow(name="test") as f:
             t1 = Task(name="t1")()
@@ -95,6 +95,15 @@ class TestCreateTask:
             t4 = Task()
             assert t4.timeout == 3
 
+    def test_create_task_with_map_batch_size(self):
+        assert Task().map_batch_size is None
+        assert Task(map_batch_size=100).map_batch_size == 100
+
+    @pytest.mark.parametrize("map_batch_size", [0, -1, 1.5])
+    def test_create_task_with_invalid_map_batch_size(self, map_batch_size):
+        with pytest.raises(ValueError, match="map_batch_size"):
+            Task(map_batch_size=map_batch_size)
+
     def test_create_task_with_trigger(self):
         t1 = Task()
         assert t1.trigger is prefect.triggers.all_successful
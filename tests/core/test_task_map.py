@@ -9,6 +9,7 @@ from prefect.core import Edge, Flow, Parameter, Task
 from prefect.engine.flow_runner import FlowRunner
 from prefect.engine.result import NoResult, Result
 from prefect.engine.state import Mapped, Pending, Retrying, Success
+from prefect.utilities.configuration import set_temporary_config
 from prefect.utilities.debug import raise_on_exception
 from prefect.utilities.tasks import task, unmapped
 
@@ -487,6 +488,77 @@ def test_map_allows_for_retries(executor):
     assert new.result == [100, 1.0, 0.5]
 
 
+@pytest.mark.parametrize(
+    "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+)
+def test_map_with_batch_size(executor):
+    a = AddTask()
+
+    with Flow(name="test") as f:
+        res = a.map(x=list(range(7)), task_args=dict(map_batch_size=3))
+        res2 = a.map(res, task_args=dict(map_batch_size=2))
+
+    s = f.run(executor=executor)
+    assert s.is_successful()
+    assert s.result[res].result == [1, 2, 3, 4, 5, 6, 7]
+    assert all(state.is_successful() for state in s.result[res].map_states)
+    assert s.result[res2].result == [2, 3, 4, 5, 6, 7, 8]
+
+
+@pytest.mark.parametrize(
+    "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+)
+def test_map_with_scattered_upstream_states(executor):
+    ll = ListTask()
+    a = AddTask()
+
+    @task
+    def big():
+        return list(range(10000))
+
+    @task
+    def take(x, items):
+        return items[x]
+
+    with Flow(name="test") as f:
+        items = big()
+        res = take.map(a.map(ll), items=unmapped(items))
+
+    with set_temporary_config({"engine.task_runner.scatter_upstream_states": True}):
+        s = f.run(executor=executor)
+    assert s.is_successful()
+    assert s.result[res].result == [2, 3, 4]
+
+
+@pytest.mark.parametrize(
+    "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+)
+def test_batched_map_retries_individual_children(executor):
+    ii = IdTask()
+    ll = ListTask()
+    div = DivTask(max_retries=1, retry_delay=datetime.timedelta(0), map_batch_size=2)
+
+    with Flow(name="test") as f:
+        l_res = ll(start=0)
+        divved = div.map(l_res)
+        res = ii.map(divved)
+
+    states = FlowRunner(flow=f).run(executor=executor, return_tasks=f.tasks)
+    assert states.is_running()
+
+    old = states.result[divved]
+    assert len(old.map_states) == 3
+    assert old.map_states[0].is_retrying()
+    assert old.result[1:] == [1.0, 0.5]
+
+    states.result[l_res].result[0] = 0.01
+    states = FlowRunner(flow=f).run(
+        task_states=states.result, executor=executor, return_tasks=f.tasks
+    )
+    assert states.is_successful()
+    assert states.result[res].result == [100, 1.0, 0.5]
+
+
 @pytest.mark.parametrize(
     "executor", ["local", "sync", "mproc", "mthread"], indirect=True
 )
@@ -132,7 +132,19 @@ class MockedCloudClient(MagicMock):
         Return task run if found, otherwise create it
         """
         self.call_count["get_task_run_info"] += 1
+        return self._get_or_create_task_run(flow_run_id, task_id, map_index)
 
+    def get_task_run_infos(self, flow_run_id, task_id, map_indices):
+        """
+        Return (creating them if necessary) the task runs of several map indices
+        """
+        self.call_count["get_task_run_infos"] += 1
+        return [
+            self._get_or_create_task_run(flow_run_id, task_id, map_index)
+            for map_index in map_indices
+        ]
+
+    def _get_or_create_task_run(self, flow_run_id, task_id, map_index):
         task_run = next(
             (
                 t
@@ -452,6 +464,50 @@ def test_simple_map(monkeypatch, executor):
     assert len([tr for tr in client.task_runs.values() if tr.task_slug == t1.slug]) == 4
 
 
+@pytest.mark.parametrize("create_batch_size", [0, 2])
+def test_map_creates_child_task_runs_in_batches(monkeypatch, create_batch_size):
+    flow_run_id = str(uuid.uuid4())
+    task_run_id_1 = str(uuid.uuid4())
+
+    with prefect.Flow(name="test", result_handler=JSONResultHandler()) as flow:
+        t1 = plus_one.map([0, 1, 2])
+
+    client = MockedCloudClient(
+        flow_runs=[FlowRun(id=flow_run_id)],
+        task_runs=[
+            TaskRun(id=task_run_id_1, task_slug=t1.slug, flow_run_id=flow_run_id)
+        ]
+        + [
+            TaskRun(id=str(uuid.uuid4()), task_slug=t.slug, flow_run_id=flow_run_id)
+            for t in flow.tasks
+            if t is not t1
+        ],
+        monkeypatch=monkeypatch,
+    )
+
+    with set_temporary_config({"cloud.task_runs.create_batch_size": create_batch_size}):
+        with prefect.context(flow_run_id=flow_run_id):
+            state = CloudFlowRunner(flow=flow).run(return_tasks=flow.tasks)
+
+    assert state.is_successful()
+    assert state.result[t1].result == [1, 2, 3]
+    children = [
+        tr
+        for tr in client.task_runs.values()
+        if tr.task_slug == t1.slug and tr.map_index != -1
+    ]
+    assert len(children) == 3
+    assert all(tr.state.is_successful() for tr in children)
+    # with batching, children are created by their parent (3 task runs in batches of 2)
+    # and don't retrieve their own task run
+    if create_batch_size:
+        assert client.call_count["get_task_run_infos"] == 2
+        assert client.call_count["get_task_run_info"] == 0
+    else:
+        assert client.call_count["get_task_run_infos"] == 0
+        assert client.call_count["get_task_run_info"] == 3
+
+
 @pytest.mark.parametrize("executor", ["local", "sync"], indirect=True)
 def test_deep_map(monkeypatch, executor):
 
@@ -13,8 +13,9 @@ import pytest
 
 import prefect
 from prefect.client import Client
+from prefect.client.client import TaskRunInfoResult
 from prefect.core import Edge, Task
-from prefect.engine.cache_validators import all_inputs
+from prefect.engine.cache_validators import all_inputs, partial_input_hashes_only
 from prefect.engine.cloud import CloudTaskRunner
 from prefect.engine.result import NoResult, Result, SafeResult
 from prefect.engine.result_handlers import JSONResultHandler, ResultHandler
@@ -38,6 +39,7 @@ from prefect.engine.state import (
     TriggerFailed,
 )
 from prefect.serialization.result_handlers import ResultHandlerSchema
+from prefect.utilities import hashing
 from prefect.utilities.configuration import set_temporary_config
 
 
@@ -404,6 +406,150 @@ def test_task_runner_respects_the_db_state(monkeypatch, state):
     assert res == db_state
 
 
+class UnreadableResultHandler(ResultHandler):
+    def read(self, val):
+        raise AssertionError("cached inputs were read")
+
+
+@pytest.fixture()
+def fingerprints():
+    with set_temporary_config({"engine.task_runner.fingerprint_cached_states": True}):
+        yield
+
+
+@pytest.mark.parametrize("cached_x", ["2", "3"])
+def test_task_runner_validates_fingerprinted_cached_states(
+    client, fingerprints, cached_x
+):
+    @prefect.task(
+        cache_for=datetime.timedelta(minutes=1),
+        cache_validator=all_inputs,
+        result_handler=JSONResultHandler(),
+    )
+    def cached_task(x):
+        return 42
+
+    expiration = datetime.datetime.utcnow() + datetime.timedelta(minutes=2)
+    fingerprint = hashing.fingerprint(hashing.hash_values({"x": 2}))
+    # a state whose fingerprint matches is still compared by its cached inputs, in
+    # case the fingerprints of different inputs collide
+    state = Cached(
+        cached_result_expiration=expiration,
+        result=SafeResult("99", JSONResultHandler()),
+        cached_inputs={"x": SafeResult(cached_x, result_handler=JSONResultHandler())},
+        cached_fingerprint=fingerprint,
+    )
+    client.get_latest_cached_states = MagicMock(return_value=[state])
+
+    res = CloudTaskRunner(task=cached_task).check_task_is_cached(
+        Pending(), inputs={"x": Result(2, result_handler=JSONResultHandler())}
+    )
+    if cached_x == "2":
+        assert res.is_cached()
+        assert res.result == 99
+        assert res.cached_fingerprint == fingerprint
+    else:
+        assert res.is_pending()
+
+
+def test_task_runner_reuses_recently_used_cached_states(client, fingerprints):
+    @prefect.task(
+        cache_for=datetime.timedelta(minutes=1),
+        cache_validator=all_inputs,
+        result_handler=JSONResultHandler(),
+    )
+    def cached_task(x):
+        return 42
+
+    state = Cached(
+        cached_result_expiration=datetime.datetime.utcnow()
+        + datetime.timedelta(minutes=2),
+        result=SafeResult("99", JSONResultHandler()),
+        cached_inputs={"x": SafeResult("2", result_handler=JSONResultHandler())},
+        cached_fingerprint=hashing.fingerprint(hashing.hash_values({"x": 2})),
+    )
+    client.get_latest_cached_states = MagicMock(return_value=[state])
+
+    with prefect.context(task_id="id"):
+        first = CloudTaskRunner(task=cached_task).check_task_is_cached(
+            Pending(), inputs={"x": Result(2)}
+        )
+        second = CloudTaskRunner(task=cached_task).check_task_is_cached(
+            Pending(), inputs={"x": Result(2)}
+        )
+        other = CloudTaskRunner(task=cached_task).check_task_is_cached(
+            Pending(), inputs={"x": Result(3)}
+        )
+
+    assert first.result == second.result == 99
+    assert second is not first
+    assert other.is_pending()
+    # the second lookup used the state found by the first
+    assert client.get_latest_cached_states.call_count == 2
+
+
+def test_task_runner_doesnt_hash_inputs_without_fingerprints(client, monkeypatch):
+    @prefect.task(
+        cache_for=datetime.timedelta(minutes=1),
+        cache_validator=all_inputs,
+        result_handler=JSONResultHandler(),
+    )
+    def cached_task(x):
+        return 42
+
+    state = Cached(
+        cached_result_expiration=datetime.datetime.utcnow()
+        + datetime.timedelta(minutes=2),
+        result=SafeResult("99", JSONResultHandler()),
+        cached_inputs={"x": SafeResult("2", result_handler=JSONResultHandler())},
+        cached_fingerprint=hashing.fingerprint(hashing.hash_values({"x": 2})),
+    )
+    client.get_latest_cached_states = MagicMock(return_value=[state])
+    stable_hash = MagicMock(side_effect=AssertionError("inputs were hashed"))
+    monkeypatch.setattr(hashing, "stable_hash", stable_hash)
+
+    with prefect.context(task_id="id"):
+        for _ in range(2):
+            res = CloudTaskRunner(task=cached_task).check_task_is_cached(
+                Pending(), inputs={"x": Result(2)}
+            )
+            assert res.result == 99
+    # recently used states are only reused with fingerprints
+    assert client.get_latest_cached_states.call_count == 2
+
+
+def test_task_runner_validates_input_hashes_without_reading_inputs(client):
+    @prefect.task(
+        cache_for=datetime.timedelta(minutes=1),
+        cache_validator=partial_input_hashes_only(validate_on=["x"]),
+        result_handler=JSONResultHandler(),
+    )
+    def cached_task(x, y):
+        return 42
+
+    state = Cached(
+        cached_result_expiration=datetime.datetime.utcnow()
+        + datetime.timedelta(minutes=2),
+        result=SafeResult("99", JSONResultHandler()),
+        cached_inputs={
+            "x": SafeResult("2", result_handler=JSONResultHandler()),
+            "y": SafeResult("3", result_handler=JSONResultHandler()),
+        },
+        cached_input_hashes=hashing.hash_values({"x": 2, "y": 3}),
+    )
+    client.get_latest_cached_states = MagicMock(return_value=[state])
+
+    res = CloudTaskRunner(task=cached_task).check_task_is_cached(
+        Pending(),
+        inputs={
+            "x": Result(2, result_handler=UnreadableResultHandler()),
+            "y": Result(4, result_handler=UnreadableResultHandler()),
+        },
+    )
+    assert res.is_cached()
+    assert res.result == 99
+
+
 def test_task_runner_uses_cached_inputs_from_db_state(monkeypatch):
     @prefect.task(name="test", result_handler=JSONResultHandler())
     def add_one(x):
@@ -606,6 +752,69 @@ class TestStateResultHandling:
         assert states[1].is_successful()
         assert states[1]._result.safe_value == SafeResult("2", result_handler=handler)
 
+    @pytest.mark.parametrize("fail", [False, True])
+    def test_task_runner_waits_for_background_checkpoints(
+        self, client, monkeypatch, fail
+    ):
+        monkeypatch.setattr(prefect.engine.checkpointing, "_checkpoint_pool", None)
+
+        class Handler(JSONResultHandler):
+            def write(self, result):
+                if fail:
+                    raise OSError("no space left")
+                return super().write(result)
+
+        @prefect.task(result_handler=Handler())
+        def add(x, y):
+            return x + y
+
+        with set_temporary_config({"engine.checkpointing.background": True}):
+            res = CloudTaskRunner(task=add).run(
+                upstream_states={
+                    Edge(Task(), Task(), key="x"): Success(result=Result(1)),
+                    Edge(Task(), Task(), key="y"): Success(result=Result(1)),
+                }
+            )
+
+        states = [call[1]["state"] for call in client.set_task_run_state.call_args_list]
+        assert states[-1] is res
+        if fail:
+            assert res.is_failed()
+            assert "no space left" in res.message
+        else:
+            assert res.is_successful()
+            assert res._result.safe_value.value == "2"
+
+    def test_task_runner_only_waits_for_checkpoints_of_successful_states(
+        self, client, monkeypatch
+    ):
+        monkeypatch.setattr(prefect.engine.checkpointing, "_checkpoint_pool", None)
+        checked = []
+
+        def check_checkpoint(state):
+            checked.append(state)
+            return state
+
+        monkeypatch.setattr(
+            prefect.engine.cloud.task_runner, "check_checkpoint", check_checkpoint
+        )
+
+        @prefect.task(result_handler=JSONResultHandler())
+        def add(x, y):
+            return x + y
+
+        with set_temporary_config({"engine.checkpointing.background": True}):
+            res = CloudTaskRunner(task=add).run(
+                upstream_states={
+                    Edge(Task(), Task(), key="x"): Success(result=Result(1)),
+                    Edge(Task(), Task(), key="y"): Success(result=Result(1)),
+                }
+            )
+
+        assert res.is_successful()
+        assert client.set_task_run_state.call_count == 2
+        assert checked == [res]
+
     def test_task_runner_handles_inputs_prior_to_setting_state(self, client):
         @prefect.task(max_retries=1, retry_delay=datetime.timedelta(days=1))
         def add(x, y):
@@ -894,3 +1103,238 @@ def test_cloud_task_runner_handles_retries_with_queued_states_from_cloud(client)
 
     # ensures result handler was called and persisted
     assert calls[2]["state"].cached_inputs["x"].safe_value.value == "42"
+
+
+class TestBatchedStateUpdates:
+    @pytest.fixture(autouse=True)
+    def batch_settings(self):
+        with set_temporary_config({"cloud.task_run_states.batch": True}):
+            yield
+
+    @pytest.fixture()
+    def client(self, client):
+        client.set_task_run_states = MagicMock(
+            side_effect=lambda states: [u["state"] for u in states]
+        )
+        return client
+
+    def test_all_states_are_sent_in_order(self, client):
+        @prefect.task
+        def add_one(x):
+            return x + 1
+
+        res = CloudTaskRunner(task=add_one).run(
+            context={"task_run_id": "id", "task_run_version": 1},
+            upstream_states={Edge(Task(), add_one, key="x"): Success(result=Result(1))},
+        )
+
+        assert res.is_successful()
+        assert res.result == 2
+        client.set_task_run_state.assert_not_called()
+        states = [
+            u["state"]
+            for call in client.set_task_run_states.call_args_list
+            for u in call[0][0]
+        ]
+        assert [type(s).__name__ for s in states] == ["Running", "Success"]
+        versions = [
+            u["version"]
+            for call in client.set_task_run_states.call_args_list
+            for u in call[0][0]
+        ]
+        assert versions == [1, 2]
+
+    def test_queued_states_are_respected(self, client):
+        calls = []
+
+        def queued_mock(states):
+            calls.extend(states)
+            if len(calls) == 1:
+                return [Queued()]  # immediate start time
+            return [u["state"] for u in states]
+
+        client.set_task_run_states = queued_mock
+
+        @prefect.task
+        def noop():
+            pass
+
+        res = CloudTaskRunner(task=noop).run(
+            context={"task_run_id": "id", "task_run_version": 1}
+        )
+
+        assert res.is_successful()
+        assert [type(c["state"]).__name__ for c in calls] == [
+            "Running",
+            "Running",
+            "Success",
+        ]
+
+    def test_failed_final_update_returns_client_failed(self, client):
+        def fail_on_success(states):
+            if any(u["state"].is_successful() for u in states):
+                raise SyntaxError("no success for you")
+            return [u["state"] for u in states]
+
+        client.set_task_run_states = fail_on_success
+
+        @prefect.task
+        def noop():
+            pass
+
+        res = CloudTaskRunner(task=noop).run(
+            context={"task_run_id": "id", "task_run_version": 1}
+        )
+
+        assert isinstance(res, ClientFailed)
+        assert res.state.is_successful()
+
+
+class PicklableClient:
+    """
+    A stand-in for `Client` which, unlike a `MagicMock`, can be sent to Dask workers along
+    with the runners that hold it; every copy records its calls in the same list.
+    """
+
+    calls = []  # type: list
+    api_server = "http://my-cloud.foo"
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def get_auth_token(self):
+        return "token"
+
+    def graphql(self, *args, **kwargs):
+        return Box(data=dict(flow_run_by_pk=dict(flow=dict(settings={}))))
+
+    def get_task_run_info(self, flow_run_id, task_id, map_index):
+        return TaskRunInfoResult(
+            id="id-{}".format(map_index),
+            task_id=task_id,
+            task_slug=task_id,
+            version=0,
+            state=None,
+        )
+
+    def get_task_run_infos(self, flow_run_id, task_id, map_indices):
+        return [self.get_task_run_info(flow_run_id, task_id, i) for i in map_indices]
+
+    def set_task_run_states(self, states):
+        type(self).calls.extend(states)
+        return [u["state"] for u in states]
+
+
+@pytest.mark.parametrize("create_batch_size", [0, 2])
+def test_batched_mapped_runs_can_be_sent_to_dask(
+    monkeypatch, mthread, create_batch_size
+):
+    monkeypatch.setattr("prefect.engine.cloud.task_runner.Client", PicklableClient)
+    monkeypatch.setattr(PicklableClient, "calls", [])
+
+    @prefect.task
+    def add_one(x):
+        return x + 1
+
+    with set_temporary_config(
+        {
+            "cloud.task_run_states.batch": True,
+            "cloud.task_runs.create_batch_size": create_batch_size,
+        }
+    ):
+        with mthread.start():
+            state = CloudTaskRunner(task=add_one).run(
+                context={"task_run_id": "id", "task_run_version": 1},
+                upstream_states={
+                    Edge(Task(), add_one, key="x", mapped=True): Success(
+                        result=Result([1, 2, 3])
+                    )
+                },
+                executor=mthread,
+            )
+            map_states = mthread.wait(state.map_states)
+
+    assert state.is_mapped()
+    assert [s.result for s in map_states] == [2, 3, 4]
+    sent = [
+        (u["task_run_id"], type(u["state"]).__name__) for u in PicklableClient.calls
+    ]
+    assert ("id", "Mapped") in sent
+    assert {("id-{}".format(i), "Success") for i in range(3)} <= set(sent)
+
+
+class TestPrepareMappedChildren:
+    def test_children_are_created_in_batches(self, client):
+        client.get_task_run_infos = MagicMock(
+            side_effect=lambda flow_run_id, task_id, map_indices: [
+                MagicMock(id="id-{}".format(i), version=i, state=Pending())
+                for i in map_indices
+            ]
+        )
+        retrying = Retrying()
+        with set_temporary_config({"cloud.task_runs.create_batch_size": 2}):
+            with prefect.context(flow_run_id="fr", task_id="t"):
+                states, contexts = CloudTaskRunner(task=Task()).prepare_mapped_children(
+                    initial_states=[None, retrying, None], map_indices=[0, 1, 2]
+                )
+
+        assert [
+            c[1]["map_indices"] for c in client.get_task_run_infos.call_args_list
+        ] == [[0, 1], [2],]
+        assert client.get_task_run_infos.call_args[1]["flow_run_id"] == "fr"
+        assert client.get_task_run_infos.call_args[1]["task_id"] == "t"
+        # provided states are kept; otherwise the state from the db is used
+        assert states[1] is retrying
+        assert isinstance(states[0], Pending) and isinstance(states[2], Pending)
+        assert [(c["task_run_id"], c["task_run_version"]) for c in contexts] == [
+            ("id-0", 0),
+            ("id-1", 1),
+            ("id-2", 2),
+        ]
+
+    @pytest.mark.parametrize(
+        "get_task_run_infos",
+        [MagicMock(side_effect=SyntaxError), MagicMock(return_value=[])],
+    )
+    def test_children_retrieve_their_own_task_run_if_creation_fails(
+        self, client, caplog, get_task_run_infos
+    ):
+        client.get_task_run_infos = get_task_run_infos
+        with set_temporary_config({"cloud.task_runs.create_batch_size": 2}):
+            states, contexts = CloudTaskRunner(task=Task()).prepare_mapped_children(
+                initial_states=[None, None], map_indices=[0, 1]
+            )
+        assert states == [None, None]
+        assert contexts == [{}, {}]
+        assert "Failed to create mapped task runs" in caplog.text
+
+    def test_children_are_not_created_if_batch_size_is_zero(self, client):
+        with set_temporary_config({"cloud.task_runs.create_batch_size": 0}):
+            states, contexts = CloudTaskRunner(task=Task()).prepare_mapped_children(
+                initial_states=[None, None], map_indices=[0, 1]
+            )
+        assert states == [None, None]
+        assert contexts == [{}, {}]
+        assert not client.get_task_run_infos.called
+
+    def test_children_are_not_created_by_default(self, client):
+        assert prefect.config.cloud.task_runs.create_batch_size == 0
+        CloudTaskRunner(task=Task()).prepare_mapped_children(
+            initial_states=[None, None], map_indices=[0, 1]
+        )
+        assert not client.get_task_run_infos.called
+
+    def test_created_children_dont_retrieve_their_task_run(self, client):
+        res = CloudTaskRunner(task=Task()).run(
+            context={
+                "map_index": 1,
+                "task_run_id": "id",
+                "task_run_version": 1,
+                "_task_run_created": True,
+            }
+        )
+        assert res.is_successful()
+        assert client.get_task_run_info.call_count == 0
+        assert [
+            call[1]["task_run_id"] for call in client.set_task_run_state.call_args_list
+        ] == ["id", "id"]
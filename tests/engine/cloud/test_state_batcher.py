@@ -0,0 +1,189 @@
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from prefect.engine.cloud.state_batcher import (
+    TaskRunStateBatcher,
+    get_task_run_state_batcher,
+)
+from prefect.engine.state import Queued, Running, Success
+
+
+class BlockingClient:
+    """
+    A client whose first `set_task_run_states` call blocks until released, so that
+    updates submitted in the meantime queue up behind it.
+    """
+
+    def __init__(self, api_server="http://cloud", token="token"):
+        self.api_server = api_server
+        self.token = token
+        self.calls = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def set_task_run_states(self, task_run_states):
+        self.calls.append(task_run_states)
+        if len(self.calls) == 1:
+            self.started.set()
+            self.release.wait(5)
+        return [update["state"] for update in task_run_states]
+
+    def get_auth_token(self):
+        return self.token
+
+
+def test_batcher_returns_the_states_from_the_client():
+    client = MagicMock(
+        set_task_run_states=MagicMock(side_effect=lambda states: [Queued()])
+    )
+    batcher = TaskRunStateBatcher()
+    future = batcher.submit(client, task_run_id="id", version=1, state=Running())
+    assert isinstance(future.result(timeout=5), Queued)
+    client.set_task_run_states.assert_called_once()
+    assert batcher.round_trips == 1
+
+
+def test_updates_queued_during_a_request_are_sent_together():
+    client = BlockingClient()
+    batcher = TaskRunStateBatcher()
+    first = batcher.submit(client, task_run_id="first", version=1, state=Running())
+    assert client.started.wait(5)
+
+    futures = [
+        batcher.submit(client, task_run_id=str(i), version=1, state=Success())
+        for i in range(5)
+    ]
+    client.release.set()
+
+    assert isinstance(first.result(timeout=5), Running)
+    assert all(isinstance(f.result(timeout=5), Success) for f in futures)
+    assert len(client.calls) == 2
+    assert [u["task_run_id"] for u in client.calls[1]] == [str(i) for i in range(5)]
+    assert batcher.round_trips == 2
+
+
+def test_batches_contain_at_most_one_update_per_task_run():
+    client = BlockingClient()
+    batcher = TaskRunStateBatcher()
+    batcher.submit(client, task_run_id="blocker", version=1, state=Running())
+    assert client.started.wait(5)
+
+    futures = [
+        batcher.submit(client, task_run_id="a", version=1, state=Running()),
+        batcher.submit(client, task_run_id="a", version=2, state=Success()),
+        batcher.submit(client, task_run_id="b", version=1, state=Running()),
+    ]
+    client.release.set()
+    for future in futures:
+        future.result(timeout=5)
+
+    assert [[(u["task_run_id"], u["version"]) for u in c] for c in client.calls] == [
+        [("blocker", 1)],
+        [("a", 1), ("b", 1)],
+        [("a", 2)],
+    ]
+
+
+def test_batches_respect_max_batch_size():
+    client = BlockingClient()
+    batcher = TaskRunStateBatcher(max_batch_size=2)
+    batcher.submit(client, task_run_id="blocker", version=1, state=Running())
+    assert client.started.wait(5)
+
+    futures = [
+        batcher.submit(client, task_run_id=str(i), version=1, state=Success())
+        for i in range(5)
+    ]
+    client.release.set()
+    for future in futures:
+        future.result(timeout=5)
+
+    assert [len(c) for c in client.calls] == [1, 2, 2, 1]
+
+
+def test_updates_for_the_same_server_and_token_share_batches():
+    client = BlockingClient()
+    batcher = TaskRunStateBatcher()
+    batcher.submit(client, task_run_id="blocker", version=1, state=Running())
+    assert client.started.wait(5)
+
+    others = [BlockingClient() for _ in range(3)]
+    for other in others:
+        other.release.set()
+    futures = [
+        batcher.submit(other, task_run_id=str(i), version=1, state=Success())
+        for i, other in enumerate(others)
+    ]
+    client.release.set()
+    for future in futures:
+        future.result(timeout=5)
+
+    # the batch is sent with the client of the first update in it
+    assert [[u["task_run_id"] for u in c] for c in others[0].calls] == [["0", "1", "2"]]
+    assert not others[1].calls and not others[2].calls
+
+
+@pytest.mark.parametrize(
+    "settings", [dict(api_server="http://other"), dict(token="other-token")]
+)
+def test_updates_for_different_servers_or_tokens_are_not_mixed(settings):
+    client = BlockingClient()
+    other = BlockingClient(**settings)
+    other.release.set()
+    batcher = TaskRunStateBatcher()
+    batcher.submit(client, task_run_id="blocker", version=1, state=Running())
+    assert client.started.wait(5)
+
+    futures = [
+        batcher.submit(client, task_run_id="a", version=1, state=Success()),
+        batcher.submit(other, task_run_id="b", version=1, state=Success()),
+        batcher.submit(client, task_run_id="c", version=1, state=Success()),
+    ]
+    client.release.set()
+    for future in futures:
+        future.result(timeout=5)
+
+    assert [[u["task_run_id"] for u in c] for c in client.calls] == [
+        ["blocker"],
+        ["a", "c"],
+    ]
+    assert [[u["task_run_id"] for u in c] for c in other.calls] == [["b"]]
+
+
+def test_failed_batches_are_retried_individually():
+    def set_task_run_states(states):
+        if any(u["task_run_id"] == "bad" for u in states):
+            raise ValueError("version mismatch")
+        return [u["state"] for u in states]
+
+    client = BlockingClient()
+    client_fn = client.set_task_run_states
+
+    def blocking_then_failing(states):
+        client_fn(states)
+        return set_task_run_states(states)
+
+    client.set_task_run_states = blocking_then_failing
+    batcher = TaskRunStateBatcher()
+    batcher.submit(client, task_run_id="blocker", version=1, state=Running())
+    assert client.started.wait(5)
+
+    good = batcher.submit(client, task_run_id="good", version=1, state=Success())
+    bad = batcher.submit(client, task_run_id="bad", version=1, state=Success())
+    client.release.set()
+
+    assert isinstance(good.result(timeout=5), Success)
+    with pytest.raises(ValueError, match="version mismatch"):
+        bad.result(timeout=5)
+    assert [[u["task_run_id"] for u in c] for c in client.calls] == [
+        ["blocker"],
+        ["good", "bad"],
+        ["good"],
+        ["bad"],
+    ]
+
+
+def test_get_task_run_state_batcher_is_shared():
+    assert get_task_run_state_batcher() is get_task_run_state_batcher()
@@ -1,7 +1,13 @@
+import uuid
+from unittest.mock import MagicMock
+
 import pytest
 
 import prefect
-from prefect.engine.cloud.utilities import prepare_state_for_cloud
+from prefect.engine.cloud.utilities import (
+    get_flow_run_settings,
+    prepare_state_for_cloud,
+)
 from prefect.engine.result import NoResult, Result, SafeResult
 from prefect.engine.result_handlers import JSONResultHandler, ResultHandler
 from prefect.engine.state import Cached, Failed, Pending, Success, _MetaState
@@ -75,3 +81,49 @@ def test_preparing_state_for_cloud_doesnt_copy_data():
     cloud_state = prepare_state_for_cloud(state)
     assert cloud_state.is_cached()
     assert cloud_state.result is state.result
+
+
+class TestGetFlowRunSettings:
+    def client(self, settings, api_server="http://my-cloud.foo"):
+        client = MagicMock(api_server=api_server)
+        client.graphql.return_value.data.flow_run_by_pk.flow.settings = settings
+        return client
+
+    def test_settings_are_cached_per_flow_run(self):
+        client = self.client(dict(disable_heartbeat=True))
+        flow_run_id = str(uuid.uuid4())
+        assert get_flow_run_settings(client, flow_run_id) == dict(
+            disable_heartbeat=True
+        )
+        assert get_flow_run_settings(client, flow_run_id) == dict(
+            disable_heartbeat=True
+        )
+        assert client.graphql.call_count == 1
+
+        get_flow_run_settings(client, str(uuid.uuid4()))
+        assert client.graphql.call_count == 2
+
+    def test_settings_are_cached_per_api_server(self):
+        flow_run_id = str(uuid.uuid4())
+        assert get_flow_run_settings(self.client(dict(a=1)), flow_run_id) == dict(a=1)
+        assert get_flow_run_settings(
+            self.client(dict(a=2), api_server="http://other.foo"), flow_run_id
+        ) == dict(a=2)
+
+    def test_failed_queries_are_not_cached(self):
+        client = self.client(dict())
+        client.graphql.side_effect = [SyntaxError(), client.graphql.return_value]
+        flow_run_id = str(uuid.uuid4())
+        with pytest.raises(SyntaxError):
+            get_flow_run_settings(client, flow_run_id)
+        assert get_flow_run_settings(client, flow_run_id) == dict()
+
+    def test_cache_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(
+            "prefect.engine.cloud.utilities._FLOW_RUN_SETTINGS_MAXSIZE", 2
+        )
+        client = self.client(dict())
+        first = str(uuid.uuid4())
+        for flow_run_id in [first, str(uuid.uuid4()), str(uuid.uuid4()), first]:
+            get_flow_run_settings(client, flow_run_id)
+        assert client.graphql.call_count == 4
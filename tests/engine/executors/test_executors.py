@@ -1,5 +1,6 @@
 import datetime
 import logging
+import queue
 import random
 import sys
 import tempfile
@@ -207,6 +208,30 @@ def test_executor_has_compatible_timeout_handler(executor):
             executor.wait(executor.submit(executor.timeout_handler, slow_fn, timeout=1))
 
 
+@pytest.mark.parametrize(
+    "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+)
+def test_add_done_callback_provides_a_reusable_result(executor):
+    done = queue.Queue()
+    with executor.start():
+        future = executor.submit(lambda: 3)
+        executor.add_done_callback(future, done.put)
+        completed = done.get(timeout=10)
+        assert executor.wait(executor.submit(lambda x: x + 1, completed)) == 4
+
+
+@pytest.mark.parametrize(
+    "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+)
+def test_scatter_provides_a_reusable_argument(executor):
+    with executor.start():
+        shared = executor.scatter({"x": [1, 2, 3]})
+        futures = executor.map(lambda d, i: d["x"][i], [shared] * 3, range(3))
+        assert executor.wait(futures) == [1, 2, 3]
+        nested = executor.submit(lambda d: d["a"]["x"], {"a": shared})
+        assert executor.wait(nested) == [1, 2, 3]
+
+
 def test_dask_processes_executor_handles_timeouts(mproc):
     slow_fn = lambda: time.sleep(2)
     with mproc.start():
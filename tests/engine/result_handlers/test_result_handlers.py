@@ -1,6 +1,12 @@
+import base64
+import hashlib
+import io
 import json
 import os
+import pickle
+import sys
 import tempfile
+import threading
 from unittest.mock import MagicMock, patch
 
 import cloudpickle
@@ -9,8 +15,10 @@ import pytest
 
 import prefect
 from prefect.client import Client
+from prefect.engine import serializers
 from prefect.engine.result_handlers import (
     AzureResultHandler,
+    CachedResultHandler,
     GCSResultHandler,
     JSONResultHandler,
     LocalResultHandler,
@@ -18,6 +26,8 @@ from prefect.engine.result_handlers import (
     S3ResultHandler,
     SecretResultHandler,
 )
+from prefect.engine.result_handlers import s3_result_handler
+from prefect.engine.result_handlers.cached_result_handler import ResultCache
 from prefect.utilities.configuration import set_temporary_config
 
 
@@ -84,16 +94,106 @@ class TestLocalHandler:
         final = handler.read(handler.write(res))
         assert final == res
 
+    def test_local_handler_writes_pickled_results_by_default(self, tmp_dir):
+        handler = LocalResultHandler(dir=tmp_dir)
+        fpath, metadata = handler.write_with_metadata({"x": 1})
+        assert metadata == {}
+        with open(fpath, "rb") as f:
+            assert f.read() == cloudpickle.dumps({"x": 1})
+
     def test_local_handler_is_pickleable(self):
         handler = LocalResultHandler(dir="root")
         new = cloudpickle.loads(cloudpickle.dumps(handler))
         assert isinstance(new, LocalResultHandler)
 
+    def test_local_handler_rejects_unknown_serializers(self, tmp_dir):
+        with pytest.raises(ValueError, match="Unknown serializer"):
+            LocalResultHandler(dir=tmp_dir, serializer="xml")
+        with pytest.raises(ValueError, match="Unknown compression"):
+            LocalResultHandler(dir=tmp_dir, compression="rar")
+
+    def test_local_handler_writes_and_reads_compressed(self, tmp_dir):
+        handler = LocalResultHandler(dir=tmp_dir, compression="zlib")
+        fpath, metadata = handler.write_with_metadata("x" * 100000)
+        assert metadata == dict(serializer="cloudpickle", compression="zlib")
+        assert os.path.getsize(fpath) < 1000
+        assert handler.read(fpath) == "x" * 100000
+
+    @pytest.mark.parametrize("memory_map", [False, True])
+    def test_local_handler_reads_pickled_results(self, tmp_dir, memory_map):
+        fpath = os.path.join(tmp_dir, "old-result")
+        with open(fpath, "wb") as f:
+            f.write(cloudpickle.dumps({"x": 1}))
+        handler = LocalResultHandler(dir=tmp_dir, memory_map=memory_map)
+        assert handler.read(fpath) == {"x": 1}
+
+    @pytest.mark.parametrize("res", [42, "stringy", None, {"x": [1, 2]}])
+    @pytest.mark.parametrize("compression", [None, "zlib"])
+    def test_local_handler_writes_and_reads_memory_mapped(
+        self, tmp_dir, res, compression
+    ):
+        handler = LocalResultHandler(
+            dir=tmp_dir, memory_map=True, compression=compression
+        )
+        assert handler.read(handler.write(res)) == res
+
+    @pytest.mark.xfail(raises=ImportError, reason="numpy is not installed.")
+    def test_local_handler_memory_maps_arrays(self, tmp_dir):
+        import numpy
+
+        handler = LocalResultHandler(dir=tmp_dir, memory_map=True, serializer="npy")
+        fpath = handler.write(numpy.arange(1000))
+        first, second = handler.read(fpath), handler.read(fpath)
+        assert (first == numpy.arange(1000)).all()
+        assert not first.flags.writeable
+        assert not first.flags.owndata
+
+        # both reads are views of the file, rather than private copies
+        with open(fpath, "r+b") as f:
+            f.seek(-8, os.SEEK_END)
+            f.write((42).to_bytes(8, sys.byteorder))
+        assert first[-1] == second[-1] == 42
+
+    @pytest.mark.xfail(raises=ImportError, reason="numpy is not installed.")
+    def test_local_handler_copies_arrays_without_memory_map(self, tmp_dir):
+        import numpy
+
+        handler = LocalResultHandler(dir=tmp_dir)
+        value = handler.read(handler.write(numpy.arange(10)))
+        value[0] = 42
+        assert value[0] == 42
+
+    def test_local_handler_writes_to_unique_files(self, tmp_dir, monkeypatch):
+        now = pendulum.now("utc")
+        monkeypatch.setattr(pendulum, "now", lambda *args: now)
+        handler = LocalResultHandler(dir=tmp_dir)
+        first, second = handler.write(42), handler.write(42)
+        assert first != second
+        assert handler.read(first) == handler.read(second) == 42
+
+    def test_local_handler_content_addressed_writes_identical_results_once(
+        self, tmp_dir
+    ):
+        handler = LocalResultHandler(dir=tmp_dir, content_addressed=True)
+        fpath = handler.write({"x": [1, 2]})
+        assert os.path.basename(fpath) == "prefect-result-" + serializers.content_hash(
+            serializers.serialize_legacy({"x": [1, 2]})
+        )
+        mtime = os.stat(fpath).st_mtime_ns
+        assert handler.write({"x": [1, 2]}) == fpath
+        assert os.stat(fpath).st_mtime_ns == mtime
+        assert handler.write({"x": [1, 3]}) != fpath
+        assert handler.read(fpath) == {"x": [1, 2]}
+        assert not [f for f in os.listdir(tmp_dir) if f.endswith(".tmp")]
+
 
 def test_result_handler_base_class_is_a_passthrough():
     handler = ResultHandler()
     assert handler.write("foo") is None
     assert handler.read(99) is None
+    assert handler.write_with_metadata("foo") == (None, {})
+    assert handler.fingerprint(99) is None
+    assert handler.read_serialized(99) is None
 
 
 @pytest.mark.xfail(raises=ImportError, reason="google extras not installed.")
@@ -148,7 +248,42 @@ class TestGCSResultHandler:
         handler = GCSResultHandler(bucket="foo")
         handler.write(None)
         assert blob.upload_from_string.called
-        assert isinstance(blob.upload_from_string.call_args[0][0], str)
+        # results are written as base64-encoded text, as by earlier versions
+        data = blob.upload_from_string.call_args[0][0]
+        assert isinstance(data, str)
+        assert cloudpickle.loads(base64.b64decode(data)) is None
+
+    def test_gcs_streams_results_written_with_a_serializer(self, google_client):
+        blob = MagicMock()
+        google_client.return_value.bucket = MagicMock(
+            return_value=MagicMock(blob=MagicMock(return_value=blob))
+        )
+        uploaded = []
+        blob.upload_from_file.side_effect = lambda stream, size: uploaded.append(
+            (stream.read(), size)
+        )
+        handler = GCSResultHandler(bucket="foo", serializer="cloudpickle")
+        handler.write(42)
+        assert not blob.upload_from_string.called
+        data, size = uploaded[0]
+        assert len(data) == size
+        assert serializers.deserialize(data) == 42
+
+    @pytest.mark.parametrize("exists", [True, False])
+    def test_gcs_content_addressed_results_are_uploaded_once(
+        self, google_client, exists
+    ):
+        blob = MagicMock(exists=MagicMock(return_value=exists))
+        google_client.return_value.bucket = MagicMock(
+            return_value=MagicMock(blob=MagicMock(return_value=blob))
+        )
+        handler = GCSResultHandler(bucket="foo", content_addressed=True)
+        uri = handler.write(42)
+        assert uri.startswith("sha256/")
+        assert blob.upload_from_string.called is not exists
+        assert uri == "sha256/{}.prefect_result".format(
+            serializers.content_hash(serializers.serialize_legacy(42, True))
+        )
 
     def test_gcs_handler_is_pickleable(self, google_client, monkeypatch):
         class gcs_bucket:
@@ -239,6 +374,220 @@ class TestS3ResultHandler:
             assert isinstance(res, S3ResultHandler)
 
 
+class InMemoryS3Client:
+    """
+    Stands in for a boto3 S3 client, storing objects in memory.
+    """
+
+    def __init__(self):
+        self.objects = {}
+        self.requests = []
+        self.uploads = 0
+
+    def head_object(self, Bucket, Key):
+        self.requests.append("HEAD")
+        if (Bucket, Key) not in self.objects:
+            raise KeyError(Key)
+        data = self.objects[(Bucket, Key)]
+        return {
+            "ContentLength": len(data),
+            "ETag": '"{}"'.format(hashlib.md5(data).hexdigest()),
+        }
+
+    def upload_fileobj(self, stream, Bucket, Key):
+        self.uploads += 1
+        parts = []
+        while True:
+            part = stream.read(7)
+            if not part:
+                break
+            parts.append(part)
+        self.objects[(Bucket, Key)] = b"".join(parts)
+
+    def download_fileobj(self, Bucket, Key, Fileobj):
+        self.requests.append(None)
+        Fileobj.write(self.objects[(Bucket, Key)])
+
+    def get_object(self, Bucket, Key, Range):
+        self.requests.append(Range)
+        start, end = Range[len("bytes=") :].split("-")
+        data = self.objects[(Bucket, Key)]
+        if int(start) >= len(data):
+            error = Exception("InvalidRange")
+            error.response = {
+                "Error": {"Code": "InvalidRange"},
+                "ResponseMetadata": {"HTTPStatusCode": 416},
+            }
+            raise error
+        return {"Body": io.BytesIO(data[int(start) : int(end or len(data) - 1) + 1])}
+
+
+class TestS3ResultHandlerFormat:
+    @pytest.fixture
+    def handler(self):
+        handler = S3ResultHandler(bucket="bucket", serializer="cloudpickle")
+        handler.client = InMemoryS3Client()
+        return handler
+
+    @pytest.mark.parametrize("res", [42, "stringy", {"x": [1, 2, 3]}, b"bytes"])
+    def test_roundtrip(self, handler, res):
+        assert handler.read(handler.write(res)) == res
+
+    def test_results_are_not_base64_encoded(self, handler):
+        uri = handler.write(b"\x00" * 1000)
+        data = handler.client.objects[("bucket", uri)]
+        assert data.startswith(serializers.MAGIC)
+        assert len(data) < 1200
+
+    def test_small_results_are_read_with_one_request(self, handler):
+        handler.read(handler.write(list(range(100))))
+        assert handler.client.requests == ["bytes=0-65535"]
+
+    def test_large_results_are_read_with_ranged_requests(self, handler, monkeypatch):
+        monkeypatch.setattr(s3_result_handler, "_PREFIX_SIZE", 32)
+        monkeypatch.setattr(s3_result_handler, "_CHUNK_SIZE", 10)
+        res = list(range(1000))
+        uri = handler.write(res)
+        assert handler.read(uri) == res
+        size = len(handler.client.objects[("bucket", uri)])
+        assert handler.client.requests[0] == "bytes=0-31"
+        # the rest of each frame is downloaded with a single request
+        ranges = [
+            [int(n) for n in r[len("bytes=") :].split("-")]
+            for r in handler.client.requests[1:]
+        ]
+        assert len(ranges) == 2
+        assert ranges[0][0] == 32
+        assert ranges[1][0] == ranges[0][1] + 1
+        assert ranges[1][1] == size - 1
+
+    def test_roundtrip_with_header_larger_than_prefix(self, handler, monkeypatch):
+        monkeypatch.setattr(s3_result_handler, "_PREFIX_SIZE", 16)
+        assert handler.read(handler.write("x" * 100)) == "x" * 100
+
+    def test_results_are_written_as_base64_by_default(self):
+        handler = S3ResultHandler(bucket="bucket")
+        handler.client = InMemoryS3Client()
+        uri, metadata = handler.write_with_metadata({"x": 1})
+        data = handler.client.objects[("bucket", uri)]
+        assert cloudpickle.loads(base64.b64decode(data)) == {"x": 1}
+        assert metadata == {}
+        assert handler.read(uri) == {"x": 1}
+
+    def test_write_records_metadata(self, handler):
+        uri, metadata = handler.write_with_metadata(42)
+        assert metadata == dict(serializer="cloudpickle", compression=None)
+
+    def test_compressed_roundtrip(self):
+        handler = S3ResultHandler(bucket="bucket", compression="zlib")
+        handler.client = InMemoryS3Client()
+        uri = handler.write(b"\x00" * 100000)
+        assert len(handler.client.objects[("bucket", uri)]) < 1000
+        assert handler.read(uri) == b"\x00" * 100000
+
+    def test_reads_base64_encoded_results(self, handler):
+        handler.client.objects[("bucket", "old")] = base64.b64encode(
+            cloudpickle.dumps({"x": 1})
+        )
+        assert handler.read("old") == {"x": 1}
+
+    def test_empty_results_are_read_as_none(self, handler):
+        handler.client.objects[("bucket", "empty")] = b""
+        assert handler.read("empty") is None
+
+    def test_small_base64_encoded_results_are_downloaded_once(self, handler):
+        handler.client.objects[("bucket", "old")] = base64.b64encode(
+            cloudpickle.dumps({"x": 1})
+        )
+        assert handler.read("old") == {"x": 1}
+        assert handler.client.requests == ["bytes=0-65535"]
+
+    @pytest.mark.parametrize("size", [16, 100])
+    def test_large_base64_encoded_results_reuse_the_prefix(
+        self, handler, monkeypatch, size
+    ):
+        monkeypatch.setattr(s3_result_handler, "_PREFIX_SIZE", 16)
+        data = base64.b64encode(cloudpickle.dumps("x" * 100))[:size]
+        handler.client.objects[("bucket", "old")] = data
+        handler.read("old")
+        assert handler.client.requests == ["bytes=0-15", "bytes=16-"]
+        if size == 100:
+            value = cloudpickle.dumps("x" * 100)
+            handler.client.objects[("bucket", "old")] = base64.b64encode(value)
+            assert handler.read("old") == "x" * 100
+
+    def test_unsupported_format_versions_are_not_read(self, handler):
+        uri = handler.write(42)
+        data = bytearray(handler.client.objects[("bucket", uri)])
+        data[len(serializers.MAGIC)] = 99
+        handler.client.objects[("bucket", uri)] = bytes(data)
+        assert handler.read(uri) is None
+
+    def test_content_addressed_results_are_uploaded_once(self):
+        handler = S3ResultHandler(bucket="bucket", content_addressed=True)
+        handler.client = InMemoryS3Client()
+        uri = handler.write(list(range(100)))
+        assert uri.startswith("sha256/")
+        assert uri.endswith(".prefect_result")
+        assert handler.write(list(range(100))) == uri
+        assert handler.client.uploads == 1
+        assert handler.write(list(range(101))) != uri
+        assert handler.client.uploads == 2
+        assert handler.read(uri) == list(range(100))
+
+    def test_fingerprints_are_etags(self, handler):
+        uri = handler.write(42)
+        fingerprint = handler.fingerprint(uri)
+        assert fingerprint == handler.client.head_object("bucket", uri)["ETag"]
+        handler.client.objects[("bucket", uri)] = b"".join(serializers.serialize(43)[0])
+        assert handler.fingerprint(uri) != fingerprint
+        assert handler.fingerprint("missing") is None
+
+    def test_content_addressed_fingerprints_are_their_uri(self):
+        handler = S3ResultHandler(bucket="bucket", content_addressed=True)
+        handler.client = InMemoryS3Client()
+        uri = handler.write(42)
+        handler.client.requests.clear()
+        assert handler.fingerprint(uri) == uri
+        assert not handler.client.requests
+
+    def test_read_serialized_returns_stored_bytes(self, handler):
+        uri = handler.write(42)
+        assert handler.read_serialized(uri) == handler.client.objects[("bucket", uri)]
+        handler.client.objects[("bucket", "old")] = base64.b64encode(
+            cloudpickle.dumps(42)
+        )
+        assert handler.read_serialized("old") is None
+
+    def test_cached_reads_only_check_the_etag(self, handler, monkeypatch):
+        monkeypatch.setattr(
+            "prefect.engine.result_handlers.cached_result_handler._result_cache",
+            ResultCache(memory_size=1000),
+        )
+        cached = CachedResultHandler(handler)
+        uri = cached.write(list(range(10)))
+        assert cached.read(uri) == list(range(10))
+        handler.client.requests.clear()
+        assert cached.read(uri) == list(range(10))
+        assert handler.client.requests == ["HEAD"]
+
+    def test_results_are_uploaded_to_new_keys_by_default(self, handler):
+        assert handler.write(42) != handler.write(42)
+        assert handler.client.uploads == 2
+        assert "HEAD" not in handler.client.requests
+
+    @pytest.mark.skipif(
+        sys.version_info < (3, 8), reason="pickle protocol 5 requires Python 3.8"
+    )
+    def test_buffers_are_written_out_of_band(self):
+        handler = S3ResultHandler(bucket="bucket", serializer="pickle5")
+        handler.client = InMemoryS3Client()
+        uri = handler.write(pickle.PickleBuffer(b"x" * 1000))
+        data = handler.client.objects[("bucket", uri)]
+        assert b"x" * 1000 in data
+        assert bytes(handler.read(uri)) == b"x" * 1000
+
+
 @pytest.mark.xfail(raises=ImportError, reason="azure extras not installed.")
 class TestAzureResultHandler:
     @pytest.fixture
@@ -321,6 +670,49 @@ class TestAzureResultHandler:
         assert used_uri.startswith(pendulum.now("utc").format("Y/M/D"))
         assert used_uri.endswith("prefect_result")
 
+    @pytest.mark.parametrize("exists", [True, False])
+    def test_azure_content_addressed_results_are_uploaded_once(
+        self, azure_service, exists
+    ):
+        azure_service.return_value.exists.return_value = exists
+        handler = AzureResultHandler(container="foo", content_addressed=True)
+
+        with prefect.context(
+            secrets=dict(AZ_CREDENTIALS=dict(ACCOUNT_NAME=1, ACCOUNT_KEY=42))
+        ):
+            with set_temporary_config({"cloud.use_local_secrets": True}):
+                uri = handler.write("so-much-data")
+
+        assert uri.startswith("sha256/")
+        assert azure_service.return_value.create_blob_from_text.called is not exists
+
+    def test_azure_writes_base64_text_by_default(self, azure_service):
+        handler = AzureResultHandler(container="foo")
+        with prefect.context(
+            secrets=dict(AZ_CREDENTIALS=dict(ACCOUNT_NAME=1, ACCOUNT_KEY=42))
+        ):
+            with set_temporary_config({"cloud.use_local_secrets": True}):
+                handler.write("so-much-data")
+        text = azure_service.return_value.create_blob_from_text.call_args[1]["text"]
+        assert cloudpickle.loads(base64.b64decode(text)) == "so-much-data"
+        assert not azure_service.return_value.create_blob_from_stream.called
+
+    def test_azure_streams_results_written_with_a_serializer(self, azure_service):
+        uploaded = []
+        azure_service.return_value.create_blob_from_stream.side_effect = lambda stream, count, **kwargs: uploaded.append(
+            (stream.read(), count)
+        )
+        handler = AzureResultHandler(container="foo", compression="zlib")
+        with prefect.context(
+            secrets=dict(AZ_CREDENTIALS=dict(ACCOUNT_NAME=1, ACCOUNT_KEY=42))
+        ):
+            with set_temporary_config({"cloud.use_local_secrets": True}):
+                handler.write("so-much-data")
+        data, count = uploaded[0]
+        assert len(data) == count
+        assert serializers.deserialize(data) == "so-much-data"
+        assert not azure_service.return_value.create_blob_from_text.called
+
     def test_azure_service_handler_is_pickleable(self):
         class service:
             def __init__(self, *args, **kwargs):
@@ -382,3 +774,207 @@ class TestSecretHandler:
         handler = SecretResultHandler(secret_task)
         new = cloudpickle.loads(cloudpickle.dumps(handler))
         assert isinstance(new, SecretResultHandler)
+
+
+class TestResultCache:
+    def test_disk_cache_requires_dir(self):
+        with pytest.raises(ValueError, match="directory"):
+            ResultCache(memory_size=10, disk_size=10)
+
+    def test_get_and_put(self):
+        cache = ResultCache(memory_size=100)
+        assert cache.get("a") is None
+        cache.put("a", b"123")
+        assert cache.get("a") == b"123"
+        assert cache.stats == dict(
+            memory_hits=1,
+            disk_hits=0,
+            misses=1,
+            evictions=0,
+            memory_bytes=3,
+            disk_bytes=0,
+        )
+
+    def test_memory_evicts_least_recently_used(self):
+        cache = ResultCache(memory_size=10)
+        cache.put("a", b"12345")
+        cache.put("b", b"12345")
+        cache.get("a")
+        cache.put("c", b"12345")
+        assert cache.get("b") is None
+        assert cache.get("a") == b"12345"
+        assert cache.get("c") == b"12345"
+        assert cache.stats["memory_bytes"] == 10
+
+    def test_payloads_larger_than_memory_are_only_stored_on_disk(self, tmpdir):
+        cache = ResultCache(memory_size=2, disk_size=100, dir=str(tmpdir))
+        cache.put("a", b"12345")
+        assert cache.stats["memory_bytes"] == 0
+        assert cache.get("a") == b"12345"
+        assert cache.stats["disk_hits"] == 1
+
+    def test_disk_hits_are_moved_into_memory(self, tmpdir):
+        cache = ResultCache(memory_size=5, disk_size=100, dir=str(tmpdir))
+        cache.put("a", b"12345")
+        cache.put("b", b"12345")
+        assert cache.get("a") == b"12345"
+        assert cache.get("a") == b"12345"
+        assert cache.stats["disk_hits"] == 1
+        assert cache.stats["memory_hits"] == 1
+
+    def test_disk_evicts_least_recently_used(self, tmpdir):
+        cache = ResultCache(memory_size=0, disk_size=10, dir=str(tmpdir))
+        cache.put("a", b"12345")
+        cache.put("b", b"12345")
+        cache.get("a")
+        cache.put("c", b"12345")
+        assert sorted(os.listdir(str(tmpdir))) == ["a", "c"]
+        assert cache.get("b") is None
+        assert cache.stats["evictions"] == 1
+        assert cache.stats["disk_bytes"] == 10
+
+    def test_disk_cache_is_shared_between_caches(self, tmpdir):
+        ResultCache(memory_size=0, disk_size=100, dir=str(tmpdir)).put("a", b"123")
+        cache = ResultCache(memory_size=0, disk_size=100, dir=str(tmpdir))
+        assert cache.get("a") == b"123"
+        assert cache.stats["disk_bytes"] == 3
+
+    def test_files_removed_from_disk_are_misses(self, tmpdir):
+        cache = ResultCache(memory_size=0, disk_size=100, dir=str(tmpdir))
+        cache.put("a", b"123")
+        os.remove(os.path.join(str(tmpdir), "a"))
+        assert cache.get("a") is None
+        assert cache.stats["misses"] == 1
+        assert cache.stats["disk_bytes"] == 0
+
+
+class CountingResultHandler(ResultHandler):
+    def __init__(self, result, version="v1"):
+        self.result = result
+        self.version = version
+        self._reads = []
+        super().__init__()
+
+    def fingerprint(self, loc):
+        return self.version
+
+    def read(self, loc):
+        self._reads.append(loc)
+        return self.result
+
+
+class TestCachedResultHandler:
+    @pytest.fixture(autouse=True)
+    def cache(self, monkeypatch):
+        cache = ResultCache(memory_size=1000)
+        monkeypatch.setattr(
+            "prefect.engine.result_handlers.cached_result_handler._result_cache", cache
+        )
+        return cache
+
+    def test_write_uses_wrapped_handler(self):
+        handler = CachedResultHandler(JSONResultHandler())
+        assert handler.write({"x": 1}) == '{"x": 1}'
+
+    def test_repeated_reads_are_served_from_cache(self, cache):
+        inner = CountingResultHandler([1, 2, 3])
+        handler = CachedResultHandler(inner)
+        assert handler.read("loc") == [1, 2, 3]
+        assert handler.read("loc") == [1, 2, 3]
+        assert inner._reads == ["loc"]
+        assert cache.stats["misses"] == 1
+        assert cache.stats["memory_hits"] == 1
+
+    def test_reads_are_cached_by_location_and_fingerprint(self, tmpdir):
+        handler = CachedResultHandler(LocalResultHandler(dir=str(tmpdir)))
+        loc = handler.write(42)
+        assert handler.read(loc) == 42
+        key = handler.cache_key(loc, "v1")
+        assert key != handler.cache_key(loc + "x", "v1")
+        assert key != handler.cache_key(loc, "v2")
+        assert key != CachedResultHandler(JSONResultHandler()).cache_key(loc, "v1")
+
+    def test_overwritten_locations_are_read_again(self, cache):
+        inner = CountingResultHandler([1, 2, 3])
+        handler = CachedResultHandler(inner)
+        assert handler.read("loc") == [1, 2, 3]
+        inner.result, inner.version = [4, 5], "v2"
+        assert handler.read("loc") == [4, 5]
+        assert handler.read("loc") == [4, 5]
+        assert inner._reads == ["loc", "loc"]
+
+    def test_overwritten_local_results_are_read_again(self, cache, tmpdir):
+        inner = LocalResultHandler(dir=str(tmpdir))
+        handler = CachedResultHandler(inner)
+        loc = handler.write(42)
+        assert handler.read(loc) == 42
+        with open(loc, "wb") as f:
+            f.write(b"".join(serializers.serialize("a longer result")[0]))
+        os.utime(loc, ns=(0, 0))
+        assert handler.read(loc) == "a longer result"
+
+    def test_results_without_a_fingerprint_are_not_cached(self, cache):
+        inner = CountingResultHandler([1, 2, 3], version=None)
+        handler = CachedResultHandler(inner)
+        assert handler.read("loc") == [1, 2, 3]
+        assert handler.read("loc") == [1, 2, 3]
+        assert inner._reads == ["loc", "loc"]
+        assert cache.stats["memory_bytes"] == 0
+
+    def test_stored_bytes_are_cached_without_serializing_again(
+        self, cache, tmpdir, monkeypatch
+    ):
+        handler = CachedResultHandler(
+            LocalResultHandler(
+                dir=str(tmpdir), serializer="cloudpickle", content_addressed=True
+            )
+        )
+        loc = handler.write({"x": 1})
+        serialize = MagicMock(side_effect=serializers.serialize)
+        monkeypatch.setattr(serializers, "serialize", serialize)
+        assert handler.read(loc) == {"x": 1}
+        assert handler.read(loc) == {"x": 1}
+        assert cache.stats["memory_hits"] == 1
+        assert not serialize.called
+        with open(loc, "rb") as f:
+            assert (
+                cache.get(handler.cache_key(loc, handler.fingerprint(loc))) == f.read()
+            )
+
+    def test_none_is_not_cached(self, cache):
+        inner = CountingResultHandler(None)
+        handler = CachedResultHandler(inner)
+        assert handler.read("loc") is None
+        assert handler.read("loc") is None
+        assert inner._reads == ["loc", "loc"]
+        assert cache.stats["memory_bytes"] == 0
+
+    def test_unpicklable_results_are_not_cached(self, cache):
+        lock = threading.Lock()
+        handler = CachedResultHandler(CountingResultHandler(lock))
+        assert handler.read("loc") is lock
+        assert cache.stats["memory_bytes"] == 0
+
+    def test_cache_is_created_from_config(self, monkeypatch, tmpdir):
+        monkeypatch.setattr(
+            "prefect.engine.result_handlers.cached_result_handler._result_cache", None
+        )
+        with set_temporary_config(
+            {
+                "engine.result_cache.memory_size": 10,
+                "engine.result_cache.disk_size": 20,
+                "engine.result_cache.dir": str(tmpdir),
+            }
+        ):
+            cache = (
+                prefect.engine.result_handlers.cached_result_handler.get_result_cache()
+            )
+        assert cache.memory_size == 10
+        assert cache.disk_size == 20
+        assert cache.dir == str(tmpdir)
+
+    def test_cached_handler_is_pickleable(self):
+        handler = CachedResultHandler(JSONResultHandler())
+        new = cloudpickle.loads(cloudpickle.dumps(handler))
+        assert isinstance(new, CachedResultHandler)
+        assert isinstance(new.handler, JSONResultHandler)
@@ -1,21 +1,40 @@
+import threading
 from datetime import timedelta
 
 import pendulum
 import pytest
 
+import prefect
 from prefect.engine.cache_validators import (
+    all_input_hashes,
     all_inputs,
+    all_parameter_hashes,
     all_parameters,
     duration_only,
     never_use,
+    partial_input_hashes_only,
     partial_inputs_only,
+    partial_parameter_hashes_only,
     partial_parameters_only,
 )
 from prefect.engine.result import Result
 from prefect.engine.state import Cached
+from prefect.utilities.hashing import hash_values
 
-all_validators = [all_inputs, all_parameters, never_use, duration_only]
-stateful_validators = [partial_inputs_only, partial_parameters_only]
+all_validators = [
+    all_inputs,
+    all_parameters,
+    never_use,
+    duration_only,
+    all_input_hashes,
+    all_parameter_hashes,
+]
+stateful_validators = [
+    partial_inputs_only,
+    partial_parameters_only,
+    partial_input_hashes_only,
+    partial_parameter_hashes_only,
+]
 
 
 def test_never_use_returns_false():
@@ -158,3 +177,102 @@ class TestPartialParametersOnly:
         validator = partial_parameters_only(validate_on=["x"])
         assert validator(state, None, dict(x=1)) is True
         assert validator(state, None, dict(x=2, s="str")) is False
+
+
+class TestAllInputHashes:
+    def test_inputs_validate(self):
+        state = Cached(cached_input_hashes=hash_values(dict(x=1, s="str")))
+        assert all_input_hashes(state, dict(x=1, s="str"), None) is True
+
+    def test_inputs_invalidate(self):
+        state = Cached(cached_input_hashes=hash_values(dict(x=1, s="str")))
+        assert all_input_hashes(state, dict(x=1, s="strs"), None) is False
+        assert all_input_hashes(state, dict(x=1, s="str", noise="e"), None) is False
+
+    def test_states_without_hashes_invalidate(self):
+        state = Cached(cached_inputs=dict(x=Result(1)))
+        assert all_input_hashes(state, dict(x=1), None) is False
+
+    def test_unhashable_inputs_invalidate(self):
+        lock = threading.Lock()
+        state = Cached(cached_input_hashes=hash_values(dict(x=lock)))
+        assert all_input_hashes(state, dict(x=lock), None) is False
+
+    def test_cached_inputs_are_not_read(self):
+        state = Cached(
+            cached_inputs=dict(x=Result(2)), cached_input_hashes=hash_values(dict(x=1))
+        )
+        assert all_input_hashes(state, dict(x=1), None) is True
+
+    def test_hashes_in_context_are_used(self):
+        state = Cached(cached_input_hashes=dict(x="abc"))
+        with prefect.context(input_hashes=dict(x="abc")):
+            assert all_input_hashes(state, dict(x=1), None) is True
+
+
+class TestAllParameterHashes:
+    def test_parameters_validate(self):
+        state = Cached(cached_parameter_hashes=hash_values(dict(x=1, s="str")))
+        assert all_parameter_hashes(state, None, dict(x=1, s="str")) is True
+
+    def test_parameters_invalidate(self):
+        state = Cached(cached_parameter_hashes=hash_values(dict(x=1, s="str")))
+        assert all_parameter_hashes(state, None, dict(x=1, s="strs")) is False
+        assert all_parameter_hashes(state, None, dict(x=1)) is False
+
+    def test_no_parameters_validate(self):
+        state = Cached(cached_parameter_hashes={})
+        assert all_parameter_hashes(state, None, None) is True
+
+
+class TestPartialInputHashesOnly:
+    def test_inputs_validate_with_defaults(self):
+        state = Cached(cached_input_hashes=hash_values(dict(x=1, s="str")))
+        assert partial_input_hashes_only(None)(state, dict(x=1, s="strs"), None) is True
+
+    def test_validate_on_kwarg(self):
+        state = Cached(cached_input_hashes=hash_values(dict(x=1, s="str")))
+        validator = partial_input_hashes_only(validate_on=["x"])
+        assert validator(state, dict(x=1, s="strs"), None) is True
+        assert validator(state, dict(x=2, s="str"), None) is False
+        validator = partial_input_hashes_only(validate_on=["x", "s"])
+        assert validator(state, dict(x=1, s="strs"), None) is False
+
+    def test_unhashable_inputs_which_are_not_validated_are_ignored(self):
+        state = Cached(
+            cached_input_hashes=hash_values(dict(x=1, lock=threading.Lock()))
+        )
+        validator = partial_input_hashes_only(validate_on=["x"])
+        assert validator(state, dict(x=1, lock=threading.Lock()), None) is True
+
+    def test_handles_none(self):
+        state = Cached(cached_input_hashes=hash_values(dict(x=5)))
+        assert partial_input_hashes_only(validate_on=["x"])(state, None, None) is False
+        state = Cached()
+        assert (
+            partial_input_hashes_only(validate_on=["x"])(state, dict(x=5), None)
+            is False
+        )
+
+
+class TestPartialParameterHashesOnly:
+    def test_validate_on_kwarg(self):
+        state = Cached(cached_parameter_hashes=hash_values(dict(x=1, s="str")))
+        validator = partial_parameter_hashes_only(validate_on=["x"])
+        assert validator(state, None, dict(x=1, s="strs")) is True
+        assert validator(state, None, dict(x=2, s="str")) is False
+
+    def test_handles_none(self):
+        state = Cached(cached_parameter_hashes=hash_values(dict(x=5)))
+        assert (
+            partial_parameter_hashes_only(validate_on=["x"])(state, None, None) is False
+        )
+
+
+class TestArrays:
+    def test_data_frames_validate_by_hash(self):
+        pandas = pytest.importorskip("pandas")
+        df = pandas.DataFrame({"x": range(100)})
+        state = Cached(cached_input_hashes=hash_values(dict(df=df)))
+        assert all_input_hashes(state, dict(df=df.copy()), None) is True
+        assert all_input_hashes(state, dict(df=df + 1), None) is False
@@ -0,0 +1,234 @@
+import threading
+import time
+
+import cloudpickle
+import pytest
+
+import prefect
+from prefect.core import Flow, Task
+from prefect.engine import checkpointing
+from prefect.engine.checkpointing import CheckpointPool, check_checkpoint
+from prefect.engine.flow_runner import FlowRunner
+from prefect.engine.result import NoResult, Result
+from prefect.engine.result_handlers import JSONResultHandler
+from prefect.engine.state import Success
+from prefect.engine.task_runner import TaskRunner
+from prefect.utilities.configuration import set_temporary_config
+
+
+class GatedResultHandler(JSONResultHandler):
+    """
+    Writes results once its gate is opened, or raises an error instead if `error` is
+    set.
+    """
+
+    def __init__(self, error=None):
+        self.error = error
+        self._gate = threading.Event()
+        self._written = []
+        super().__init__()
+
+    def write(self, result):
+        assert self._gate.wait(10)
+        if self.error is not None:
+            raise self.error
+        self._written.append(result)
+        return super().write(result)
+
+
+class SlowResultHandler(JSONResultHandler):
+    def __init__(self, error=None):
+        self.error = error
+        super().__init__()
+
+    def write(self, result):
+        time.sleep(0.1)
+        if self.error is not None:
+            raise self.error
+        return super().write(result)
+
+
+@pytest.fixture
+def pool():
+    return CheckpointPool(max_workers=2, max_pending=2)
+
+
+@pytest.fixture
+def background(monkeypatch):
+    monkeypatch.setattr(checkpointing, "_checkpoint_pool", None)
+    with set_temporary_config({"engine.checkpointing.background": True}):
+        yield
+
+
+class TestCheckpointPool:
+    def test_max_pending_must_cover_max_workers(self):
+        with pytest.raises(ValueError, match="max_pending"):
+            CheckpointPool(max_workers=4, max_pending=2)
+
+    def test_results_are_written_in_the_background(self, pool):
+        handler = GatedResultHandler()
+        result = Result(42, result_handler=handler)
+        pool.submit(result)
+        assert result.safe_value == NoResult
+        assert pool.pending == 1
+
+        handler._gate.set()
+        pool.flush()
+        assert pool.pending == 0
+        assert result.safe_value.value == "42"
+
+    def test_store_safe_value_waits_for_background_writes(self, pool):
+        handler = GatedResultHandler()
+        result = Result(42, result_handler=handler)
+        pool.submit(result)
+        threading.Timer(0.1, handler._gate.set).start()
+        result.store_safe_value()
+        assert result.safe_value.value == "42"
+        assert handler._written == [42]
+
+    def test_failed_writes_are_raised(self, pool):
+        handler = GatedResultHandler(error=OSError("no space left"))
+        handler._gate.set()
+        result = Result(42, result_handler=handler)
+        pool.submit(result)
+        pool.flush()
+        with pytest.raises(OSError, match="no space left"):
+            result.store_safe_value()
+
+    def test_submit_blocks_while_max_pending_results_are_pending(self, pool):
+        handler = GatedResultHandler()
+        pool.submit(Result(1, result_handler=handler))
+        pool.submit(Result(2, result_handler=handler))
+
+        submitted = threading.Event()
+
+        def submit():
+            pool.submit(Result(3, result_handler=handler))
+            submitted.set()
+
+        threading.Thread(target=submit).start()
+        assert not submitted.wait(0.2)
+        handler._gate.set()
+        assert submitted.wait(10)
+        pool.flush()
+        assert sorted(handler._written) == [1, 2, 3]
+
+    def test_flush_times_out(self, pool):
+        handler = GatedResultHandler()
+        pool.submit(Result(1, result_handler=handler))
+        with pytest.raises(TimeoutError):
+            pool.flush(timeout=0.1)
+        handler._gate.set()
+        pool.flush()
+
+    def test_writes_run_in_the_submitting_context(self, pool):
+        class ContextHandler(JSONResultHandler):
+            def write(self, result):
+                return prefect.context.get("secret_location")
+
+        result = Result(1, result_handler=ContextHandler())
+        with prefect.context(secret_location="bucket/key"):
+            pool.submit(result)
+        pool.flush()
+        assert result.safe_value.value == "bucket/key"
+
+    def test_pool_is_created_from_config(self, monkeypatch):
+        monkeypatch.setattr(checkpointing, "_checkpoint_pool", None)
+        with set_temporary_config(
+            {
+                "engine.checkpointing.max_workers": 3,
+                "engine.checkpointing.max_pending": 5,
+            }
+        ):
+            pool = checkpointing.get_checkpoint_pool()
+        assert (pool.max_workers, pool.max_pending) == (3, 5)
+        assert checkpointing.get_checkpoint_pool() is pool
+
+
+class TestCheckCheckpoint:
+    def test_states_without_background_writes_are_unchanged(self):
+        state = Success(result=Result(1, result_handler=JSONResultHandler()))
+        assert check_checkpoint(state) is state
+        assert check_checkpoint(Success()).is_successful()
+
+    def test_failed_writes_fail_the_state(self, pool):
+        handler = GatedResultHandler(error=OSError("no space left"))
+        handler._gate.set()
+        state = Success(result=Result(1, result_handler=handler))
+        pool.submit(state._result)
+        new_state = check_checkpoint(state)
+        assert new_state.is_failed()
+        assert "no space left" in new_state.message
+        assert isinstance(new_state.result, OSError)
+
+    def test_pickled_results_carry_their_write_errors(self, pool):
+        result = Result(1, result_handler=SlowResultHandler(OSError("no space left")))
+        pool.submit(result)
+        new = cloudpickle.loads(cloudpickle.dumps(result))
+        assert check_checkpoint(Success(result=new)).is_failed()
+
+    def test_pickled_results_are_written(self, pool):
+        result = Result(1, result_handler=SlowResultHandler())
+        pool.submit(result)
+        new = cloudpickle.loads(cloudpickle.dumps(result))
+        assert new.safe_value.value == "1"
+        assert check_checkpoint(Success(result=new)).is_successful()
+
+
+class TestBackgroundCheckpointing:
+    def test_task_runner_returns_before_result_is_written(self, background):
+        class ReturnsOne(Task):
+            def run(self):
+                return 1
+
+        handler = GatedResultHandler()
+        with prefect.context(checkpointing=True):
+            state = TaskRunner(task=ReturnsOne(result_handler=handler)).run()
+        assert state.is_successful()
+        assert state._result.safe_value == NoResult
+
+        handler._gate.set()
+        state._result.store_safe_value()
+        assert state._result.safe_value.value == "1"
+
+    def test_downstream_tasks_run_while_results_are_written(self, background):
+        handler = GatedResultHandler()
+
+        class Upstream(Task):
+            def run(self):
+                return 1
+
+        class Downstream(Task):
+            def run(self, x):
+                # the upstream result can only be written once this task has run
+                handler._gate.set()
+                return x + 1
+
+        with Flow("background", result_handler=handler) as flow:
+            up = Upstream()
+            down = Downstream()(up)
+
+        with prefect.context(checkpointing=True):
+            state = FlowRunner(flow=flow).run(return_tasks=[up, down])
+        assert state.is_successful()
+        assert state.result[down].result == 2
+        assert state.result[up]._result.safe_value.value == "1"
+        assert sorted(handler._written) == [1, 2]
+
+    def test_failed_writes_fail_tasks_and_the_flow_run(self, background):
+        handler = GatedResultHandler(error=OSError("no space left"))
+        handler._gate.set()
+
+        class Identity(Task):
+            def run(self, x):
+                return x
+
+        with Flow("background", result_handler=handler) as flow:
+            mapped = Identity().map([1, 2])
+
+        with prefect.context(checkpointing=True):
+            state = FlowRunner(flow=flow).run(return_tasks=[mapped])
+        assert state.is_failed()
+        children = state.result[mapped].map_states
+        assert all(child.is_failed() for child in children)
+        assert all("no space left" in child.message for child in children)
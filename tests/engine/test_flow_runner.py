@@ -3,7 +3,9 @@ import datetime
 import queue
 import random
 import sys
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from distutils.version import LooseVersion
 from unittest.mock import MagicMock
 
@@ -1599,3 +1601,137 @@ def test_constant_tasks_arent_submitted_when_mapped(caplog):
 
     ## to be safe, ensure '5' isn't in the logs
     assert len([log.message for log in caplog.records if "99" in log.message]) == 0
+
+
+class TestReadyQueueScheduling:
+    @pytest.fixture(autouse=True)
+    def ready_queue(self):
+        with prefect.utilities.configuration.set_temporary_config(
+            {"engine.flow_runner.scheduling": "ready_queue"}
+        ):
+            yield
+
+    @pytest.mark.parametrize(
+        "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+    )
+    def test_diamond_flow_runs(self, executor):
+        with Flow(name="test") as f:
+            a = SuccessTask()()
+            b = AddTask()(a, 1)
+            c = AddTask()(a, 2)
+            d = AddTask()(b, c)
+
+        state = FlowRunner(flow=f).run(executor=executor, return_tasks=f.tasks)
+        assert state.is_successful()
+        assert state.result[d].result == 5
+
+    @pytest.mark.parametrize(
+        "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+    )
+    def test_mapped_and_reduce_tasks_run(self, executor):
+        @prefect.task
+        def inc(x):
+            return x + 1
+
+        @prefect.task
+        def total(xs):
+            return sum(xs)
+
+        with Flow(name="test") as f:
+            mapped = inc.map(inc.map([1, 2, 3]))
+            reduced = total(mapped)
+
+        state = FlowRunner(flow=f).run(executor=executor, return_tasks=f.tasks)
+        assert state.is_successful()
+        assert state.result[mapped].result == [3, 4, 5]
+        assert state.result[reduced].result == 12
+
+    def test_tasks_are_submitted_after_their_upstream_tasks_complete(self):
+        events = []
+
+        class RecordingExecutor(LocalExecutor):
+            def submit(self, fn, *args, **kwargs):
+                events.append(("submit", kwargs["task"].name))
+                return super().submit(fn, *args, **kwargs)
+
+            def add_done_callback(self, future, fn):
+                events.append(("done", future))
+                super().add_done_callback(future, fn)
+
+        with Flow(name="test") as f:
+            a = Task(name="a")
+            b = Task(name="b")
+            f.chain(a, b)
+
+        state = FlowRunner(flow=f).run(executor=RecordingExecutor())
+        assert state.is_successful()
+        assert [e[0] for e in events] == ["submit", "done", "submit", "done"]
+        assert events[0][1] == "a" and events[2][1] == "b"
+
+    def test_finished_task_states_are_not_resubmitted(self):
+        calls = []
+
+        class TrackSubmissions(LocalExecutor):
+            def submit(self, *args, **kwargs):
+                calls.append(kwargs["task"])
+                return super().submit(*args, **kwargs)
+
+        with Flow(name="test") as f:
+            a = SuccessTask()()
+            b = AddTask()(a, 1)
+
+        state = FlowRunner(flow=f).run(
+            executor=TrackSubmissions(),
+            task_states={a: Success(result=Result(10))},
+            return_tasks=[b],
+        )
+        assert state.is_successful()
+        assert state.result[b].result == 11
+        assert calls == [b]
+
+    def test_max_in_flight_bounds_running_tasks(self):
+        lock = threading.Lock()
+        running, peak = [0], [0]
+
+        class SlowTask(Task):
+            def run(self):
+                with lock:
+                    running[0] += 1
+                    peak[0] = max(peak[0], running[0])
+                time.sleep(0.05)
+                with lock:
+                    running[0] -= 1
+
+        class ThreadExecutor(Executor):
+            def __init__(self):
+                self.pool = ThreadPoolExecutor(max_workers=8)
+                super().__init__()
+
+            def submit(self, fn, *args, **kwargs):
+                return self.pool.submit(fn, *args, **kwargs)
+
+            def add_done_callback(self, future, fn):
+                future.add_done_callback(lambda f: fn(f.result()))
+
+            def wait(self, futures):
+                if isinstance(futures, dict):
+                    return {k: self.wait(v) for k, v in futures.items()}
+                elif isinstance(futures, Future):
+                    return futures.result()
+                return futures
+
+        f = Flow(name="test", tasks=[SlowTask() for _ in range(10)])
+        with prefect.utilities.configuration.set_temporary_config(
+            {"engine.flow_runner.max_in_flight": 2}
+        ):
+            state = FlowRunner(flow=f).run(executor=ThreadExecutor())
+        assert state.is_successful()
+        assert peak[0] <= 2
+
+    def test_unknown_scheduling_mode_fails_the_flow(self):
+        with prefect.utilities.configuration.set_temporary_config(
+            {"engine.flow_runner.scheduling": "unknown"}
+        ):
+            state = FlowRunner(flow=Flow(name="test", tasks=[SuccessTask()])).run()
+        assert state.is_failed()
+        assert "Unknown scheduling mode" in state.message
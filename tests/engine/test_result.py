@@ -1,3 +1,5 @@
+import threading
+
 import cloudpickle
 import pytest
 
@@ -7,6 +9,7 @@ from prefect.engine.result_handlers import (
     LocalResultHandler,
     ResultHandler,
 )
+from prefect.utilities.hashing import stable_hash
 
 
 class TestInitialization:
@@ -182,6 +185,22 @@ class TestStoreSafeValue:
         r.store_safe_value()
         assert r.safe_value is safe_value
 
+    def test_store_safe_value_records_metadata(self, tmpdir):
+        handler = LocalResultHandler(dir=str(tmpdir), serializer="cloudpickle")
+        r = Result(value=4, result_handler=handler)
+        r.store_safe_value()
+        assert r.safe_value.metadata == dict(serializer="cloudpickle", compression=None)
+
+    def test_store_safe_value_records_no_metadata_for_legacy_results(self, tmpdir):
+        r = Result(value=4, result_handler=LocalResultHandler(dir=str(tmpdir)))
+        r.store_safe_value()
+        assert r.safe_value.metadata == {}
+
+    def test_store_safe_value_records_no_metadata_for_plain_handlers(self):
+        r = Result(value=4, result_handler=JSONResultHandler())
+        r.store_safe_value()
+        assert r.safe_value.metadata == {}
+
     def test_error_when_storing_with_no_handler(self):
         r = Result(value=42)
         with pytest.raises(AssertionError):
@@ -244,3 +263,25 @@ def test_results_are_pickleable_with_their_safe_values():
     res = Result(3, result_handler=JSONResultHandler())
     res.store_safe_value()
     assert cloudpickle.loads(cloudpickle.dumps(res)) == res
+
+
+class TestValueHash:
+    def test_value_hash_is_stable_hash_of_value(self):
+        assert Result([1, 2]).value_hash == stable_hash([1, 2])
+        assert NoResult.value_hash == stable_hash(None)
+
+    def test_value_hash_is_kept_with_the_result(self):
+        result = Result([1, 2])
+        value_hash = result.value_hash
+        result.value.append(3)
+        assert result.value_hash == value_hash
+        new = cloudpickle.loads(cloudpickle.dumps(result))
+        assert new.value_hash == value_hash
+
+    def test_value_hash_is_none_for_unhashable_values(self):
+        assert Result(threading.Lock()).value_hash is None
+
+    def test_value_hash_does_not_affect_equality(self):
+        result = Result(1)
+        result.value_hash
+        assert result == Result(1)
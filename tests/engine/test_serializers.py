@@ -0,0 +1,254 @@
+import base64
+import io
+import struct
+import sys
+
+import cloudpickle
+import pytest
+
+from prefect.engine import serializers
+
+
+def roundtrip(value, **kwargs):
+    frames, metadata = serializers.serialize(value, **kwargs)
+    return serializers.deserialize(b"".join(frames)), metadata
+
+
+class TestSerialize:
+    @pytest.mark.parametrize("value", [42, "stringy", None, {"x": [1, 2]}, b"\x00"])
+    def test_roundtrip(self, value):
+        assert roundtrip(value) == (
+            value,
+            dict(serializer="cloudpickle", compression=None),
+        )
+
+    def test_roundtrip_with_functions(self):
+        value, _ = roundtrip(lambda x: x + 1, serializer="cloudpickle")
+        assert value(1) == 2
+
+    def test_compressed_roundtrip(self):
+        frames, metadata = serializers.serialize("x" * 100000, compression="zlib")
+        assert metadata == dict(serializer="cloudpickle", compression="zlib")
+        assert sum(frame.nbytes for frame in frames) < 1000
+        assert serializers.deserialize(b"".join(frames)) == "x" * 100000
+
+    def test_serialized_results_are_self_describing(self):
+        frames, _ = serializers.serialize(42, compression="zlib")
+        data = b"".join(frames)
+        assert serializers.is_serialized(data)
+        header_size = serializers.header_size(data)
+        lengths = serializers.frame_lengths(data[:header_size])
+        assert header_size + sum(lengths) == len(data)
+        metadata = serializers.read_metadata(
+            [data[header_size : header_size + lengths[0]]]
+        )
+        assert metadata == dict(serializer="cloudpickle", compression="zlib")
+
+    @pytest.mark.parametrize("compression", [None, "zlib"])
+    def test_serializer_frames_are_aligned(self, compression):
+        frames, _ = serializers.serialize(42, compression=compression)
+        offset = frames[0].nbytes + frames[1].nbytes
+        assert offset % serializers.ALIGNMENT == 0
+
+    def test_content_hash(self):
+        frames, _ = serializers.serialize({"x": 1})
+        digest = serializers.content_hash(frames)
+        assert digest == serializers.content_hash([b"".join(frames)])
+        assert digest == serializers.content_hash(serializers.serialize({"x": 1})[0])
+        assert digest != serializers.content_hash(serializers.serialize({"x": 2})[0])
+        assert digest != serializers.content_hash(
+            serializers.serialize({"x": 1}, compression="zlib")[0]
+        )
+
+    def test_pickles_are_not_serialized_results(self):
+        assert not serializers.is_serialized(cloudpickle.dumps(42))
+        assert not serializers.is_serialized(b"")
+
+    def test_unsupported_format_versions_raise(self):
+        data = struct.pack(">4sBI", serializers.MAGIC, 99, 0)
+        with pytest.raises(ValueError, match="format version: 99"):
+            serializers.deserialize(data)
+
+    def test_unknown_names_raise(self):
+        with pytest.raises(ValueError, match="Unknown serializer"):
+            serializers.serialize(42, serializer="xml")
+        with pytest.raises(ValueError, match="Unknown compression"):
+            serializers.serialize(42, compression="rar")
+
+    def test_cloudpickle_is_the_default(self):
+        _, metadata = roundtrip([1, 2])
+        assert metadata["serializer"] == "cloudpickle"
+
+    def test_auto_pickles_plain_objects(self):
+        serializer = serializers.choose_serializer({"x": 1})
+        assert serializer.name in ["cloudpickle", "pickle5"]
+
+
+class TestSerializeResult:
+    def test_legacy_encoding_is_the_default(self):
+        frames, metadata = serializers.serialize_result({"x": 1})
+        assert metadata == {}
+        assert b"".join(frames) == cloudpickle.dumps({"x": 1})
+
+    def test_legacy_encoding_can_be_base64_encoded(self):
+        frames, _ = serializers.serialize_result(42, base64_encoded=True)
+        assert cloudpickle.loads(base64.b64decode(b"".join(frames))) == 42
+
+    def test_compression_alone_uses_the_framed_format(self):
+        frames, metadata = serializers.serialize_result(42, compression="zlib")
+        assert metadata == dict(serializer="cloudpickle", compression="zlib")
+        assert serializers.deserialize(b"".join(frames)) == 42
+
+
+class TestFramesReader:
+    def test_streams_frames_in_order(self):
+        frames = [memoryview(b"first"), memoryview(b""), memoryview(b"x" * 100)]
+        stream = serializers.FramesReader(frames)
+        assert stream.size == 105
+        assert stream.read(3) == b"fir"
+        assert stream.read() == b"st" + b"x" * 100
+        assert stream.read(3) == b""
+
+    def test_seek_and_tell(self):
+        stream = serializers.FramesReader([memoryview(b"abc"), memoryview(b"def")])
+        assert stream.seek(2) == 2
+        assert stream.read(2) == b"cd"
+        assert stream.tell() == 4
+        assert stream.seek(-1, io.SEEK_END) == 5
+        assert stream.read() == b"f"
+        stream.seek(0)
+        assert stream.read() == b"abcdef"
+
+
+@pytest.mark.xfail(raises=ImportError, reason="pickle protocol 5 is not available.")
+def test_pickle5_stores_buffers_out_of_band():
+    pickle_module = serializers._pickle5()
+    if pickle_module is None:
+        raise ImportError("pickle protocol 5 is not available")
+    buffer = pickle_module.PickleBuffer(b"x" * 1000)
+    frames = serializers.SERIALIZERS["pickle5"].serialize(buffer)
+    assert [frame.nbytes for frame in frames[1:]] == [1000]
+    value, metadata = roundtrip(buffer, serializer="pickle5")
+    assert bytes(value) == b"x" * 1000
+    assert metadata["serializer"] == "pickle5"
+
+
+@pytest.mark.xfail(raises=ImportError, reason="numpy is not installed.")
+class TestNumpySerializer:
+    def test_auto_chooses_npy_for_arrays(self):
+        import numpy
+
+        array = numpy.arange(12, dtype="float32").reshape(3, 4)
+        value, metadata = roundtrip(array, serializer="auto")
+        assert metadata["serializer"] == "npy"
+        assert value.dtype == array.dtype
+        assert (value == array).all()
+
+    @pytest.mark.parametrize("order", ["C", "F"])
+    def test_array_data_is_not_copied(self, order):
+        import numpy
+
+        array = numpy.ones((100, 10), order=order)
+        frames = serializers.SERIALIZERS["npy"].serialize(array)
+        assert frames[1].nbytes == array.nbytes
+        assert numpy.shares_memory(numpy.asarray(frames[1]), array)
+        value, _ = roundtrip(array, serializer="npy")
+        assert (value == array).all()
+
+    def test_non_contiguous_arrays_roundtrip(self):
+        import numpy
+
+        array = numpy.arange(100).reshape(10, 10)[::2, ::3]
+        value, _ = roundtrip(array, serializer="npy")
+        assert (value == array).all()
+
+    def test_arrays_are_read_in_place(self):
+        import numpy
+
+        array = numpy.arange(1000, dtype="int64")
+        frames, _ = serializers.serialize(array, serializer="npy")
+        data = bytearray(b"".join(frames))
+        value = serializers.deserialize(data)
+        assert (value == array).all()
+        assert value.ctypes.data % serializers.ALIGNMENT == (
+            numpy.frombuffer(data, dtype="uint8").ctypes.data % serializers.ALIGNMENT
+        )
+        data[-8:] = (42).to_bytes(8, sys.byteorder)
+        assert value[-1] == 42
+
+    @pytest.mark.parametrize("compression", [None, "zlib"])
+    def test_arrays_read_from_bytes_are_writable(self, compression):
+        import numpy
+
+        frames, _ = serializers.serialize(
+            numpy.arange(10), serializer="npy", compression=compression
+        )
+        value = serializers.deserialize(b"".join(frames))
+        value[0] = 42
+        assert value[0] == 42
+
+    def test_arrays_read_only_from_bytes_are_read_in_place(self):
+        import numpy
+
+        frames, _ = serializers.serialize(numpy.arange(10), serializer="npy")
+        value = serializers.deserialize(b"".join(frames), read_only=True)
+        assert not value.flags.writeable
+
+    def test_object_arrays_are_pickled(self):
+        import numpy
+
+        array = numpy.array([{"x": 1}, None], dtype=object)
+        assert not serializers.SERIALIZERS["npy"].accepts(array)
+
+    def test_array_subclasses_are_pickled(self):
+        import numpy
+
+        masked = numpy.ma.masked_array([1, 2, 3], mask=[False, True, False])
+        value, metadata = roundtrip(masked, serializer="auto")
+        assert metadata["serializer"] != "npy"
+        assert (value.mask == masked.mask).all()
+
+        matrix = numpy.matrix([[1, 2], [3, 4]])
+        value, metadata = roundtrip(matrix, serializer="auto")
+        assert metadata["serializer"] != "npy"
+        assert isinstance(value, numpy.matrix)
+
+
+@pytest.mark.xfail(raises=ImportError, reason="pandas or pyarrow is not installed.")
+def test_auto_chooses_parquet_for_dataframes():
+    import pandas
+    import pyarrow  # noqa: F401
+
+    df = pandas.DataFrame({"x": [1, 2, 3], "y": ["a", "b", "c"]})
+    value, metadata = roundtrip(df, serializer="auto")
+    assert metadata["serializer"] == "parquet"
+    assert value.equals(df)
+
+
+@pytest.mark.xfail(raises=ImportError, reason="pandas or pyarrow is not installed.")
+def test_auto_pickles_dataframes_which_parquet_cannot_write():
+    import pandas
+    import pyarrow  # noqa: F401
+
+    df = pandas.DataFrame([[1, 2]], columns=["x", "x"])
+    value, metadata = roundtrip(df, serializer="auto")
+    assert metadata["serializer"] in ["cloudpickle", "pickle5"]
+    assert value.equals(df)
+
+
+@pytest.mark.xfail(raises=ImportError, reason="zstandard is not installed.")
+def test_zstd_compression():
+    import zstandard  # noqa: F401
+
+    value, metadata = roundtrip("x" * 10000, compression="zstd")
+    assert value == "x" * 10000
+    assert metadata["compression"] == "zstd"
+
+
+@pytest.mark.xfail(raises=ImportError, reason="lz4 is not installed.")
+def test_lz4_compression():
+    import lz4  # noqa: F401
+
+    value, metadata = roundtrip("x" * 10000, compression="lz4")
+    assert value == "x" * 10000
+    assert metadata["compression"] == "lz4"
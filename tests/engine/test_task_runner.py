@@ -1,9 +1,11 @@
 import collections
+import concurrent.futures
 import os
 import pendulum
 import pytest
 import sys
 import tempfile
+import threading
 
 from datetime import datetime, timedelta
 from time import sleep, time
@@ -48,6 +50,7 @@ from prefect.engine.state import (
     TriggerFailed,
 )
 from prefect.engine.task_runner import ENDRUN, TaskRunner
+from prefect.utilities import hashing
 from prefect.utilities.configuration import set_temporary_config
 from prefect.utilities.debug import raise_on_exception
 from prefect.utilities.tasks import pause_task
@@ -951,6 +954,48 @@ class TestCheckTaskCached:
         )
         assert new_state.is_pending()
 
+    def test_cached_same_input_hashes(self):
+        with pytest.warns(UserWarning):
+            task = Task(cache_validator=cache_validators.all_input_hashes)
+        state = Cached(cached_input_hashes=hashing.hash_values({"a": 1}), result=2)
+        new = TaskRunner(task).check_task_is_cached(
+            state=state, inputs={"a": Result(1)}
+        )
+        assert new is state
+
+    def test_cached_different_input_hashes(self):
+        with pytest.warns(UserWarning):
+            task = Task(cache_validator=cache_validators.all_input_hashes)
+        state = Cached(cached_input_hashes=hashing.hash_values({"a": 1}), result=2)
+        new_state = TaskRunner(task).check_task_is_cached(
+            state=state, inputs={"a": Result(2)}
+        )
+        assert new_state.is_pending()
+
+    def test_input_hashes_are_computed_once(self, monkeypatch):
+        calls = []
+        stable_hash = hashing.stable_hash
+
+        def counting_hash(value):
+            calls.append(value)
+            return stable_hash(value)
+
+        monkeypatch.setattr(hashing, "stable_hash", counting_hash)
+        task = Task(
+            cache_for=timedelta(minutes=1),
+            cache_validator=cache_validators.all_input_hashes,
+        )
+        candidates = [
+            Cached(cached_input_hashes={"a": str(i)}, result=i) for i in range(3)
+        ] + [Cached(cached_input_hashes={"a": stable_hash(1)}, result=3)]
+        inputs = {"a": Result(1)}
+
+        with prefect.context(caches={"Task": candidates}):
+            new = TaskRunner(task).check_task_is_cached(state=Pending(), inputs=inputs)
+        assert new.result == 3
+        assert inputs["a"].value_hash == stable_hash(1)
+        assert calls == [1]
+
     def test_cached_duration(self):
         with pytest.warns(UserWarning):
             task = Task(cache_validator=cache_validators.duration_only)
@@ -1549,6 +1594,55 @@ class TestCacheResultStep:
         assert new_state.result == 2
         assert new_state.cached_inputs == {"x": Result(5)}
 
+    def test_success_state_with_cache_for_records_no_hashes_by_default(self):
+        @prefect.task(cache_for=timedelta(minutes=10))
+        def fn(x):
+            return x + 1
+
+        inputs = {"x": Result(5)}
+        new_state = TaskRunner(task=fn).cache_result(
+            state=Success(result=2), inputs=inputs
+        )
+        assert new_state.cached_fingerprint is None
+        assert new_state.cached_input_hashes is None
+        assert new_state.cached_parameter_hashes is None
+        assert "_value_hash" not in inputs["x"].__dict__
+
+    def test_success_state_with_hash_validator_records_hashes(self):
+        @prefect.task(
+            cache_for=timedelta(minutes=10),
+            cache_validator=cache_validators.all_input_hashes,
+        )
+        def fn(x):
+            return x + 1
+
+        new_state = TaskRunner(task=fn).cache_result(
+            state=Success(result=2), inputs={"x": Result(5)}
+        )
+        assert new_state.cached_input_hashes == {"x": hashing.stable_hash(5)}
+        assert new_state.cached_parameter_hashes == {}
+
+    def test_success_state_with_cache_for_records_fingerprint(self):
+        @prefect.task(cache_for=timedelta(minutes=10))
+        def fn(x):
+            return x + 1
+
+        with set_temporary_config(
+            {"engine.task_runner.fingerprint_cached_states": True}
+        ):
+            with prefect.context(parameters={"p": 1}):
+                new_state = TaskRunner(task=fn).cache_result(
+                    state=Success(result=2), inputs={"x": Result(5)}
+                )
+        assert new_state.cached_input_hashes == {"x": hashing.stable_hash(5)}
+        assert new_state.cached_parameter_hashes == {"p": hashing.stable_hash(1)}
+        assert new_state.cached_fingerprint == hashing.fingerprint(
+            new_state.cached_input_hashes, new_state.cached_parameter_hashes
+        )
+        assert new_state.cached_fingerprint != hashing.fingerprint(
+            hashing.hash_values({"x": 5})
+        )
+
 
 class TestCheckScheduledStep:
     @pytest.mark.parametrize(
@@ -1878,6 +1972,287 @@ def test_task_runner_performs_mapping(executor):
     assert [s.result for s in res.map_states] == [2, 3, 4]
 
 
+class ThreadPoolExecutor(prefect.engine.executors.Executor):
+    """
+    An executor with asynchronous futures, whose submissions run in a thread pool.
+    """
+
+    def __init__(self):
+        self.pool = concurrent.futures.ThreadPoolExecutor(max_workers=8)
+        super().__init__()
+
+    def submit(self, fn, *args):
+        def call():
+            return fn(*[self.wait(arg) for arg in args])
+
+        return self.pool.submit(call)
+
+    def map(self, fn, *args):
+        return [self.submit(fn, *a) for a in zip(*args)]
+
+    def add_done_callback(self, future, fn):
+        future.add_done_callback(fn)
+
+    def wait(self, futures):
+        if isinstance(futures, concurrent.futures.Future):
+            return futures.result()
+        elif isinstance(futures, list):
+            return [self.wait(f) for f in futures]
+        return futures
+
+
+class TestRunMappedInWindows:
+    @pytest.fixture(autouse=True)
+    def windowed(self):
+        with set_temporary_config({"engine.task_runner.max_mapped_in_flight": 2}):
+            yield
+
+    @pytest.mark.parametrize(
+        "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+    )
+    def test_task_runner_performs_windowed_mapping(self, executor):
+        add = AddTask()
+        ex = Edge(SuccessTask(), add, key="x")
+        ey = Edge(ListTask(), add, key="y", mapped=True)
+        runner = TaskRunner(add)
+        with executor.start():
+            res = runner.run(
+                upstream_states={
+                    ex: Success(result=1),
+                    ey: Success(result=[1, 2, 3, 4, 5]),
+                },
+                executor=executor,
+            )
+            res.map_states = executor.wait(res.map_states)
+        assert isinstance(res, Mapped)
+        assert [s.result for s in res.map_states] == [2, 3, 4, 5, 6]
+
+    def test_children_are_submitted_as_earlier_children_finish(self):
+        release = threading.Event()
+        finished = []
+        running = collections.Counter()
+        lock = threading.Lock()
+
+        class SlowTask(Task):
+            def run(self, x):
+                with lock:
+                    running["now"] += 1
+                    running["max"] = max(running["max"], running["now"])
+                # the first child runs until every other child has been submitted
+                if x == 0:
+                    release.wait(10)
+                with lock:
+                    running["now"] -= 1
+                    finished.append(x)
+                return x
+
+        task = SlowTask()
+        ex = Edge(ListTask(), task, key="x", mapped=True)
+        executor = ThreadPoolExecutor()
+        state = TaskRunner(task).run_mapped_task(
+            state=Running(),
+            upstream_states={ex: Success(result=list(range(6)))},
+            context={},
+            executor=executor,
+        )
+
+        # a slow child doesn't hold back the children after it, and the children of
+        # the last window are returned without being waited on
+        assert state.is_mapped()
+        assert not release.is_set()
+        assert sorted(finished[:4]) == [1, 2, 3, 4]
+        release.set()
+        map_states = executor.wait(state.map_states)
+        assert [s.result for s in map_states] == list(range(6))
+        assert running["max"] == 2
+
+    def test_upstream_states_are_generated_lazily(self):
+        generated = []
+        runner = TaskRunner(task=AddTask())
+        original = runner.generate_map_upstream_states
+
+        def spy(*args, **kwargs):
+            for states in original(*args, **kwargs):
+                generated.append(states)
+                yield states
+
+        class CheckingExecutor(prefect.engine.executors.LocalExecutor):
+            def submit(self, fn, *args):
+                # children are only generated up to the end of the current window
+                assert args[1] + 1 <= len(generated) <= args[1] + 2
+                return super().submit(fn, *args)
+
+        runner.generate_map_upstream_states = spy
+        ey = Edge(ListTask(), runner.task, key="y", mapped=True)
+        ex = Edge(SuccessTask(), runner.task, key="x")
+        state = runner.run(
+            upstream_states={ex: Success(result=1), ey: Success(result=list(range(6)))},
+            executor=CheckingExecutor(),
+        )
+        assert len(state.map_states) == 6
+
+    def test_preparing_state_records_the_number_of_children(self):
+        handler = MagicMock(side_effect=lambda t, o, n: n)
+        add = AddTask(state_handlers=[handler])
+        ex = Edge(SuccessTask(), add, key="x")
+        ey = Edge(ListTask(), add, key="y", mapped=True)
+        TaskRunner(add).run_mapped_task(
+            state=Running(),
+            upstream_states={ex: Success(result=1), ey: Success(result=[1, 2, 3])},
+            context={},
+            executor=prefect.engine.executors.LocalExecutor(),
+        )
+        preparing = handler.call_args_list[0][0][2]
+        assert preparing.is_mapped()
+        assert preparing.map_states == [None] * 3
+
+    def test_windowed_mapping_uses_shortest_upstream(self):
+        add = AddTask()
+        ex = Edge(ListTask(), add, key="x", mapped=True)
+        ey = Edge(ListTask(), add, key="y", mapped=True)
+        state = TaskRunner(add).run(
+            upstream_states={
+                ex: Success(result=[10, 20, 30]),
+                ey: Success(result=[1, 2, 3, 4, 5]),
+            },
+            executor=prefect.engine.executors.LocalExecutor(),
+        )
+        assert [s.result for s in state.map_states] == [11, 22, 33]
+
+    def test_children_are_submitted_in_batches(self):
+        class RecordingExecutor(prefect.engine.executors.LocalExecutor):
+            def __init__(self):
+                self.submissions = []
+                super().__init__()
+
+            def submit(self, fn, *args):
+                if fn.__name__ == "run_batch":
+                    self.submissions.append(len(args[0]))
+                return super().submit(fn, *args)
+
+        executor = RecordingExecutor()
+        add = AddTask(map_batch_size=2)
+        ex = Edge(SuccessTask(), add, key="x")
+        ey = Edge(ListTask(), add, key="y", mapped=True)
+        with set_temporary_config({"engine.task_runner.max_mapped_in_flight": 5}):
+            state = TaskRunner(add).run(
+                upstream_states={
+                    ex: Success(result=1),
+                    ey: Success(result=list(range(7))),
+                },
+                executor=executor,
+            )
+        # children are prepared a window at a time, and batched within each window
+        assert executor.submissions == [2, 2, 1, 2]
+        assert [s.result for s in state.map_states] == [1, 2, 3, 4, 5, 6, 7]
+        assert all(s.is_successful() for s in state.map_states)
+
+    def test_batches_are_not_waited_on_without_a_window(self):
+        release = threading.Event()
+
+        class BlockingTask(Task):
+            def run(self, x):
+                release.wait(10)
+                return x
+
+        task = BlockingTask(map_batch_size=2)
+        ex = Edge(ListTask(), task, key="x", mapped=True)
+        executor = ThreadPoolExecutor()
+        with set_temporary_config({"engine.task_runner.max_mapped_in_flight": 0}):
+            state = TaskRunner(task).run_mapped_task(
+                state=Running(),
+                upstream_states={ex: Success(result=list(range(5)))},
+                context={},
+                executor=executor,
+            )
+
+        # the batches are still running, and each child has a future of its own
+        assert state.is_mapped()
+        assert len(state.map_states) == 5
+        assert not any(future.done() for future in state.map_states)
+        release.set()
+        map_states = executor.wait(state.map_states)
+        assert [s.result for s in map_states] == list(range(5))
+
+    def test_windowed_mapping_with_no_upstream_states(self):
+        state = TaskRunner(task=Task()).run_mapped_task(
+            state=Pending(),
+            upstream_states={},
+            context={},
+            executor=prefect.engine.executors.LocalExecutor(),
+        )
+        assert state.is_mapped()
+        assert state.map_states == []
+
+
+class TestScatterUpstreamStates:
+    @pytest.fixture(autouse=True)
+    def scattering(self):
+        with set_temporary_config({"engine.task_runner.scatter_upstream_states": True}):
+            yield
+
+    @pytest.mark.parametrize(
+        "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+    )
+    def test_task_runner_performs_mapping_with_scattered_upstreams(self, executor):
+        add = AddTask()
+        ex = Edge(SuccessTask(), add, key="x")
+        ey = Edge(ListTask(), add, key="y", mapped=True)
+        runner = TaskRunner(add)
+        with executor.start():
+            res = runner.run(
+                upstream_states={ex: Success(result=1), ey: Success(result=[1, 2, 3])},
+                executor=executor,
+            )
+            res.map_states = executor.wait(res.map_states)
+        assert isinstance(res, Mapped)
+        assert [s.result for s in res.map_states] == [2, 3, 4]
+
+    def test_unmapped_upstream_states_are_scattered_once(self):
+        class ScatteringExecutor(prefect.engine.executors.LocalExecutor):
+            def __init__(self):
+                self.scattered = []
+                super().__init__()
+
+            def scatter(self, obj):
+                self.scattered.append(obj)
+                return obj
+
+        executor = ScatteringExecutor()
+        add = AddTask()
+        ex = Edge(SuccessTask(), add, key="x")
+        ey = Edge(ListTask(), add, key="y", mapped=True)
+        x_state = Success(result=1)
+        state = TaskRunner(add).run(
+            upstream_states={ex: x_state, ey: Success(result=list(range(10)))},
+            executor=executor,
+        )
+        assert executor.scattered == [x_state]
+        assert [s.result for s in state.map_states] == list(range(1, 11))
+
+    def test_children_only_receive_their_own_element(self):
+        add = AddTask()
+        ex = Edge(SuccessTask(), add, key="x")
+        ey = Edge(ListTask(), add, key="y", mapped=True)
+        y_state = Success(
+            result=[1, 2, 3], cached_inputs={"start": Result(list(range(100)))}
+        )
+        runner = TaskRunner(add)
+        upstream_states = runner.scatter_upstream_states(
+            upstream_states={ex: Success(result=1), ey: y_state},
+            executor=prefect.engine.executors.LocalExecutor(),
+        )
+        children = list(
+            runner.generate_map_upstream_states(
+                state=Pending(), upstream_states=upstream_states
+            )
+        )
+        assert [child[ey].result for child in children] == [1, 2, 3]
+        assert all(child[ey].cached_inputs == {} for child in children)
+        # the original upstream state is left untouched
+        assert y_state.cached_inputs == {"start": Result(list(range(100)))}
+
+
 @pytest.mark.parametrize(
     "executor", ["local", "sync", "mproc", "mthread"], indirect=True
 )
@@ -2242,3 +2617,41 @@ def test_task_runner_uses_upstream_result_handlers():
     state = TaskRunner(task=t).run(upstream_states=upstream_states)
     assert state.is_successful()
     assert state.result == "cool"
+
+
+@pytest.mark.parametrize("max_mapped_in_flight", [0, 2])
+def test_prepare_mapped_children_provides_child_states_and_context(
+    max_mapped_in_flight,
+):
+    class PreparingTaskRunner(TaskRunner):
+        def prepare_mapped_children(self, initial_states, map_indices):
+            self.prepared = getattr(self, "prepared", []) + [list(map_indices)]
+            return (
+                [Retrying(run_count=5) for _ in initial_states],
+                [dict(child_key=i * 10) for i in map_indices],
+            )
+
+    class ContextTask(Task):
+        def run(self, x):
+            return (x, prefect.context.child_key, prefect.context.task_run_count)
+
+    task = ContextTask()
+    runner = PreparingTaskRunner(task)
+    with set_temporary_config(
+        {"engine.task_runner.max_mapped_in_flight": max_mapped_in_flight}
+    ):
+        state = runner.run(
+            upstream_states={
+                Edge(ListTask(), task, key="x", mapped=True): Success(
+                    result=["a", "b", "c"]
+                )
+            },
+            executor=prefect.engine.executors.LocalExecutor(),
+        )
+
+    assert [s.result for s in state.map_states] == [
+        ("a", 0, 6),
+        ("b", 10, 6),
+        ("c", 20, 6),
+    ]
+    assert runner.prepared == ([[0, 1], [2]] if max_mapped_in_flight else [[0, 1, 2]])
@@ -57,6 +57,23 @@ def test_roundtrip_for_results():
     assert r == s
 
 
+def test_safe_result_metadata_roundtrips():
+    r = SafeResult(
+        value="3",
+        result_handler=JSONResultHandler(),
+        metadata=dict(serializer="cloudpickle", compression="zlib"),
+    )
+    s = SafeResultSchema().load(SafeResultSchema().dump(r))
+    assert s.metadata == dict(serializer="cloudpickle", compression="zlib")
+
+
+def test_safe_result_without_metadata_deserializes():
+    r = SafeResultSchema().load(
+        {"value": "3", "result_handler": {"type": "JSONResultHandler"}}
+    )
+    assert r.metadata == {}
+
+
 def test_basic_noresult_deserializes():
     r = NoResultSchema().load({})
     assert r == NoResult
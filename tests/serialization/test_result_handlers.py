@@ -7,6 +7,7 @@ import prefect
 from prefect.client import Client
 from prefect.engine.result_handlers import (
     AzureResultHandler,
+    CachedResultHandler,
     GCSResultHandler,
     JSONResultHandler,
     LocalResultHandler,
@@ -126,6 +127,38 @@ class TestLocalResultHandler:
         assert serialized["type"] == "LocalResultHandler"
         assert serialized["dir"] == root_dir
 
+    def test_serializer_and_compression_roundtrip(self, tmpdir):
+        schema = ResultHandlerSchema()
+        handler = schema.load(
+            schema.dump(
+                LocalResultHandler(
+                    dir=str(tmpdir), serializer="cloudpickle", compression="zlib"
+                )
+            )
+        )
+        assert handler.serializer == "cloudpickle"
+        assert handler.compression == "zlib"
+        assert handler.memory_map is False
+
+    def test_memory_map_roundtrip(self, tmpdir):
+        schema = ResultHandlerSchema()
+        handler = schema.load(
+            schema.dump(LocalResultHandler(dir=str(tmpdir), memory_map=True))
+        )
+        assert handler.memory_map is True
+
+    def test_content_addressed_roundtrip(self, tmpdir):
+        schema = ResultHandlerSchema()
+        handler = schema.load(
+            schema.dump(LocalResultHandler(dir=str(tmpdir), content_addressed=True))
+        )
+        assert handler.content_addressed is True
+
+    def test_deserialize_defaults_serializer(self):
+        handler = ResultHandlerSchema().load({"type": "LocalResultHandler"})
+        assert handler.serializer is None
+        assert handler.compression is None
+
     def test_deserialize_local_result_handler(self):
         schema = ResultHandlerSchema()
         root_dir = os.path.abspath(os.sep)
@@ -218,6 +251,23 @@ class TestJSONResultHandler:
         assert handler.write(3) == "3"
 
 
+class TestCachedResultHandler:
+    def test_serialize(self):
+        serialized = ResultHandlerSchema().dump(
+            CachedResultHandler(LocalResultHandler(dir="/root/prefect"))
+        )
+        assert serialized["type"] == "CachedResultHandler"
+        assert serialized["handler"]["type"] == "LocalResultHandler"
+        assert serialized["handler"]["dir"] == "/root/prefect"
+
+    def test_roundtrip(self):
+        schema = ResultHandlerSchema()
+        handler = schema.load(schema.dump(CachedResultHandler(JSONResultHandler())))
+        assert isinstance(handler, CachedResultHandler)
+        assert isinstance(handler.handler, JSONResultHandler)
+        assert handler.write(3) == "3"
+
+
 @pytest.mark.xfail(raises=ImportError, reason="aws extras not installed.")
 class TestS3ResultHandler:
     def test_serialize(self):
@@ -240,6 +290,14 @@ class TestS3ResultHandler:
         handler = schema.load(schema.dump(S3ResultHandler(bucket="bucket3")))
         assert isinstance(handler, S3ResultHandler)
         assert handler.bucket == "bucket3"
+        assert handler.content_addressed is False
+
+    def test_content_addressed_roundtrip(self):
+        schema = ResultHandlerSchema()
+        handler = schema.load(
+            schema.dump(S3ResultHandler(bucket="bucket3", content_addressed=True))
+        )
+        assert handler.content_addressed is True
 
     def test_roundtrip_never_loads_client(self, monkeypatch):
         schema = ResultHandlerSchema()
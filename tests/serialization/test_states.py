@@ -38,6 +38,9 @@ def complex_states():
         result=res3,
         cached_parameters={"x": 1, "y": {"z": 2}},
         cached_result_expiration=utc_dt,
+        cached_fingerprint="fingerprint",
+        cached_input_hashes={"x": "hash", "y": None},
+        cached_parameter_hashes={"p": "hash"},
     )
     cached_state_naive = state.Cached(
         cached_inputs=complex_result,
@@ -32,6 +32,7 @@ def test_deserialize_task():
         max_retries=5,
         retry_delay=datetime.timedelta(seconds=5),
         timeout=60,
+        map_batch_size=10,
         trigger=prefect.triggers.all_failed,
         skip_on_upstream_skip=False,
         cache_for=datetime.timedelta(hours=1),
@@ -45,6 +46,7 @@ def test_deserialize_task():
         "max_retries",
         "retry_delay",
         "timeout",
+        "map_batch_size",
         "trigger",
         "skip_on_upstream_skip",
         "cache_for",
@@ -173,6 +175,10 @@ def test_unknown_trigger():
         prefect.engine.cache_validators.all_parameters,
         prefect.engine.cache_validators.partial_inputs_only,
         prefect.engine.cache_validators.partial_parameters_only,
+        prefect.engine.cache_validators.all_input_hashes,
+        prefect.engine.cache_validators.all_parameter_hashes,
+        prefect.engine.cache_validators.partial_input_hashes_only,
+        prefect.engine.cache_validators.partial_parameter_hashes_only,
     ],
 )
 def test_cache_validator(cache_validator):
@@ -194,6 +200,8 @@ def test_cache_validator_never_use():
     [
         prefect.engine.cache_validators.partial_inputs_only,
         prefect.engine.cache_validators.partial_parameters_only,
+        prefect.engine.cache_validators.partial_input_hashes_only,
+        prefect.engine.cache_validators.partial_parameter_hashes_only,
     ],
 )
 @pytest.mark.parametrize("validate_on", [["x"], ["longer"], ["x", "y"]])
@@ -118,6 +118,57 @@ def test_modify_context_by_calling_update_inside_contextmanager():
     assert "a" not in context
 
 
+def test_exiting_context_restores_deleted_and_modified_keys():
+    with context(a=1, b=2):
+        with context(c=3):
+            del context["a"]
+            context.b = 20
+            context.d = 4
+            assert "a" not in context
+        assert context.a == 1
+        assert context.b == 2
+        assert "c" not in context
+        assert "d" not in context
+    assert not {"a", "b", "c", "d"} & set(context)
+
+
+def test_exiting_context_restores_keys_changed_in_nested_contexts():
+    with context(a=1):
+        context.a = 2
+        with context(a=3):
+            context.b = 4
+            with context():
+                context.a = 5
+            assert context.a == 3
+        assert context.a == 2
+        assert "b" not in context
+    assert "a" not in context
+
+
+def test_context_is_restored_after_an_error():
+    with pytest.raises(ValueError):
+        with context(a=1):
+            context.b = 2
+            raise ValueError()
+    assert "a" not in context
+    assert "b" not in context
+
+
+def test_reentering_the_current_config_does_not_copy_it():
+    current = context.config
+    with context(config=context.to_dict()["config"]):
+        assert context.config is current
+    assert context.config is current
+
+
+def test_entering_a_different_config_is_merged_and_restored():
+    current = context.config
+    with context(config=dict(logging=dict(level="FOO"))):
+        assert context.config is not current
+        assert context.config.logging.level == "FOO"
+    assert context.config is current
+
+
 def test_context_loads_values_from_config(monkeypatch):
     subsection = Config(password="1234")
     config = Config(context=Config(subsection=subsection, my_key="my_value"))
@@ -1,5 +1,7 @@
+import glob
 import os
 import multiprocessing
+import subprocess
 import sys
 import threading
 import tempfile
@@ -11,7 +13,14 @@ import pytest
 
 import prefect
 from prefect.utilities.configuration import set_temporary_config
+from prefect.utilities import executors
 from prefect.utilities.executors import (
+    HeartbeatService,
+    SoftTimeoutExecutor,
+    TimeoutProcessPool,
+    get_heartbeat_service,
+    get_soft_timeout_executor,
+    get_timeout_pool,
     timeout_handler,
     run_with_heartbeat,
     tail_recursive,
@@ -122,6 +131,256 @@ def test_timeout_handler_preserves_logging(caplog):
     assert len(caplog.records) >= 2  # 1 INFO to start, 1 INFO to end
 
 
+def run_in_thread(fn, *args, **kwargs):
+    result = {}
+
+    def target():
+        try:
+            result["value"] = fn(*args, **kwargs)
+        except Exception as exc:
+            result["error"] = exc
+
+    thread = threading.Thread(target=target)
+    thread.start()
+    thread.join()
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Test fails on Windows")
+def test_timeout_handler_forks_for_each_call_outside_main_thread(monkeypatch):
+    monkeypatch.setattr(executors, "get_timeout_pool", None)
+    pids = [run_in_thread(timeout_handler, os.getpid, timeout=5) for _ in range(3)]
+    assert len(set(pids)) == 3
+    assert os.getpid() not in pids
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Test fails on Windows")
+def test_timeout_handler_runs_in_timeout_pool_if_reusing_workers(monkeypatch):
+    pool = TimeoutProcessPool()
+    monkeypatch.setattr(executors, "get_timeout_pool", lambda: pool)
+    try:
+        with set_temporary_config({"engine.timeouts.reuse_workers": True}):
+            pids = {
+                run_in_thread(timeout_handler, os.getpid, timeout=5) for _ in range(3)
+            }
+        assert len(pids) == 1
+        assert pids != {os.getpid()}
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Test fails on Windows")
+class TestTimeoutProcessPool:
+    @pytest.fixture
+    def pool(self):
+        pool = TimeoutProcessPool(max_idle_workers=2, shared_memory_threshold=1024)
+        yield pool
+        pool.shutdown()
+
+    def test_workers_are_reused(self, pool):
+        pids = [pool.run(os.getpid, timeout=5) for _ in range(5)]
+        assert len(set(pids)) == 1
+        assert pool.workers == 1
+
+    def test_workers_are_replaced_after_max_calls(self):
+        pool = TimeoutProcessPool(max_calls_per_worker=2)
+        try:
+            pids = [pool.run(os.getpid, timeout=5) for _ in range(5)]
+        finally:
+            pool.shutdown()
+        assert pids[0] == pids[1] != pids[2] == pids[3] != pids[4]
+
+    def test_max_calls_per_worker_must_be_positive(self):
+        with pytest.raises(ValueError, match="at least 1"):
+            TimeoutProcessPool(max_calls_per_worker=0)
+
+    def test_idle_workers_are_capped(self, pool):
+        def wait():
+            # every call is running at once
+            time.sleep(0.5)
+            return os.getpid()
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(pool.run(wait, timeout=5)))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(set(results)) == 4
+        assert pool.workers == 2
+
+    def test_timed_out_workers_are_killed_and_replaced(self, pool):
+        pid = pool.run(os.getpid, timeout=5)
+        with pytest.raises(TimeoutError):
+            pool.run(time.sleep, 5, timeout=0.2)
+        assert pool.workers == 0
+        new_pid = pool.run(os.getpid, timeout=5)
+        assert new_pid != pid
+        with pytest.raises(ProcessLookupError):
+            os.kill(pid, 0)
+
+    def test_workers_which_exit_are_replaced(self, pool):
+        with pytest.raises(RuntimeError, match="exited with code 3"):
+            pool.run(os._exit, 3, timeout=5)
+        assert pool.run(lambda: 42, timeout=5) == 42
+
+    def test_errors_are_raised(self, pool):
+        def fail():
+            raise ValueError("test")
+
+        with pytest.raises(ValueError, match="test"):
+            pool.run(fail, timeout=5)
+        assert pool.workers == 1
+
+    def test_large_results_are_returned_through_shared_memory(self, pool):
+        value = pool.run(lambda: [b"x" * 4096, "y"], timeout=5)
+        assert value == [b"x" * 4096, "y"]
+        assert not glob.glob(os.path.join(pool.shm_dir, "prefect-timeout-*"))
+
+    def test_context_is_passed_to_workers(self, pool):
+        with prefect.context(test_key=42):
+            assert pool.run(lambda: prefect.context.get("test_key"), timeout=5) == 42
+
+    def test_calls_which_cant_be_pickled_run_in_new_processes(self, pool):
+        lock = threading.Lock()
+        assert pool.run(lambda: (lock.locked(), os.getpid()), timeout=5)[1] not in (
+            os.getpid(),
+            pool.run(os.getpid, timeout=5),
+        )
+        with pytest.raises(TimeoutError):
+            pool.run(lambda: lock.locked() or time.sleep(5), timeout=0.2)
+
+    def test_pool_is_created_from_config(self, monkeypatch):
+        monkeypatch.setattr(executors, "_timeout_pool", None)
+        with set_temporary_config(
+            {
+                "engine.timeouts.max_idle_workers": 3,
+                "engine.timeouts.shared_memory_threshold": 10,
+                "engine.timeouts.max_calls_per_worker": 5,
+            }
+        ):
+            pool = get_timeout_pool()
+        assert (
+            pool.max_idle_workers,
+            pool.shared_memory_threshold,
+            pool.max_calls_per_worker,
+        ) == (3, 10, 5)
+        assert get_timeout_pool() is pool
+
+
+class TestSoftTimeoutExecutor:
+    @pytest.fixture
+    def executor(self):
+        return SoftTimeoutExecutor(max_workers=2)
+
+    def test_runs_functions_with_context(self, executor):
+        with prefect.context(test_key=42):
+            assert executor.run(lambda x: (x, prefect.context.test_key), 1) == (1, 42)
+
+    def test_threads_are_shared_and_bounded(self, executor):
+        names = {
+            executor.run(lambda: threading.current_thread().name, timeout=5)
+            for _ in range(10)
+        }
+        assert len(names) <= 2
+        assert all(name.startswith("prefect-soft-timeout") for name in names)
+
+    def test_errors_are_raised(self, executor):
+        def fail():
+            raise ValueError("test")
+
+        with pytest.raises(ValueError, match="test"):
+            executor.run(fail, timeout=5)
+
+    def test_timed_out_runs_are_abandoned_and_cancelled(self, executor):
+        release = threading.Event()
+        cancelled = threading.Event()
+
+        def wait():
+            assert release.wait(10)
+            if prefect.context.cancel_event.is_set():
+                cancelled.set()
+
+        with pytest.raises(TimeoutError):
+            executor.run(wait, timeout=0.1)
+        assert executor.stats == dict(
+            running=1,
+            abandoned=1,
+            timed_out=1,
+            never_started=0,
+            finished_after_timeout=0,
+        )
+
+        release.set()
+        assert cancelled.wait(10)
+        for _ in range(100):
+            if executor.stats["abandoned"] == 0:
+                break
+            time.sleep(0.05)
+        assert executor.stats == dict(
+            running=0,
+            abandoned=0,
+            timed_out=1,
+            never_started=0,
+            finished_after_timeout=1,
+        )
+
+    def test_timeouts_start_when_runs_start(self):
+        executor = SoftTimeoutExecutor(max_workers=1)
+        thread = threading.Thread(target=executor.run, args=(time.sleep, 0.5))
+        thread.start()
+        time.sleep(0.1)
+        try:
+            # waits longer than its timeout for the thread, which doesn't count
+            assert executor.run(lambda: 42, timeout=0.2) == 42
+        finally:
+            thread.join()
+        assert executor.stats["timed_out"] == 0
+
+    def test_runs_which_time_out_before_they_start_never_run(self, executor):
+        release = threading.Event()
+        ran = []
+        for _ in range(2):
+            with pytest.raises(TimeoutError):
+                executor.run(release.wait, 10, timeout=0.05)
+
+        with pytest.raises(TimeoutError, match="before it started"):
+            executor.run(ran.append, 1, timeout=0.05)
+        release.set()
+        assert executor.run(lambda: 42, timeout=5) == 42
+        assert ran == []
+        assert executor.stats["timed_out"] == 3
+        assert executor.stats["never_started"] == 1
+
+    def test_warns_when_threads_are_consumed_by_abandoned_runs(self, executor, caplog):
+        release = threading.Event()
+        with pytest.raises(TimeoutError):
+            executor.run(release.wait, 10, timeout=0.05)
+        release.set()
+        assert "1 of 2 soft timeout threads" in caplog.text
+
+    def test_executor_is_created_from_config(self, monkeypatch):
+        monkeypatch.setattr(executors, "_soft_timeout_executor", None)
+        with set_temporary_config({"engine.timeouts.soft_timeout_threads": 3}):
+            executor = get_soft_timeout_executor()
+        assert executor.max_workers == 3
+        assert get_soft_timeout_executor() is executor
+
+    def test_timeout_handler_uses_shared_executor_for_soft_timeouts(self, monkeypatch):
+        monkeypatch.setattr(sys, "platform", "win32")
+        executor = SoftTimeoutExecutor(max_workers=2)
+        monkeypatch.setattr(executors, "get_soft_timeout_executor", lambda: executor)
+        with pytest.warns(UserWarning, match="soft timeout"):
+            with pytest.raises(TimeoutError):
+                timeout_handler(time.sleep, 0.5, timeout=0.1)
+        assert executor.stats["timed_out"] == 1
+
+
 def test_recursion_go_case():
     @tail_recursive
     def my_func(a=0):
@@ -212,3 +471,171 @@ def test_recursion_raises_when_not_decorated():
         assert a_func()
 
     assert call_checkpoints == [("a", 0), ("b", 1), ("a", 3), ("b", 4), ("a", 6)]
+
+
+class TestHeartbeatService:
+    @pytest.fixture()
+    def popen(self, monkeypatch):
+        processes = []
+
+        def new_process(*args, **kwargs):
+            process = MagicMock(poll=MagicMock(return_value=None))
+            process.lines = []
+            process.stdin.write.side_effect = lambda s: process.lines.extend(
+                s.splitlines()
+            )
+            processes.append(process)
+            return process
+
+        monkeypatch.setattr(
+            "prefect.utilities.executors.subprocess.Popen",
+            MagicMock(side_effect=new_process),
+        )
+        return processes
+
+    def test_one_process_serves_every_run(self, popen):
+        service = HeartbeatService()
+        service.register("task-run", "a")
+        service.register("task-run", "b")
+        service.register("flow-run", "c")
+        service.unregister("task-run", "a")
+
+        assert len(popen) == 1
+        assert popen[0].lines == [
+            "add task-run a",
+            "add task-run b",
+            "add flow-run c",
+            "remove task-run a",
+        ]
+
+    def test_runs_registered_twice_are_removed_once_unregistered_twice(self, popen):
+        service = HeartbeatService()
+        service.register("task-run", "a")
+        service.register("task-run", "a")
+        service.unregister("task-run", "a")
+        assert popen[0].lines == ["add task-run a"]
+        service.unregister("task-run", "a")
+        assert popen[0].lines == ["add task-run a", "remove task-run a"]
+
+    def test_dead_service_is_restarted_with_current_runs(self, popen):
+        service = HeartbeatService()
+        service.register("task-run", "a")
+        service.register("flow-run", "b")
+        popen[0].poll.return_value = 1
+
+        service.register("task-run", "c")
+        assert len(popen) == 2
+        assert popen[1].lines == [
+            "add task-run a",
+            "add flow-run b",
+            "add task-run c",
+        ]
+
+    def test_stopped_service_is_restarted_with_current_runs(self, popen):
+        service = HeartbeatService()
+        service.register("task-run", "a")
+        service.stop()
+        popen[0].stdin.close.assert_called_once_with()
+        popen[0].wait.assert_called_once_with()
+
+        service.register("task-run", "b")
+        assert len(popen) == 2
+        assert popen[1].lines == ["add task-run a", "add task-run b"]
+
+    def test_failed_registration_is_forgotten(self, monkeypatch):
+        monkeypatch.setattr(
+            "prefect.utilities.executors.subprocess.Popen",
+            MagicMock(side_effect=FileNotFoundError),
+        )
+        service = HeartbeatService()
+        with pytest.raises(FileNotFoundError):
+            service.register("task-run", "a")
+        assert not service._runs
+
+    def test_get_heartbeat_service_is_shared(self):
+        assert get_heartbeat_service() is get_heartbeat_service()
+
+    @pytest.mark.skipif(
+        not hasattr(os, "register_at_fork"), reason="requires os.register_at_fork"
+    )
+    def test_forked_children_dont_keep_the_service_alive(self, monkeypatch):
+        popen = subprocess.Popen
+        monkeypatch.setattr(
+            "prefect.utilities.executors.subprocess.Popen",
+            lambda args, **kwargs: popen(
+                [sys.executable, "-c", "import sys; sys.stdin.read()"], **kwargs
+            ),
+        )
+        monkeypatch.setattr(
+            "prefect.utilities.executors._heartbeat_service", HeartbeatService()
+        )
+        monkeypatch.setattr(
+            "prefect.utilities.executors._heartbeat_service_pid", os.getpid()
+        )
+        service = get_heartbeat_service()
+        with set_temporary_config({"cloud.auth_token": "token"}):
+            service.register("task-run", "a")
+
+        read, write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            # the child lives until the parent is done checking on the service
+            os.read(read, 1)
+            os._exit(0)
+        try:
+            service._process.stdin.close()
+            assert service._process.wait(timeout=10) == 0
+        finally:
+            os.write(write, b"x")
+            os.waitpid(pid, 0)
+            os.close(read)
+            os.close(write)
+
+
+class TestRunWithHeartbeat:
+    class HeartbeatRunner(prefect.engine.runner.Runner):
+        def __init__(self, heartbeat_cmd):
+            super().__init__()
+            self.heartbeat_cmd = heartbeat_cmd
+
+        def _heartbeat(self):
+            return True
+
+        @run_with_heartbeat
+        def run(self):
+            return get_heartbeat_service()._runs.copy()
+
+    @pytest.fixture()
+    def popen(self, monkeypatch):
+        popen = MagicMock()
+        monkeypatch.setattr("prefect.utilities.executors.subprocess.Popen", popen)
+        monkeypatch.setattr(
+            "prefect.utilities.executors._heartbeat_service", HeartbeatService()
+        )
+        monkeypatch.setattr(
+            "prefect.utilities.executors._heartbeat_service_pid", os.getpid()
+        )
+        return popen
+
+    def test_runs_are_registered_with_the_heartbeat_service(self, popen):
+        runner = self.HeartbeatRunner(["prefect", "heartbeat", "task-run", "-i", "a"])
+        with set_temporary_config({"cloud.heartbeat_mode": "service"}):
+            assert runner.run() == {("task-run", "a"): 1}
+        assert not get_heartbeat_service()._runs
+        assert popen.call_args[0][0] == ["prefect", "heartbeat", "service"]
+
+    @pytest.mark.parametrize("mode", [None, "process"])
+    def test_process_mode_starts_a_process_per_run(self, popen, mode):
+        cmd = ["prefect", "heartbeat", "task-run", "-i", "a"]
+        # a process per run is the default
+        with set_temporary_config({"cloud.heartbeat_mode": mode} if mode else {}):
+            assert not self.HeartbeatRunner(cmd).run()
+        assert popen.call_args[0][0] == cmd
+        popen.return_value.kill.assert_called_once()
+
+    def test_other_commands_start_a_process_per_run(self, popen):
+        cmd = ["my-heartbeat", "--id", "a"]
+        with set_temporary_config({"cloud.heartbeat_mode": "service"}):
+            assert not self.HeartbeatRunner(cmd).run()
+        assert popen.call_args[0][0] == cmd
+        popen.return_value.kill.assert_called_once()
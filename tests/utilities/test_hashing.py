@@ -0,0 +1,162 @@
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from prefect.utilities.hashing import fingerprint, hash_values, stable_hash
+
+
+class Point:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+@pytest.mark.parametrize(
+    "value",
+    [None, True, 1, 1.5, 1j, "x", b"x", [1, "x"], (1, "x"), {1, 2}, {"x": [1]}],
+)
+def test_equal_values_have_equal_hashes(value):
+    assert stable_hash(value) == stable_hash(value)
+    assert len(stable_hash(value)) == 64
+
+
+@pytest.mark.parametrize(
+    "first, second",
+    [
+        (1, 1.0),
+        (1, True),
+        ("1", 1),
+        ("x", b"x"),
+        ([1, 2], (1, 2)),
+        (["ab"], ["a", "b"]),
+        ([[1], 2], [1, [2]]),
+        ({"x": 1}, {"x": 2}),
+        ({"x": 1}, {"y": 1}),
+        (None, "None"),
+    ],
+)
+def test_different_values_have_different_hashes(first, second):
+    assert stable_hash(first) != stable_hash(second)
+
+
+def test_hashes_ignore_the_order_of_dicts_and_sets():
+    assert stable_hash({"x": 1, "y": 2}) == stable_hash({"y": 2, "x": 1})
+    assert stable_hash({"a", "b", "c"}) == stable_hash({"c", "b", "a"})
+
+
+def test_bytes_like_values_are_hashed_by_their_contents():
+    assert stable_hash(b"abc") == stable_hash(bytearray(b"abc"))
+    assert stable_hash(b"abc") == stable_hash(memoryview(b"abc"))
+
+
+def test_other_objects_are_hashed_by_their_pickles():
+    assert stable_hash(Point(1, 2)) == stable_hash(Point(1, 2))
+    assert stable_hash(Point(1, 2)) != stable_hash(Point(2, 1))
+
+
+def test_hashes_are_the_same_in_every_process():
+    value = {"x": [1, 2.5, "three"], "y": {"a", "b"}, "z": (None, b"\x00")}
+    script = "from prefect.utilities.hashing import stable_hash; print(stable_hash({!r}))".format(
+        value
+    )
+    hashes = {
+        subprocess.check_output(
+            [sys.executable, "-c", script], env=dict(PYTHONHASHSEED=str(seed))
+        )
+        .decode()
+        .strip()
+        for seed in [1, 2]
+    }
+    assert hashes == {stable_hash(value)}
+
+
+def test_hash_values_hashes_each_value():
+    assert hash_values({"x": 1, "y": [2]}) == {
+        "x": stable_hash(1),
+        "y": stable_hash([2]),
+    }
+    assert hash_values({}) == {}
+
+
+def test_hash_values_records_unhashable_values_as_none():
+    assert hash_values({"x": 1, "lock": threading.Lock()}) == {
+        "x": stable_hash(1),
+        "lock": None,
+    }
+
+
+def test_fingerprint_covers_inputs_and_parameters():
+    assert fingerprint(hash_values({"x": 1})) == fingerprint(hash_values({"x": 1}), {})
+    assert fingerprint(hash_values({"x": 1})) != fingerprint(hash_values({"x": 2}))
+    assert fingerprint(hash_values({"x": 1})) != fingerprint(
+        hash_values({"x": 1}), hash_values({"p": 1})
+    )
+
+
+def test_fingerprint_is_none_for_unhashable_values():
+    assert fingerprint(hash_values({"x": threading.Lock()})) is None
+    assert fingerprint({}, hash_values({"p": threading.Lock()})) is None
+
+
+class TestNumPy:
+    @pytest.fixture(autouse=True)
+    def numpy(self):
+        return pytest.importorskip("numpy")
+
+    def test_arrays_are_hashed_by_their_contents(self, numpy):
+        assert stable_hash(numpy.arange(10)) == stable_hash(numpy.arange(10))
+        assert stable_hash(numpy.arange(10)) != stable_hash(numpy.arange(1, 11))
+
+    def test_arrays_with_different_dtypes_or_shapes_differ(self, numpy):
+        array = numpy.arange(12, dtype="int64")
+        assert stable_hash(array) != stable_hash(array.astype("int32"))
+        assert stable_hash(array) != stable_hash(array.reshape(3, 4))
+        assert stable_hash(array) != stable_hash(array.tolist())
+
+    def test_views_are_hashed_by_their_elements(self, numpy):
+        array = numpy.arange(12).reshape(3, 4)
+        assert stable_hash(array.T) == stable_hash(numpy.ascontiguousarray(array.T))
+        assert stable_hash(array[:, ::2]) == stable_hash(array[:, ::2].copy())
+
+    def test_object_arrays_and_scalars(self, numpy):
+        assert stable_hash(numpy.array([1, "x"], dtype=object)) == stable_hash(
+            numpy.array([1, "x"], dtype=object)
+        )
+        assert stable_hash(numpy.int64(1)) != stable_hash(numpy.int32(1))
+
+    def test_array_subclasses_are_hashed_by_their_pickles(self, numpy):
+        data = [1, 2, 3]
+        first = numpy.ma.masked_array(data, mask=[False, True, False])
+        second = numpy.ma.masked_array(data, mask=[True, False, False])
+        assert stable_hash(first) != stable_hash(second)
+        assert stable_hash(first) == stable_hash(
+            numpy.ma.masked_array(data, mask=[False, True, False])
+        )
+        assert stable_hash(numpy.matrix(data)) != stable_hash(numpy.array([data]))
+
+
+class TestPandas:
+    @pytest.fixture(autouse=True)
+    def pandas(self):
+        return pytest.importorskip("pandas")
+
+    def test_data_frames_are_hashed_by_their_contents(self, pandas):
+        df = pandas.DataFrame({"x": [1, 2], "y": ["a", "b"]})
+        assert stable_hash(df) == stable_hash(df.copy())
+        assert stable_hash(df) != stable_hash(df.assign(y=["a", "c"]))
+        assert stable_hash(df) != stable_hash(df.rename(columns={"y": "z"}))
+        assert stable_hash(df) != stable_hash(df.set_index(pandas.Index([5, 6])))
+        assert stable_hash(df) != stable_hash(df.astype({"x": "float64"}))
+
+    def test_series_and_indexes(self, pandas):
+        series = pandas.Series([1, 2], name="x")
+        assert stable_hash(series) == stable_hash(series.copy())
+        assert stable_hash(series) != stable_hash(series.rename("y"))
+        assert stable_hash(pandas.Index([1, 2])) != stable_hash(pandas.Index([2, 1]))
+
+    def test_unhashable_cells_are_pickled(self, pandas):
+        df = pandas.DataFrame({"x": [[1], [2]]})
+        assert stable_hash(df) == stable_hash(df.copy())
+        assert stable_hash(df) != stable_hash(pandas.DataFrame({"x": [[1], [3]]}))
@@ -1,9 +1,11 @@
 import json
 import logging
+import threading
 import time
 from unittest.mock import MagicMock
 
 import pytest
+import requests
 
 from prefect import context, utilities
 
@@ -309,3 +311,159 @@ def test_context_only_specified_attributes():
     logger.filters.pop()
 
     assert test_filter.called
+
+
+class TestCloudHandlerBatching:
+    def make_handler(self, **config):
+        config = {"cloud.{}".format(key): value for key, value in config.items()}
+        handler = utilities.logging.CloudHandler()
+        # batches are uploaded by the tests rather than by a background thread
+        handler._thread = MagicMock()
+        handler.client = MagicMock()
+        with utilities.configuration.set_temporary_config(config):
+            handler.queue
+        return handler
+
+    def make_log(self, message, level="INFO"):
+        return dict(message=message, level=level, info={})
+
+    def sent_batches(self, handler):
+        return [
+            [log["message"] for log in call[0][0]]
+            for call in handler.client.write_run_logs.call_args_list
+        ]
+
+    def test_batches_are_limited_by_count(self):
+        handler = self.make_handler(logging_max_batch_count=2)
+        for i in range(5):
+            handler.put(self.make_log(str(i)))
+        handler.batch_upload()
+
+        assert self.sent_batches(handler) == [["0", "1"], ["2", "3"], ["4"]]
+        assert handler.stats["sent"] == 5
+        assert handler.stats["batches"] == 3
+
+    def test_batches_are_limited_by_size(self):
+        size = len(json.dumps(self.make_log("0")))
+        handler = self.make_handler(logging_max_batch_bytes=2 * size + 1)
+        for i in range(5):
+            handler.put(self.make_log(str(i)))
+        handler.put(self.make_log("x" * 10 * size))
+        handler.batch_upload()
+
+        # logs larger than the limit are sent on their own
+        assert self.sent_batches(handler) == [
+            ["0", "1"],
+            ["2", "3"],
+            ["4"],
+            ["x" * 10 * size],
+        ]
+
+    def test_logs_are_sent_as_they_were_serialized(self):
+        handler = self.make_handler(logging_compress=True)
+        logs = [self.make_log("one"), self.make_log("two")]
+        for log in logs:
+            handler.put(log)
+        handler.batch_upload()
+
+        args, kwargs = handler.client.write_run_logs.call_args
+        assert args == (logs,)
+        assert kwargs["serialized_logs"] == [json.dumps(log) for log in logs]
+        assert kwargs["compress_body"] is True
+        assert handler.stats["bytes"] == sum(len(json.dumps(log)) for log in logs)
+
+    def test_logs_are_dropped_when_the_queue_is_full(self):
+        handler = self.make_handler(logging_max_queue_size=2, logging_overflow="drop")
+        for i in range(3):
+            handler.put(self.make_log(str(i), level="ERROR"))
+        handler.batch_upload()
+
+        assert self.sent_batches(handler) == [["0", "1"]]
+        assert handler.stats["sent"] == 2
+        assert handler.stats["dropped"] == 1
+
+    def test_logs_below_warning_are_sampled_once_the_queue_is_half_full(self):
+        handler = self.make_handler(
+            logging_max_queue_size=100,
+            logging_overflow="sample",
+            logging_sample_rate=3,
+        )
+        for i in range(50):
+            handler.put(self.make_log(str(i)))
+        for i in range(50, 56):
+            handler.put(self.make_log(str(i)))
+        handler.put(self.make_log("warning", level="WARNING"))
+        handler.batch_upload()
+
+        (messages,) = self.sent_batches(handler)
+        assert messages == [str(i) for i in range(50)] + ["52", "55", "warning"]
+        assert handler.stats["sampled"] == 6
+        assert handler.stats["dropped"] == 4
+
+    def test_logs_are_counted_from_many_threads(self):
+        handler = self.make_handler(
+            logging_max_queue_size=1000, logging_max_batch_count=10
+        )
+
+        def put_logs():
+            for i in range(500):
+                handler.put(self.make_log(str(i)))
+
+        threads = [threading.Thread(target=put_logs) for _ in range(8)]
+        uploader = threading.Thread(target=handler.batch_upload)
+        for thread in threads + [uploader]:
+            thread.start()
+        for thread in threads + [uploader]:
+            thread.join()
+        handler.batch_upload()
+
+        stats = handler.stats
+        assert stats["sent"] + stats["dropped"] == 4000
+        assert stats["sent"] == sum(map(len, self.sent_batches(handler)))
+
+    def test_logs_below_warning_leave_room_for_more_severe_logs(self):
+        handler = self.make_handler(logging_max_queue_size=20, logging_overflow="drop")
+        for i in range(20):
+            handler.put(self.make_log(str(i)))
+        for i in range(3):
+            handler.put(self.make_log("error", level="ERROR"))
+        handler.batch_upload()
+
+        (messages,) = self.sent_batches(handler)
+        assert messages == [str(i) for i in range(18)] + ["error", "error"]
+        assert handler.stats["dropped"] == 3
+
+    def test_logs_are_not_compressed_by_default(self):
+        handler = self.make_handler()
+        handler.put(self.make_log("one"))
+        handler.batch_upload()
+
+        assert handler.client.write_run_logs.call_args[1]["compress_body"] is False
+
+    @pytest.mark.parametrize("status", [400, 415])
+    def test_logs_are_sent_uncompressed_if_gzip_is_rejected(self, status):
+        handler = self.make_handler(logging_compress=True)
+        error = requests.HTTPError(response=MagicMock(status_code=status))
+        handler.client.write_run_logs.side_effect = [error, None, None]
+        handler.put(self.make_log("one"))
+        handler.batch_upload()
+        handler.put(self.make_log("two"))
+        handler.batch_upload()
+
+        compressed = [
+            call[1]["compress_body"]
+            for call in handler.client.write_run_logs.call_args_list
+        ]
+        assert compressed == [True, False, False]
+        assert self.sent_batches(handler) == [["one"], ["one"], ["two"]]
+        assert handler.stats["sent"] == 2
+        assert handler.stats["failed"] == 0
+
+    def test_failed_uploads_are_counted(self):
+        handler = self.make_handler()
+        handler.client.write_run_logs.side_effect = ValueError("no")
+        handler.put(self.make_log("one"))
+        handler.batch_upload()
+
+        assert handler.stats["failed"] == 1
+        assert handler.stats["sent"] == 0
@@ -0,0 +1,50 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from prefect.engine import checkpointing
+from prefect.engine.cloud import utilities as cloud_utilities
+from prefect.engine.result_handlers import cached_result_handler
+from prefect.utilities import executors, process_state
+
+
+@pytest.fixture
+def resets(monkeypatch):
+    resets = list(process_state._RESETS)
+    monkeypatch.setattr(process_state, "_RESETS", resets)
+    return resets
+
+
+def test_registered_resets_are_called_once_in_order(resets):
+    calls = []
+    first = MagicMock(side_effect=lambda: calls.append("first"))
+    second = MagicMock(side_effect=lambda: calls.append("second"))
+    assert process_state.register_reset(first) is first
+    process_state.register_reset(second)
+    process_state.register_reset(first)
+
+    process_state.reset_process_state()
+    assert calls[-2:] == ["first", "second"]
+    assert first.call_count == 1
+
+
+def test_shared_objects_are_recreated_after_a_reset(resets):
+    pool = checkpointing.get_checkpoint_pool()
+    cache = cached_result_handler.get_result_cache()
+    soft_timeout_executor = executors.get_soft_timeout_executor()
+    cloud_utilities._CACHED_STATES["key"] = {}
+
+    process_state.reset_process_state()
+
+    assert checkpointing.get_checkpoint_pool() is not pool
+    assert cached_result_handler.get_result_cache() is not cache
+    assert executors.get_soft_timeout_executor() is not soft_timeout_executor
+    assert not cloud_utilities._CACHED_STATES
+
+
+def test_heartbeat_service_is_stopped_by_a_reset(resets, monkeypatch):
+    service = MagicMock()
+    monkeypatch.setattr(executors, "_heartbeat_service", service)
+    process_state.reset_process_state()
+    assert service.stop.called
+    assert executors._heartbeat_service is None